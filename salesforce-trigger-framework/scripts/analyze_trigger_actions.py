@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Trigger Action Pipeline Analyzer
+Shows the execution order of every Trigger_Action__mdt record in a project and
+estimates the SOQL queries and DML statements each action costs.
+
+Each record is linked to its Apex class. The class's context method
+(beforeInsert, afterUpdate, ...) is analyzed statically and followed into
+the project classes it calls (Service, DAL, ...). Actions are then laid out per
+object and DML operation in the order the framework runs them:
+before + after context, by Order__c. Cumulative consumption is measured
+against the governor limits to show which action pushes the transaction
+over budget.
+
+Usage:
+    python analyze_trigger_actions.py [--project-dir DIR] [--object NAME] [--batch-size N]
+                                      [--soql-budget N] [--dml-budget N] [--verbose] [--format json]
+
+Examples:
+    python analyze_trigger_actions.py
+    python analyze_trigger_actions.py --object Opportunity --verbose
+    python analyze_trigger_actions.py --soql-budget 50 --format json > pipeline.json
+
+Estimates are static: every query/DML statement reachable from the context
+method counts once per call, and statements inside loops are multiplied by
+--batch-size (records per trigger chunk). Branches are not evaluated, so the
+numbers are an upper bound for the code path, not a measurement.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_trigger_action import (  # noqa: E402
+    CONTEXT_LABEL_MAP, Registration, format_order, parse_registration
+)
+
+# Synchronous per-transaction governor limits
+SOQL_LIMIT = 100
+DML_LIMIT = 150
+DEFAULT_BATCH_SIZE = 200
+
+# DML operation -> contexts that run for it, in execution order
+OPERATIONS = {
+    'insert': ['BeforeInsert', 'AfterInsert'],
+    'update': ['BeforeUpdate', 'AfterUpdate'],
+    'delete': ['BeforeDelete', 'AfterDelete'],
+    'undelete': ['AfterUndelete'],
+}
+
+FLOW_ACTION_CLASS = 'TriggerActionFlow'
+
+# Calls are followed this deep; anything further is reported as unresolved
+MAX_CALL_DEPTH = 40
+SKIP_DIRS = {'.git', '.sf', '.sfdx', 'node_modules', '.localdevserver'}
+
+# Comments and string literals are blanked before matching (lengths and
+# newlines preserved, so offsets still map to line numbers)
+COMMENT_OR_STRING = re.compile(r"//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'", re.DOTALL)
+
+METHOD_HEADER = re.compile(
+    r'(?:^|[;{}])\s*(?:@\w+(?:\([^)]*\))?\s*)*'
+    r'(?:(?:public|private|protected|global|static|override|virtual|abstract|webservice|testmethod)\s+)*'
+    r'[\w.<>,\[\]\s]*?\b(\w+)\s*\([^()]*\)\s*(?:throws\s+[\w.,\s]+)?\{',
+    re.IGNORECASE
+)
+LOOP_HEADER = re.compile(r'\b(?:for|while)\s*\(|\bdo\s*\{', re.IGNORECASE)
+SOQL = re.compile(r'\[\s*SELECT\b|\bDatabase\s*\.\s*(?:query|countQuery|queryWithBinds)\s*\(', re.IGNORECASE)
+DML = re.compile(
+    r'(?<![\w.])(?:insert|update|upsert|delete|undelete|merge)\s+(?=[\w(\[])'
+    r'|\bDatabase\s*\.\s*(?:insert|update|upsert|delete|undelete|merge|convertLead)\w*\s*\('
+    r'|\bEventBus\s*\.\s*publish\s*\(',
+    re.IGNORECASE
+)
+QUALIFIED_CALL = re.compile(r'(?<![\w.])(\w+)\s*\.\s*(\w+)\s*\(')
+LOCAL_CALL = re.compile(r'(?<![\w.])(\w+)\s*\(')
+CONSTRUCTOR_CALL = re.compile(r'\bnew\s+(\w+)\s*\(', re.IGNORECASE)
+NOT_METHODS = {'if', 'for', 'while', 'switch', 'catch', 'return', 'new', 'else', 'when', 'do', 'try',
+               'super', 'this', 'system', 'insert', 'update', 'upsert', 'delete', 'undelete', 'merge'}
+
+COST_KEYS = ('soql', 'dml', 'soql_loop', 'dml_loop')
+
+
+# =============================================================================
+# Apex static analysis
+# =============================================================================
+
+@dataclass
+class MethodInfo:
+    class_name: str
+    name: str
+    start: int                      # offset of the body's opening brace
+    end: int                        # offset just past the closing brace
+
+
+@dataclass
+class Cost:
+    """Queries/DML reachable from a method: counts plus the statements behind them."""
+    soql: int = 0
+    dml: int = 0
+    soql_loop: int = 0              # inside a loop: runs once per record
+    dml_loop: int = 0
+    sources: Set[Tuple[str, int, str, bool]] = field(default_factory=set)  # (Class.method, line, kind, loop)
+    unresolved: Set[str] = field(default_factory=set)
+
+    def add(self, other: 'Cost', in_loop: bool):
+        if in_loop:
+            self.soql_loop += other.soql + other.soql_loop
+            self.dml_loop += other.dml + other.dml_loop
+        else:
+            for key in COST_KEYS:
+                setattr(self, key, getattr(self, key) + getattr(other, key))
+        self.sources |= {(where, line, kind, loop or in_loop) for where, line, kind, loop in other.sources}
+        self.unresolved |= other.unresolved
+
+    def estimate(self, batch_size: int) -> Tuple[int, int]:
+        """(SOQL queries, DML statements) for one trigger chunk of batch_size records."""
+        return self.soql + self.soql_loop * batch_size, self.dml + self.dml_loop * batch_size
+
+
+def _blank(match: re.Match) -> str:
+    return re.sub(r'[^\n]', ' ', match.group(0))
+
+
+def _matching_brace(code: str, start: int) -> int:
+    """Offset just past the brace closing the one at start."""
+    depth = 0
+    for i in range(start, len(code)):
+        if code[i] == '{':
+            depth += 1
+        elif code[i] == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(code)
+
+
+class ApexIndex:
+    """Project Apex classes, their methods and a memoized cost per method."""
+
+    def __init__(self, class_files: Dict[str, Path]):
+        self.files = {name.lower(): path for name, path in class_files.items()}
+        self.names = {name.lower(): name for name in class_files}
+        self._code: Dict[str, str] = {}
+        self._methods: Dict[str, Dict[str, List[MethodInfo]]] = {}
+        self._variables: Dict[str, Dict[str, str]] = {}
+        self._costs: Dict[Tuple[str, str], Cost] = {}
+
+    def has_class(self, name: str) -> bool:
+        return name.lower() in self.files
+
+    def code(self, class_name: str) -> str:
+        key = class_name.lower()
+        if key not in self._code:
+            source = self.files[key].read_text(encoding='utf-8', errors='replace')
+            self._code[key] = COMMENT_OR_STRING.sub(_blank, source)
+        return self._code[key]
+
+    def methods(self, class_name: str) -> Dict[str, List[MethodInfo]]:
+        """Methods by lower-cased name (overloads share a name)."""
+        key = class_name.lower()
+        if key not in self._methods:
+            code = self.code(class_name)
+            methods: Dict[str, List[MethodInfo]] = {}
+            position = 0
+            while True:
+                match = METHOD_HEADER.search(code, position)
+                if not match:
+                    break
+                name = match.group(1)
+                brace = match.end() - 1
+                if name.lower() in NOT_METHODS:
+                    position = brace                    # the brace anchors the next header
+                    continue
+                end = _matching_brace(code, brace)
+                methods.setdefault(name.lower(), []).append(MethodInfo(self.names[key], name, brace, end))
+                position = end - 1
+            self._methods[key] = methods
+        return self._methods[key]
+
+    def variables(self, class_name: str) -> Dict[str, str]:
+        """Variable name -> project class, for fields and locals declared with a project type."""
+        key = class_name.lower()
+        if key not in self._variables:
+            found = {}
+            for match in re.finditer(r'\b(\w+)\s+(\w+)\s*[=;:,)]', self.code(class_name)):
+                if self.has_class(match.group(1)):
+                    found[match.group(2).lower()] = self.names[match.group(1).lower()]
+            self._variables[key] = found
+        return self._variables[key]
+
+    def method_cost(self, class_name: str, method_name: str, stack: Tuple = ()) -> Cost:
+        """Cost of calling class_name.method_name (the costliest overload)."""
+        key = (class_name.lower(), method_name.lower())
+        if key in self._costs:
+            return self._costs[key]
+        if key in stack:
+            return Cost()                               # recursion: counted once
+        if len(stack) >= MAX_CALL_DEPTH:
+            return Cost(unresolved={f'{class_name}.{method_name} (call depth > {MAX_CALL_DEPTH})'})
+        candidates = self.methods(class_name).get(method_name.lower(), [])
+        if not candidates:
+            cost = Cost(unresolved={f'{class_name}.{method_name} (method not found)'})
+        else:
+            costs = [self._body_cost(info, stack + (key,)) for info in candidates]
+            cost = max(costs, key=lambda c: c.estimate(DEFAULT_BATCH_SIZE))
+        self._costs[key] = cost
+        return cost
+
+    def _body_cost(self, info: MethodInfo, stack: Tuple) -> Cost:
+        code = self.code(info.class_name)
+        body = code[info.start:info.end]
+        loops = self._loop_ranges(body)
+        line_base = code.count('\n', 0, info.start) + 1
+        where = f'{info.class_name}.{info.name}'
+        variables = self.variables(info.class_name)
+        local_methods = self.methods(info.class_name)
+        cost = Cost()
+
+        def in_loop(offset):
+            return any(start <= offset < end for start, end in loops)
+
+        def line_of(offset):
+            return line_base + body.count('\n', 0, offset)
+
+        for pattern, kind in ((SOQL, 'soql'), (DML, 'dml')):
+            for match in pattern.finditer(body):
+                loop = in_loop(match.start())
+                counter = f'{kind}_loop' if loop else kind
+                setattr(cost, counter, getattr(cost, counter) + 1)
+                cost.sources.add((where, line_of(match.start()), kind.upper(), loop))
+
+        for match in QUALIFIED_CALL.finditer(body):
+            target, method = match.group(1), match.group(2)
+            target_class = self.names.get(target.lower()) or variables.get(target.lower())
+            if target_class is None and target.lower() == 'this':
+                target_class = info.class_name
+            if target_class:
+                cost.add(self.method_cost(target_class, method, stack), in_loop(match.start()))
+        for match in LOCAL_CALL.finditer(body):
+            method = match.group(1).lower()
+            if method in local_methods and method not in NOT_METHODS and method != info.class_name.lower():
+                cost.add(self.method_cost(info.class_name, method, stack), in_loop(match.start()))
+        for match in CONSTRUCTOR_CALL.finditer(body):
+            target_class = self.names.get(match.group(1).lower())
+            if target_class and match.group(1).lower() in self.methods(target_class):
+                cost.add(self.method_cost(target_class, match.group(1), stack), in_loop(match.start()))
+        return cost
+
+    @staticmethod
+    def _loop_ranges(body: str) -> List[Tuple[int, int]]:
+        """[start, end) offsets of loop bodies (the header's collection is evaluated once)."""
+        ranges = []
+        for match in LOOP_HEADER.finditer(body):
+            position = match.end()
+            if match.group(0).lower().startswith(('for', 'while')):
+                depth = 1                                   # skip the parenthesized header
+                while position < len(body) and depth:
+                    depth += {'(': 1, ')': -1}.get(body[position], 0)
+                    position += 1
+                while position < len(body) and body[position].isspace():
+                    position += 1
+            else:
+                position -= 1                               # do { ... }
+            if position < len(body) and body[position] == '{':
+                ranges.append((position, _matching_brace(body, position)))
+            else:
+                ranges.append((position, body.find(';', position) + 1 or len(body)))
+        return ranges
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+
+@dataclass
+class PipelineEntry:
+    registration: Registration
+    status: str                     # analyzed, flow, bypassed, missing-class, missing-method
+    cost: Cost
+    soql: int = 0                   # estimated for one chunk
+    dml: int = 0
+    cumulative_soql: int = 0
+    cumulative_dml: int = 0
+    over_budget: List[str] = field(default_factory=list)
+
+
+def find_project_files(project_dir: Path) -> Tuple[List[Path], Dict[str, Path]]:
+    """Trigger_Action records and {class name: path} for every Apex class."""
+    records, classes = [], {}
+    for dirpath, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for filename in filenames:
+            if filename.startswith('Trigger_Action.') and filename.endswith('.md-meta.xml'):
+                records.append(Path(dirpath) / filename)
+            elif filename.endswith('.cls'):
+                classes.setdefault(filename[:-len('.cls')], Path(dirpath) / filename)
+    return sorted(records), classes
+
+
+def context_method(context: str) -> str:
+    return context[0].lower() + context[1:]
+
+
+def analyze_entry(registration: Registration, apex: ApexIndex, batch_size: int) -> PipelineEntry:
+    """Link one record to its class and estimate its cost."""
+    if registration.bypassed:
+        return PipelineEntry(registration, 'bypassed', Cost())
+    if registration.class_name == FLOW_ACTION_CLASS or registration.flow_name:
+        return PipelineEntry(registration, 'flow', Cost())
+    if not apex.has_class(registration.class_name):
+        return PipelineEntry(registration, 'missing-class', Cost())
+    method = context_method(registration.context)
+    if method.lower() not in apex.methods(registration.class_name):
+        return PipelineEntry(registration, 'missing-method', Cost())
+    cost = apex.method_cost(registration.class_name, method)
+    soql, dml = cost.estimate(batch_size)
+    return PipelineEntry(registration, 'analyzed', cost, soql, dml)
+
+
+def build_pipelines(registrations: List[Registration], apex: ApexIndex, batch_size: int,
+                    soql_budget: int, dml_budget: int) -> Dict[str, Dict[str, List[PipelineEntry]]]:
+    """{object: {operation: [entries in execution order with cumulative totals]}}."""
+    by_object: Dict[str, List[Registration]] = {}
+    for registration in registrations:
+        by_object.setdefault(registration.object_name, []).append(registration)
+
+    pipelines = {}
+    for object_name in sorted(by_object, key=str.lower):
+        pipelines[object_name] = {}
+        for operation, contexts in OPERATIONS.items():
+            ordered = sorted((r for r in by_object[object_name] if r.context in contexts),
+                             key=lambda r: (contexts.index(r.context), r.order, r.class_name))
+            if not ordered:
+                continue
+            entries, soql_total, dml_total = [], 0, 0
+            for registration in ordered:
+                entry = analyze_entry(registration, apex, batch_size)
+                soql_total += entry.soql
+                dml_total += entry.dml
+                entry.cumulative_soql, entry.cumulative_dml = soql_total, dml_total
+                if soql_total > soql_budget and soql_total - entry.soql <= soql_budget:
+                    entry.over_budget.append('SOQL')
+                if dml_total > dml_budget and dml_total - entry.dml <= dml_budget:
+                    entry.over_budget.append('DML')
+                entries.append(entry)
+            pipelines[object_name][operation] = entries
+    return pipelines
+
+
+def order_collisions(registrations: List[Registration]) -> List[str]:
+    """Records sharing an object, context and Order__c (non-deterministic order)."""
+    seen: Dict[Tuple[str, str, float], Registration] = {}
+    collisions = []
+    for registration in registrations:
+        key = (registration.object_name.lower(), registration.context, registration.order)
+        if key in seen:
+            collisions.append(f'{registration.object_name} {registration.context} order '
+                              f'{format_order(registration.order)}: {seen[key].path.name} and {registration.path.name}')
+        else:
+            seen[key] = registration
+    return collisions
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+STATUS_NOTES = {
+    'flow': 'Flow (not analyzed)',
+    'bypassed': 'Bypass_Execution__c',
+    'missing-class': 'class not found',
+    'missing-method': 'no context method',
+}
+
+
+def print_pipelines(pipelines, collisions: List[str], batch_size: int, soql_budget: int, dml_budget: int,
+                    verbose: bool):
+    print(f'🔍 Trigger action pipelines (estimates per {batch_size}-record chunk; '
+          f'budget {soql_budget} SOQL / {dml_budget} DML)')
+    for object_name, operations in pipelines.items():
+        for operation, entries in operations.items():
+            contexts = ' → '.join(CONTEXT_LABEL_MAP[c].replace('_', ' ') for c in OPERATIONS[operation])
+            print(f'\n📦 {object_name} — {operation} ({contexts})')
+            print(f'   {"context":<14} {"order":>6}  {"action":<40} {"SOQL":>5} {"DML":>5}  '
+                  f'{"cum SOQL":>9} {"cum DML":>8}')
+            for entry in entries:
+                registration = entry.registration
+                name = registration.flow_name or registration.class_name
+                loop = '*' if entry.cost.soql_loop or entry.cost.dml_loop else ' '
+                note = STATUS_NOTES.get(entry.status, '')
+                flag = f'  ⛔ pushes {" and ".join(entry.over_budget)} over budget' if entry.over_budget else ''
+                print(f'   {registration.context:<14} {format_order(registration.order):>6}  {name:<40} '
+                      f'{entry.soql:>5} {entry.dml:>5}{loop} {entry.cumulative_soql:>9} {entry.cumulative_dml:>8}'
+                      f'{"  " + note if note else ""}{flag}')
+                if verbose:
+                    for where, line, kind, in_loop in sorted(entry.cost.sources):
+                        print(f'        {kind:<4} {where}:{line}{"  (in loop)" if in_loop else ""}')
+                    for unresolved in sorted(entry.cost.unresolved):
+                        print(f'        ?    {unresolved}')
+            last = entries[-1]
+            if last.cumulative_soql > soql_budget or last.cumulative_dml > dml_budget:
+                print(f'   ❌ Total {last.cumulative_soql} SOQL / {last.cumulative_dml} DML exceeds budget')
+            elif last.cumulative_soql > 0.8 * soql_budget or last.cumulative_dml > 0.8 * dml_budget:
+                print(f'   ⚠️  Total {last.cumulative_soql} SOQL / {last.cumulative_dml} DML is over 80% of budget')
+
+    print('\n* statements inside loops, multiplied by the chunk size')
+    if collisions:
+        print(f'\n⚠️  {len(collisions)} Order__c collision(s) (execution order is non-deterministic):')
+        for collision in collisions:
+            print(f'   - {collision}')
+
+
+def pipelines_to_dict(pipelines, collisions: List[str], batch_size: int, soql_budget: int,
+                      dml_budget: int) -> dict:
+    def entry_dict(entry: PipelineEntry) -> dict:
+        registration = entry.registration
+        return {
+            'context': registration.context,
+            'order': registration.order,
+            'class': registration.class_name,
+            'flow': registration.flow_name or None,
+            'record': str(registration.path),
+            'status': entry.status,
+            'soql': entry.soql,
+            'dml': entry.dml,
+            'static': {key: getattr(entry.cost, key) for key in COST_KEYS},
+            'cumulative_soql': entry.cumulative_soql,
+            'cumulative_dml': entry.cumulative_dml,
+            'over_budget': entry.over_budget,
+            'sources': [{'method': where, 'line': line, 'kind': kind, 'in_loop': in_loop}
+                        for where, line, kind, in_loop in sorted(entry.cost.sources)],
+            'unresolved': sorted(entry.cost.unresolved),
+        }
+
+    return {
+        'batch_size': batch_size,
+        'budget': {'soql': soql_budget, 'dml': dml_budget},
+        'objects': {object_name: {operation: [entry_dict(e) for e in entries]
+                                  for operation, entries in operations.items()}
+                    for object_name, operations in pipelines.items()},
+        'order_collisions': collisions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze Trigger Actions Framework execution order and cost')
+    parser.add_argument('--project-dir', default='.', help='Project root to scan (default: .)')
+    parser.add_argument('--object', action='append', default=[], help='Only this object (repeatable)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Records per trigger chunk for in-loop statements (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--soql-budget', type=int, default=SOQL_LIMIT,
+                        help=f'SOQL queries available to the trigger (default: {SOQL_LIMIT})')
+    parser.add_argument('--dml-budget', type=int, default=DML_LIMIT,
+                        help=f'DML statements available to the trigger (default: {DML_LIMIT})')
+    parser.add_argument('--verbose', action='store_true', help='List the statements behind each estimate')
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir)
+    record_paths, class_files = find_project_files(project_dir)
+    registrations = [r for r in map(parse_registration, record_paths) if r]
+    if args.object:
+        wanted = {name.lower() for name in args.object}
+        registrations = [r for r in registrations if r.object_name.lower() in wanted]
+    if not registrations:
+        print(f'❌ No Trigger_Action records found under {project_dir}')
+        sys.exit(1)
+
+    apex = ApexIndex(class_files)
+    pipelines = build_pipelines(registrations, apex, args.batch_size, args.soql_budget, args.dml_budget)
+    collisions = order_collisions(registrations)
+
+    if args.format == 'json':
+        print(json.dumps(pipelines_to_dict(pipelines, collisions, args.batch_size, args.soql_budget,
+                                           args.dml_budget), indent=2))
+    else:
+        print_pipelines(pipelines, collisions, args.batch_size, args.soql_budget, args.dml_budget, args.verbose)
+
+    over = any(entry.over_budget for operations in pipelines.values()
+               for entries in operations.values() for entry in entries)
+    sys.exit(1 if over else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,16 +5,46 @@ Generates all required files for a new trigger action in the Trigger Actions Fra
 
 Usage:
     python generate_trigger_action.py <ObjectName> <ActionName> <Context> [--order ORDER] [--output-dir DIR]
+    python generate_trigger_action.py --manifest actions.yaml [--output-dir DIR] [--dry-run] [--overwrite]
 
 Examples:
-    python generate_trigger_action.py Lead SetDefaults BeforeInsert --order 10
+    python generate_trigger_action.py Lead SetDefaults BeforeInsert              # order: next free slot
+    python generate_trigger_action.py Lead NormalizeEmail BeforeInsert --order 15
     python generate_trigger_action.py Opportunity ValidateAmount BeforeInsert --order 20 --output-dir force-app/main/default
+    python generate_trigger_action.py --manifest opportunity-actions.csv --dry-run
+
+Manifest (YAML/JSON; CSV uses the columns object,action,context,order):
+    object: Opportunity            # default for entries without `object`
+    actions:
+      - {action: SetDefaults, context: BeforeInsert, order: 10}
+      - {action: ValidateAmount, context: BeforeInsert}      # order: next free slot (step 10)
+      - {action: SyncLineItems, context: AfterUpdate}
+
+Every action is planned and checked before anything is written: Order__c
+collisions (against Trigger_Action records already in <output-dir>/customMetadata
+and within the manifest) abort the run. Files are then staged next to their
+targets and renamed into place in one pass. Existing files that differ are left
+alone unless --overwrite is given, so implemented classes are never clobbered.
 """
 
 import argparse
+import csv
+import difflib
+import json
 import os
+import re
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
 # Context mapping for interface names
 CONTEXT_MAP = {
@@ -238,70 +268,390 @@ def generate_trigger_action_metadata(object_name: str, action_name: str, context
 '''
 
 
+# Auto-assigned Order__c values are multiples of this step
+ORDER_STEP = 10
+
+NAME_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+MANIFEST_SUFFIXES = ('.yaml', '.yml', '.json', '.csv')
+CMD_NAMESPACE = '{http://soap.sforce.com/2006/04/metadata}'
+XSI_NIL = '{http://www.w3.org/2001/XMLSchema-instance}nil'
+
+
+@dataclass
+class ActionSpec:
+    """One trigger action to generate."""
+    object_name: str
+    action_name: str
+    context: str
+    order: Optional[float] = None  # None: next free slot for the object/context
+    source: str = ''
+
+    @property
+    def class_name(self) -> str:
+        return f'TA_{self.object_name}_{self.action_name}'
+
+    @property
+    def metadata_name(self) -> str:
+        return (f'Trigger_Action.{self.object_name}_{CONTEXT_LABEL_MAP[self.context]}_'
+                f'{format_order(self.order)}_{self.action_name}')
+
+
+@dataclass
+class Registration:
+    """A Trigger_Action__mdt record already in the output directory."""
+    object_name: str
+    context: str
+    order: float
+    class_name: str
+    path: Path
+    flow_name: str = ''
+    bypassed: bool = False
+
+
+def format_order(order: Optional[float]) -> str:
+    """Order__c as written in labels and file names (10, not 10.0)."""
+    if order is None:
+        return '?'
+    return str(int(order)) if float(order).is_integer() else str(order)
+
+
+# =============================================================================
+# Manifest
+# =============================================================================
+
+def load_manifest(path: str) -> List[ActionSpec]:
+    """
+    Read a YAML, JSON or CSV manifest of trigger actions.
+
+    Raises:
+        ValueError: Unreadable manifest or malformed entry
+    """
+    manifest = Path(path)
+    if manifest.suffix.lower() not in MANIFEST_SUFFIXES:
+        raise ValueError(f'{path}: manifest must be one of {", ".join(MANIFEST_SUFFIXES)}')
+
+    with open(manifest, 'r', encoding='utf-8-sig', newline='') as f:
+        if manifest.suffix.lower() == '.csv':
+            rows = [(f'{path}:{line}', row) for line, row in enumerate(csv.DictReader(f), start=2)]
+            default_object = None
+        else:
+            if manifest.suffix.lower() == '.json':
+                doc = json.load(f)
+            elif yaml is None:
+                raise ValueError(f'{path}: PyYAML is required for YAML manifests (pip install pyyaml)')
+            else:
+                doc = yaml.safe_load(f)
+            if isinstance(doc, list):
+                doc = {'actions': doc}
+            if not isinstance(doc, dict) or not isinstance(doc.get('actions'), list):
+                raise ValueError(f'{path}: expected a list of actions or a mapping with an "actions" list')
+            default_object = doc.get('object')
+            rows = [(f'{path}: actions[{i}]', row) for i, row in enumerate(doc['actions'])]
+
+    specs = []
+    for source, row in rows:
+        if not isinstance(row, dict):
+            raise ValueError(f'{source}: expected a mapping')
+        row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+        order = row.get('order')
+        try:
+            order = float(order) if order not in (None, '') else None
+        except (TypeError, ValueError):
+            raise ValueError(f'{source}: order must be a number, got {order!r}')
+        specs.append(ActionSpec(
+            object_name=str(row.get('object') or default_object or '').strip(),
+            action_name=str(row.get('action') or row.get('name') or '').strip(),
+            context=str(row.get('context') or '').strip(),
+            order=order,
+            source=source,
+        ))
+    return specs
+
+
+def validate_specs(specs: List[ActionSpec]) -> List[str]:
+    """Errors in the specs themselves (names, contexts, duplicates)."""
+    errors = []
+    contexts_by_class: Dict[str, ActionSpec] = {}
+    for spec in specs:
+        where = f'{spec.source}: ' if spec.source else ''
+        if not NAME_PATTERN.match(spec.object_name):
+            errors.append(f'{where}invalid object name {spec.object_name!r}')
+        if not NAME_PATTERN.match(spec.action_name):
+            errors.append(f'{where}invalid action name {spec.action_name!r}')
+        if spec.context not in CONTEXT_MAP:
+            errors.append(f'{where}unknown context {spec.context!r} (one of {", ".join(CONTEXT_MAP)})')
+        if spec.order is not None and spec.order <= 0:
+            errors.append(f'{where}order must be positive')
+
+        first = contexts_by_class.get(spec.class_name)
+        if first is None:
+            contexts_by_class[spec.class_name] = spec
+        elif first.context == spec.context:
+            errors.append(f'{where}duplicate of {first.source or first.class_name}')
+        else:
+            errors.append(f'{where}{spec.class_name} is already listed for {first.context}; '
+                          f'use a distinct action name per context')
+    return errors
+
+
+# =============================================================================
+# Existing metadata and Order__c collisions
+# =============================================================================
+
+def parse_registration(path: Path) -> Optional[Registration]:
+    """A Trigger_Action__mdt record file, or None if it cannot be placed in a pipeline."""
+    try:
+        root = ET.parse(path).getroot()
+    except ET.ParseError:
+        return None
+    values = {}
+    for entry in root.iter(f'{CMD_NAMESPACE}values'):
+        field = entry.find(f'{CMD_NAMESPACE}field')
+        value = entry.find(f'{CMD_NAMESPACE}value')
+        if field is not None and value is not None and value.get(XSI_NIL) != 'true':
+            values[(field.text or '').strip()] = (value.text or '').strip()
+    try:
+        order = float(values.get('Order__c', ''))
+    except ValueError:
+        return None
+
+    # Framework layout: the context lookup field names the object;
+    # older generated records use sObject__c and carry the context in the name.
+    object_name = context = None
+    for context_key, label in CONTEXT_LABEL_MAP.items():
+        if values.get(f'{label}__c'):
+            object_name, context = values[f'{label}__c'].split('.')[-1], context_key
+            break
+    if context is None and values.get('sObject__c'):
+        object_name = values['sObject__c'].split('.')[-1]
+        developer_name = path.name[len('Trigger_Action.'):-len('.md-meta.xml')]
+        for context_key, label in CONTEXT_LABEL_MAP.items():
+            if developer_name.startswith(f'{object_name}_{label}_'):
+                context = context_key
+                break
+    if context is None:
+        return None
+    return Registration(object_name, context, order, values.get('Apex_Class_Name__c', ''), path,
+                        flow_name=values.get('Flow_Name__c', ''),
+                        bypassed=values.get('Bypass_Execution__c') == 'true')
+
+
+def read_registrations(metadata_dir: Path) -> List[Registration]:
+    """Trigger_Action__mdt records in a customMetadata directory."""
+    if not metadata_dir.is_dir():
+        return []
+    paths = sorted(metadata_dir.glob('Trigger_Action.*.md-meta.xml'))
+    return [registration for registration in map(parse_registration, paths) if registration]
+
+
+def assign_orders(specs: List[ActionSpec], registrations: List[Registration],
+                  step: int = ORDER_STEP) -> List[str]:
+    """
+    Fill in missing orders and report Order__c collisions.
+
+    An action already registered keeps its order; a new one gets the next
+    multiple of step after every order used for its object and context.
+    """
+    errors = []
+    registered = {(r.object_name.lower(), r.context, r.class_name.lower()): r for r in registrations}
+    taken: Dict[Tuple[str, str, float], str] = {
+        (r.object_name.lower(), r.context, r.order): f'{r.class_name} ({r.path.name})' for r in registrations
+    }
+
+    # Explicit orders first, so auto-assigned ones fit around them
+    for spec in sorted(specs, key=lambda s: s.order is None):
+        key = (spec.object_name.lower(), spec.context)
+        existing = registered.get(key + (spec.class_name.lower(),))
+        if spec.order is None:
+            if existing:
+                spec.order = existing.order
+            else:
+                used = [order for (obj, context, order) in taken if (obj, context) == key]
+                spec.order = float((int(max(used, default=0)) // step + 1) * step)
+        elif existing and existing.order != spec.order:
+            errors.append(f'{spec.class_name} is already registered for {spec.context} at order '
+                          f'{format_order(existing.order)} ({existing.path.name}); remove that record '
+                          f'or use order {format_order(existing.order)}')
+            continue
+
+        holder = taken.get(key + (spec.order,))
+        if holder and not (existing and existing.order == spec.order):
+            errors.append(f'{spec.object_name} {spec.context} order {format_order(spec.order)} '
+                          f'for {spec.class_name} collides with {holder}')
+        else:
+            taken[key + (spec.order,)] = f'{spec.class_name} ({spec.source or "arguments"})'
+    return errors
+
+
+# =============================================================================
+# Rendering and writing
+# =============================================================================
+
+def render_action(spec: ActionSpec, output_dir: Path) -> List[Tuple[Path, str]]:
+    """(path, content) for every file of one trigger action."""
+    classes_dir = output_dir / 'classes'
+    test_name = f'{spec.class_name}_Test'
+    return [
+        (classes_dir / f'{spec.class_name}.cls',
+         generate_trigger_action_class(spec.object_name, spec.action_name, spec.context)),
+        (classes_dir / f'{spec.class_name}.cls-meta.xml', generate_apex_meta()),
+        (classes_dir / f'{test_name}.cls',
+         generate_test_class(spec.object_name, spec.action_name, spec.context)),
+        (classes_dir / f'{test_name}.cls-meta.xml', generate_apex_meta()),
+        (output_dir / 'customMetadata' / f'{spec.metadata_name}.md-meta.xml',
+         generate_trigger_action_metadata(spec.object_name, spec.action_name, spec.context,
+                                          int(spec.order) if spec.order.is_integer() else spec.order)),
+    ]
+
+
+def plan_writes(files: List[Tuple[Path, str]], overwrite: bool) -> List[Tuple[Path, str, str, str]]:
+    """
+    Compare rendered files with the disk.
+
+    Returns:
+        (path, content, current content, status) with status create, update,
+        unchanged or exists (differs, kept because overwrite is off)
+    """
+    planned = []
+    for path, content in files:
+        if not path.exists():
+            planned.append((path, content, '', 'create'))
+            continue
+        current = path.read_text(encoding='utf-8')
+        if current == content:
+            status = 'unchanged'
+        else:
+            status = 'update' if overwrite else 'exists'
+        planned.append((path, content, current, status))
+    return planned
+
+
+def write_atomically(files: List[Tuple[Path, str]]):
+    """
+    Write all files or none.
+
+    Every file is first staged as a temp file in its target directory; only
+    when all are staged are they renamed into place (os.replace is atomic
+    per file), so a failure part way leaves no half-written output.
+    """
+    staged = []
+    try:
+        for path, content in files:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+            staged.append((tmp, path))
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+        for tmp, path in staged:
+            os.replace(tmp, path)
+    finally:
+        for tmp, _ in staged:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def print_diff(path: Path, current: str, content: str):
+    """Unified diff of one planned write."""
+    diff = difflib.unified_diff(
+        current.splitlines(keepends=True), content.splitlines(keepends=True),
+        fromfile=str(path) if current else '/dev/null', tofile=str(path)
+    )
+    sys.stdout.writelines(diff)
+    if not content.endswith('\n'):
+        print()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate Trigger Action files')
-    parser.add_argument('object_name', help='Salesforce object name (e.g., Lead, Account)')
-    parser.add_argument('action_name', help='Action name (e.g., SetDefaults, ValidateFields)')
-    parser.add_argument('context', choices=list(CONTEXT_MAP.keys()),
+    parser.add_argument('object_name', nargs='?', help='Salesforce object name (e.g., Lead, Account)')
+    parser.add_argument('action_name', nargs='?', help='Action name (e.g., SetDefaults, ValidateFields)')
+    parser.add_argument('context', nargs='?', choices=list(CONTEXT_MAP.keys()),
                         help='Trigger context')
-    parser.add_argument('--order', type=int, default=10,
-                        help='Execution order (default: 10)')
+    parser.add_argument('--order', type=float, default=None,
+                        help='Execution order (default: next free slot for the object and context)')
+    parser.add_argument('--manifest', help='YAML/JSON/CSV manifest of actions to generate in one pass')
+    parser.add_argument('--order-step', type=int, default=ORDER_STEP,
+                        help=f'Spacing for actions without an order (default: {ORDER_STEP})')
     parser.add_argument('--output-dir', default='force-app/main/default',
                         help='Output directory (default: force-app/main/default)')
-    
+    parser.add_argument('--dry-run', action='store_true', help='Show the plan and diffs, write nothing')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='Replace existing files that differ (default: keep them)')
+
     args = parser.parse_args()
-    
+
+    if args.manifest:
+        if args.object_name:
+            parser.error('use either --manifest or <ObjectName> <ActionName> <Context>, not both')
+        try:
+            specs = load_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            print(f'❌ {e}')
+            sys.exit(1)
+    elif args.object_name and args.action_name and args.context:
+        specs = [ActionSpec(args.object_name, args.action_name, args.context, args.order)]
+    else:
+        parser.error('ObjectName, ActionName and Context are required without --manifest')
+
     output_dir = Path(args.output_dir)
-    classes_dir = output_dir / 'classes'
-    metadata_dir = output_dir / 'customMetadata'
-    
-    # Create directories
-    classes_dir.mkdir(parents=True, exist_ok=True)
-    metadata_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate files
-    class_name = f'TA_{args.object_name}_{args.action_name}'
-    test_name = f'{class_name}_Test'
-    context_label = CONTEXT_LABEL_MAP[args.context]
-    metadata_name = f'Trigger_Action.{args.object_name}_{context_label}_{args.order}_{args.action_name}'
-    
-    files_created = []
-    
-    # Trigger Action Class
-    class_path = classes_dir / f'{class_name}.cls'
-    class_path.write_text(generate_trigger_action_class(args.object_name, args.action_name, args.context))
-    files_created.append(str(class_path))
-    
-    # Trigger Action Class Meta
-    meta_path = classes_dir / f'{class_name}.cls-meta.xml'
-    meta_path.write_text(generate_apex_meta())
-    files_created.append(str(meta_path))
-    
-    # Test Class
-    test_path = classes_dir / f'{test_name}.cls'
-    test_path.write_text(generate_test_class(args.object_name, args.action_name, args.context))
-    files_created.append(str(test_path))
-    
-    # Test Class Meta
-    test_meta_path = classes_dir / f'{test_name}.cls-meta.xml'
-    test_meta_path.write_text(generate_apex_meta())
-    files_created.append(str(test_meta_path))
-    
-    # Custom Metadata
-    cmd_path = metadata_dir / f'{metadata_name}.md-meta.xml'
-    cmd_path.write_text(generate_trigger_action_metadata(
-        args.object_name, args.action_name, args.context, args.order
-    ))
-    files_created.append(str(cmd_path))
-    
-    print(f'✅ Generated {len(files_created)} files:')
-    for f in files_created:
-        print(f'   - {f}')
-    
+    errors = validate_specs(specs)
+    if not errors:
+        errors = assign_orders(specs, read_registrations(output_dir / 'customMetadata'), args.order_step)
+    if errors:
+        print(f'❌ {len(errors)} problem(s), nothing written:')
+        for error in errors:
+            print(f'   - {error}')
+        sys.exit(1)
+
+    # Render everything before touching the disk
+    files = []
+    for spec in specs:
+        files.extend(render_action(spec, output_dir))
+    planned = plan_writes(files, args.overwrite)
+    writes = [(path, content) for path, content, _, status in planned if status in ('create', 'update')]
+
+    if len(specs) > 1 or args.dry_run:
+        print(f'📋 {len(specs)} trigger action(s):')
+        for spec in sorted(specs, key=lambda s: (s.object_name, list(CONTEXT_MAP).index(s.context), s.order)):
+            print(f'   {spec.object_name:<20} {spec.context:<14} {format_order(spec.order):>6}  {spec.class_name}')
+    icons = {'create': '➕', 'update': '✏️ ', 'unchanged': '  ', 'exists': '⏭️ '}
+    skipped = [path for path, _, _, status in planned if status == 'exists']
+
+    if args.dry_run:
+        print()
+        for path, content, current, status in planned:
+            print(f'{icons[status]} {status:<9} {path}')
+        print()
+        for path, content, current, status in planned:
+            if status in ('create', 'update'):
+                print_diff(path, current, content)
+        print(f'\n🔍 Dry run: {len(writes)} file(s) would be written, {len(skipped)} existing file(s) kept')
+        return
+
+    write_atomically(writes)
+
+    print(f'✅ Generated {len(writes)} files:')
+    for path, _ in writes:
+        print(f'   - {path}')
+    if skipped:
+        print(f'⏭️  Kept {len(skipped)} existing file(s) that differ (use --overwrite to replace):')
+        for path in skipped:
+            print(f'   - {path}')
+
+    objects = sorted({spec.object_name for spec in specs})
+    missing_settings = [obj for obj in objects
+                        if not (output_dir / 'customMetadata' / f'sObject_Trigger_Setting.{obj}.md-meta.xml').exists()]
+
     print(f'\n📋 Next steps:')
-    print(f'   1. Verify sObject_Trigger_Setting.{args.object_name} exists')
-    print(f'   2. Implement business logic in {class_name}.cls')
-    print(f'   3. Complete test class {test_name}.cls')
+    if len(specs) == 1:
+        class_name = specs[0].class_name
+        print(f'   1. Verify sObject_Trigger_Setting.{specs[0].object_name} exists')
+        print(f'   2. Implement business logic in {class_name}.cls')
+        print(f'   3. Complete test class {class_name}_Test.cls')
+    else:
+        print(f'   1. Verify sObject_Trigger_Setting exists for: {", ".join(missing_settings) or "(all present)"}')
+        print(f'   2. Implement business logic in the {len(specs)} TA_*.cls classes')
+        print(f'   3. Complete the matching *_Test.cls classes')
     print(f'   4. Deploy: sf project deploy start --source-dir {output_dir}')
 
 
@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+"""
+Load Action Plan Templates in bulk from YAML, JSON or CSV definitions.
+
+Definitions are validated locally, diffed against the templates already in
+the org (matched by Name, items by UniqueName, values by field) and only the
+differences are pushed: sObject Collections calls for updates, deletes and
+new values, Composite requests for new items (see
+create_action_plan_template.py). Templates are applied concurrently.
+
+Usage:
+    python3 bulk_load_templates.py validate templates/
+    python3 bulk_load_templates.py plan templates/ --org myorg
+    python3 bulk_load_templates.py apply templates/ --org myorg --workers 8
+    python3 bulk_load_templates.py apply onboarding.csv --org myorg --prune
+
+YAML/JSON format (a list, or {"templates": [...]}):
+
+    templates:
+      - template:
+          Name: Agency Onboarding
+          ActionPlanType: Industries
+          TargetEntityType: Account
+          Description: Documents collected from new agencies.
+        items:
+          - type: DocumentChecklistItem
+            unique_name: onb_w9
+            display_order: 1
+            is_required: true
+            values: {Name: W-9, Status: New}
+          - type: Task
+            unique_name: onb_call
+            display_order: 2
+            values:
+              Subject: Kick-off call
+              ActivityDate: {formula: StartDate + 3}
+
+CSV format: one row per item, template columns repeated (first non-empty
+value wins); a row without unique_name declares a template with no items.
+
+    template,action_plan_type,target_entity_type,description,type,unique_name,display_order,is_required,value.Subject,formula.ActivityDate
+
+Published (Final), Obsolete and ReadOnly templates cannot be edited; they
+are reported as locked, or recreated as a new Draft with --replace-published.
+
+Prerequisites:
+    - pip install requests
+    - pip install pyyaml (YAML definitions only)
+    - sf CLI authenticated to target org
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+import create_action_plan_template as apt
+
+DEFINITION_SUFFIXES = {".yaml", ".yml", ".json", ".csv"}
+ITEM_ENTITY_TYPES = {"DocumentChecklistItem", "Task", "Event", "RecordAction"}
+ACTION_PLAN_TYPES = {"Industries", "Standard"}
+DESCRIPTION_MAX = 255
+# Template fields compared when diffing; other keys in `template` are sent on create only
+TEMPLATE_FIELDS = ("ActionPlanType", "TargetEntityType", "Description")
+# Field names documented per entity type; others only produce a warning
+KNOWN_VALUE_FIELDS = {
+    "DocumentChecklistItem": {"Name", "Status", "Instruction"},
+    "Task": {"Subject", "Priority", "Status", "Description", "ActivityDate", "IsReminderSet", "ReminderDateTime"},
+    "Event": {"Subject", "Description", "Location"},
+}
+CSV_TEMPLATE_COLUMNS = {
+    "template": "Name",
+    "action_plan_type": "ActionPlanType",
+    "target_entity_type": "TargetEntityType",
+    "description": "Description",
+}
+SOQL_CHUNK = 200
+
+
+# ---------------------------------------------------------------------------
+# Definitions
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TemplateDef:
+    """One template as declared in a definition file."""
+    config: dict                      # ActionPlanTemplate fields (Name, ActionPlanType, ...)
+    items: List[dict]                 # create_action_plan_template ITEMS format
+    source: str                       # file (and row) it came from
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.config.get("Name") or ""
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("true", "yes", "y", "1", "x")
+
+
+def _to_literal(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def normalize_item(raw: dict, errors: List[str], where: str) -> dict:
+    """Coerce an item declaration to the ITEMS format with string values."""
+    item = {
+        "type": str(raw.get("type") or "").strip(),
+        "unique_name": str(raw.get("unique_name") or "").strip(),
+        "display_order": raw.get("display_order"),
+        "is_required": _to_bool(raw.get("is_required", False)),
+        "values": {},
+    }
+    try:
+        item["display_order"] = int(item["display_order"])
+    except (TypeError, ValueError):
+        errors.append(f"{where}: display_order must be an integer, got {item['display_order']!r}")
+        item["display_order"] = 0
+    for name, value in (raw.get("values") or {}).items():
+        if isinstance(value, dict):
+            if "formula" not in value:
+                errors.append(f"{where}: value {name} must be a literal or {{formula: ...}}")
+                continue
+            item["values"][name] = {"formula": str(value["formula"])}
+        elif value is not None:
+            item["values"][name] = _to_literal(value)
+    return item
+
+
+def parse_document(doc, source: str) -> List[TemplateDef]:
+    """Templates from a parsed YAML/JSON document."""
+    if isinstance(doc, dict):
+        doc = doc.get("templates", [doc])
+    if not isinstance(doc, list):
+        raise ValueError(f"{source}: expected a list of templates or {{templates: [...]}}")
+    definitions = []
+    for i, entry in enumerate(doc, 1):
+        where = f"{source}#{i}"
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: template entry must be a mapping")
+        errors: List[str] = []
+        config = {key: value for key, value in (entry.get("template") or {}).items() if value is not None}
+        items = [normalize_item(raw, errors, f"{where} item {n}")
+                 for n, raw in enumerate(entry.get("items") or [], 1)]
+        definitions.append(TemplateDef(config, items, where, errors))
+    return definitions
+
+
+def parse_csv(path: Path) -> List[TemplateDef]:
+    """Templates from a CSV file with one row per item."""
+    by_name: Dict[str, TemplateDef] = {}
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row_no, row in enumerate(csv.DictReader(f), 2):
+            row = {(key or "").strip(): (value or "").strip() for key, value in row.items()}
+            name = row.get("template", "")
+            where = f"{path}:{row_no}"
+            if not name:
+                raise ValueError(f"{where}: template column is empty")
+            definition = by_name.setdefault(name, TemplateDef({}, [], where))
+            for column, api_name in CSV_TEMPLATE_COLUMNS.items():
+                if row.get(column) and api_name not in definition.config:
+                    definition.config[api_name] = row[column]
+            if not row.get("unique_name"):
+                continue
+            raw = {key: row.get(key) for key in ("type", "unique_name", "display_order")}
+            raw["is_required"] = row.get("is_required", "")
+            values = {}
+            for column, value in row.items():
+                if not value:
+                    continue
+                if column.startswith("value."):
+                    values[column[len("value."):]] = value
+                elif column.startswith("formula."):
+                    values[column[len("formula."):]] = {"formula": value}
+            raw["values"] = values
+            definition.items.append(normalize_item(raw, definition.errors, where))
+    return list(by_name.values())
+
+
+def find_definition_files(paths: List[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() in DEFINITION_SUFFIXES))
+        else:
+            files.append(path)
+    return files
+
+
+def load_definitions(paths: List[str]) -> List[TemplateDef]:
+    """Read every definition file under the given files/directories."""
+    definitions = []
+    for path in find_definition_files(paths):
+        suffix = path.suffix.lower()
+        if suffix == ".csv":
+            definitions.extend(parse_csv(path))
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            if suffix == ".json":
+                doc = json.load(f)
+            elif yaml is None:
+                raise ValueError(f"{path}: PyYAML is required for YAML definitions (pip install pyyaml)")
+            else:
+                doc = yaml.safe_load(f)
+        definitions.extend(parse_document(doc, str(path)))
+    return definitions
+
+
+def validate(definitions: List[TemplateDef]) -> Tuple[List[str], List[str]]:
+    """
+    Check definitions without contacting the org.
+
+    Returns:
+        (errors, warnings) as "source: message" strings
+    """
+    errors, warnings = [], []
+    seen: Dict[str, str] = {}
+    for definition in definitions:
+        errors.extend(definition.errors)
+        where, config = definition.source, definition.config
+        if not definition.name:
+            errors.append(f"{where}: template Name is required")
+        elif definition.name.lower() in seen:
+            errors.append(f"{where}: template '{definition.name}' is also defined in {seen[definition.name.lower()]}")
+        else:
+            seen[definition.name.lower()] = where
+        plan_type = config.get("ActionPlanType")
+        if plan_type not in ACTION_PLAN_TYPES:
+            errors.append(f"{where}: ActionPlanType must be one of {sorted(ACTION_PLAN_TYPES)}, got {plan_type!r}")
+        if not config.get("TargetEntityType"):
+            errors.append(f"{where}: TargetEntityType is required")
+        if len(config.get("Description") or "") > DESCRIPTION_MAX:
+            errors.append(f"{where}: Description is {len(config['Description'])} characters (max {DESCRIPTION_MAX})")
+
+        unique_names, orders = set(), set()
+        for item in definition.items:
+            label = f"{where} [{definition.name}] item {item['unique_name'] or '?'}"
+            if not item["unique_name"]:
+                errors.append(f"{label}: unique_name is required")
+            elif item["unique_name"] in unique_names:
+                errors.append(f"{label}: duplicate unique_name")
+            unique_names.add(item["unique_name"])
+            if item["type"] not in ITEM_ENTITY_TYPES:
+                errors.append(f"{label}: type must be one of {sorted(ITEM_ENTITY_TYPES)}, got {item['type']!r}")
+            elif plan_type == "Standard" and item["type"] != "Task":
+                errors.append(f"{label}: Standard templates support Task items only")
+            if item["display_order"] in orders:
+                warnings.append(f"{label}: display_order {item['display_order']} is used twice")
+            orders.add(item["display_order"])
+            if not item["values"]:
+                warnings.append(f"{label}: no values")
+            known = KNOWN_VALUE_FIELDS.get(item["type"])
+            if known:
+                for name in sorted(set(item["values"]) - known):
+                    warnings.append(f"{label}: unknown {item['type']} field {name}")
+            if item["type"] == "Task" and not isinstance(item["values"].get("ActivityDate"), dict):
+                warnings.append(f"{label}: Task without an ActivityDate formula does not render in the UI")
+            if "ItemEntityType" in item["values"]:
+                errors.append(f"{label}: ItemEntityType is read-only on item values")
+        if len(definition.items) > 100:
+            warnings.append(f"{where}: {len(definition.items)} items (UI performance degrades beyond ~100)")
+    return errors, warnings
+
+
+# ---------------------------------------------------------------------------
+# Org state
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ExistingTemplate:
+    """A template in the org with its version, items and values."""
+    id: str
+    config: dict
+    version_id: Optional[str] = None
+    status: Optional[str] = None
+    items: Dict[str, dict] = field(default_factory=dict)  # UniqueName -> item record (+ "values" by field)
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _query_in(client: apt.SalesforceClient, soql: str, values: List[str]) -> List[dict]:
+    """Run `soql` (ending in "IN ({})") over chunks of values."""
+    records = []
+    for i in range(0, len(values), SOQL_CHUNK):
+        chunk = ", ".join(_quote(value) for value in values[i:i + SOQL_CHUNK])
+        records.extend(client.query(soql.format(chunk)))
+    return records
+
+
+def fetch_existing(client: apt.SalesforceClient, names: List[str]) -> Dict[str, ExistingTemplate]:
+    """
+    Current state of the named templates, in four queries per 200 names.
+
+    Each template is compared through one version: its Draft if it has one
+    (the replacement being prepared), otherwise its latest by CreatedDate.
+    When several templates share a Name, the same rule picks between them.
+    """
+    templates = _query_in(client, "SELECT Id, Name, " + ", ".join(TEMPLATE_FIELDS) +
+                          " FROM ActionPlanTemplate WHERE Name IN ({}) ORDER BY CreatedDate", names)
+    if not templates:
+        return {}
+    by_id = {rec["Id"]: ExistingTemplate(rec["Id"], {key: rec.get(key) for key in ("Name",) + TEMPLATE_FIELDS})
+             for rec in templates}
+    for rec in _query_in(client, "SELECT Id, ActionPlanTemplateId, Status FROM ActionPlanTemplateVersion "
+                                 "WHERE ActionPlanTemplateId IN ({}) ORDER BY CreatedDate", list(by_id)):
+        existing = by_id[rec["ActionPlanTemplateId"]]
+        # CreatedDate order: a later version replaces the current pick unless that is a Draft
+        if existing.status != "Draft" or rec["Status"] == "Draft":
+            existing.version_id, existing.status = rec["Id"], rec["Status"]
+    by_version = {template.version_id: template for template in by_id.values() if template.version_id}
+    items_by_id = {}
+    for rec in _query_in(client, "SELECT Id, ActionPlanTemplateVersionId, UniqueName, Name, DisplayOrder, "
+                                 "IsRequired, ItemEntityType FROM ActionPlanTemplateItem "
+                                 "WHERE ActionPlanTemplateVersionId IN ({})", list(by_version)):
+        rec["values"] = {}
+        by_version[rec["ActionPlanTemplateVersionId"]].items[rec["UniqueName"]] = rec
+        items_by_id[rec["Id"]] = rec
+    for rec in _query_in(client, "SELECT Id, ActionPlanTemplateItemId, ItemEntityFieldName, ValueLiteral, "
+                                 "ValueFormula FROM ActionPlanTemplateItemValue "
+                                 "WHERE ActionPlanTemplateItemId IN ({})", list(items_by_id)):
+        field_name = rec["ItemEntityFieldName"].split(".", 1)[-1]
+        items_by_id[rec["ActionPlanTemplateItemId"]]["values"][field_name] = rec
+
+    existing: Dict[str, ExistingTemplate] = {}
+    for template in by_id.values():  # CreatedDate order: later templates replace earlier ones
+        key = template.config["Name"].lower()
+        current = existing.get(key)
+        if current is None or template.status == "Draft" or current.status != "Draft":
+            existing[key] = template
+    return existing
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TemplatePlan:
+    """Changes needed to bring one template in line with its definition."""
+    definition: TemplateDef
+    existing: Optional[ExistingTemplate]
+    template_update: dict = field(default_factory=dict)
+    new_items: List[dict] = field(default_factory=list)       # item definitions, created with their values
+    item_updates: List[dict] = field(default_factory=list)    # collection records
+    value_creates: List[dict] = field(default_factory=list)
+    value_updates: List[dict] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)          # record Ids
+    changes: List[str] = field(default_factory=list)          # human-readable
+    kept: int = 0                                              # org records not in the definition (no --prune)
+
+    @property
+    def action(self) -> str:
+        if self.existing is None:
+            return "create"
+        if not self.has_changes:
+            return "unchanged"
+        return "update" if self.existing.status == "Draft" else "locked"
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.template_update or self.new_items or self.item_updates or
+                    self.value_creates or self.value_updates or self.deletes)
+
+    def counts(self) -> Dict[str, int]:
+        if self.existing is None:
+            return {"items": len(self.definition.items),
+                    "values": sum(len(item["values"]) for item in self.definition.items)}
+        return {"template": int(bool(self.template_update)), "new_items": len(self.new_items),
+                "item_updates": len(self.item_updates), "value_creates": len(self.value_creates),
+                "value_updates": len(self.value_updates), "deletes": len(self.deletes)}
+
+
+def _item_name(item: dict) -> str:
+    return apt.item_record(item, "")["Name"]
+
+
+def diff_template(definition: TemplateDef, existing: Optional[ExistingTemplate], prune: bool = False) -> TemplatePlan:
+    """Compare a definition with the org's copy of the template."""
+    plan = TemplatePlan(definition, existing)
+    if existing is None:
+        plan.changes.append(f"+ template ({len(definition.items)} items)")
+        return plan
+
+    for key in TEMPLATE_FIELDS:
+        if key in definition.config and (definition.config[key] or None) != (existing.config.get(key) or None):
+            plan.template_update[key] = definition.config[key]
+            plan.changes.append(f"~ {key}: {existing.config.get(key)!r} -> {definition.config[key]!r}")
+    if plan.template_update:
+        plan.template_update.update({"attributes": {"type": "ActionPlanTemplate"}, "Id": existing.id})
+
+    declared = {item["unique_name"] for item in definition.items}
+    for item in definition.items:
+        current = existing.items.get(item["unique_name"])
+        if current is None or current["ItemEntityType"] != item["type"]:
+            if current is not None:
+                # The entity type of an item cannot be changed: replace it
+                plan.deletes.append(current["Id"])
+                plan.changes.append(f"- item {item['unique_name']} ({current['ItemEntityType']})")
+            plan.new_items.append(item)
+            plan.changes.append(f"+ item {item['unique_name']} ({item['type']}, {len(item['values'])} values)")
+            continue
+
+        wanted = {"Name": _item_name(item), "DisplayOrder": item["display_order"], "IsRequired": item["is_required"]}
+        changed = {key: value for key, value in wanted.items() if current.get(key) != value}
+        if changed:
+            plan.item_updates.append({"attributes": {"type": "ActionPlanTemplateItem"}, "Id": current["Id"], **changed})
+            plan.changes.append(f"~ item {item['unique_name']}: {', '.join(sorted(changed))}")
+
+        for name, value in item["values"].items():
+            fields = apt.value_fields(value)
+            current_value = current["values"].get(name)
+            if current_value is None:
+                plan.value_creates.extend(rec for rec in apt.value_records({**item, "values": {name: value}},
+                                                                            current["Id"]))
+                plan.changes.append(f"+ value {item['unique_name']}.{name}")
+            elif any((current_value.get(key) or None) != (val or None) for key, val in fields.items()):
+                plan.value_updates.append({"attributes": {"type": "ActionPlanTemplateItemValue"},
+                                           "Id": current_value["Id"], **fields})
+                plan.changes.append(f"~ value {item['unique_name']}.{name}")
+        for name in sorted(set(current["values"]) - set(item["values"])):
+            if prune:
+                plan.deletes.append(current["values"][name]["Id"])
+                plan.changes.append(f"- value {item['unique_name']}.{name}")
+            else:
+                plan.kept += 1
+
+    for unique_name in sorted(set(existing.items) - declared):
+        if prune:
+            plan.deletes.append(existing.items[unique_name]["Id"])
+            plan.changes.append(f"- item {unique_name}")
+        else:
+            plan.kept += 1
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# Apply
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TemplateResult:
+    name: str
+    action: str
+    seconds: float = 0.0
+    counts: Dict[str, int] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    template_id: Optional[str] = None
+
+
+def _collect_failures(results: List[dict], labels: List[str], errors: List[str]):
+    for label, result in zip(labels, results):
+        if not result.get("success"):
+            details = "; ".join(f"{e.get('statusCode')}: {e.get('message')}" for e in result.get("errors", []))
+            errors.append(f"{label}: {details or 'unknown error'}")
+
+
+def apply_plan(client: apt.SalesforceClient, plan: TemplatePlan, replace_published: bool = False,
+               version_timeout: float = apt.VERSION_POLL_TIMEOUT) -> TemplateResult:
+    """Push one template's changes; errors are collected, not raised."""
+    definition = plan.definition
+    result = TemplateResult(definition.name, plan.action, counts=plan.counts())
+    start = time.monotonic()
+    try:
+        if plan.action == "create" or (plan.action == "locked" and replace_published):
+            if plan.action == "locked":
+                result.action = "replace"
+            created = apt.create_template(client, definition.config, definition.items, version_timeout, verbose=False)
+            result.template_id = created["template_id"]
+            result.counts = {"items": created["items"], "values": created["values"]}
+            result.errors.extend(created["errors"])
+        elif plan.action == "update":
+            existing = plan.existing
+            result.template_id = existing.id
+            if plan.deletes:
+                _collect_failures(client.delete_collection(plan.deletes), [f"delete {i}" for i in plan.deletes],
+                                  result.errors)
+            updates = ([plan.template_update] if plan.template_update else []) + plan.item_updates + plan.value_updates
+            if updates:
+                _collect_failures(client.update_collection(updates),
+                                  [f"update {rec['attributes']['type']} {rec['Id']}" for rec in updates], result.errors)
+            if plan.value_creates:
+                _collect_failures(client.create_collection(plan.value_creates),
+                                  [f"value {rec['ItemEntityFieldName']}" for rec in plan.value_creates], result.errors)
+            if plan.new_items:
+                _, _, errors = apt.create_items(client, existing.version_id, plan.new_items, verbose=False)
+                result.errors.extend(errors)
+        elif plan.action == "locked":
+            result.template_id = plan.existing.id
+            result.errors.append(f"version is {plan.existing.status}; published templates cannot be edited "
+                                 f"(use --replace-published to create a Draft replacement)")
+    except apt.SalesforceError as e:
+        result.errors.append(f"{e}: {json.dumps(e.body)}" if e.body else str(e))
+    result.seconds = time.monotonic() - start
+    return result
+
+
+def apply_plans(client: apt.SalesforceClient, plans: List[TemplatePlan], workers: int = 4,
+                replace_published: bool = False, version_timeout: float = apt.VERSION_POLL_TIMEOUT,
+                progress=None) -> List[TemplateResult]:
+    """Apply plans concurrently (one template per worker); results keep the plans' order."""
+    results: List[Optional[TemplateResult]] = [None] * len(plans)
+    pending = [(i, plan) for i, plan in enumerate(plans) if plan.action != "unchanged"]
+    for i, plan in enumerate(plans):
+        if plan.action == "unchanged":
+            results[i] = TemplateResult(plan.definition.name, "unchanged", template_id=plan.existing.id)
+
+    def run(entry):
+        i, plan = entry
+        results[i] = apply_plan(client, plan, replace_published, version_timeout)
+        if progress:
+            progress(results[i])
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(run, pending))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def print_plan(plans: List[TemplatePlan], verbose: bool = False):
+    for plan in plans:
+        counts = ", ".join(f"{key}={value}" for key, value in plan.counts().items() if value)
+        print(f"  {plan.action.upper():<9} {plan.definition.name}" + (f"  ({counts})" if counts else ""))
+        if plan.action != "unchanged" and (verbose or plan.action != "create"):
+            for change in plan.changes:
+                print(f"              {change}")
+        if plan.kept:
+            print(f"              {plan.kept} record(s) in the org not in the definition (kept; --prune deletes)")
+    by_action: Dict[str, int] = {}
+    for plan in plans:
+        by_action[plan.action] = by_action.get(plan.action, 0) + 1
+    print(f"\n  {len(plans)} templates: " + ", ".join(f"{count} {action}" for action, count in sorted(by_action.items())))
+
+
+def print_result(result: TemplateResult):
+    status = "ERROR" if result.errors else result.action.upper()
+    counts = ", ".join(f"{key}={value}" for key, value in result.counts.items() if value)
+    print(f"  {status:<9} {result.name:<45} {result.seconds:6.2f}s" + (f"  ({counts})" if counts else ""))
+    for error in result.errors:
+        print(f"              {error}")
+
+
+def plan_to_dict(plan: TemplatePlan) -> dict:
+    return {"name": plan.definition.name, "source": plan.definition.source, "action": plan.action,
+            "template_id": plan.existing.id if plan.existing else None,
+            "status": plan.existing.status if plan.existing else None,
+            "counts": plan.counts(), "changes": plan.changes, "kept": plan.kept}
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("paths", nargs="+", help="Definition files or directories (*.yaml, *.yml, *.json, *.csv)")
+    common.add_argument("--only", action="append", default=[], help="Only this template Name (repeatable)")
+
+    org = argparse.ArgumentParser(add_help=False)
+    org.add_argument("--org", default=apt.ORG_ALIAS, help=f"sf CLI org alias (default: {apt.ORG_ALIAS})")
+    org.add_argument("--instance-url", help="Instance URL; with --access-token, skips the sf CLI")
+    org.add_argument("--access-token", help="Access token for --instance-url")
+    org.add_argument("--api-version", default=apt.API_VERSION, help=f"REST API version (default: {apt.API_VERSION})")
+    org.add_argument("--prune", action="store_true", help="Delete items/values in the org that are not defined")
+    org.add_argument("--format", choices=["console", "json"], default="console")
+    org.add_argument("--verbose", "-v", action="store_true", help="List every change, also for new templates")
+
+    parser = argparse.ArgumentParser(description="Load Action Plan Templates in bulk from YAML/JSON/CSV")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("validate", parents=[common], help="Check definitions locally")
+    sub.add_parser("plan", parents=[common, org], help="Show what apply would change")
+    apply = sub.add_parser("apply", parents=[common, org], help="Push changes to the org")
+    apply.add_argument("--workers", type=int, default=4, help="Templates applied in parallel (default: 4)")
+    apply.add_argument("--replace-published", action="store_true",
+                       help="Create a Draft replacement for changed published templates")
+    apply.add_argument("--version-timeout", type=float, default=apt.VERSION_POLL_TIMEOUT,
+                       help=f"Seconds to wait for a new template's version (default: {apt.VERSION_POLL_TIMEOUT:g})")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        definitions = load_definitions(args.paths)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 1
+    if args.only:
+        wanted = {name.lower() for name in args.only}
+        definitions = [d for d in definitions if d.name.lower() in wanted]
+
+    errors, warnings = validate(definitions)
+    if args.command == "validate" or errors or getattr(args, "format", "console") == "console":
+        for warning in warnings:
+            print(f"  WARNING {warning}")
+        for error in errors:
+            print(f"  ERROR   {error}")
+    if errors:
+        print(f"\n{len(errors)} error(s) in {len(definitions)} template definition(s); nothing sent to the org")
+        return 1
+    if args.command == "validate":
+        print(f"\n{len(definitions)} template definition(s) valid ({len(warnings)} warning(s))")
+        return 0
+
+    workers = getattr(args, "workers", 1)
+    client = apt.get_client(args, pool_size=max(10, workers))
+    try:
+        start = time.monotonic()
+        try:
+            existing = fetch_existing(client, [d.name for d in definitions])
+        except apt.SalesforceError as e:
+            print("ERROR: fetching org state failed: " + (f"{e}: {json.dumps(e.body)}" if e.body else str(e)))
+            return 1
+        plans = [diff_template(d, existing.get(d.name.lower()), args.prune) for d in definitions]
+        fetch_seconds = time.monotonic() - start
+
+        if args.command == "plan":
+            if args.format == "json":
+                print(json.dumps([plan_to_dict(plan) for plan in plans], indent=2))
+            else:
+                print(f"Org state fetched in {fetch_seconds:.1f}s ({client.requests_made} requests)\n")
+                print_plan(plans, args.verbose)
+            return 0
+
+        console = args.format == "console"
+        if console:
+            print(f"Org state fetched in {fetch_seconds:.1f}s; applying with {workers} worker(s)\n")
+        results = apply_plans(client, plans, workers, args.replace_published, args.version_timeout,
+                              progress=print_result if console else None)
+        elapsed = time.monotonic() - start
+    finally:
+        client.close()
+
+    failed = [r for r in results if r.errors]
+    if console:
+        busy = sum(r.seconds for r in results)
+        print(f"\n{'=' * 50}")
+        print(f"Templates: {len(results)} ({len(results) - len(failed)} ok, {len(failed)} with errors)")
+        print(f"Requests:  {client.requests_made}")
+        print(f"Time:      {elapsed:.1f}s wall, {busy:.1f}s summed per template")
+        if any(r.action in ("create", "replace") for r in results):
+            print("\nNext: Publish new templates in Setup > Action Plan Templates")
+    else:
+        print(json.dumps({"seconds": round(elapsed, 3), "requests": client.requests_made, "results": [
+            {"name": r.name, "action": r.action, "template_id": r.template_id, "seconds": round(r.seconds, 3),
+             "counts": r.counts, "errors": r.errors} for r in results]}, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,17 +7,32 @@ sections for your specific template.
 
 Usage:
     python3 create_action_plan_template.py [--org <org-alias>]
+    python3 create_action_plan_template.py --instance-url http://localhost:8080 --access-token test
+
+Requests go through one pooled HTTPS session. Items and their values are
+created together in Composite API requests: items as an sObject Collections
+subrequest, values in further subrequests that reference the new item Ids
+(@{items0[3].id}), so a template with 40 items x 5 values takes one round
+trip instead of 240. The auto-created version is found with a bounded poll.
+--instance-url/--access-token skip the sf CLI, e.g. to run against a local
+stub server.
 
 Prerequisites:
     - pip install requests
     - sf CLI authenticated to target org
 """
 
+import argparse
 import json
 import subprocess
 import sys
+import threading
 import time
+from typing import Dict, List, Optional, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # Configuration — CUSTOMIZE THESE FOR YOUR TEMPLATE
@@ -25,6 +40,11 @@ import requests
 
 ORG_ALIAS = "XSBrokers-Prod"  # Override with --org flag
 API_VERSION = "v62.0"
+VERSION_POLL_TIMEOUT = 15.0     # Seconds to wait for the auto-created template version
+
+# REST API limits
+COMPOSITE_MAX_COLLECTIONS = 5   # sObject Collections subrequests per Composite request
+COLLECTION_MAX_RECORDS = 200    # records per sObject Collections call
 
 TEMPLATE_CONFIG = {
     "Name": "My Action Plan Template",
@@ -39,7 +59,8 @@ TEMPLATE_CONFIG = {
 #   unique_name: stable identifier
 #   display_order: integer sequence
 #   is_required: boolean
-#   values: dict of {FieldName: value} — use short names, script qualifies them
+#   values: dict of {FieldName: value} — use short names, script qualifies them;
+#           {"formula": "StartDate + 3"} sets ValueFormula instead of ValueLiteral
 ITEMS = [
     {
         "type": "DocumentChecklistItem",
@@ -83,119 +104,338 @@ def get_sf_credentials(org_alias):
     return data["accessToken"], data["instanceUrl"]
 
 
-def parse_args():
-    """Parse --org flag if provided."""
-    org = ORG_ALIAS
-    args = sys.argv[1:]
-    if "--org" in args:
-        idx = args.index("--org")
-        if idx + 1 < len(args):
-            org = args[idx + 1]
-    return org
+def parse_args(argv=None):
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Create an Action Plan Template via REST API")
+    parser.add_argument("--org", default=ORG_ALIAS, help=f"sf CLI org alias (default: {ORG_ALIAS})")
+    parser.add_argument("--instance-url", help="Instance URL; with --access-token, skips the sf CLI")
+    parser.add_argument("--access-token", help="Access token for --instance-url")
+    parser.add_argument("--api-version", default=API_VERSION, help=f"REST API version (default: {API_VERSION})")
+    parser.add_argument("--version-timeout", type=float, default=VERSION_POLL_TIMEOUT,
+                        help=f"Seconds to wait for the template version (default: {VERSION_POLL_TIMEOUT:g})")
+    return parser.parse_args(argv)
 
 
 # ---------------------------------------------------------------------------
-# HTTP helpers
+# REST client
 # ---------------------------------------------------------------------------
 
-def sf_post(base_url, headers, sobject, payload, label=""):
-    """POST to create an sObject record. Returns the Id or None."""
-    url = f"{base_url}/sobjects/{sobject}"
-    resp = requests.post(url, headers=headers, json=payload)
-    body = resp.json()
-    if resp.status_code in (200, 201) and body.get("success"):
-        rec_id = body["id"]
-        if label:
-            print(f"  CREATED {sobject}: {label}  (Id={rec_id})")
-        return rec_id
-    else:
-        print(f"  ERROR creating {sobject} ({label}): {resp.status_code}")
-        print(f"    {json.dumps(body, indent=2)}")
-        return None
-
-
-def sf_query(base_url, headers, soql):
-    """Run a SOQL query. Returns list of records."""
-    url = f"{base_url}/query"
-    resp = requests.get(url, headers=headers, params={"q": soql})
-    if resp.status_code == 200:
-        return resp.json().get("records", [])
-    print(f"  ERROR querying: {resp.status_code} {resp.text}")
-    return []
+class SalesforceError(Exception):
+    """A REST call failed; `body` holds the parsed error response."""
+
+    def __init__(self, message, status=None, body=None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+class SalesforceClient:
+    """
+    Minimal REST client on a pooled requests.Session.
+
+    Connection errors are retried for every method; 429/5xx responses are
+    retried (honouring Retry-After) only for GET, so a create is never
+    sent twice.
+    """
+
+    def __init__(self, instance_url: str, access_token: str, api_version: str = API_VERSION,
+                 timeout: float = 60.0, pool_size: int = 10, session: Optional[requests.Session] = None):
+        self.instance_url = instance_url.rstrip("/")
+        self.api_version = api_version if api_version.startswith("v") else f"v{api_version}"
+        self.base_url = f"{self.instance_url}/services/data/{self.api_version}"
+        self.timeout = timeout
+        self.requests_made = 0
+        self._count_lock = threading.Lock()  # requests are sent from worker threads
+        self.session = session or requests.Session()
+        retry = Retry(total=5, connect=3, read=0, status=3, backoff_factor=0.5,
+                      status_forcelist=(429, 502, 503, 504), allowed_methods=frozenset({"GET"}),
+                      respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        })
+
+    def close(self):
+        self.session.close()
+
+    def request(self, method: str, path: str, **kwargs):
+        """Call an endpoint (path relative to /services/data/vXX.X) and return parsed JSON."""
+        url = path if path.startswith("http") else f"{self.base_url}/{path.lstrip('/')}"
+        with self._count_lock:
+            self.requests_made += 1
+        resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        try:
+            body = resp.json() if resp.content else None
+        except ValueError:
+            body = resp.text
+        if resp.status_code >= 400:
+            raise SalesforceError(f"{method} {path} failed: HTTP {resp.status_code}", resp.status_code, body)
+        return body
+
+    def create(self, sobject: str, payload: dict) -> str:
+        """Create one record and return its Id."""
+        body = self.request("POST", f"sobjects/{sobject}", json=payload)
+        if not (isinstance(body, dict) and body.get("success")):
+            raise SalesforceError(f"Creating {sobject} failed", body=body)
+        return body["id"]
+
+    def query(self, soql: str) -> List[dict]:
+        """Run a SOQL query, following nextRecordsUrl."""
+        body = self.request("GET", "query", params={"q": soql})
+        records = list(body.get("records", []))
+        while body.get("nextRecordsUrl"):
+            body = self.request("GET", f"{self.instance_url}{body['nextRecordsUrl']}")
+            records.extend(body.get("records", []))
+        return records
+
+    def create_collection(self, records: List[dict], all_or_none: bool = False) -> List[dict]:
+        """sObject Collections create; records need attributes.type. Returns per-record results."""
+        results = []
+        for i in range(0, len(records), COLLECTION_MAX_RECORDS):
+            results.extend(self.request("POST", "composite/sobjects", json={
+                "allOrNone": all_or_none, "records": records[i:i + COLLECTION_MAX_RECORDS]}))
+        return results
+
+    def update_collection(self, records: List[dict], all_or_none: bool = False) -> List[dict]:
+        """sObject Collections update; records need attributes.type and Id."""
+        results = []
+        for i in range(0, len(records), COLLECTION_MAX_RECORDS):
+            results.extend(self.request("PATCH", "composite/sobjects", json={
+                "allOrNone": all_or_none, "records": records[i:i + COLLECTION_MAX_RECORDS]}))
+        return results
+
+    def delete_collection(self, ids: List[str], all_or_none: bool = False) -> List[dict]:
+        """sObject Collections delete."""
+        results = []
+        for i in range(0, len(ids), COLLECTION_MAX_RECORDS):
+            results.extend(self.request("DELETE", "composite/sobjects", params={
+                "ids": ",".join(ids[i:i + COLLECTION_MAX_RECORDS]),
+                "allOrNone": str(all_or_none).lower()}))
+        return results
+
+    def composite(self, subrequests: List[dict], all_or_none: bool = False) -> Dict[str, dict]:
+        """Run a Composite request; returns responses keyed by referenceId."""
+        for sub in subrequests:
+            if not sub["url"].startswith("/services/"):
+                sub["url"] = f"/services/data/{self.api_version}/{sub['url'].lstrip('/')}"
+        body = self.request("POST", "composite", json={"allOrNone": all_or_none, "compositeRequest": subrequests})
+        return {res["referenceId"]: res for res in body.get("compositeResponse", [])}
+
+
+def get_client(args, pool_size: int = 10) -> SalesforceClient:
+    """Client from --instance-url/--access-token, else from the sf CLI org."""
+    if args.instance_url and args.access_token:
+        return SalesforceClient(args.instance_url, args.access_token, args.api_version, pool_size=pool_size)
+    access_token, instance_url = get_sf_credentials(args.org)
+    return SalesforceClient(instance_url, access_token, args.api_version, pool_size=pool_size)
 
 
 # ---------------------------------------------------------------------------
-# Main
+# Template creation
 # ---------------------------------------------------------------------------
 
-def main():
-    org = parse_args()
-    print(f"Connecting to org: {org}")
-    access_token, instance_url = get_sf_credentials(org)
-    base_url = f"{instance_url}/services/data/{API_VERSION}"
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
+def wait_for_version(client: SalesforceClient, template_id: str, timeout: float = VERSION_POLL_TIMEOUT) -> str:
+    """
+    Poll for the version Salesforce creates with the template.
+
+    Starts at 0.25s and doubles up to 2s between attempts, so the usual
+    case returns after the first or second query instead of a fixed sleep.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.25
+    while True:
+        versions = client.query(
+            f"SELECT Id FROM ActionPlanTemplateVersion WHERE ActionPlanTemplateId = '{template_id}'")
+        if versions:
+            return versions[0]["Id"]
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise SalesforceError(f"No ActionPlanTemplateVersion for {template_id} after {timeout:g}s")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 2.0)
+
+
+def item_record(item_def: dict, version_id: str) -> dict:
+    return {
+        "attributes": {"type": "ActionPlanTemplateItem"},
+        "ActionPlanTemplateVersionId": version_id,
+        "Name": item_def["values"].get("Name") or item_def["values"].get("Subject", item_def["unique_name"]),
+        "DisplayOrder": item_def["display_order"],
+        "IsRequired": item_def["is_required"],
+        "ItemEntityType": item_def["type"],
+        "UniqueName": item_def["unique_name"],
+        "IsActive": True,
     }
-    print(f"Connected: {instance_url}\n")
 
-    # 1. Create template
-    template_id = sf_post(base_url, headers, "ActionPlanTemplate", TEMPLATE_CONFIG, TEMPLATE_CONFIG["Name"])
-    if not template_id:
-        sys.exit(1)
 
-    # 2. Query auto-created version
-    time.sleep(1)
-    versions = sf_query(base_url, headers,
-        f"SELECT Id FROM ActionPlanTemplateVersion WHERE ActionPlanTemplateId = '{template_id}'"
-    )
-    if not versions:
-        print("ERROR: No version found")
-        sys.exit(1)
-    version_id = versions[0]["Id"]
-    print(f"  Version: {version_id}\n")
-
-    # 3. Create items and values
-    item_count = 0
-    value_count = 0
-    for item_def in ITEMS:
-        item_id = sf_post(base_url, headers, "ActionPlanTemplateItem", {
-            "ActionPlanTemplateVersionId": version_id,
-            "Name": item_def["values"].get("Name") or item_def["values"].get("Subject", item_def["unique_name"]),
-            "DisplayOrder": item_def["display_order"],
-            "IsRequired": item_def["is_required"],
-            "ItemEntityType": item_def["type"],
-            "UniqueName": item_def["unique_name"],
+def value_fields(value) -> dict:
+    """ValueLiteral/ValueFormula for a value; {"formula": "StartDate + 3"} sets a formula."""
+    if isinstance(value, dict):
+        return {"ValueLiteral": None, "ValueFormula": value["formula"]}
+    return {"ValueLiteral": value, "ValueFormula": None}
+
+
+def value_records(item_def: dict, item_id: str) -> List[dict]:
+    """Values for one item; field names are qualified with the entity type."""
+    # NOTE: Do NOT include ItemEntityType — it is read-only
+    records = []
+    for field_name, value in item_def["values"].items():
+        fields = {key: val for key, val in value_fields(value).items() if val is not None}
+        records.append({
+            "attributes": {"type": "ActionPlanTemplateItemValue"},
+            "ActionPlanTemplateItemId": item_id,
+            "ItemEntityFieldName": f"{item_def['type']}.{field_name}",
+            **fields,
+            "Name": field_name,
             "IsActive": True,
-        }, label=f"#{item_def['display_order']} {item_def['unique_name']}")
+        })
+    return records
+
+
+def pack_batches(items: List[dict]) -> List[List[int]]:
+    """
+    Group item indexes so each Composite request stays within limits:
+    one collection of <= 200 items plus <= 4 collections (800 records) of values.
+    """
+    max_values = (COMPOSITE_MAX_COLLECTIONS - 1) * COLLECTION_MAX_RECORDS
+    batches, current, values = [], [], 0
+    for i, item_def in enumerate(items):
+        count = len(item_def["values"])
+        if current and (len(current) == COLLECTION_MAX_RECORDS or values + count > max_values):
+            batches.append(current)
+            current, values = [], 0
+        current.append(i)
+        values += count
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _record_errors(result: dict) -> str:
+    return "; ".join(f"{e.get('statusCode')}: {e.get('message')}" for e in result.get("errors", [])) or "unknown error"
+
 
-        if not item_id:
+def create_items(client: SalesforceClient, version_id: str, items: List[dict],
+                 verbose: bool = True) -> Tuple[int, int, List[str]]:
+    """
+    Create items and their values in Composite requests.
+
+    Returns:
+        (items created, values created, error messages)
+    """
+    item_count, value_count, errors = 0, 0, []
+    for batch_no, batch in enumerate(pack_batches(items)):
+        ref = f"items{batch_no}"
+        subrequests = [{"method": "POST", "url": "composite/sobjects", "referenceId": ref,
+                        "body": {"allOrNone": False, "records": [item_record(items[i], version_id) for i in batch]}}]
+        pending = []  # (position in batch, value record)
+        for pos, i in enumerate(batch):
+            pending.extend((pos, rec) for rec in value_records(items[i], f"@{{{ref}[{pos}].id}}"))
+        value_chunks = [pending[k:k + COLLECTION_MAX_RECORDS] for k in range(0, len(pending), COLLECTION_MAX_RECORDS)]
+        for n, chunk in enumerate(value_chunks):
+            subrequests.append({"method": "POST", "url": "composite/sobjects", "referenceId": f"{ref}_values{n}",
+                                "body": {"allOrNone": False, "records": [rec for _, rec in chunk]}})
+
+        responses = client.composite(subrequests)
+        item_response = responses.get(ref, {})
+        item_results = item_response.get("body") if item_response.get("httpStatusCode") == 200 else None
+        if not isinstance(item_results, list):
+            errors.append(f"Item batch {batch_no + 1} failed: {json.dumps(item_response.get('body'))}")
             continue
-        item_count += 1
-
-        # Create values — qualify field names with entity type
-        for field_name, value in item_def["values"].items():
-            qualified = f"{item_def['type']}.{field_name}"
-            # NOTE: Do NOT include ItemEntityType — it is read-only
-            val_id = sf_post(base_url, headers, "ActionPlanTemplateItemValue", {
-                "ActionPlanTemplateItemId": item_id,
-                "ItemEntityFieldName": qualified,
-                "ValueLiteral": value,
-                "Name": field_name,
-                "IsActive": True,
-            }, label=f"  → {field_name}")
-            if val_id:
-                value_count += 1
-
-    # 4. Summary
+
+        item_ids = {}
+        for pos, result in enumerate(item_results):
+            item_def = items[batch[pos]]
+            if result.get("success"):
+                item_ids[pos] = result["id"]
+                item_count += 1
+                if verbose:
+                    print(f"  CREATED ActionPlanTemplateItem: #{item_def['display_order']} "
+                          f"{item_def['unique_name']}  (Id={result['id']})")
+            else:
+                errors.append(f"Item {item_def['unique_name']}: {_record_errors(result)}")
+
+        retry = []
+        for n, chunk in enumerate(value_chunks):
+            response = responses.get(f"{ref}_values{n}", {})
+            results = response.get("body") if response.get("httpStatusCode") == 200 else None
+            if not isinstance(results, list):
+                # A reference to a failed item breaks the whole subrequest: resend with resolved Ids
+                retry.extend((pos, rec) for pos, rec in chunk if pos in item_ids)
+                continue
+            for (pos, rec), result in zip(chunk, results):
+                if result.get("success"):
+                    value_count += 1
+                elif pos in item_ids:
+                    errors.append(f"Value {items[batch[pos]]['unique_name']}.{rec['Name']}: {_record_errors(result)}")
+        if retry:
+            records = [{**rec, "ActionPlanTemplateItemId": item_ids[pos]} for pos, rec in retry]
+            for (pos, rec), result in zip(retry, client.create_collection(records)):
+                if result.get("success"):
+                    value_count += 1
+                else:
+                    errors.append(f"Value {items[batch[pos]]['unique_name']}.{rec['Name']}: {_record_errors(result)}")
+    return item_count, value_count, errors
+
+
+def create_template(client: SalesforceClient, config: dict, items: List[dict],
+                    version_timeout: float = VERSION_POLL_TIMEOUT, verbose: bool = True) -> dict:
+    """
+    Create a Draft template with its items and values.
+
+    Returns:
+        dict with template_id, version_id, items, values, errors
+    """
+    template_id = client.create("ActionPlanTemplate", config)
+    if verbose:
+        print(f"  CREATED ActionPlanTemplate: {config['Name']}  (Id={template_id})")
+    version_id = wait_for_version(client, template_id, version_timeout)
+    if verbose:
+        print(f"  Version: {version_id}\n")
+    item_count, value_count, errors = create_items(client, version_id, items, verbose)
+    return {"template_id": template_id, "version_id": version_id,
+            "items": item_count, "values": value_count, "errors": errors}
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    args = parse_args()
+    client = get_client(args)
+    print(f"Connected: {client.instance_url}\n")
+
+    start = time.monotonic()
+    try:
+        result = create_template(client, TEMPLATE_CONFIG, ITEMS, args.version_timeout)
+    except SalesforceError as e:
+        print(f"ERROR: {e}")
+        if e.body:
+            print(f"    {json.dumps(e.body, indent=2)}")
+        sys.exit(1)
+    finally:
+        client.close()
+
+    for error in result["errors"]:
+        print(f"  ERROR {error}")
+
+    # Summary
     print(f"\n{'='*50}")
     print(f"Template: {TEMPLATE_CONFIG['Name']}")
-    print(f"  Id:      {template_id}")
-    print(f"  Version: {version_id}")
-    print(f"  Items:   {item_count}")
-    print(f"  Values:  {value_count}")
+    print(f"  Id:      {result['template_id']}")
+    print(f"  Version: {result['version_id']}")
+    print(f"  Items:   {result['items']}")
+    print(f"  Values:  {result['values']}")
     print(f"  Status:  Draft")
+    print(f"  Requests: {client.requests_made} in {time.monotonic() - start:.1f}s")
     print(f"\nNext: Go to Setup > Action Plan Templates > Publish")
+    if result["errors"]:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -14,6 +14,10 @@ Scoring Categories (150 points total):
 6. Error Handling (15 pts): try-catch, custom exceptions
 7. Performance (10 pts): limits, caching, async
 8. Documentation (10 pts): ApexDoc, inline comments
+
+Inside an SFDX project, custom objects and fields used in static SOQL,
+`new Obj__c(...)` and trigger declarations are checked against the shared
+project metadata index (missing ones count against Architecture).
 """
 
 import re
@@ -21,6 +25,24 @@ import sys
 import os
 from typing import Dict, List, Tuple
 
+# Project metadata index (shared/metadata_index) for cross-file reference checks
+SHARED_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), 'shared'
+)
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+
+try:
+    from metadata_index import index_for
+    INDEX_AVAILABLE = True
+except ImportError:
+    INDEX_AVAILABLE = False
+
+# Static SOQL select list and FROM object; sObject construction; trigger declaration
+SOQL_FROM_PATTERN = re.compile(r'\[\s*SELECT\s+(.*?)\s+FROM\s+(\w+)', re.IGNORECASE | re.DOTALL)
+NEW_SOBJECT_PATTERN = re.compile(r'\bnew\s+(\w+__c)\s*\(', re.IGNORECASE)
+TRIGGER_PATTERN = re.compile(r'^\s*trigger\s+\w+\s+on\s+(\w+)', re.IGNORECASE | re.MULTILINE)
+
 
 class ApexValidator:
     """Validates Apex code for best practices."""
@@ -84,6 +106,7 @@ class ApexValidator:
         self._check_naming_conventions()
         self._check_error_handling()
         self._check_documentation()
+        self._check_metadata_references()
 
         # Calculate total score
         total_score = sum(self.scores.values())
@@ -342,6 +365,57 @@ class ApexValidator:
                     self.scores['documentation'] -= 2
 
 
+    def _check_metadata_references(self):
+        """Check custom objects/fields used in code against the project metadata index."""
+        if not INDEX_AVAILABLE:
+            return
+        index = index_for(self.file_path)
+        if index is None:
+            return
+
+        # (line, kind, name) in source order
+        used = []
+        for match in TRIGGER_PATTERN.finditer(self.content):
+            used.append((self._line_of(match.start()), 'object', match.group(1)))
+        for match in SOQL_FROM_PATTERN.finditer(self.content):
+            line, select_list, sobject = self._line_of(match.start()), match.group(1), match.group(2)
+            used.append((line, 'object', sobject))
+            if '(' in select_list:
+                # Subquery or aggregate: the FROM matched may be the inner one
+                continue
+            for field in select_list.split(','):
+                field = field.strip()
+                if re.fullmatch(r'\w+', field):
+                    used.append((line, 'field', f'{sobject}.{field}'))
+        for match in NEW_SOBJECT_PATTERN.finditer(self.content):
+            used.append((self._line_of(match.start()), 'object', match.group(1)))
+
+        reported = set()
+        for line, kind, name in sorted(used):
+            if name.lower() in reported:
+                continue
+            if kind == 'object':
+                status = index.check_object(name)
+            else:
+                status = index.check_field(*name.split('.', 1))
+            if status != 'missing':
+                continue
+            reported.add(name.lower())
+            self.issues.append({
+                'severity': 'WARNING',
+                'category': 'architecture',
+                'message': f'{"Object" if kind == "object" else "Field"} {name} not found in project metadata',
+                'line': line,
+                'fix': 'Check the API name, or add the object/field to the project before deploying'
+            })
+            if len(reported) <= 3:
+                self.scores['architecture'] -= 2
+
+    def _line_of(self, offset: int) -> int:
+        """1-based line number of a character offset in the file."""
+        return self.content.count('\n', 0, offset) + 1
+
+
 def main():
     """Command-line interface for Apex validation."""
     if len(sys.argv) < 2:
@@ -8,18 +8,28 @@ and provides structured analysis including:
 - Performance hotspots
 - Exceptions and stack traces
 - Optimization recommendations
+- Call-tree profile: inclusive/self time and SOQL/DML per method
 
 Environment Variables:
     TOOL_OUTPUT: The stdout from the Bash command
     TOOL_INPUT: The command that was executed
+
+Standalone profiler:
+    python3 parse-debug-log.py <log-file> [--top 20] [--folded out.folded] [--format json]
+
+The folded output (one "frame;frame;frame value" line per stack, value in
+microseconds of self time) feeds flamegraph.pl or speedscope directly.
 """
 
+import argparse
+import hashlib
 import json
 import os
 import sys
 import re
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
 from datetime import datetime
 
 # Only process debug log commands
@@ -53,6 +63,18 @@ class QueryInfo:
     rows_returned: int
     execution_time_ms: float
     is_in_loop: bool = False
+    shape_hash: str = ""
+
+@dataclass
+class QueryShape:
+    """Aggregate of every execution of one normalized query."""
+    shape_hash: str
+    shape: str
+    count: int = 0
+    total_rows: int = 0
+    total_time_ms: float = 0
+    in_loop_count: int = 0
+    line_numbers: List[int] = field(default_factory=list)
 
 @dataclass
 class DMLInfo:
@@ -77,11 +99,99 @@ class LogAnalysis:
     queries: List[QueryInfo] = field(default_factory=list)
     dml_operations: List[DMLInfo] = field(default_factory=list)
     exceptions: List[ExceptionInfo] = field(default_factory=list)
+    query_shapes: List[QueryShape] = field(default_factory=list)
     execution_time_ms: float = 0
     entry_point: str = ""
     warnings: List[str] = field(default_factory=list)
     critical_issues: List[str] = field(default_factory=list)
 
+# Same shape executed this many times is reported as a repeated (N+1) query
+REPEATED_QUERY_THRESHOLD = 5
+
+SOQL_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+SOQL_DATE_LITERAL_RE = re.compile(r'\b([A-Z_]+_N_[A-Z_]+)\s*:\s*\d+', re.IGNORECASE)
+SOQL_DATETIME_RE = re.compile(r'\b\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)?\b')
+SOQL_BIND_RE = re.compile(r':\s*[A-Za-z_][\w.]*(?:\(\))?')
+SOQL_NUMBER_RE = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])')
+SOQL_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+SOQL_OPERATOR_RE = re.compile(r'\s*(!=|<>|<=|>=|=|<|>)\s*')
+SOQL_CALL_RE = re.compile(r'\b(?!(?:IN|AND|OR|NOT|WHERE|INCLUDES|EXCLUDES)\b)(\w+) \(')
+LOG_NANOS_RE = re.compile(r'\((\d+)\)\|')
+
+def _split_top_level(text: str, sep: str = ',') -> List[str]:
+    """Split on sep outside parentheses."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts]
+
+def _canonical_select(query: str) -> str:
+    """Sort the top-level SELECT field list (subqueries are canonicalized recursively)."""
+    if not query.startswith('SELECT '):
+        return query
+    depth = 0
+    for i in range(7, len(query)):
+        ch = query[i]
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth == 0 and query.startswith(' FROM ', i):
+            fields = []
+            for item in _split_top_level(query[7:i]):
+                if item.startswith('(') and item.endswith(')'):
+                    item = '(' + _canonical_select(item[1:-1].strip()) + ')'
+                fields.append(item)
+            return 'SELECT ' + ', '.join(sorted(fields)) + query[i:]
+    return query
+
+@lru_cache(maxsize=4096)
+def normalize_soql(query: str) -> str:
+    """
+    Reduce a SOQL statement to its shape.
+
+    String/number/date literals and bind variables become '?', IN lists
+    collapse to 'IN (?)', whitespace and case are canonicalized and the
+    SELECT field list is sorted, so executions that differ only in their
+    values or field order share one shape.
+    """
+    shape = SOQL_STRING_RE.sub('?', query)
+    shape = SOQL_DATE_LITERAL_RE.sub(r'\1:?', shape)
+    shape = SOQL_DATETIME_RE.sub('?', shape)
+    shape = SOQL_BIND_RE.sub('?', shape)
+    shape = SOQL_NUMBER_RE.sub('?', shape)
+    shape = SOQL_OPERATOR_RE.sub(r' \1 ', shape)
+    shape = ' '.join(shape.replace('(', ' ( ').replace(')', ' ) ').replace(',', ' , ').split()).upper()
+    shape = SOQL_CALL_RE.sub(r'\1(', shape.replace('( ', '(').replace(' )', ')').replace(' ,', ','))
+    shape = SOQL_IN_LIST_RE.sub('IN (?)', shape)
+    return _canonical_select(shape)
+
+@lru_cache(maxsize=4096)
+def soql_shape_hash(query: str) -> str:
+    return hashlib.sha1(normalize_soql(query).encode('utf-8')).hexdigest()[:12]
+
+def aggregate_query_shapes(queries: List[QueryInfo]) -> List[QueryShape]:
+    """Group queries by shape hash, most executed first."""
+    shapes: Dict[str, QueryShape] = {}
+    for q in queries:
+        shape = shapes.get(q.shape_hash)
+        if shape is None:
+            shape = shapes[q.shape_hash] = QueryShape(shape_hash=q.shape_hash, shape="")
+        shape.count += 1
+        shape.total_rows += q.rows_returned
+        shape.total_time_ms += q.execution_time_ms
+        shape.in_loop_count += int(q.is_in_loop)
+        if q.line_number not in shape.line_numbers:
+            shape.line_numbers.append(q.line_number)
+    return sorted(shapes.values(), key=lambda s: (s.count, s.total_rows), reverse=True)
+
 def parse_debug_log(log_content: str) -> LogAnalysis:
     """
     Parse a Salesforce debug log and extract key metrics.
@@ -97,7 +207,8 @@ def parse_debug_log(log_content: str) -> LogAnalysis:
     lines = log_content.split('\n')
     in_loop_depth = 0
     current_method = ""
-    query_start_times: Dict[int, float] = {}
+    query_start_ns: Optional[int] = None
+    shape_text: Dict[str, str] = {}
 
     for i, line in enumerate(lines):
         # Track loop depth
@@ -122,34 +233,48 @@ def parse_debug_log(log_content: str) -> LogAnalysis:
                 query_match = re.search(r'SELECT.*', line, re.IGNORECASE)
                 query_text = query_match.group(0) if query_match else "Unknown query"
 
+                shape_hash = soql_shape_hash(query_text)
+                if shape_hash not in shape_text:
+                    shape_text[shape_hash] = normalize_soql(query_text)
                 query_info = QueryInfo(
                     line_number=line_num,
                     query=query_text[:200],  # Truncate long queries
                     rows_returned=0,
                     execution_time_ms=0,
-                    is_in_loop=in_loop_depth > 0
+                    is_in_loop=in_loop_depth > 0,
+                    shape_hash=shape_hash
                 )
                 analysis.queries.append(query_info)
                 analysis.limits.soql_queries += 1
+                nanos = LOG_NANOS_RE.search(line)
+                query_start_ns = int(nanos.group(1)) if nanos else None
 
         # Parse SOQL results
         if '|SOQL_EXECUTE_END|' in line and analysis.queries:
-            match = re.search(r'\[(\d+)\s*rows?\]', line)
+            match = re.search(r'\[(\d+)\s*rows?\]|Rows:(\d+)', line)
             if match and analysis.queries:
-                analysis.queries[-1].rows_returned = int(match.group(1))
+                analysis.queries[-1].rows_returned = int(match.group(1) or match.group(2))
+            nanos = LOG_NANOS_RE.search(line)
+            if nanos and query_start_ns is not None:
+                analysis.queries[-1].execution_time_ms = (int(nanos.group(1)) - query_start_ns) / 1e6
+                query_start_ns = None
 
         # Parse DML operations
         if '|DML_BEGIN|' in line:
-            match = re.search(r'\[(\d+)\].*?\|(INSERT|UPDATE|DELETE|UPSERT)', line, re.IGNORECASE)
+            match = re.search(r'\[(\d+)\].*?\|(?:Op:)?(INSERT|UPDATE|DELETE|UPSERT|UNDELETE|MERGE)',
+                              line, re.IGNORECASE)
             if match:
+                rows = re.search(r'\|Rows:(\d+)', line)
                 dml_info = DMLInfo(
                     line_number=int(match.group(1)),
                     operation=match.group(2).upper(),
-                    rows_affected=0,
+                    rows_affected=int(rows.group(1)) if rows else 0,
                     is_in_loop=in_loop_depth > 0
                 )
                 analysis.dml_operations.append(dml_info)
                 analysis.limits.dml_statements += 1
+                if rows:
+                    analysis.limits.dml_rows += dml_info.rows_affected
 
         # Parse DML rows
         if '|DML_END|' in line and analysis.dml_operations:
@@ -205,6 +330,10 @@ def parse_debug_log(log_content: str) -> LogAnalysis:
             if match:
                 analysis.execution_time_ms = float(match.group(1))
 
+    analysis.query_shapes = aggregate_query_shapes(analysis.queries)
+    for shape in analysis.query_shapes:
+        shape.shape = shape_text.get(shape.shape_hash, "")
+
     # Analyze for issues
     analyze_issues(analysis)
 
@@ -229,6 +358,18 @@ def analyze_issues(analysis: LogAnalysis) -> None:
             f"DML in loop detected: {len(loop_dml)} DML operations inside loops"
         )
 
+    # Check for repeated query shapes (N+1)
+    for shape in analysis.query_shapes:
+        if shape.count < REPEATED_QUERY_THRESHOLD:
+            break
+        lines_text = ', '.join(str(n) for n in shape.line_numbers[:5])
+        message = (f"N+1 query: same SOQL shape executed {shape.count}x from line(s) {lines_text} "
+                   f"({shape.total_rows} rows, {shape.total_time_ms:.1f}ms) - {shape.shape[:80]}")
+        if shape.in_loop_count or shape.count >= 4 * REPEATED_QUERY_THRESHOLD:
+            analysis.critical_issues.append(message)
+        else:
+            analysis.warnings.append(message)
+
     # Check SOQL limit
     soql_percent = (limits.soql_queries / limits.soql_limit) * 100 if limits.soql_limit else 0
     if soql_percent >= 95:
@@ -347,6 +488,20 @@ def format_output(analysis: LogAnalysis) -> str:
             lines.append(f"   ... and {len(loop_queries) - 5} more")
         lines.append("")
 
+    # Repeated query shapes
+    repeated = [shape for shape in analysis.query_shapes if shape.count > 1]
+    if repeated:
+        lines.append("🔁 REPEATED QUERY SHAPES")
+        lines.append("-" * 60)
+        lines.append(f"   {'Count':>5} {'Rows':>7} {'Time ms':>8}  Lines / Shape")
+        for shape in repeated[:5]:
+            line_list = ', '.join(str(n) for n in shape.line_numbers[:5])
+            lines.append(f"   {shape.count:5d} {shape.total_rows:7d} {shape.total_time_ms:8.1f}  "
+                         f"[{line_list}] {shape.shape[:70]}")
+        if len(repeated) > 5:
+            lines.append(f"   ... and {len(repeated) - 5} more repeated shapes")
+        lines.append("")
+
     # DML in loops
     loop_dml = [d for d in analysis.dml_operations if d.is_in_loop]
     if loop_dml:
@@ -382,6 +537,13 @@ def format_output(analysis: LogAnalysis) -> str:
             lines.append("   3. Access from Map inside loop")
             lines.append("")
 
+        if any(shape.count >= REPEATED_QUERY_THRESHOLD for shape in analysis.query_shapes):
+            lines.append("For repeated query shapes (N+1):")
+            lines.append("   1. Collect the bind values (Ids) first")
+            lines.append("   2. Run ONE query with WHERE ... IN :ids")
+            lines.append("   3. Index results in a Map and look up per record")
+            lines.append("")
+
         if loop_dml:
             lines.append("For DML in loop:")
             lines.append("   1. Create List<SObject> before loop")
@@ -400,8 +562,247 @@ def format_output(analysis: LogAnalysis) -> str:
 
     return "\n".join(lines)
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Call-tree profiler
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Event -> (frame kind, True for entry / False for exit)
+FRAME_EVENTS = {
+    'CODE_UNIT_STARTED': ('code_unit', True),
+    'CODE_UNIT_FINISHED': ('code_unit', False),
+    'METHOD_ENTRY': ('method', True),
+    'METHOD_EXIT': ('method', False),
+    'CONSTRUCTOR_ENTRY': ('method', True),
+    'CONSTRUCTOR_EXIT': ('method', False),
+}
+
+TIMESTAMP_RE = re.compile(r'^[\d:.]+\s*\((\d+)\)\|([A-Z_]+)')
+ROWS_RE = re.compile(r'(?:Rows:|\[)(\d+)\s*(?:rows?\])?')
+
+@dataclass
+class CallFrame:
+    """A node in the reconstructed call tree."""
+    name: str
+    kind: str
+    start_ns: int = 0
+    end_ns: int = 0
+    line_number: int = 0
+    soql_queries: int = 0
+    soql_rows: int = 0
+    dml_statements: int = 0
+    dml_rows: int = 0
+    children: List['CallFrame'] = field(default_factory=list)
+
+    @property
+    def inclusive_ns(self) -> int:
+        return max(0, self.end_ns - self.start_ns)
+
+    @property
+    def self_ns(self) -> int:
+        return max(0, self.inclusive_ns - sum(c.inclusive_ns for c in self.children))
+
+    def total(self, attr: str) -> int:
+        """Counter summed over this frame and its descendants."""
+        return getattr(self, attr) + sum(c.total(attr) for c in self.children)
+
+@dataclass
+class MethodStats:
+    """Per-method aggregate over every call in the tree."""
+    name: str
+    calls: int = 0
+    inclusive_ns: int = 0
+    self_ns: int = 0
+    soql_queries: int = 0
+    soql_rows: int = 0
+    dml_statements: int = 0
+    dml_rows: int = 0
+
+def _frame_name(kind: str, fields: List[str], is_entry: bool = True) -> str:
+    """
+    Frame name from a split log line (id and line-number fields skipped).
+
+    Code units are keyed by their unit name, which is the last field except on
+    triggers, where both events carry the trigger path after it:
+
+        CODE_UNIT_STARTED|[EXTERNAL]|01q..|X on Account trigger event BeforeInsert|__sfdc_trigger/X
+        CODE_UNIT_FINISHED|X on Account trigger event BeforeInsert|__sfdc_trigger/X
+    """
+    if kind == 'code_unit' and is_entry and len(fields) >= 5:
+        return fields[4]
+    if kind == 'code_unit' and not is_entry and len(fields) > 2:
+        return fields[2]
+    return fields[-1] if len(fields) > 2 else ''
+
+def _frame_matches(frame: CallFrame, kind: str, name: str) -> bool:
+    if frame.kind != kind:
+        return False
+    if not name or frame.name == name:
+        return True
+    # METHOD_EXIT for constructors/static init may carry only the class name
+    return frame.name.startswith(name + '.') or frame.name.startswith(name + '(')
+
+def build_call_tree(log_content: str) -> CallFrame:
+    """
+    Rebuild the entry/exit nesting of a debug log into a call tree.
+
+    Timings come from the nanosecond counter in each line's "(123456)" prefix.
+    Exits that do not match the innermost frame close every frame above the
+    matching one; exits with no matching frame are ignored, and frames still
+    open at the end of the log (truncated logs) are closed at the last
+    timestamp.
+
+    Args:
+        log_content: Raw debug log text
+
+    Returns:
+        Synthetic root CallFrame spanning the whole log
+    """
+    root = CallFrame(name='(log)', kind='root')
+    stack = [root]
+    first_ns = last_ns = None
+
+    for line in log_content.split('\n'):
+        match = TIMESTAMP_RE.match(line)
+        if not match:
+            continue
+        ts = int(match.group(1))
+        event = match.group(2)
+        if first_ns is None:
+            first_ns = ts
+        last_ns = ts
+        top = stack[-1]
+
+        if event in FRAME_EVENTS:
+            kind, is_entry = FRAME_EVENTS[event]
+            fields = line.rstrip('\r').split('|')
+            name = _frame_name(kind, fields, is_entry)
+            if is_entry:
+                line_match = re.match(r'\[(\d+)\]', fields[2]) if len(fields) > 2 else None
+                frame = CallFrame(name=name, kind=kind, start_ns=ts,
+                                  line_number=int(line_match.group(1)) if line_match else 0)
+                top.children.append(frame)
+                stack.append(frame)
+            else:
+                for depth in range(len(stack) - 1, 0, -1):
+                    if _frame_matches(stack[depth], kind, name):
+                        for frame in stack[depth:]:
+                            frame.end_ns = ts
+                        del stack[depth:]
+                        break
+        elif event == 'SOQL_EXECUTE_BEGIN':
+            top.soql_queries += 1
+        elif event == 'SOQL_EXECUTE_END':
+            rows = ROWS_RE.search(line.split('|', 3)[-1])
+            if rows:
+                top.soql_rows += int(rows.group(1))
+        elif event == 'DML_BEGIN':
+            top.dml_statements += 1
+            rows = re.search(r'Rows:(\d+)', line)
+            if rows:
+                top.dml_rows += int(rows.group(1))
+
+    for frame in stack[1:]:
+        frame.end_ns = last_ns or 0
+    root.start_ns = first_ns or 0
+    root.end_ns = last_ns or 0
+    return root
+
+def _walk(frame: CallFrame, path: Tuple[str, ...] = ()):
+    """Yield (stack path, frame) for every frame below the root, depth first."""
+    stack = [(frame, path)]
+    while stack:
+        node, node_path = stack.pop()
+        if node.kind != 'root':
+            yield node_path, node
+        for child in reversed(node.children):
+            stack.append((child, node_path + (child.name,)))
+
+def method_stats(root: CallFrame) -> List[MethodStats]:
+    """
+    Aggregate the tree per method name, sorted by self time.
+
+    Inclusive time is counted only for the outermost activation of a method,
+    so recursive calls are not double counted.
+    """
+    stats: Dict[str, MethodStats] = {}
+    for path, frame in _walk(root):
+        entry = stats.setdefault(frame.name, MethodStats(name=frame.name))
+        entry.calls += 1
+        entry.self_ns += frame.self_ns
+        if frame.name not in path[:-1]:
+            entry.inclusive_ns += frame.inclusive_ns
+        entry.soql_queries += frame.soql_queries
+        entry.soql_rows += frame.soql_rows
+        entry.dml_statements += frame.dml_statements
+        entry.dml_rows += frame.dml_rows
+    return sorted(stats.values(), key=lambda s: s.self_ns, reverse=True)
+
+def folded_stacks(root: CallFrame) -> List[str]:
+    """
+    Flamegraph folded-stack lines ("a;b;c <self microseconds>").
+
+    Identical stacks are merged; frame names have ';' replaced so they
+    cannot split a stack.
+    """
+    folded: Dict[str, int] = {}
+    if root.self_ns:
+        folded['(log)'] = root.self_ns
+    for path, frame in _walk(root):
+        key = ';'.join(p.replace(';', ',') for p in path)
+        folded[key] = folded.get(key, 0) + frame.self_ns
+    return [f"{stack} {ns // 1000}" for stack, ns in folded.items() if ns // 1000 > 0]
+
+def format_profile(root: CallFrame, top: int = 20) -> str:
+    """Format the top methods by self time plus the hottest call path."""
+    lines = []
+    total_ns = root.inclusive_ns or 1
+    stats = method_stats(root)
+
+    lines.append("⏱️  CPU PROFILE (by self time)")
+    lines.append("-" * 60)
+    lines.append(f"   {'Self ms':>9} {'Incl ms':>9} {'Calls':>6} {'SOQL':>5} {'DML':>4}  Method")
+    for entry in stats[:top]:
+        lines.append(
+            f"   {entry.self_ns / 1e6:9.2f} {entry.inclusive_ns / 1e6:9.2f} {entry.calls:6d} "
+            f"{entry.soql_queries:5d} {entry.dml_statements:4d}  {entry.name[:60]}"
+            f"{'' if entry.self_ns * 20 < total_ns else '  🔥'}")
+    lines.append("")
+
+    # Hottest path: follow the child with the largest inclusive time
+    node, path = root, []
+    while node.children:
+        node = max(node.children, key=lambda c: c.inclusive_ns)
+        path.append(f"{node.name} ({node.inclusive_ns / 1e6:.1f}ms, "
+                    f"SOQL {node.total('soql_queries')}, DML {node.total('dml_statements')})")
+    if path:
+        lines.append("🔥 HOTTEST PATH")
+        lines.append("-" * 60)
+        for depth, entry in enumerate(path):
+            lines.append(f"   {'  ' * depth}{entry}")
+        lines.append("")
+    return "\n".join(lines)
+
+def profile_to_dict(root: CallFrame, top: int = 20) -> Dict:
+    return {
+        'total_ms': root.inclusive_ns / 1e6,
+        'methods': [{
+            'name': s.name,
+            'calls': s.calls,
+            'self_ms': s.self_ns / 1e6,
+            'inclusive_ms': s.inclusive_ns / 1e6,
+            'soql_queries': s.soql_queries,
+            'soql_rows': s.soql_rows,
+            'dml_statements': s.dml_statements,
+            'dml_rows': s.dml_rows,
+        } for s in method_stats(root)[:top]],
+    }
+
 def main():
     """Main entry point."""
+    if len(sys.argv) > 1:
+        profile_main()
+        return
+
     if not should_process():
         sys.exit(0)
 
@@ -431,9 +832,53 @@ def main():
             analysis.exceptions or analysis.limits.soql_queries > 0):
             formatted = format_output(analysis)
             print(formatted)
+            root = build_call_tree(output)
+            if root.children:
+                print(format_profile(root, top=5))
     except Exception as e:
         # Silently fail - don't block on parsing errors
         sys.exit(0)
 
+def profile_main():
+    """Standalone CLI: analyze and profile a saved log file."""
+    parser = argparse.ArgumentParser(description="Analyze and profile a Salesforce debug log")
+    parser.add_argument("log_file", help="Debug log file ('-' for stdin)")
+    parser.add_argument("--top", type=int, default=20, help="Methods to list (default: 20)")
+    parser.add_argument("--folded", metavar="FILE",
+                        help="Write flamegraph folded stacks to FILE ('-' for stdout)")
+    parser.add_argument("--format", choices=["console", "json"], default="console")
+    args = parser.parse_args()
+
+    if args.log_file == '-':
+        content = sys.stdin.read()
+    else:
+        with open(args.log_file, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+
+    root = build_call_tree(content)
+    if args.folded:
+        folded = "\n".join(folded_stacks(root)) + "\n"
+        if args.folded == '-':
+            sys.stdout.write(folded)
+            return
+        with open(args.folded, 'w', encoding='utf-8') as f:
+            f.write(folded)
+
+    analysis = parse_debug_log(content)
+    if args.format == "json":
+        print(json.dumps({
+            'critical_issues': analysis.critical_issues,
+            'warnings': analysis.warnings,
+            'limits': analysis.limits.__dict__,
+            'query_shapes': [shape.__dict__ for shape in analysis.query_shapes[:args.top]],
+            'profile': profile_to_dict(root, args.top),
+        }, indent=2))
+    else:
+        print(format_output(analysis))
+        if root.children:
+            print(format_profile(root, args.top))
+        if args.folded:
+            print(f"Folded stacks written to {args.folded}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+debug_log_index.py - Index a directory of Apex debug logs into SQLite
+
+Parses many logs in parallel (process pool) with the same parser the sf-debug
+hook uses, and stores per-transaction queries, DML, exceptions, limit
+snapshots and method timings in a SQLite database. Questions such as "top 20
+SOQL by rows across all logs" are then answered from the index without
+re-parsing. Re-running ingest only parses new or modified files.
+
+Usage:
+    python3 debug_log_index.py ingest ./logs [--db logs.db] [--workers 8]
+    python3 debug_log_index.py top-soql [--db logs.db] [--limit 20]
+    python3 debug_log_index.py query-shapes | slow-methods | exceptions | limits | logs
+    python3 debug_log_index.py sql "SELECT operation, SUM(rows) FROM dml GROUP BY 1"
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PARSER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           '..', 'hooks', 'scripts', 'parse-debug-log.py')
+
+_spec = importlib.util.spec_from_file_location('parse_debug_log', PARSER_PATH)
+parser_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(parser_module)
+
+SCHEMA_VERSION = 2
+DEFAULT_DB = 'debug-log-index.db'
+LOG_EXTENSIONS = ('.log', '.txt')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    entry_point TEXT,
+    started_at TEXT,
+    execution_ms REAL,
+    soql_queries INTEGER,
+    dml_statements INTEGER,
+    dml_rows INTEGER,
+    cpu_time INTEGER,
+    heap_size INTEGER,
+    callouts INTEGER,
+    critical_issues INTEGER,
+    parse_error TEXT
+);
+CREATE TABLE IF NOT EXISTS queries (
+    log_id INTEGER NOT NULL REFERENCES logs(id) ON DELETE CASCADE,
+    line_number INTEGER,
+    query TEXT,
+    rows INTEGER,
+    in_loop INTEGER,
+    time_ms REAL,
+    shape_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS query_shapes (
+    shape_hash TEXT PRIMARY KEY,
+    shape TEXT
+);
+CREATE TABLE IF NOT EXISTS dml (
+    log_id INTEGER NOT NULL REFERENCES logs(id) ON DELETE CASCADE,
+    line_number INTEGER,
+    operation TEXT,
+    rows INTEGER,
+    in_loop INTEGER
+);
+CREATE TABLE IF NOT EXISTS exceptions (
+    log_id INTEGER NOT NULL REFERENCES logs(id) ON DELETE CASCADE,
+    type TEXT,
+    message TEXT,
+    line_number INTEGER
+);
+CREATE TABLE IF NOT EXISTS limit_snapshots (
+    log_id INTEGER NOT NULL REFERENCES logs(id) ON DELETE CASCADE,
+    snapshot INTEGER,
+    namespace TEXT,
+    metric TEXT,
+    used INTEGER,
+    maximum INTEGER
+);
+CREATE TABLE IF NOT EXISTS methods (
+    log_id INTEGER NOT NULL REFERENCES logs(id) ON DELETE CASCADE,
+    name TEXT,
+    calls INTEGER,
+    self_ns INTEGER,
+    inclusive_ns INTEGER,
+    soql_queries INTEGER,
+    dml_statements INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_queries_rows ON queries(rows DESC);
+CREATE INDEX IF NOT EXISTS idx_queries_log ON queries(log_id);
+CREATE INDEX IF NOT EXISTS idx_queries_shape ON queries(shape_hash);
+CREATE INDEX IF NOT EXISTS idx_dml_log ON dml(log_id);
+CREATE INDEX IF NOT EXISTS idx_exceptions_type ON exceptions(type);
+CREATE INDEX IF NOT EXISTS idx_limits_metric ON limit_snapshots(metric, used DESC);
+CREATE INDEX IF NOT EXISTS idx_methods_name ON methods(name);
+"""
+
+# "Number of SOQL queries: 3 out of 100" inside LIMIT_USAGE_FOR_NS blocks
+LIMIT_LINE_RE = re.compile(r'^\s*(?:Maximum |Number of )?(.+?):\s*(\d+)\s+out of\s+(\d+)')
+NAMESPACE_RE = re.compile(r'\|LIMIT_USAGE_FOR_NS\|([^|]*)\|')
+STARTED_RE = re.compile(r'^(\d{2}:\d{2}:\d{2}\.\d+)\s*\(\d+\)\|EXECUTION_STARTED')
+
+
+# ANSI color codes
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    CYAN = '\033[0;36m'
+    BOLD = '\033[1m'
+    NC = '\033[0m'  # No Color
+
+
+def parse_limit_snapshots(content: str) -> List[Tuple[int, str, str, int, int]]:
+    """
+    Extract every LIMIT_USAGE_FOR_NS block.
+
+    Returns:
+        List of (snapshot number, namespace, metric, used, maximum)
+    """
+    rows = []
+    snapshot = -1
+    namespace = None
+    for line in content.split('\n'):
+        ns_match = NAMESPACE_RE.search(line)
+        if ns_match:
+            snapshot += 1
+            namespace = ns_match.group(1) or '(default)'
+            continue
+        if namespace is None:
+            continue
+        match = LIMIT_LINE_RE.match(line)
+        if match:
+            rows.append((snapshot, namespace, match.group(1).strip(), int(match.group(2)), int(match.group(3))))
+        elif '|' in line:
+            namespace = None  # next log event ends the block
+    return rows
+
+
+def parse_log_file(path: str) -> Dict:
+    """
+    Process-pool entry point: parse one log into plain rows for the index.
+
+    Returns:
+        Dict of log-level columns plus lists of child rows
+    """
+    st = os.stat(path)
+    record = {'path': path, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size,
+              'queries': [], 'shapes': [], 'dml': [], 'exceptions': [], 'limits': [], 'methods': []}
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        analysis = parser_module.parse_debug_log(content)
+        root = parser_module.build_call_tree(content)
+    except Exception as e:
+        record['parse_error'] = str(e)
+        return record
+
+    started = next((m.group(1) for m in map(STARTED_RE.match, content.split('\n', 50)) if m), None)
+    limits = analysis.limits
+    record.update({
+        'entry_point': analysis.entry_point,
+        'started_at': started,
+        'execution_ms': analysis.execution_time_ms,
+        'soql_queries': limits.soql_queries,
+        'dml_statements': limits.dml_statements,
+        'dml_rows': limits.dml_rows,
+        'cpu_time': limits.cpu_time,
+        'heap_size': limits.heap_size,
+        'callouts': limits.callouts,
+        'critical_issues': len(analysis.critical_issues),
+        'parse_error': None,
+    })
+    record['queries'] = [(q.line_number, q.query, q.rows_returned, int(q.is_in_loop), q.execution_time_ms,
+                          q.shape_hash) for q in analysis.queries]
+    record['shapes'] = [(shape.shape_hash, shape.shape) for shape in analysis.query_shapes]
+    record['dml'] = [(d.line_number, d.operation, d.rows_affected, int(d.is_in_loop)) for d in analysis.dml_operations]
+    record['exceptions'] = [(e.exception_type, e.message, e.line_number) for e in analysis.exceptions]
+    record['limits'] = parse_limit_snapshots(content)
+    record['methods'] = [(m.name, m.calls, m.self_ns, m.inclusive_ns, m.soql_queries, m.dml_statements)
+                         for m in parser_module.method_stats(root)]
+    return record
+
+
+class LogIndex:
+    """SQLite index of parsed debug logs."""
+
+    LOG_COLUMNS = ('path', 'mtime_ns', 'size', 'entry_point', 'started_at', 'execution_ms',
+                   'soql_queries', 'dml_statements', 'dml_rows', 'cpu_time', 'heap_size',
+                   'callouts', 'critical_issues', 'parse_error')
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self._migrate()
+
+    def _migrate(self):
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            version = int(row[0]) if row else None
+        except sqlite3.OperationalError:
+            pass
+        if version is not None and version != SCHEMA_VERSION:
+            # Derived data only: rebuild rather than migrate
+            for table in ('methods', 'limit_snapshots', 'exceptions', 'dml', 'queries',
+                          'query_shapes', 'logs', 'meta'):
+                self.conn.execute(f'DROP TABLE IF EXISTS {table}')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def stale_paths(self, paths: Iterable[str]) -> List[str]:
+        """Paths that are new or whose mtime/size changed since they were indexed."""
+        known = {row['path']: (row['mtime_ns'], row['size'])
+                 for row in self.conn.execute('SELECT path, mtime_ns, size FROM logs')}
+        stale = []
+        for path in paths:
+            st = os.stat(path)
+            if known.get(path) != (st.st_mtime_ns, st.st_size):
+                stale.append(path)
+        return stale
+
+    def prune(self, root: str, present: Iterable[str]) -> int:
+        """Drop indexed logs under root that no longer exist."""
+        present = set(present)
+        prefix = os.path.join(root, '')
+        gone = [row['path'] for row in self.conn.execute('SELECT path FROM logs')
+                if row['path'].startswith(prefix) and row['path'] not in present]
+        for path in gone:
+            self._delete_log(path)
+        return len(gone)
+
+    def _delete_log(self, path: str):
+        """Delete a log; child rows cascade, and shapes no other log uses are dropped."""
+        row = self.conn.execute('SELECT id FROM logs WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            return
+        shapes = [r[0] for r in self.conn.execute(
+            'SELECT DISTINCT shape_hash FROM queries WHERE log_id = ? AND shape_hash IS NOT NULL', (row['id'],))]
+        self.conn.execute('DELETE FROM logs WHERE id = ?', (row['id'],))
+        self.conn.executemany(
+            'DELETE FROM query_shapes WHERE shape_hash = ? '
+            'AND NOT EXISTS (SELECT 1 FROM queries WHERE shape_hash = ?)',
+            [(shape, shape) for shape in shapes])
+
+    def store(self, record: Dict):
+        """Replace one log and its child rows."""
+        self._delete_log(record['path'])
+        values = [record.get(col) for col in self.LOG_COLUMNS]
+        cursor = self.conn.execute(
+            f"INSERT INTO logs ({', '.join(self.LOG_COLUMNS)}) VALUES ({', '.join('?' * len(values))})",
+            values)
+        log_id = cursor.lastrowid
+        self.conn.executemany('INSERT INTO queries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                              [(log_id,) + row for row in record['queries']])
+        self.conn.executemany('INSERT OR IGNORE INTO query_shapes VALUES (?, ?)', record['shapes'])
+        self.conn.executemany('INSERT INTO dml VALUES (?, ?, ?, ?, ?)',
+                              [(log_id,) + row for row in record['dml']])
+        self.conn.executemany('INSERT INTO exceptions VALUES (?, ?, ?, ?)',
+                              [(log_id,) + row for row in record['exceptions']])
+        self.conn.executemany('INSERT INTO limit_snapshots VALUES (?, ?, ?, ?, ?, ?)',
+                              [(log_id,) + row for row in record['limits']])
+        self.conn.executemany('INSERT INTO methods VALUES (?, ?, ?, ?, ?, ?, ?)',
+                              [(log_id,) + row for row in record['methods']])
+
+    def query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        return self.conn.execute(sql, params).fetchall()
+
+    def query_read_only(self, sql: str) -> List[sqlite3.Row]:
+        """Run user-supplied SQL on a separate read-only connection."""
+        conn = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('PRAGMA query_only = ON')
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+
+
+def discover_logs(directory: str) -> List[str]:
+    """All log files under directory, sorted."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for filename in filenames:
+            if filename.endswith(LOG_EXTENSIONS):
+                found.append(os.path.abspath(os.path.join(dirpath, filename)))
+    return sorted(found)
+
+
+def ingest(index: LogIndex, directory: str, workers: Optional[int] = None,
+           force: bool = False, verbose: bool = True) -> Dict[str, int]:
+    """
+    Parse new/changed logs under directory in a process pool and store them.
+
+    Returns:
+        Counts of discovered, parsed, skipped, failed and removed logs
+    """
+    paths = discover_logs(directory)
+    pending = paths if force else index.stale_paths(paths)
+    stats = {'discovered': len(paths), 'parsed': 0, 'skipped': len(paths) - len(pending),
+             'failed': 0, 'removed': index.prune(os.path.abspath(directory), paths)}
+
+    if pending:
+        workers = workers or min(len(pending), os.cpu_count() or 1)
+        if workers <= 1 or len(pending) < 4:
+            results = map(parse_log_file, pending)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(parse_log_file, pending, chunksize=max(1, len(pending) // (workers * 4)))
+        try:
+            for i, record in enumerate(results, 1):
+                index.store(record)
+                if record.get('parse_error'):
+                    stats['failed'] += 1
+                else:
+                    stats['parsed'] += 1
+                if i % 200 == 0:
+                    index.conn.commit()
+                    if verbose:
+                        print(f"  ... {i}/{len(pending)} logs", file=sys.stderr)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    index.conn.commit()
+    return stats
+
+
+# Canned reports: name -> (description, SQL). "?" is bound to --limit.
+REPORTS = {
+    'top-soql': ("SOQL statements by rows returned", """
+        SELECT q.rows, q.line_number AS line, q.in_loop, q.query, l.path
+        FROM queries q JOIN logs l ON l.id = q.log_id
+        ORDER BY q.rows DESC LIMIT ?"""),
+    'query-shapes': ("Normalized SOQL shapes by executions (N+1 candidates)", """
+        SELECT COUNT(*) AS executions, COUNT(DISTINCT q.log_id) AS logs, SUM(q.rows) AS rows,
+               ROUND(SUM(q.time_ms), 1) AS time_ms, SUM(q.in_loop) AS in_loop,
+               GROUP_CONCAT(DISTINCT q.line_number) AS lines, s.shape
+        FROM queries q JOIN query_shapes s ON s.shape_hash = q.shape_hash
+        GROUP BY q.shape_hash ORDER BY executions DESC LIMIT ?"""),
+    'soql-in-loops': ("SOQL executed inside loops, grouped by line and statement", """
+        SELECT COUNT(*) AS executions, COUNT(DISTINCT q.log_id) AS logs, SUM(q.rows) AS rows,
+               q.line_number AS line, q.query
+        FROM queries q WHERE q.in_loop = 1
+        GROUP BY q.line_number, q.query ORDER BY executions DESC LIMIT ?"""),
+    'top-dml': ("DML statements by rows", """
+        SELECT d.rows, d.operation, d.line_number AS line, d.in_loop, l.path
+        FROM dml d JOIN logs l ON l.id = d.log_id
+        ORDER BY d.rows DESC LIMIT ?"""),
+    'slow-methods': ("Methods by total self time across logs", """
+        SELECT name, SUM(calls) AS calls, ROUND(SUM(self_ns) / 1e6, 2) AS self_ms,
+               ROUND(SUM(inclusive_ns) / 1e6, 2) AS inclusive_ms,
+               SUM(soql_queries) AS soql, SUM(dml_statements) AS dml, COUNT(*) AS logs
+        FROM methods GROUP BY name ORDER BY SUM(self_ns) DESC LIMIT ?"""),
+    'exceptions': ("Exceptions grouped by type and message", """
+        SELECT COUNT(*) AS occurrences, COUNT(DISTINCT log_id) AS logs, type,
+               SUBSTR(message, 1, 120) AS message
+        FROM exceptions GROUP BY type, SUBSTR(message, 1, 120)
+        ORDER BY occurrences DESC LIMIT ?"""),
+    'limits': ("Peak usage per limit across snapshots", """
+        SELECT metric, namespace, MAX(used) AS peak, maximum,
+               ROUND(100.0 * MAX(used) / NULLIF(maximum, 0), 1) AS pct,
+               COUNT(DISTINCT log_id) AS logs
+        FROM limit_snapshots GROUP BY metric, namespace
+        ORDER BY pct DESC LIMIT ?"""),
+    'logs': ("Transactions by CPU time", """
+        SELECT cpu_time, soql_queries AS soql, dml_statements AS dml, dml_rows,
+               critical_issues AS issues, entry_point, path
+        FROM logs ORDER BY cpu_time DESC, soql_queries DESC LIMIT ?"""),
+}
+
+
+def print_rows(rows: List[sqlite3.Row], title: str = ""):
+    """Print query rows as an aligned table."""
+    if title:
+        print(f"\n{Colors.BOLD}{title}{Colors.NC}")
+    if not rows:
+        print("  (no rows)")
+        return
+    columns = rows[0].keys()
+    cells = [[str(row[c]) if row[c] is not None else '' for c in columns] for row in rows]
+    widths = [min(60, max(len(c), *(len(r[i]) for r in cells))) for i, c in enumerate(columns)]
+    print("  " + "  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  " + "  ".join("-" * w for w in widths))
+    for row in cells:
+        print("  " + "  ".join(v[:w].ljust(w) for v, w in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and query a directory of Apex debug logs")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite index file (default: {DEFAULT_DB})")
+    parser.add_argument("--format", choices=["console", "json"], default="console")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = sub.add_parser("ingest", help="Parse new/changed logs into the index")
+    ingest_parser.add_argument("directory", help="Directory of .log files (searched recursively)")
+    ingest_parser.add_argument("--workers", type=int, help="Parser processes (default: CPU count)")
+    ingest_parser.add_argument("--force", action="store_true", help="Re-parse every log")
+
+    for name, (description, _) in REPORTS.items():
+        report_parser = sub.add_parser(name, help=description)
+        report_parser.add_argument("--limit", type=int, default=20, help="Rows to show (default: 20)")
+
+    sql_parser = sub.add_parser("sql", help="Run a read-only SQL query against the index")
+    sql_parser.add_argument("statement")
+
+    args = parser.parse_args()
+    index = LogIndex(args.db)
+    try:
+        if args.command == "ingest":
+            if not os.path.isdir(args.directory):
+                print(f"{Colors.RED}❌ Not a directory: {args.directory}{Colors.NC}")
+                sys.exit(1)
+            stats = ingest(index, args.directory, args.workers, args.force,
+                           verbose=args.format == "console")
+            if args.format == "json":
+                print(json.dumps(stats))
+            else:
+                print(f"{Colors.GREEN}✓{Colors.NC} {stats['discovered']} logs: {stats['parsed']} parsed, "
+                      f"{stats['skipped']} unchanged, {stats['failed']} failed, "
+                      f"{stats['removed']} removed → {args.db}")
+            return
+
+        if args.command == "sql":
+            title, rows = "", index.query_read_only(args.statement)
+        else:
+            title, sql = REPORTS[args.command]
+            rows = index.query(sql, (args.limit,))
+
+        if args.format == "json":
+            print(json.dumps([dict(row) for row in rows], indent=2))
+        else:
+            print_rows(rows, title)
+    except sqlite3.Error as e:
+        print(f"{Colors.RED}❌ SQLite error: {e}{Colors.NC}")
+        sys.exit(1)
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
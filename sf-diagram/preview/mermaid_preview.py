@@ -5,20 +5,31 @@ Mermaid Diagram Preview Server
 A lightweight HTTP server with live reload for previewing Mermaid diagrams.
 Uses Server-Sent Events (SSE) for instant browser refresh on file changes.
 
+One server previews any number of diagram files. Changes are picked up with
+inotify on Linux (polling elsewhere) and broadcast to every connected browser
+tab: each update bumps a version counter and each SSE client tracks the last
+version it has seen, so no client can consume another client's update.
+
 Usage:
     python mermaid_preview.py start --file diagram.mmd    # Start server
+    python mermaid_preview.py start --file other.mmd      # Add a file to the running server
     python mermaid_preview.py stop                         # Stop server
     python mermaid_preview.py status                       # Check if running
 
 Options:
+    --file PATH       Mermaid file to watch, .mmd or .mermaid (repeatable)
     --port PORT       Server port (default: 8765)
     --no-browser      Don't auto-open browser
     --pid-file PATH   PID file location (default: /tmp/mermaid-preview.pid)
+    --watcher MODE    auto, inotify or poll (default: auto)
 
 Examples:
     # Start preview for a diagram file
     python mermaid_preview.py start --file /tmp/my-diagram.mmd
 
+    # Preview two diagrams (http://localhost:8765/ lists them)
+    python mermaid_preview.py start --file erd.mmd --file flow.mmd
+
     # Check server status
     python mermaid_preview.py status
 
@@ -30,28 +41,36 @@ Copyright (c) 2024-2025 Jag Valaiyapathy
 """
 
 import argparse
+import collections
+import ctypes
+import ctypes.util
+import html as html_lib
 import http.server
+import json
 import os
+import re
+import select
 import signal
+import struct
 import sys
 import threading
 import time
+import urllib.request
 import webbrowser
-from pathlib import Path
-from typing import Optional, Set
-from urllib.parse import urlparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 
 # Default configuration
+DEFAULT_HOST = "127.0.0.1"  # never reachable from other machines
 DEFAULT_PORT = 8765
 DEFAULT_PID_FILE = "/tmp/mermaid-preview.pid"
 DEFAULT_WATCHED_FILE = "/tmp/mermaid-preview.mmd"
-POLL_INTERVAL = 0.5  # seconds
-
-# Global state for file watching
-_watched_file: Optional[str] = None
-_last_mtime: float = 0
-_sse_clients: Set = set()
-_file_changed_event = threading.Event()
+POLL_INTERVAL = 0.5  # seconds (polling watcher)
+RESCAN_INTERVAL = 5.0  # seconds (inotify watcher safety net)
+KEEPALIVE_INTERVAL = 15.0  # seconds between SSE keepalive comments
+EVENT_HISTORY = 256  # updates kept for clients reconnecting with Last-Event-ID
+DIAGRAM_EXTENSIONS = (".mmd", ".mermaid")  # the only files the server will read
 
 # HTML template with SSE live reload
 HTML_TEMPLATE = """<!DOCTYPE html>
@@ -193,7 +212,7 @@ HTML_TEMPLATE = """<!DOCTYPE html>
       </div>
     </header>
 
-    <p class="file-info">Watching: <code id="filePath">{{FILE_PATH}}</code></p>
+    <p class="file-info">Watching: <code id="filePath">{{FILE_PATH}}</code>{{NAV}}</p>
 
     <div class="diagram-container">
       <pre class="mermaid" id="diagram">{{MERMAID_CODE}}</pre>
@@ -242,9 +261,14 @@ HTML_TEMPLATE = """<!DOCTYPE html>
       securityLevel: 'loose'
     });
 
-    // SSE for live reload
+    // SSE for live reload. The browser reconnects on its own and sends
+    // Last-Event-ID; only a closed stream needs a new EventSource, which
+    // passes the last id as ?last= so missed updates are still delivered.
+    let lastEventId = '';
+
     function connectSSE() {
-      const events = new EventSource('/events');
+      const last = lastEventId ? '&last=' + encodeURIComponent(lastEventId) : '';
+      const events = new EventSource('/events?file={{FILE_ID}}' + last);
 
       events.onopen = () => {
         document.getElementById('statusDot').classList.remove('disconnected');
@@ -252,6 +276,7 @@ HTML_TEMPLATE = """<!DOCTYPE html>
       };
 
       events.onmessage = (e) => {
+        if (e.lastEventId) lastEventId = e.lastEventId;
         if (e.data === 'reload') {
           showToast('File changed, reloading...');
           setTimeout(() => location.reload(), 300);
@@ -261,8 +286,10 @@ HTML_TEMPLATE = """<!DOCTYPE html>
       events.onerror = () => {
         document.getElementById('statusDot').classList.add('disconnected');
         document.getElementById('statusText').textContent = 'Disconnected';
-        // Attempt to reconnect after 3 seconds
-        setTimeout(connectSSE, 3000);
+        // Still CONNECTING: the browser retries by itself
+        if (events.readyState === EventSource.CLOSED) {
+          setTimeout(connectSSE, 3000);
+        }
       };
     }
 
@@ -311,6 +338,261 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 """
 
 
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <title>Mermaid Preview - sf-diagram</title>
+  <style>
+    body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; padding: 1.5rem; }
+    @media (prefers-color-scheme: dark) { body { background: #0f172a; color: #f1f5f9; } a { color: #60a5fa; } }
+    li { margin: 0.5rem 0; }
+    code { opacity: 0.7; font-size: 0.875rem; }
+  </style>
+</head>
+<body>
+  <h1>Mermaid Preview</h1>
+  <ul>{{ITEMS}}</ul>
+  <script>
+    // Reload when diagrams are added or change
+    const events = new EventSource('/events');
+    events.onmessage = (e) => { if (e.data === 'reload') location.reload(); };
+  </script>
+</body>
+</html>
+"""
+
+
+# =============================================================================
+# Watched files and update broadcast
+# =============================================================================
+
+class Broadcaster:
+    """
+    Fan-out of file updates to every SSE client.
+
+    Each publish bumps a global version; clients wait for a version newer than
+    the last one they saw, so every client sees every update (nothing is
+    consumed). Recent updates are kept so a reconnecting client can catch up.
+    """
+
+    def __init__(self, history: int = EVENT_HISTORY):
+        self._condition = threading.Condition()
+        self._events = collections.deque(maxlen=history)  # (version, diagram id)
+        self.version = 0
+
+    def publish(self, diagram_id: str):
+        with self._condition:
+            self.version += 1
+            self._events.append((self.version, diagram_id))
+            self._condition.notify_all()
+
+    def wait(self, after: int, timeout: float) -> Tuple[List[Tuple[int, str]], bool]:
+        """
+        Updates newer than version `after` (blocks up to timeout).
+
+        Returns:
+            (updates, missed) where missed means older updates were already
+            dropped from the history
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.version > after, timeout)
+            updates = [event for event in self._events if event[0] > after]
+            missed = bool(updates) and updates[0][0] > after + 1
+            return updates, missed
+
+
+@dataclass
+class Diagram:
+    """One watched Mermaid file."""
+    id: str
+    path: str
+    state: Optional[Tuple[int, int]]  # (mtime_ns, size), None when missing
+    version: int = 0
+
+
+def _file_state(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DiagramRegistry:
+    """Watched files by id, publishing to a Broadcaster when one changes."""
+
+    def __init__(self, broadcaster: Broadcaster):
+        self.broadcaster = broadcaster
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, Diagram] = {}
+        self._by_path: Dict[str, Diagram] = {}
+        self.on_add = None  # callback(diagram) used by the watcher
+
+    def add(self, path: str) -> Diagram:
+        """Watch a file (idempotent); the id is a URL-safe form of its name."""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path in self._by_path:
+                return self._by_path[path]
+            base = re.sub(r"[^A-Za-z0-9_-]+", "-", os.path.splitext(os.path.basename(path))[0]).strip("-")
+            diagram_id, n = base or "diagram", 2
+            while diagram_id in self._by_id:
+                diagram_id, n = f"{base or 'diagram'}-{n}", n + 1
+            diagram = Diagram(diagram_id, path, _file_state(path))
+            self._by_id[diagram_id] = diagram
+            self._by_path[path] = diagram
+        if self.on_add:
+            self.on_add(diagram)
+        self.broadcaster.publish(diagram.id)
+        return diagram
+
+    def get(self, diagram_id: str) -> Optional[Diagram]:
+        with self._lock:
+            return self._by_id.get(diagram_id)
+
+    def all(self) -> List[Diagram]:
+        with self._lock:
+            return list(self._by_id.values())
+
+    def check(self, path: Optional[str] = None):
+        """Re-stat one file (or all) and publish the ones that changed."""
+        with self._lock:
+            if path is None:
+                diagrams = list(self._by_id.values())
+            else:
+                diagram = self._by_path.get(os.path.abspath(path))
+                diagrams = [diagram] if diagram else []
+            changed = []
+            for diagram in diagrams:
+                state = _file_state(diagram.path)
+                if state != diagram.state:
+                    diagram.state = state
+                    diagram.version += 1
+                    changed.append(diagram.id)
+        for diagram_id in changed:
+            self.broadcaster.publish(diagram_id)
+
+
+# =============================================================================
+# File watchers
+# =============================================================================
+
+class PollingWatcher:
+    """Re-stats every watched file each POLL_INTERVAL (portable fallback)."""
+
+    name = "poll"
+
+    def __init__(self, registry: DiagramRegistry):
+        self.registry = registry
+
+    def run(self):
+        while True:
+            self.registry.check()
+            time.sleep(POLL_INTERVAL)
+
+
+class InotifyWatcher:
+    """
+    Linux inotify watcher (via libc, no dependencies).
+
+    Watches the directories containing the files rather than the files
+    themselves, so editors that save by writing a temp file and renaming it
+    over the original are still seen. A slow full re-stat runs as a safety
+    net (e.g. if a watched directory is removed and recreated).
+    """
+
+    name = "inotify"
+
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+    def __init__(self, registry: DiagramRegistry):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.registry = registry
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._lock = threading.Lock()
+        self._dirs: Dict[int, str] = {}  # watch descriptor -> directory
+        for diagram in registry.all():
+            self.watch(diagram)
+        registry.on_add = self.watch
+
+    def watch(self, diagram: Diagram):
+        directory = os.path.dirname(diagram.path)
+        with self._lock:
+            if directory in self._dirs.values():
+                return
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = directory
+
+    def run(self):
+        while True:
+            readable, _, _ = select.select([self._fd], [], [], RESCAN_INTERVAL)
+            if not readable:
+                self.registry.check()
+                continue
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            offset = 0
+            while offset + self.EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    self.registry.check()
+                    continue
+                with self._lock:
+                    directory = self._dirs.get(wd)
+                if directory and name:
+                    self.registry.check(os.path.join(directory, os.fsdecode(name)))
+
+
+def create_watcher(registry: DiagramRegistry, mode: str = "auto"):
+    """inotify when available (or requested), else polling."""
+    if mode in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(registry)
+        except (OSError, AttributeError) as e:
+            if mode == "inotify":
+                raise
+            print(f"inotify unavailable ({e}); polling every {POLL_INTERVAL}s", file=sys.stderr)
+    return PollingWatcher(registry)
+
+
+def is_diagram_file(path) -> bool:
+    """True for a path with a Mermaid extension (.mmd / .mermaid)."""
+    return isinstance(path, str) and path.lower().endswith(DIAGRAM_EXTENSIONS)
+
+
+# =============================================================================
+# HTTP server
+# =============================================================================
+
+class PreviewServer(http.server.ThreadingHTTPServer):
+    """Threaded server (one thread per SSE client) holding the diagram registry."""
+
+    daemon_threads = True
+
+    def __init__(self, address, handler, registry: DiagramRegistry, on_change=None):
+        super().__init__(address, handler)
+        self.registry = registry
+        self.on_change = on_change  # called after a diagram is added over HTTP
+
+
 class MermaidPreviewHandler(http.server.BaseHTTPRequestHandler):
     """HTTP request handler for Mermaid preview server."""
 
@@ -320,50 +602,141 @@ class MermaidPreviewHandler(http.server.BaseHTTPRequestHandler):
 
     def do_GET(self):
         """Handle GET requests."""
-        path = urlparse(self.path).path
+        url = urlparse(self.path)
+        path = url.path
+        diagrams = self.server.registry.all()
 
         if path == "/" or path == "/index.html":
-            self._serve_html()
+            if len(diagrams) == 1:
+                self._serve_html(diagrams[0])
+            else:
+                self._serve_index(diagrams)
+        elif path.startswith("/view/"):
+            diagram = self.server.registry.get(path[len("/view/"):])
+            if diagram:
+                self._serve_html(diagram)
+            else:
+                self.send_error(404, "Unknown diagram")
         elif path == "/events":
-            self._serve_sse()
+            query = parse_qs(url.query)
+            self._serve_sse(query.get("file", [""])[0] or None, query.get("last", [""])[0])
+        elif path == "/api/files":
+            self._send_json([{"id": d.id, "path": d.path, "version": d.version, "url": f"/view/{d.id}"}
+                             for d in diagrams])
         else:
             self.send_error(404, "Not Found")
 
-    def _serve_html(self):
-        """Serve the HTML page with the Mermaid diagram."""
-        global _watched_file
+    def do_POST(self):
+        """
+        Handle POST /api/watch {"file": path}.
 
+        Only the CLI may call this: requests must come from this machine as
+        application/json (which a page cannot send cross-origin without a
+        preflight) and carry no Origin other than the server's own, so a web
+        page open in the browser cannot make the server read arbitrary files.
+        """
+        if urlparse(self.path).path != "/api/watch":
+            self.send_error(404, "Not Found")
+            return
+        if self.client_address[0] not in ("127.0.0.1", "::1", "::ffff:127.0.0.1"):
+            self.send_error(403, "Files can only be added from this machine")
+            return
+        origin = self.headers.get("Origin")
+        if origin is not None and origin not in self._own_origins():
+            self.send_error(403, "Cross-origin requests are not allowed")
+            return
+        if self.headers.get_content_type() != "application/json":
+            self.send_error(415, "Expected Content-Type: application/json")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            file_path = body["file"]
+        except (ValueError, KeyError, TypeError):
+            self.send_error(400, 'Expected JSON {"file": "/path/to/diagram.mmd"}')
+            return
+        if not is_diagram_file(file_path):
+            self.send_error(400, f"Only {' / '.join(DIAGRAM_EXTENSIONS)} files can be previewed")
+            return
+        diagram = self.server.registry.add(file_path)
+        if self.server.on_change:
+            self.server.on_change()
+        self._send_json({"id": diagram.id, "path": diagram.path, "url": f"/view/{diagram.id}"})
+
+    def _own_origins(self) -> Tuple[str, ...]:
+        port = self.server.server_address[1]
+        return tuple(f"http://{host}:{port}" for host in ("localhost", "127.0.0.1", "[::1]"))
+
+    def _send_json(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _serve_index(self, diagrams: List[Diagram]):
+        """List the watched diagrams."""
+        items = "".join(
+            f'<li><a href="/view/{d.id}">{html_lib.escape(os.path.basename(d.path))}</a> '
+            f"<code>{html_lib.escape(d.path)}</code></li>"
+            for d in diagrams
+        ) or "<li>No files watched. Start with --file.</li>"
+        self._send_html(INDEX_TEMPLATE.replace("{{ITEMS}}", items))
+
+    def _serve_html(self, diagram: Diagram):
+        """Serve the HTML page with the Mermaid diagram."""
         # Read the mermaid file
         mermaid_code = ""
-        if _watched_file and os.path.exists(_watched_file):
+        if os.path.exists(diagram.path):
             try:
-                with open(_watched_file, "r") as f:
+                with open(diagram.path, "r") as f:
                     mermaid_code = f.read().strip()
             except Exception as e:
                 mermaid_code = f"flowchart TB\n    Error[Error reading file: {e}]"
         else:
-            mermaid_code = "flowchart TB\n    A[No file specified]\n    A --> B[Use --file option]"
+            mermaid_code = "flowchart TB\n    A[File not found]\n    A --> B[Save the diagram to reload]"
 
         # Escape for JavaScript string
         mermaid_escaped = mermaid_code.replace("\\", "\\\\").replace("`", "\\`").replace("$", "\\$")
+        nav = ' &middot; <a href="/">All diagrams</a>' if len(self.server.registry.all()) > 1 else ""
 
         # Generate HTML
         html = HTML_TEMPLATE
-        html = html.replace("{{FILE_PATH}}", _watched_file or "No file")
+        html = html.replace("{{FILE_PATH}}", diagram.path)
+        html = html.replace("{{FILE_ID}}", diagram.id)
+        html = html.replace("{{NAV}}", nav)
         html = html.replace("{{MERMAID_CODE}}", mermaid_code)
         html = html.replace("{{MERMAID_CODE_ESCAPED}}", mermaid_escaped)
         html = html.replace("{{PORT}}", str(self.server.server_address[1]))
+        self._send_html(html)
 
-        # Send response
+    def _send_html(self, html: str):
         self.send_response(200)
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.send_header("Content-Length", len(html.encode()))
         self.end_headers()
         self.wfile.write(html.encode())
 
-    def _serve_sse(self):
-        """Serve Server-Sent Events for live reload."""
-        global _file_changed_event
+    def _serve_sse(self, diagram_id: Optional[str], last_event_id: str = ""):
+        """
+        Serve Server-Sent Events for live reload.
+
+        Sends `reload` for updates to diagram_id (any diagram when None). Each
+        event carries the broadcast version as its id, so a browser that
+        reconnects (Last-Event-ID header, or ?last= from a page that had to
+        open a new EventSource) receives what it missed. An id newer than the
+        current version comes from before a server restart: the history is
+        gone, so the client is told to reload and resumes from now.
+        """
+        broadcaster = self.server.registry.broadcaster
+        try:
+            last_seen = int(self.headers.get("Last-Event-ID") or last_event_id)
+        except ValueError:
+            last_seen = broadcaster.version
+        restarted = last_seen > broadcaster.version
+        if restarted:
+            last_seen = broadcaster.version
 
         self.send_response(200)
         self.send_header("Content-Type", "text/event-stream")
@@ -372,75 +745,65 @@ class MermaidPreviewHandler(http.server.BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
 
-        # Send initial connection event
-        self.wfile.write(b"data: connected\n\n")
+        # Send initial connection event (and the browser's reconnect delay)
+        self.wfile.write(b"retry: 3000\ndata: connected\n\n")
+        if restarted:
+            self.wfile.write(f"id: {last_seen}\ndata: reload\n\n".encode())
         self.wfile.flush()
 
         # Keep connection open and send reload events
         try:
             while True:
-                # Wait for file change event or timeout
-                changed = _file_changed_event.wait(timeout=POLL_INTERVAL)
-                if changed:
-                    _file_changed_event.clear()
-                    self.wfile.write(b"data: reload\n\n")
-                    self.wfile.flush()
-                else:
+                updates, missed = broadcaster.wait(last_seen, KEEPALIVE_INTERVAL)
+                if not updates:
                     # Send keepalive comment
                     self.wfile.write(b": keepalive\n\n")
                     self.wfile.flush()
+                    continue
+                last_seen = updates[-1][0]
+                if missed or diagram_id is None or any(d_id == diagram_id for _, d_id in updates):
+                    self.wfile.write(f"id: {last_seen}\ndata: reload\n\n".encode())
+                    self.wfile.flush()
         except (BrokenPipeError, ConnectionResetError):
             pass  # Client disconnected
 
 
-def file_watcher():
-    """Background thread that watches the file for changes."""
-    global _watched_file, _last_mtime, _file_changed_event
-
-    while True:
-        try:
-            if _watched_file and os.path.exists(_watched_file):
-                current_mtime = os.path.getmtime(_watched_file)
-                if current_mtime > _last_mtime:
-                    _last_mtime = current_mtime
-                    _file_changed_event.set()
-        except Exception:
-            pass
-
-        time.sleep(POLL_INTERVAL)
+def write_info_file(pid_file: str, port: int, registry: DiagramRegistry, watcher_name: str):
+    """Record PID, port, watcher and watched files for `status`."""
+    try:
+        with open(f"{pid_file}.info", "w") as f:
+            f.write(f"PID: {os.getpid()}\nPort: {port}\nWatcher: {watcher_name}\n")
+            for diagram in registry.all():
+                f.write(f"File: {diagram.path}\n")
+    except OSError:
+        pass
 
 
-def run_server_foreground(file_path: str, port: int, pid_file: str):
+def run_server_foreground(file_paths: List[str], port: int, pid_file: str, watcher_mode: str = "auto"):
     """Run server in foreground (called by daemon subprocess)."""
-    global _watched_file, _last_mtime
-
-    _watched_file = file_path
-    _last_mtime = os.path.getmtime(_watched_file) if os.path.exists(_watched_file) else 0
+    registry = DiagramRegistry(Broadcaster())
+    for file_path in file_paths:
+        registry.add(file_path)
+    watcher = create_watcher(registry, watcher_mode)
 
     # Write PID file
     with open(pid_file, "w") as f:
         f.write(str(os.getpid()))
-
-    # Write info file
-    try:
-        with open(f"{pid_file}.info", "w") as f:
-            f.write(f"PID: {os.getpid()}\nPort: {port}\nFile: {_watched_file}\n")
-    except:
-        pass
+    write_info_file(pid_file, port, registry, watcher.name)
 
     # Ignore SIGHUP so we survive terminal close
     signal.signal(signal.SIGHUP, signal.SIG_IGN)
 
     # Start file watcher thread
-    watcher_thread = threading.Thread(target=file_watcher, daemon=True)
+    watcher_thread = threading.Thread(target=watcher.run, daemon=True)
     watcher_thread.start()
 
     # Start HTTP server
-    server = http.server.HTTPServer(("", port), MermaidPreviewHandler)
+    server = PreviewServer((DEFAULT_HOST, port), MermaidPreviewHandler, registry,
+                           on_change=lambda: write_info_file(pid_file, port, registry, watcher.name))
 
     # Handle graceful shutdown
     def shutdown_handler(signum, frame):
-        server.shutdown()
         if os.path.exists(pid_file):
             os.remove(pid_file)
         if os.path.exists(f"{pid_file}.info"):
@@ -461,11 +824,62 @@ def run_server_foreground(file_path: str, port: int, pid_file: str):
             os.remove(f"{pid_file}.info")
 
 
-def start_server(file_path: str, port: int, no_browser: bool, pid_file: str):
+def _ensure_file(abs_file_path: str):
+    """Create a starter diagram if the file doesn't exist."""
+    if not os.path.exists(abs_file_path):
+        os.makedirs(os.path.dirname(abs_file_path), exist_ok=True)
+        with open(abs_file_path, "w") as f:
+            f.write("flowchart TB\n    A[Edit this file]\n    A --> B[Browser will reload]")
+
+
+def _running_port(pid_file: str, default: int) -> int:
+    try:
+        with open(f"{pid_file}.info", "r") as f:
+            for line in f:
+                if line.startswith("Port:"):
+                    return int(line.split(":")[1].strip())
+    except (OSError, ValueError):
+        pass
+    return default
+
+
+def add_to_running_server(file_paths: List[str], port: int, no_browser: bool):
+    """Ask a running server to watch more files."""
+    for abs_file_path in file_paths:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}/api/watch",
+            data=json.dumps({"file": abs_file_path}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                added = json.loads(response.read())
+        except OSError as e:
+            print(f"Could not add {abs_file_path} to the running server: {e}")
+            print(f"Use 'python {sys.argv[0]} stop' and start again")
+            sys.exit(1)
+        url = f"http://localhost:{port}{added['url']}"
+        print(f"Added to running server: {added['path']}")
+        print(f"  URL:     {url}")
+        if not no_browser:
+            webbrowser.open(url)
+
+
+def start_server(file_paths: List[str], port: int, no_browser: bool, pid_file: str, watcher_mode: str = "auto"):
     """Start the preview server as a detached background process."""
     import subprocess
 
-    # Check if already running
+    # Resolve file paths (create missing ones)
+    abs_file_paths = [os.path.abspath(file_path) for file_path in file_paths]
+    rejected = [path for path in abs_file_paths if not is_diagram_file(path)]
+    if rejected:
+        print(f"Not a Mermaid file ({' / '.join(DIAGRAM_EXTENSIONS)}): {', '.join(rejected)}")
+        sys.exit(1)
+    for abs_file_path in abs_file_paths:
+        _ensure_file(abs_file_path)
+
+    # Already running: hand the files to that server
     if os.path.exists(pid_file):
         try:
             with open(pid_file, "r") as f:
@@ -473,33 +887,26 @@ def start_server(file_path: str, port: int, no_browser: bool, pid_file: str):
             # Check if process is still running
             os.kill(old_pid, 0)
             print(f"Server already running (PID: {old_pid})")
-            print(f"Use 'python {sys.argv[0]} stop' to stop it first")
-            sys.exit(1)
+            add_to_running_server(abs_file_paths, _running_port(pid_file, port), no_browser)
+            return
         except (ProcessLookupError, ValueError):
             # Process not running, clean up stale PID file
             os.remove(pid_file)
             if os.path.exists(f"{pid_file}.info"):
                 os.remove(f"{pid_file}.info")
 
-    # Resolve file path
-    abs_file_path = os.path.abspath(file_path)
-
-    # Create file if it doesn't exist
-    if not os.path.exists(abs_file_path):
-        os.makedirs(os.path.dirname(abs_file_path), exist_ok=True)
-        with open(abs_file_path, "w") as f:
-            f.write("flowchart TB\n    A[Edit this file]\n    A --> B[Browser will reload]")
-
     # Launch server as completely detached subprocess
     script_path = os.path.abspath(__file__)
     cmd = [
         sys.executable,
         script_path,
         "_run",  # Internal command
-        "--file", abs_file_path,
         "--port", str(port),
         "--pid-file", pid_file,
+        "--watcher", watcher_mode,
     ]
+    for abs_file_path in abs_file_paths:
+        cmd += ["--file", abs_file_path]
 
     # Use nohup-like approach: redirect all IO to /dev/null, start new session
     with open("/dev/null", "r") as devnull_in, \
@@ -522,7 +929,8 @@ def start_server(file_path: str, port: int, no_browser: bool, pid_file: str):
             daemon_pid = f.read().strip()
         print(f"Mermaid Preview Server started!")
         print(f"  URL:     http://localhost:{port}")
-        print(f"  File:    {abs_file_path}")
+        for abs_file_path in abs_file_paths:
+            print(f"  File:    {abs_file_path}")
         print(f"  PID:     {daemon_pid}")
         print()
         print(f"Stop with: python {sys.argv[0]} stop")
@@ -585,6 +993,8 @@ def server_status(pid_file: str):
                     elif line.startswith("File:"):
                         file_path = line.split(":", 1)[1].strip()
                         print(f"  File: {file_path}")
+                    elif line.startswith("Watcher:"):
+                        print(f"  Watcher: {line.split(':', 1)[1].strip()}")
         else:
             print(f"  URL: http://localhost:{DEFAULT_PORT}")
 
@@ -605,6 +1015,8 @@ def main():
         epilog="""
 Examples:
   Start server:    python mermaid_preview.py start --file diagram.mmd
+  Several files:   python mermaid_preview.py start -f erd.mmd -f sequence.mmd
+  Add to running:  python mermaid_preview.py start --file another.mmd
   Stop server:     python mermaid_preview.py stop
   Check status:    python mermaid_preview.py status
         """,
@@ -615,11 +1027,16 @@ Examples:
     # Start command
     start_parser = subparsers.add_parser("start", help="Start the preview server")
     start_parser.add_argument(
-        "--file", "-f", default=DEFAULT_WATCHED_FILE, help=f"Mermaid file to watch (default: {DEFAULT_WATCHED_FILE})"
+        "--file", "-f", action="append",
+        help=f"Mermaid file (.mmd / .mermaid) to watch; repeat for several (default: {DEFAULT_WATCHED_FILE})",
     )
     start_parser.add_argument("--port", "-p", type=int, default=DEFAULT_PORT, help=f"Server port (default: {DEFAULT_PORT})")
     start_parser.add_argument("--no-browser", action="store_true", help="Don't auto-open browser")
     start_parser.add_argument("--pid-file", default=DEFAULT_PID_FILE, help=f"PID file location (default: {DEFAULT_PID_FILE})")
+    start_parser.add_argument(
+        "--watcher", choices=("auto", "inotify", "poll"), default="auto",
+        help="File change detection: inotify (Linux), poll, or auto (default)",
+    )
 
     # Stop command
     stop_parser = subparsers.add_parser("stop", help="Stop the preview server")
@@ -631,21 +1048,22 @@ Examples:
 
     # Internal run command (used by start to spawn daemon)
     run_parser = subparsers.add_parser("_run", help=argparse.SUPPRESS)
-    run_parser.add_argument("--file", "-f", required=True)
+    run_parser.add_argument("--file", "-f", action="append", required=True)
     run_parser.add_argument("--port", "-p", type=int, required=True)
     run_parser.add_argument("--pid-file", required=True)
+    run_parser.add_argument("--watcher", default="auto")
 
     args = parser.parse_args()
 
     if args.command == "start":
-        start_server(args.file, args.port, args.no_browser, args.pid_file)
+        start_server(args.file or [DEFAULT_WATCHED_FILE], args.port, args.no_browser, args.pid_file, args.watcher)
     elif args.command == "stop":
         stop_server(args.pid_file)
     elif args.command == "status":
         server_status(args.pid_file)
     elif args.command == "_run":
         # Internal: run server in foreground (called by start as detached process)
-        run_server_foreground(args.file, args.port, args.pid_file)
+        run_server_foreground(args.file, args.port, args.pid_file, args.watcher)
     else:
         parser.print_help()
         sys.exit(1)
@@ -11,6 +11,16 @@ Usage:
     python3 query-org-metadata.py --objects Account,Contact,Invoice__c --target-org myorg
     python3 query-org-metadata.py --objects Account,Contact --target-org myorg --output table
     python3 query-org-metadata.py --objects Account --target-org myorg --output json
+    python3 query-org-metadata.py --objects-file erd-objects.txt --target-org myorg --workers 8
+
+Fetching:
+    Labels, key prefixes and OWD for all objects come from one Tooling API
+    EntityDefinition query per 200 objects. Record counts are batched 25
+    COUNT() queries per Composite batch request. Batches run concurrently on
+    a bounded worker pool, and rate-limit/transient errors are retried with
+    a backoff shared by all workers. Per-object sf CLI calls are only used as
+    a fallback (older CLI without `sf api request`, objects missing from
+    EntityDefinition).
 
 Output:
     JSON or table with object metadata for diagram generation
@@ -18,34 +28,130 @@ Output:
 
 import subprocess
 import json
+import os
 import sys
+import time
+import random
 import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+from urllib.parse import quote
+
+# Shared org snapshot cache (../../shared relative to sf-diagram/scripts)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(SCRIPT_DIR)), "shared")
+sys.path.insert(0, SHARED_DIR)
+
+try:
+    from org_snapshot import FixtureSource, OrgSnapshot, OrgSnapshotStore
+    SNAPSHOT_AVAILABLE = True
+except ImportError:
+    SNAPSHOT_AVAILABLE = False
 
 LDV_THRESHOLD = 2_000_000  # 2 million records
 
 
+DEFAULT_API_VERSION = "60.0"
+DEFAULT_WORKERS = 6
+COMPOSITE_BATCH_SIZE = 25       # Composite batch subrequest limit
+ENTITY_QUERY_CHUNK = 200        # objects per EntityDefinition IN (...) clause
+
+# Errors worth retrying: concurrency limits, transient server/network failures
+RATE_LIMIT_ERRORS = ("REQUEST_LIMIT_EXCEEDED", "ConcurrentPerOrgLongTxn", "ConcurrentRequests",
+                     "Too Many Requests")
+TRANSIENT_ERRORS = ("SERVER_UNAVAILABLE", "Service Unavailable", "QUERY_TIMEOUT",
+                    "ECONNRESET", "ETIMEDOUT", "socket hang up")
+# ...except the daily API quota, which no amount of waiting within a run fixes
+FATAL_ERRORS = ("TotalRequests Limit exceeded",)
+
+
+class SfCommandRunner:
+    """
+    Runs sf CLI commands with retries.
+
+    Retryable failures back off exponentially with jitter; a rate-limit
+    response also pauses every other worker sharing this runner until the
+    backoff has elapsed, so a burst of concurrent calls does not keep
+    hitting the limit.
+    """
+
+    def __init__(self, retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.calls = 0
+        self.retried = 0
+        self._pause_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_for_pause(self):
+        while True:
+            with self._lock:
+                delay = self._pause_until - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _backoff(self, attempt: int, shared: bool):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt)) + random.uniform(0, self.base_delay / 2)
+        if shared:
+            with self._lock:
+                self._pause_until = max(self._pause_until, time.monotonic() + delay)
+            self._wait_for_pause()
+        else:
+            time.sleep(delay)
+
+    @staticmethod
+    def _classify(text: str) -> str:
+        """'fatal', 'rate_limit', 'transient' or 'error' for a failed call's output."""
+        if any(marker in text for marker in FATAL_ERRORS):
+            return "fatal"
+        if any(marker in text for marker in RATE_LIMIT_ERRORS):
+            return "rate_limit"
+        if any(marker in text for marker in TRANSIENT_ERRORS):
+            return "transient"
+        return "error"
+
+    def run(self, cmd: list[str], timeout: int = 30) -> Optional[dict]:
+        """Run a command; return parsed stdout on success, None on failure."""
+        for attempt in range(self.retries + 1):
+            self._wait_for_pause()
+            with self._lock:
+                self.calls += 1
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                kind, output = "transient", ""
+            except OSError:
+                return None  # sf not installed
+            else:
+                if result.returncode == 0:
+                    try:
+                        return json.loads(result.stdout)
+                    except json.JSONDecodeError:
+                        return None
+                output = result.stdout + result.stderr
+                kind = self._classify(output)
+
+            if kind in ("fatal", "error") or attempt == self.retries:
+                return None
+            with self._lock:
+                self.retried += 1
+            self._backoff(attempt, shared=kind == "rate_limit")
+        return None
+
+
+_default_runner = SfCommandRunner()
+
+
 def run_sf_command(cmd: list[str], timeout: int = 30) -> Optional[dict]:
     """Run an sf CLI command and return parsed JSON result."""
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-    except subprocess.TimeoutExpired:
-        pass
-    except json.JSONDecodeError:
-        pass
-    except Exception:
-        pass
-    return None
-
-
-def query_record_count(sobject: str, target_org: str) -> int:
+    return _default_runner.run(cmd, timeout)
+
+
+def query_record_count(sobject: str, target_org: str, runner: Optional[SfCommandRunner] = None) -> int:
     """Query record count using sf data query."""
     # External objects don't support COUNT()
     if sobject.endswith("__x"):
@@ -58,13 +164,13 @@ def query_record_count(sobject: str, target_org: str) -> int:
         "--json"
     ]
 
-    data = run_sf_command(cmd)
+    data = (runner or _default_runner).run(cmd)
     if data:
         return data.get("result", {}).get("totalSize", -1)
     return -1
 
 
-def query_object_describe(sobject: str, target_org: str) -> dict:
+def query_object_describe(sobject: str, target_org: str, runner: Optional[SfCommandRunner] = None) -> dict:
     """Get object metadata (label, custom flag) via sobject describe."""
     cmd = [
         "sf", "sobject", "describe",
@@ -73,7 +179,7 @@ def query_object_describe(sobject: str, target_org: str) -> dict:
         "--json"
     ]
 
-    data = run_sf_command(cmd)
+    data = (runner or _default_runner).run(cmd)
     if data:
         result_data = data.get("result", {})
         return {
@@ -84,38 +190,198 @@ def query_object_describe(sobject: str, target_org: str) -> dict:
     return {}
 
 
-def query_owd_bulk(objects: list[str], target_org: str) -> dict[str, dict]:
-    """
-    Query OWD for multiple objects using Tooling API EntityDefinition.
+FIELD_ATTRIBUTES = ("name", "label", "type", "referenceTo", "relationshipName", "nillable",
+                    "length", "custom", "calculated", "externalId", "unique")
 
-    This is the correct way to get OWD - sf sobject describe returns null
-    for sharingModel, but EntityDefinition via Tooling API works.
-    """
-    # Build IN clause for SOQL
-    quoted_objects = ", ".join([f"'{obj}'" for obj in objects])
-    query = f"SELECT QualifiedApiName, InternalSharingModel, ExternalSharingModel FROM EntityDefinition WHERE QualifiedApiName IN ({quoted_objects})"
 
+def query_object_fields(sobject: str, target_org: str, runner: Optional[SfCommandRunner] = None) -> list[dict]:
+    """Field metadata from sobject describe, trimmed to the attributes diagrams and analyzers use."""
     cmd = [
-        "sf", "data", "query",
-        "--query", query,
+        "sf", "sobject", "describe",
+        "--sobject", sobject,
         "--target-org", target_org,
-        "--use-tooling-api",
         "--json"
     ]
 
-    data = run_sf_command(cmd, timeout=60)
-    result = {}
+    data = (runner or _default_runner).run(cmd)
+    if not data:
+        return []
+    return [{attr: field.get(attr) for attr in FIELD_ATTRIBUTES}
+            for field in data.get("result", {}).get("fields", [])]
 
-    if data:
-        records = data.get("result", {}).get("records", [])
-        for record in records:
-            api_name = record.get("QualifiedApiName", "")
-            result[api_name] = {
-                "internal_owd": record.get("InternalSharingModel", "Unknown"),
-                "external_owd": record.get("ExternalSharingModel", "Unknown"),
-            }
 
-    return result
+def query_owd_bulk(objects: list[str], target_org: str) -> dict[str, dict]:
+    """
+    Query OWD for multiple objects using Tooling API EntityDefinition.
+
+    This is the correct way to get OWD - sf sobject describe returns null
+    for sharingModel, but EntityDefinition via Tooling API works.
+    """
+    return OrgMetadataFetcher(target_org).entity_definitions(objects)
+
+
+class OrgMetadataFetcher:
+    """Fetches counts, labels and OWD for many objects with batching and a worker pool."""
+
+    def __init__(self, target_org: str, workers: int = DEFAULT_WORKERS,
+                 runner: Optional[SfCommandRunner] = None, progress: bool = False):
+        self.target_org = target_org
+        self.workers = max(1, workers)
+        self.runner = runner or _default_runner
+        self.progress = progress
+        self.composite_supported = True
+
+    def _log(self, message: str, end: str = "\n"):
+        if self.progress:
+            print(message, end=end, flush=True)
+
+    def _map(self, fn, items: list) -> list:
+        if len(items) <= 1 or self.workers == 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+    def api_version(self) -> str:
+        data = self.runner.run(["sf", "org", "display", "--target-org", self.target_org, "--json"])
+        version = (data or {}).get("result", {}).get("apiVersion")
+        return str(version) if version else DEFAULT_API_VERSION
+
+    def entity_definitions(self, objects: list[str]) -> dict[str, dict]:
+        """Label, key prefix and OWD per object from Tooling API EntityDefinition."""
+        def fetch(chunk: list[str]) -> list[dict]:
+            quoted = ", ".join(f"'{obj}'" for obj in chunk)
+            query = ("SELECT QualifiedApiName, Label, KeyPrefix, InternalSharingModel, ExternalSharingModel "
+                     f"FROM EntityDefinition WHERE QualifiedApiName IN ({quoted})")
+            data = self.runner.run(["sf", "data", "query", "--query", query, "--target-org", self.target_org,
+                                    "--use-tooling-api", "--json"], timeout=60)
+            return (data or {}).get("result", {}).get("records", [])
+
+        chunks = [objects[i:i + ENTITY_QUERY_CHUNK] for i in range(0, len(objects), ENTITY_QUERY_CHUNK)]
+        result = {}
+        for records in self._map(fetch, chunks):
+            for record in records:
+                api_name = record.get("QualifiedApiName", "")
+                result[api_name] = {
+                    "label": record.get("Label") or api_name,
+                    "key_prefix": record.get("KeyPrefix") or "",
+                    "is_custom": api_name.endswith("__c"),
+                    "internal_owd": record.get("InternalSharingModel", "Unknown"),
+                    "external_owd": record.get("ExternalSharingModel", "Unknown"),
+                }
+        return result
+
+    def _composite_counts(self, batch: list[str], api_version: str) -> Optional[dict[str, int]]:
+        """COUNT() for up to 25 objects in one Composite batch request; None if unsupported."""
+        body = json.dumps({"batchRequests": [
+            {"method": "GET", "url": f"v{api_version}/query?q={quote(f'SELECT COUNT() FROM {obj}')}"}
+            for obj in batch]})
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write(body)
+        try:
+            data = self.runner.run(["sf", "api", "request", "rest", f"/services/data/v{api_version}/composite/batch",
+                                    "--method", "POST", "--body", f.name, "--target-org", self.target_org],
+                                   timeout=120)
+        finally:
+            os.unlink(f.name)
+        if not data or "results" not in data:
+            return None
+        counts = {}
+        for obj, sub in zip(batch, data["results"]):
+            ok = isinstance(sub, dict) and sub.get("statusCode") == 200 and isinstance(sub.get("result"), dict)
+            counts[obj] = sub["result"].get("totalSize", -1) if ok else -1
+        return counts
+
+    def record_counts(self, objects: list[str]) -> dict[str, int]:
+        counts = {obj: -1 for obj in objects if obj.endswith("__x")}  # External objects don't support COUNT()
+        countable = [obj for obj in objects if obj not in counts]
+        if not countable:
+            return counts
+
+        api_version = self.api_version()
+        batches = [countable[i:i + COMPOSITE_BATCH_SIZE] for i in range(0, len(countable), COMPOSITE_BATCH_SIZE)]
+        # Probe with the first batch: an sf CLI without `sf api request` falls back to per-object queries
+        first = self._composite_counts(batches[0], api_version)
+        if first is None:
+            self.composite_supported = False
+            counts.update(zip(countable, self._map(lambda obj: query_record_count(obj, self.target_org, self.runner),
+                                                   countable)))
+            return counts
+        counts.update(first)
+        for batch, result in zip(batches[1:], self._map(lambda b: self._composite_counts(b, api_version), batches[1:])):
+            if result is None:
+                result = dict(zip(batch, (query_record_count(obj, self.target_org, self.runner) for obj in batch)))
+            counts.update(result)
+        return counts
+
+    @property
+    def name(self) -> str:
+        return f"sf:{self.target_org}"
+
+    def fetch_entries(self, kind: str, keys: list[str]) -> dict:
+        """Snapshot source protocol: fetch 'entity', 'record_count' or 'fields' entries."""
+        # Failed lookups are left out so the cache doesn't keep them until the TTL expires
+        if kind == "record_count":
+            return {obj: count for obj, count in self.record_counts(keys).items()
+                    if count >= 0 or obj.endswith("__x")}
+        if kind == "fields":
+            fields = self._map(lambda obj: query_object_fields(obj, self.target_org, self.runner), keys)
+            return {obj: obj_fields for obj, obj_fields in zip(keys, fields) if obj_fields}
+        if kind != "entity":
+            return {}
+
+        definitions = self.entity_definitions(keys)
+        # Objects EntityDefinition didn't return (e.g. not visible to Tooling) fall back to describe
+        missing = [obj for obj in keys if obj not in definitions]
+        for obj, describe in zip(missing, self._map(
+                lambda obj: query_object_describe(obj, self.target_org, self.runner), missing)):
+            if describe:
+                definitions[obj] = {**describe, "internal_owd": "Unknown", "external_owd": "Unknown"}
+        return definitions
+
+    def fetch(self, objects: list[str], snapshot=None, include_fields: bool = False) -> dict[str, dict]:
+        """
+        Collect everything print_table_output/print_mermaid_hints need.
+
+        Args:
+            objects: Object API names
+            snapshot: OrgSnapshot to read through (optional; None fetches everything)
+            include_fields: Also return field metadata per object
+        """
+        get = snapshot.get if snapshot else self.fetch_entries
+        steps = 3 if include_fields else 2
+        before = snapshot.hits if snapshot else 0
+
+        self._log(f"  [1/{steps}] Object definitions + OWD (Tooling API)...", end=" ")
+        definitions = get("entity", objects)
+        self._log(f"OK ({len(definitions)} found)")
+
+        self._log(f"  [2/{steps}] Record counts...", end=" ")
+        counts = get("record_count", objects)
+        self._log("OK" + ("" if self.composite_supported else " (per-object queries)"))
+
+        fields = {}
+        if include_fields:
+            self._log(f"  [3/{steps}] Field metadata...", end=" ")
+            fields = get("fields", objects)
+            self._log("OK")
+        if snapshot:
+            self._log(f"  Cache: {snapshot.hits - before} entries reused, {snapshot.fetched} fetched")
+
+        results = {}
+        for obj in objects:
+            definition = definitions.get(obj, {})
+            count = counts.get(obj, -1)
+            results[obj] = {
+                "record_count": count,
+                "ldv_indicator": format_ldv(count),
+                "object_type": get_object_type(obj, definition),
+                "owd": format_owd(definition.get("internal_owd", "Unknown")),
+                "external_owd": format_owd(definition.get("external_owd", "Unknown")),
+                "label": definition.get("label", obj),
+            }
+            if include_fields:
+                results[obj]["fields"] = fields.get(obj, [])
+        return results
 
 
 def get_object_type(sobject: str, describe: dict) -> str:
@@ -218,9 +484,12 @@ Examples:
     )
     parser.add_argument(
         "--objects", "-o",
-        required=True,
         help="Comma-separated object API names (e.g., Account,Contact,Invoice__c)"
     )
+    parser.add_argument(
+        "--objects-file",
+        help="File with object API names (one per line or comma-separated)"
+    )
     parser.add_argument(
         "--target-org", "-u",
         required=True,
@@ -237,48 +506,81 @@ Examples:
         action="store_true",
         help="Include Mermaid style hints in output"
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent sf CLI calls (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--fields",
+        action="store_true",
+        help="Include field metadata per object (JSON output)"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-fetch from the org and update the snapshot cache"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use only the snapshot cache (expired entries included); never contact the org"
+    )
+    parser.add_argument(
+        "--fixture",
+        help="Read org metadata from a recorded snapshot fixture instead of the sf CLI (not cached)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the snapshot cache"
+    )
+    parser.add_argument(
+        "--snapshot-db",
+        help="Snapshot database (default: $SF_ORG_SNAPSHOT_DB or ~/.cache/sf-skills/org-snapshots.db)"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries for rate-limited or transient failures (default: 3)"
+    )
 
     args = parser.parse_args()
 
-    objects = [o.strip() for o in args.objects.split(",")]
-    results = {}
+    names = args.objects or ""
+    if args.objects_file:
+        with open(args.objects_file, "r") as f:
+            names += "," + f.read().replace("\n", ",")
+    # Preserve order, drop blanks/duplicates
+    objects = list(dict.fromkeys(o.strip() for o in names.split(",") if o.strip()))
+    if not objects:
+        parser.error("--objects or --objects-file is required")
 
     # Show progress for table output
     if args.output == "table":
         print(f"\nQuerying {len(objects)} objects from org: {args.target_org}")
         print("-" * 50)
 
-    # Bulk query OWD for all objects at once (much faster)
+    start = time.monotonic()
+    runner = SfCommandRunner(retries=args.retries)
+    fetcher = OrgMetadataFetcher(args.target_org, args.workers, runner, progress=args.output == "table")
+
+    snapshot = None
+    if SNAPSHOT_AVAILABLE:
+        # --no-cache and --fixture use a throwaway in-memory store: fixture data must never
+        # land in the persistent snapshot DB under the real org alias
+        store = OrgSnapshotStore(":memory:" if args.no_cache or args.fixture else args.snapshot_db)
+        source = FixtureSource(args.fixture) if args.fixture else fetcher
+        snapshot = OrgSnapshot(args.target_org, source=source, store=store,
+                               offline=args.offline, refresh=args.refresh)
+    elif args.offline or args.fixture:
+        parser.error("--offline/--fixture need the shared org_snapshot module")
+    results = fetcher.fetch(objects, snapshot, args.fields)
     if args.output == "table":
-        print("  [0] Querying OWD via Tooling API...", end=" ", flush=True)
-    owd_data = query_owd_bulk(objects, args.target_org)
-    if args.output == "table":
-        print(f"OK ({len(owd_data)} found)")
-
-    for i, obj in enumerate(objects, 1):
-        if args.output == "table":
-            print(f"  [{i}/{len(objects)}] Querying {obj}...", end=" ", flush=True)
-
-        count = query_record_count(obj, args.target_org)
-        describe = query_object_describe(obj, args.target_org)
-        obj_type = get_object_type(obj, describe)
-
-        # Get OWD from bulk query result
-        obj_owd = owd_data.get(obj, {})
-        internal_owd = obj_owd.get("internal_owd", "Unknown")
-
-        results[obj] = {
-            "record_count": count,
-            "ldv_indicator": format_ldv(count),
-            "object_type": obj_type,
-            "owd": format_owd(internal_owd),
-            "external_owd": format_owd(obj_owd.get("external_owd", "Unknown")),
-            "label": describe.get("label", obj),
-        }
-
-        if args.output == "table":
-            status = "OK" if describe else "WARN"
-            print(status)
+        retried = f", {runner.retried} retried" if runner.retried else ""
+        print(f"  Done in {time.monotonic() - start:.1f}s ({runner.calls} sf CLI calls{retried})")
 
     # Output results
     if args.output == "json":
@@ -7,38 +7,113 @@ by parsing flow XML and populating the documentation template.
 
 Usage:
     python doc_generator.py <path-to-flow.xml> [output-path.md]
+    python doc_generator.py --bulk force-app/main/default/flows --output-dir docs/flows [--workers 8] [--force]
+
+Bulk mode compiles the template once, renders flows across a process pool and
+skips flows whose XML (and template) are unchanged since the last run, using a
+content-hash manifest stored in the output directory.
 """
 
 import xml.etree.ElementTree as ET
 import os
 import re
+import json
+import hashlib
+import sys
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'templates', 'flow-documentation-template.md')
+MANIFEST_NAME = '.doc-manifest.json'
+# Bump when the generated content changes so bulk mode re-renders everything
+GENERATOR_VERSION = '2'
+
+PLACEHOLDER_RE = re.compile(r'\{\{([A-Z0-9_]+)\}\}')
+
+
+class CompiledTemplate:
+    """
+    Documentation template split once into literal and placeholder segments.
+
+    Rendering is a single join over the segments instead of one full-document
+    str.replace per placeholder. Placeholders without a value are left as-is.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        self.segments: List[Tuple[bool, str]] = []  # (is_placeholder, literal or key)
+        pos = 0
+        for match in PLACEHOLDER_RE.finditer(text):
+            if match.start() > pos:
+                self.segments.append((False, text[pos:match.start()]))
+            self.segments.append((True, match.group(1)))
+            pos = match.end()
+        if pos < len(text):
+            self.segments.append((False, text[pos:]))
+
+    @classmethod
+    def load(cls, template_path: Optional[str] = None) -> 'CompiledTemplate':
+        with open(template_path or DEFAULT_TEMPLATE, 'r') as f:
+            return cls(f.read())
+
+    def render(self, data: Dict[str, object]) -> str:
+        return ''.join(
+            (str(data[part]) if part in data else f"{{{{{part}}}}}") if is_key else part
+            for is_key, part in self.segments)
+
+
+class FlowIndex:
+    """
+    Metadata-namespace elements of a flow grouped by local tag, built in one
+    pass over the tree: `all(tag)` matches findall('.//sf:tag') and `top`
+    holds the first direct child per tag, as find('sf:tag') would.
+    """
+
+    NS = '{http://soap.sforce.com/2006/04/metadata}'
+
+    def __init__(self, root: ET.Element):
+        self.by_tag: Dict[str, List[ET.Element]] = defaultdict(list)
+        self.top: Dict[str, ET.Element] = {}
+        ns_len = len(self.NS)
+        for child in root:
+            if child.tag.startswith(self.NS):
+                self.top.setdefault(child.tag[ns_len:], child)
+        elements = root.iter()
+        next(elements)  # the root itself is not a descendant
+        for elem in elements:
+            if elem.tag.startswith(self.NS):
+                self.by_tag[elem.tag[ns_len:]].append(elem)
+
+    def all(self, tag: str) -> List[ET.Element]:
+        return self.by_tag.get(tag, [])
+
+    def count(self, tag: str) -> int:
+        return len(self.by_tag.get(tag, ()))
 
 class FlowDocGenerator:
     """Generates documentation from flow XML."""
 
-    def __init__(self, flow_xml_path: str, template_path: str = None):
+    def __init__(self, flow_xml_path: str, template_path: str = None,
+                 template: Optional[CompiledTemplate] = None):
         """
         Initialize the documentation generator.
 
         Args:
             flow_xml_path: Path to the flow XML file
             template_path: Path to template file (optional)
+            template: Already compiled template, shared across flows in bulk mode (optional)
         """
         self.flow_path = flow_xml_path
         self.tree = ET.parse(flow_xml_path)
         self.root = self.tree.getroot()
         self.namespace = {'sf': 'http://soap.sforce.com/2006/04/metadata'}
-
-        # Load template
-        if template_path is None:
-            # Use default template location
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            template_path = os.path.join(script_dir, '..', 'templates', 'flow-documentation-template.md')
-
-        with open(template_path, 'r') as f:
-            self.template = f.read()
+        self.index = FlowIndex(self.root)
+        self.template = template or CompiledTemplate.load(template_path)
 
     def generate(self) -> str:
         """
@@ -47,16 +122,7 @@ class FlowDocGenerator:
         Returns:
             Populated documentation string
         """
-        # Extract all data from flow
-        data = self._extract_flow_data()
-
-        # Replace all placeholders
-        doc = self.template
-        for key, value in data.items():
-            placeholder = f"{{{{{key}}}}}"
-            doc = doc.replace(placeholder, str(value))
-
-        return doc
+        return self.template.render(self._extract_flow_data())
 
     def _extract_flow_data(self) -> Dict[str, str]:
         """Extract all relevant data from flow XML."""
@@ -191,17 +257,25 @@ class FlowDocGenerator:
 
     def _get_text(self, element_name: str, default: str = '') -> str:
         """Get text from XML element."""
-        elem = self.root.find(f'sf:{element_name}', self.namespace)
+        elem = self.index.top.get(element_name)
         return elem.text if elem is not None else default
 
+    def _start_text(self, element_name: str, default: str = '') -> str:
+        """Get text from a child of the flow's start element."""
+        for start in self.index.all('start'):
+            elem = start.find(f'sf:{element_name}', self.namespace)
+            if elem is not None and elem.text:
+                return elem.text
+        return default
+
     def _determine_flow_type(self) -> str:
         """Determine the flow type."""
         process_type = self._get_text('processType', 'Unknown')
 
         # Check if record-triggered
-        if self.root.find('sf:triggerType', self.namespace) is not None:
+        if 'triggerType' in self.index.top:
             trigger_type = self._get_text('triggerType', '')
-            object_name = self._get_text('.//sf:start/sf:object', '')
+            object_name = self._start_text('object')
             return f"Record-Triggered ({trigger_type} on {object_name})"
 
         type_map = {
@@ -215,7 +289,8 @@ class FlowDocGenerator:
     def _get_entry_criteria(self) -> str:
         """Get entry criteria for the flow."""
         # Check for record trigger
-        trigger_elem = self.root.find('.//sf:start', self.namespace)
+        starts = self.index.all('start')
+        trigger_elem = starts[0] if starts else None
         if trigger_elem is not None:
             object_elem = trigger_elem.find('sf:object', self.namespace)
             trigger_type_elem = trigger_elem.find('sf:recordTriggerType', self.namespace)
@@ -229,7 +304,7 @@ class FlowDocGenerator:
 
     def _get_decision_points(self) -> str:
         """List all decision points."""
-        decisions = self.root.findall('.//sf:decisions', self.namespace)
+        decisions = self.index.all('decisions')
         if not decisions:
             return "No decision points (linear flow)"
 
@@ -260,7 +335,7 @@ class FlowDocGenerator:
 
     def _count_elements(self, element_type: str) -> int:
         """Count elements of a specific type."""
-        return len(self.root.findall(f'.//sf:{element_type}', self.namespace))
+        return self.index.count(element_type)
 
     def _count_dml_operations(self) -> int:
         """Count all DML operations."""
@@ -284,7 +359,7 @@ class FlowDocGenerator:
 
     def _get_child_subflows(self) -> str:
         """List child subflows called."""
-        subflows = self.root.findall('.//sf:subflows', self.namespace)
+        subflows = self.index.all('subflows')
         if not subflows:
             return "N/A - no child subflows"
 
@@ -313,10 +388,10 @@ class FlowDocGenerator:
     def _check_bulkification(self) -> str:
         """Check bulkification status."""
         # Check for DML in loops (anti-pattern)
-        loops = self.root.findall('.//sf:loops', self.namespace)
+        loops = self.index.all('loops')
         for loop in loops:
             # This is a simplified check
-            if self.root.find('.//sf:recordCreates', self.namespace) is not None:
+            if self.index.count('recordCreates'):
                 return "⚠️ Potential issue - verify no DML in loops"
 
         return "✅ Appears bulkified"
@@ -330,7 +405,7 @@ class FlowDocGenerator:
         # Count DML with fault paths
         dml_with_faults = 0
         for dml_type in ['recordCreates', 'recordUpdates', 'recordDeletes']:
-            for element in self.root.findall(f'.//sf:{dml_type}', self.namespace):
+            for element in self.index.all(dml_type):
                 fault = element.find('sf:faultConnector', self.namespace)
                 if fault is not None:
                     dml_with_faults += 1
@@ -343,7 +418,7 @@ class FlowDocGenerator:
     def _detect_error_logging(self) -> str:
         """Detect error logging method."""
         # Check for Sub_LogError calls
-        for subflow in self.root.findall('.//sf:subflows', self.namespace):
+        for subflow in self.index.all('subflows'):
             flow_name = subflow.find('sf:flowName', self.namespace)
             if flow_name is not None and 'LogError' in flow_name.text:
                 return "Sub_LogError (structured logging)"
@@ -353,7 +428,7 @@ class FlowDocGenerator:
     def _get_alert_mechanism(self) -> str:
         """Get alert mechanism."""
         # Check for email alerts
-        for action in self.root.findall('.//sf:actionCalls', self.namespace):
+        for action in self.index.all('actionCalls'):
             action_name = action.find('sf:actionName', self.namespace)
             if action_name is not None and 'email' in action_name.text.lower():
                 return "Email notifications"
@@ -362,7 +437,7 @@ class FlowDocGenerator:
 
     def _get_subflows_used(self) -> str:
         """List subflows used."""
-        subflows = self.root.findall('.//sf:subflows', self.namespace)
+        subflows = self.index.all('subflows')
         if not subflows:
             return "None"
 
@@ -382,7 +457,7 @@ class FlowDocGenerator:
     def _get_input_variables(self) -> str:
         """List input variables."""
         result = []
-        for var in self.root.findall('.//sf:variables', self.namespace):
+        for var in self.index.all('variables'):
             is_input = var.find('sf:isInput', self.namespace)
             if is_input is not None and is_input.text == 'true':
                 name = var.find('sf:name', self.namespace)
@@ -396,7 +471,7 @@ class FlowDocGenerator:
     def _get_output_variables(self) -> str:
         """List output variables."""
         result = []
-        for var in self.root.findall('.//sf:variables', self.namespace):
+        for var in self.index.all('variables'):
             is_output = var.find('sf:isOutput', self.namespace)
             if is_output is not None and is_output.text == 'true':
                 name = var.find('sf:name', self.namespace)
@@ -409,7 +484,7 @@ class FlowDocGenerator:
 
     def _get_running_mode(self) -> str:
         """Get running mode."""
-        run_in_mode = self.root.find('sf:runInMode', self.namespace)
+        run_in_mode = self.index.top.get('runInMode')
         if run_in_mode is not None:
             return run_in_mode.text
         return "User Mode (Default)"
@@ -426,7 +501,7 @@ class FlowDocGenerator:
         objects = set()
 
         for elem_type in ['recordCreates', 'recordUpdates', 'recordDeletes', 'recordLookups']:
-            for element in self.root.findall(f'.//sf:{elem_type}', self.namespace):
+            for element in self.index.all(elem_type):
                 obj = element.find('sf:object', self.namespace)
                 if obj is not None:
                     objects.add(obj.text)
@@ -455,7 +530,7 @@ class FlowDocGenerator:
         fields = set()
 
         # Extract fields from various operations
-        for elem in self.root.findall('.//sf:field', self.namespace):
+        for elem in self.index.all('field'):
             if elem.text:
                 fields.add(elem.text)
 
@@ -474,7 +549,7 @@ class FlowDocGenerator:
 
     def _get_required_apex(self) -> str:
         """List required Apex classes."""
-        actions = self.root.findall('.//sf:actionCalls', self.namespace)
+        actions = self.index.all('actionCalls')
         apex_classes = set()
 
         for action in actions:
@@ -509,18 +584,19 @@ class FlowDocGenerator:
         return '\n'.join(docs)
 
 
-def generate_documentation(flow_xml_path: str, output_path: str = None) -> str:
+def generate_documentation(flow_xml_path: str, output_path: str = None, template_path: str = None) -> str:
     """
     Generate documentation for a flow.
 
     Args:
         flow_xml_path: Path to flow XML file
         output_path: Output path for documentation (optional)
+        template_path: Path to template file (optional)
 
     Returns:
         Generated documentation string
     """
-    generator = FlowDocGenerator(flow_xml_path)
+    generator = FlowDocGenerator(flow_xml_path, template_path)
     doc = generator.generate()
 
     if output_path:
@@ -531,15 +607,153 @@ def generate_documentation(flow_xml_path: str, output_path: str = None) -> str:
     return doc
 
 
-if __name__ == "__main__":
-    import sys
+def find_flow_files(paths: Iterable[str]) -> List[str]:
+    """Flow metadata files under the given files/directories, sorted."""
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(os.path.abspath(path))
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+            found.extend(os.path.abspath(os.path.join(dirpath, f))
+                         for f in filenames if f.endswith(('.flow-meta.xml', '.flow')))
+    return sorted(set(found))
+
+
+def flow_api_name(flow_path: str) -> str:
+    """My_Flow.flow-meta.xml -> My_Flow."""
+    name = os.path.basename(flow_path)
+    for suffix in ('.flow-meta.xml', '.flow', '.xml'):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
 
-    if len(sys.argv) < 2:
+def content_hash(flow_path: str, template: CompiledTemplate) -> str:
+    """Hash of the flow XML, template and generator version."""
+    digest = hashlib.sha1(f"{GENERATOR_VERSION}:{template.digest}:".encode('utf-8'))
+    with open(flow_path, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+_worker_template: Optional[CompiledTemplate] = None
+
+
+def _init_worker(template: CompiledTemplate):
+    global _worker_template
+    _worker_template = template
+
+
+def _render_one(job: Tuple[str, str]) -> Tuple[str, Optional[str]]:
+    """Process-pool entry point: render one flow. Returns (flow path, error or None)."""
+    flow_path, output_path = job
+    try:
+        doc = FlowDocGenerator(flow_path, template=_worker_template).generate()
+        with open(output_path, 'w') as f:
+            f.write(doc)
+        return flow_path, None
+    except Exception as e:
+        return flow_path, str(e)
+
+
+def generate_bulk(flow_paths: List[str], output_dir: str, template_path: str = None,
+                  workers: Optional[int] = None, force: bool = False,
+                  verbose: bool = True) -> Dict[str, int]:
+    """
+    Document many flows, skipping those unchanged since the last run.
+
+    Args:
+        flow_paths: Flow XML files
+        output_dir: Directory for <FlowName>_documentation.md files and the manifest
+        template_path: Path to template file (optional)
+        workers: Process count (default: CPU count; 1 renders in-process)
+        force: Re-render every flow
+
+    Returns:
+        Counts of rendered, skipped and failed flows
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    template = CompiledTemplate.load(template_path)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    jobs, hashes = [], {}
+    stats = {'flows': len(flow_paths), 'rendered': 0, 'skipped': 0, 'failed': 0}
+    for flow_path in flow_paths:
+        output_name = f"{flow_api_name(flow_path)}_documentation.md"
+        hashes[flow_path] = content_hash(flow_path, template)
+        entry = manifest.get(flow_path)
+        if (not force and entry and entry.get('hash') == hashes[flow_path]
+                and os.path.exists(os.path.join(output_dir, entry.get('output', output_name)))):
+            stats['skipped'] += 1
+            continue
+        jobs.append((flow_path, os.path.join(output_dir, output_name)))
+
+    if workers == 1 or len(jobs) < 2:
+        _init_worker(template)
+        results = [_render_one(job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(template,)) as pool:
+            results = list(pool.map(_render_one, jobs, chunksize=chunksize))
+
+    outputs = dict(jobs)
+    for flow_path, error in results:
+        if error:
+            stats['failed'] += 1
+            manifest.pop(flow_path, None)
+            if verbose:
+                print(f"❌ {os.path.basename(flow_path)}: {error}")
+        else:
+            stats['rendered'] += 1
+            manifest[flow_path] = {'hash': hashes[flow_path], 'output': os.path.basename(outputs[flow_path])}
+
+    for stale in set(manifest) - set(flow_paths):
+        if not os.path.exists(stale):
+            del manifest[stale]
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Flow documentation from flow XML")
+    parser.add_argument("flow", nargs="?", help="Path to a flow XML file")
+    parser.add_argument("output", nargs="?", help="Output markdown path (default: <flow>_documentation.md)")
+    parser.add_argument("--bulk", nargs="+", metavar="PATH", help="Flow files or directories to document")
+    parser.add_argument("--output-dir", default="flow-docs", help="Bulk output directory (default: flow-docs)")
+    parser.add_argument("--template", help="Documentation template (default: templates/flow-documentation-template.md)")
+    parser.add_argument("--workers", type=int, help="Bulk worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render flows even if unchanged")
+    args = parser.parse_args()
+
+    if args.bulk:
+        flow_paths = find_flow_files(args.bulk)
+        if not flow_paths:
+            print(f"❌ No flow files found in: {', '.join(args.bulk)}")
+            sys.exit(1)
+        start = datetime.now()
+        stats = generate_bulk(flow_paths, args.output_dir, args.template, args.workers, args.force)
+        elapsed = (datetime.now() - start).total_seconds()
+        print(f"\n✅ {stats['flows']} flows: {stats['rendered']} rendered, {stats['skipped']} unchanged, "
+              f"{stats['failed']} failed ({elapsed:.1f}s) → {args.output_dir}")
+        sys.exit(1 if stats['failed'] else 0)
+
+    if not args.flow:
         print("Usage: python doc_generator.py <path-to-flow.xml> [output-path.md]")
+        print("       python doc_generator.py --bulk <flows-dir> [--output-dir DIR]")
         sys.exit(1)
 
-    flow_path = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+    flow_path = args.flow
+    output_path = args.output
 
     # Auto-generate output path if not provided
     if output_path is None:
@@ -547,10 +761,14 @@ if __name__ == "__main__":
         output_path = f"{flow_name}_documentation.md"
 
     try:
-        doc = generate_documentation(flow_path, output_path)
+        doc = generate_documentation(flow_path, output_path, args.template)
         print(f"\n✅ Documentation generated successfully!")
         print(f"   File: {output_path}")
         print(f"   Lines: {len(doc.splitlines())}")
     except Exception as e:
         print(f"❌ Error generating documentation: {e}")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
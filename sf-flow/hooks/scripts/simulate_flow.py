@@ -1,10 +1,22 @@
 #!/usr/bin/env python3
 """
-Salesforce Flow Simulator - Bulk Testing & Governor Limit Analysis (v2.1.0)
+Salesforce Flow Simulator - Bulk Testing & Governor Limit Analysis (v3.0.0)
 
 Simulates flow execution with mock data to catch governor limit issues
 before deployment. Tests bulkification and performance with 200+ records.
 
+v3.0.0:
+- NEW: Path-sensitive abstract interpreter over the flow graph. Every execution
+  path through decisions, loops and subflows gets its own SOQL/DML/rows/CPU
+  estimate; the report shows the worst case and the heaviest paths.
+- NEW: Loop iteration counts are configurable (--loop-size, --collection-size LOOP=N)
+- NEW: Subflows are resolved from the flow's directory and costed recursively
+- NEW: Costs are polynomials in N (interviews in the batch) and F (loop size),
+  memoized per sub-path, so large flows stay tractable
+- NEW: --format json
+- NEW: --sweep/--fan-out evaluate many batch sizes from one analysis and report
+  the record count at which each governor limit breaks
+
 v2.1.0 Fixes:
 - FIXED: Removed bulkSupport check (deprecated in API 60.0+, automatic in record-triggered flows)
 - FIXED: Record-triggered flows use $Record context - platform handles batching automatically
@@ -13,15 +25,23 @@ v2.1.0 Fixes:
 
 Usage:
     python3 flow_simulator.py <path-to-flow-meta.xml> --test-records 200 [--mock-data]
+    python3 flow_simulator.py <path-to-flow-meta.xml> --loop-size 20 --collection-size Loop_Items=500
+    python3 flow_simulator.py <path-to-flow-meta.xml> --sweep 1,200,2000,10000 --fan-out 1,10,50
     python3 flow_simulator.py <path-to-flow-meta.xml> --analyze-only
 """
 
+import os
 import sys
 import xml.etree.ElementTree as ET
 import argparse
 import json
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Sweeps fall back to pure Python evaluation
 
 @dataclass
 class GovernorLimits:
@@ -45,10 +65,540 @@ class SimulationMetrics:
     loops_executed: int = 0
     decisions_evaluated: int = 0
 
+
+# Metrics carried by Cost, in vector order, with their governor limit
+COST_METRICS = ('soql_queries', 'soql_records', 'dml_statements', 'dml_rows', 'cpu_time_ms')
+METRIC_LIMITS = {
+    'soql_queries': GovernorLimits.SOQL_QUERIES,
+    'soql_records': GovernorLimits.SOQL_RECORDS,
+    'dml_statements': GovernorLimits.DML_STATEMENTS,
+    'dml_rows': GovernorLimits.DML_ROWS,
+    'cpu_time_ms': GovernorLimits.CPU_TIME_MS,
+}
+
+DML_ELEMENTS = ('recordCreates', 'recordUpdates', 'recordDeletes')
+
+# Records per record-triggered flow/trigger invocation: a larger save runs the
+# automation once per chunk, all chunks sharing the transaction's limits
+TRIGGER_CHUNK_SIZE = 200
+NS = '{http://soap.sforce.com/2006/04/metadata}'
+
+
+def trigger_chunks(records: int) -> List[Tuple[int, int]]:
+    """(chunk size, count) pairs a record-triggered save of `records` runs in."""
+    full, rest = divmod(records, TRIGGER_CHUNK_SIZE)
+    chunks = [(TRIGGER_CHUNK_SIZE, full)] if full else []
+    if rest:
+        chunks.append((rest, 1))
+    return chunks
+
+
+class Cost:
+    """
+    Resource cost as a polynomial in N (interviews sharing the transaction)
+    and F (default loop collection size).
+
+    terms maps a monomial (n_exp, f_exp) to a vector of COST_METRICS
+    coefficients. All coefficients are non-negative, so the coefficient-wise
+    max of two costs (envelope) bounds both for every N, F >= 0.
+    """
+    __slots__ = ('terms',)
+
+    def __init__(self, terms: Optional[Dict[Tuple[int, int], List[float]]] = None):
+        self.terms = terms or {}
+
+    @classmethod
+    def of(cls, monomial: Tuple[int, int] = (0, 0), **metrics) -> 'Cost':
+        return cls({monomial: [float(metrics.get(m, 0)) for m in COST_METRICS]})
+
+    def __add__(self, other: 'Cost') -> 'Cost':
+        terms = {k: list(v) for k, v in self.terms.items()}
+        for k, vec in other.terms.items():
+            if k in terms:
+                terms[k] = [a + b for a, b in zip(terms[k], vec)]
+            else:
+                terms[k] = list(vec)
+        return Cost(terms)
+
+    def scale(self, factor: float = 1.0, monomial: Tuple[int, int] = (0, 0)) -> 'Cost':
+        """Multiply by factor * N^a * F^b."""
+        a, b = monomial
+        return Cost({(n + a, f + b): [c * factor for c in vec] for (n, f), vec in self.terms.items()})
+
+    def envelope(self, other: 'Cost') -> 'Cost':
+        terms = {k: list(v) for k, v in self.terms.items()}
+        for k, vec in other.terms.items():
+            if k in terms:
+                terms[k] = [max(a, b) for a, b in zip(terms[k], vec)]
+            else:
+                terms[k] = list(vec)
+        return Cost(terms)
+
+    def has(self, metric: str) -> bool:
+        i = COST_METRICS.index(metric)
+        return any(vec[i] for vec in self.terms.values())
+
+    def evaluate(self, n: float, f: float) -> Dict[str, int]:
+        totals = [0.0] * len(COST_METRICS)
+        for (a, b), vec in self.terms.items():
+            weight = (n ** a) * (f ** b)
+            for i, c in enumerate(vec):
+                totals[i] += c * weight
+        return {m: int(round(v)) for m, v in zip(COST_METRICS, totals)}
+
+    def evaluate_many(self, points: List[Tuple[float, float]]) -> List[List[float]]:
+        """
+        Evaluate at many (N, F) points at once.
+
+        Returns:
+            One COST_METRICS vector per point
+        """
+        if not self.terms:
+            return [[0.0] * len(COST_METRICS) for _ in points]
+        monomials = list(self.terms)
+        if np is not None:
+            pts = np.asarray(points, dtype=float).reshape(-1, 2)
+            exps = np.asarray(monomials, dtype=float)
+            coeffs = np.asarray([self.terms[k] for k in monomials], dtype=float)
+            weights = pts[:, :1] ** exps[:, 0] * pts[:, 1:] ** exps[:, 1]
+            return (weights @ coeffs).tolist()
+        results = []
+        for n, f in points:
+            totals = [0.0] * len(COST_METRICS)
+            for a, b in monomials:
+                weight = (n ** a) * (f ** b)
+                for i, c in enumerate(self.terms[(a, b)]):
+                    totals[i] += c * weight
+            results.append(totals)
+        return results
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Human-readable polynomial, e.g. {'soql_records': {'N*F': 1.0}}."""
+        out: Dict[str, Dict[str, float]] = {}
+        for (a, b), vec in sorted(self.terms.items()):
+            label = '*'.join(p for p in (
+                '' if a == 0 else ('N' if a == 1 else f'N^{a}'),
+                '' if b == 0 else ('F' if b == 1 else f'F^{b}'),
+            ) if p) or '1'
+            for m, c in zip(COST_METRICS, vec):
+                if c:
+                    out.setdefault(m, {})[label] = round(c, 4)
+        return out
+
+
+@dataclass
+class CostModel:
+    """
+    Per-execution cost constants. CPU figures are rough platform averages in
+    milliseconds; calibrate them against debug logs from your org.
+    """
+    cpu_per_element_ms: float = 0.05       # assignment/decision/screen, per interview
+    cpu_per_query_ms: float = 2.0          # per SOQL statement
+    cpu_per_query_row_ms: float = 0.02     # per row returned
+    cpu_per_dml_ms: float = 4.0            # per DML statement
+    cpu_per_dml_row_ms: float = 0.3        # per row written (excludes other automation)
+    cpu_per_action_ms: float = 5.0         # invocable/Apex action, per interview
+    rows_per_lookup: Optional[int] = None  # rows per Get Records (default: F)
+
+
+@dataclass
+class FlowElement:
+    """Flow graph node."""
+    name: str
+    kind: str
+    xml: ET.Element
+    successors: List[Tuple[Optional[str], str]] = field(default_factory=list)  # (outcome label, target)
+    loop_body: Optional[str] = None
+    loop_exit: Optional[str] = None
+
+
+@dataclass
+class ExecutionPath:
+    """One route from start to end with its accumulated cost."""
+    outcomes: Tuple[str, ...]
+    cost: Cost
+    elements: int = 0
+
+
+class FlowGraph:
+    """Flow XML indexed once into named elements and their connectors."""
+
+    def __init__(self, xml_path: str):
+        self.xml_path = xml_path
+        self.root = ET.parse(xml_path).getroot()
+        self.elements: Dict[str, FlowElement] = {}
+        self.collections = set()
+        self.variable_types: Dict[str, str] = {}
+        self.start_target: Optional[str] = None
+        self.start = self.root.find(f'{NS}start')
+
+        for child in self.root:
+            kind = child.tag.replace(NS, '')
+            if kind == 'variables':
+                if _text(child, 'isCollection') == 'true':
+                    self.collections.add(_text(child, 'name'))
+                if _text(child, 'objectType'):
+                    self.variable_types[_text(child, 'name')] = _text(child, 'objectType')
+                continue
+            name = _text(child, 'name')
+            if name is None or kind == 'start':
+                continue
+            self.elements[name] = self._build_element(name, kind, child)
+
+        if self.start is not None:
+            self.start_target = _text(self.start, 'connector/targetReference')
+        else:
+            # Legacy flows use startElementReference
+            self.start_target = _text(self.root, 'startElementReference')
+
+    def reference_type(self, ref: str) -> Optional[str]:
+        """
+        sObject type behind a reference: a typed variable, a Get Records
+        element, or a loop (its current item, typed by the collection it
+        iterates).
+        """
+        seen = set()
+        while ref not in seen:
+            seen.add(ref)
+            if ref in self.variable_types:
+                return self.variable_types[ref]
+            node = self.elements.get(ref)
+            if node is None:
+                return None
+            if node.kind == 'recordLookups':
+                return _text(node.xml, 'object')
+            if node.kind != 'loops':
+                return None
+            ref = (_text(node.xml, 'collectionReference') or '').split('.')[0]
+        return None
+
+    def _build_element(self, name: str, kind: str, elem: ET.Element) -> FlowElement:
+        node = FlowElement(name=name, kind=kind, xml=elem)
+        if kind == 'loops':
+            node.loop_body = _text(elem, 'nextValueConnector/targetReference')
+            node.loop_exit = _text(elem, 'noMoreValuesConnector/targetReference')
+            return node
+
+        for rule in elem.findall(f'{NS}rules') + elem.findall(f'{NS}waitEvents'):
+            target = _text(rule, 'connector/targetReference')
+            if target:
+                node.successors.append((_text(rule, 'label') or _text(rule, 'name'), target))
+        default = _text(elem, 'defaultConnector/targetReference')
+        if default:
+            node.successors.append((_text(elem, 'defaultConnectorLabel') or 'Default', default))
+        connector = _text(elem, 'connector/targetReference')
+        if connector:
+            node.successors.append((None, connector))
+        return node
+
+
+def _text(elem: ET.Element, path: str) -> Optional[str]:
+    """Text of a namespaced child path like 'connector/targetReference'."""
+    found = elem.find('/'.join(f'{NS}{part}' for part in path.split('/')))
+    return found.text if found is not None else None
+
+
+class FlowAnalyzer:
+    """
+    Abstract interpreter that enumerates execution paths through a flow graph.
+
+    Sub-path results are memoized per (element, stop element), so shared tails
+    after a decision are costed once. Loop bodies are folded into the
+    coefficient-wise worst case of their own paths, multiplied by the loop's
+    iteration count.
+    """
+
+    def __init__(self, xml_path: str, model: Optional[CostModel] = None,
+                 loop_sizes: Optional[Dict[str, int]] = None, before_save: bool = False,
+                 max_paths: int = 256, flows_dir: Optional[str] = None,
+                 _shared: Optional[Dict] = None):
+        self.xml_path = xml_path
+        self.model = model or CostModel()
+        self.loop_sizes = loop_sizes or {}
+        self.before_save = before_save
+        self.max_paths = max_paths
+        self.flows_dir = flows_dir or os.path.dirname(os.path.abspath(xml_path))
+        self.graph = FlowGraph(xml_path)
+        start = self.graph.start
+        self.record_triggered = start is not None and 'Record' in (_text(start, 'triggerType') or '')
+        self.notes: List[str] = []
+        self.loop_findings: Dict[str, Cost] = {}
+        self.truncated = False
+        self._paths_memo: Dict[Tuple[str, Optional[str]], List[ExecutionPath]] = {}
+        self._env_memo: Dict[Tuple[str, Optional[str]], Cost] = {}
+        self._count_memo: Dict[Tuple[str, Optional[str]], int] = {}
+        self._shared = _shared if _shared is not None else {'subflows': {}, 'active': set()}
+        self._score_point = (1.0, 1.0)
+
+    # ------------------------------------------------------------------
+    # Element costs
+    # ------------------------------------------------------------------
+
+    def _rows_monomial(self, single: bool) -> Tuple[int, int]:
+        """Rows touched per interview: one record, or a collection of F."""
+        return (1, 0) if single else (1, 1)
+
+    def _implicit_record_update(self, node: FlowElement) -> bool:
+        """True for "update the triggering record": neither an input reference nor an object."""
+        return (node.kind == 'recordUpdates' and not _text(node.xml, 'inputReference')
+                and node.xml.find(f'{NS}object') is None)
+
+    def element_cost(self, node: FlowElement) -> Cost:
+        m = self.model
+        elem = node.xml
+
+        if node.kind == 'recordLookups':
+            single = _text(elem, 'getFirstRecordOnly') == 'true'
+            if single:
+                rows = Cost.of((1, 0), soql_records=1, cpu_time_ms=m.cpu_per_query_row_ms)
+            elif m.rows_per_lookup is not None:
+                rows = Cost.of((1, 0), soql_records=m.rows_per_lookup,
+                               cpu_time_ms=m.cpu_per_query_row_ms * m.rows_per_lookup)
+            else:
+                rows = Cost.of((1, 1), soql_records=1, cpu_time_ms=m.cpu_per_query_row_ms)
+            return Cost.of(soql_queries=1, cpu_time_ms=m.cpu_per_query_ms) + rows
+
+        if node.kind in DML_ELEMENTS:
+            ref = _text(elem, 'inputReference') or ''
+            implicit_record = self._implicit_record_update(node)
+            if self.before_save and node.kind == 'recordUpdates' and (ref.startswith('$Record') or implicit_record):
+                # Before-save updates to $Record are saved with the record - no DML
+                return Cost.of((1, 0), cpu_time_ms=m.cpu_per_element_ms)
+            if ref:
+                single = ref.split('.')[0] not in self.graph.collections
+            elif implicit_record and self.record_triggered:
+                single = True  # one $Record row per interview
+            else:
+                # Field-based create writes one record; filtered update/delete hits many
+                single = node.kind == 'recordCreates'
+            return (Cost.of(dml_statements=1, cpu_time_ms=m.cpu_per_dml_ms)
+                    + Cost.of(self._rows_monomial(single), dml_rows=1, cpu_time_ms=m.cpu_per_dml_row_ms))
+
+        if node.kind == 'actionCalls':
+            if _text(elem, 'actionType') == 'apex':
+                self._note(f"Apex action '{node.name}' ({_text(elem, 'actionName')}) is costed as "
+                           f"{m.cpu_per_action_ms}ms CPU per interview; its SOQL/DML is not modelled")
+            return Cost.of((1, 0), cpu_time_ms=m.cpu_per_action_ms)
+
+        if node.kind == 'subflows':
+            return self._subflow_cost(node)
+
+        return Cost.of((1, 0), cpu_time_ms=m.cpu_per_element_ms)
+
+    def _subflow_cost(self, node: FlowElement) -> Cost:
+        flow_name = _text(node.xml, 'flowName') or ''
+        candidates = [os.path.join(self.flows_dir, f'{flow_name}.flow-meta.xml'),
+                      os.path.join(self.flows_dir, f'{flow_name}.flow')]
+        path = next((c for c in candidates if os.path.exists(c)), None)
+        base = Cost.of((1, 0), cpu_time_ms=self.model.cpu_per_element_ms)
+        if path is None:
+            self._note(f"Subflow '{flow_name}' not found in {self.flows_dir}; its cost is not included")
+            return base
+
+        key = os.path.abspath(path)
+        cache = self._shared['subflows']
+        if key in cache:
+            return base + cache[key]
+        if key in self._shared['active']:
+            self._note(f"Recursive subflow '{flow_name}' - counted once")
+            return base
+
+        self._shared['active'].add(key)
+        try:
+            child = FlowAnalyzer(path, self.model, self.loop_sizes, max_paths=self.max_paths,
+                                 flows_dir=self.flows_dir, _shared=self._shared)
+            cost = child.envelope()
+            self.notes.extend(n for n in child.notes if n not in self.notes)
+            for loop, body in child.loop_findings.items():
+                self.loop_findings[f'{flow_name}.{loop}'] = body
+        except (ET.ParseError, OSError) as e:
+            self._note(f"Subflow '{flow_name}' could not be parsed: {e}")
+            cost = Cost()
+        finally:
+            self._shared['active'].discard(key)
+        cache[key] = cost
+        return base + cost
+
+    def _loop_iterations(self, node: FlowElement, body: Cost) -> Cost:
+        if node.name in self.loop_sizes:
+            return body.scale(self.loop_sizes[node.name])
+        return body.scale(1, (0, 1))
+
+    def _note(self, message: str):
+        if message not in self.notes:
+            self.notes.append(message)
+
+    # ------------------------------------------------------------------
+    # Path enumeration (memoized)
+    # ------------------------------------------------------------------
+
+    def _score(self, cost: Cost) -> float:
+        values = cost.evaluate(*self._score_point)
+        return max(values[m] / METRIC_LIMITS[m] for m in COST_METRICS)
+
+    def _prune(self, paths: List[ExecutionPath]) -> List[ExecutionPath]:
+        if len(paths) <= self.max_paths:
+            return paths
+        self.truncated = True
+        return sorted(paths, key=lambda p: self._score(p.cost), reverse=True)[:self.max_paths]
+
+    def _loop_body(self, node: FlowElement, stack: set) -> Cost:
+        body = self._envelope_from(node.loop_body, node.name, stack) if node.loop_body else Cost()
+        if body.has('soql_queries') or body.has('dml_statements'):
+            self.loop_findings[node.name] = body
+        return self._loop_iterations(node, body)
+
+    def _paths_from(self, name: Optional[str], stop: Optional[str], stack: set) -> List[ExecutionPath]:
+        if name is None or name == stop or name not in self.graph.elements:
+            return [ExecutionPath((), Cost())]
+        key = (name, stop)
+        if key in self._paths_memo:
+            return self._paths_memo[key]
+        if name in stack:
+            self._note(f"Connector cycle through '{name}' outside a loop - followed once")
+            return [ExecutionPath((), Cost())]
+
+        stack.add(name)
+        node = self.graph.elements[name]
+        result = []
+        if node.kind == 'loops':
+            own = self.element_cost(node) + self._loop_body(node, stack)
+            size = self.loop_sizes.get(name, 'F')
+            for tail in self._paths_from(node.loop_exit, stop, stack):
+                result.append(ExecutionPath((f'{name}×{size}',) + tail.outcomes,
+                                            own + tail.cost, tail.elements + 1))
+        else:
+            own = self.element_cost(node)
+            branches = node.successors or [(None, None)]
+            for label, target in branches:
+                prefix = (f'{name}→{label}',) if label and len(branches) > 1 else ()
+                for tail in self._paths_from(target, stop, stack):
+                    result.append(ExecutionPath(prefix + tail.outcomes, own + tail.cost, tail.elements + 1))
+        stack.discard(name)
+
+        result = self._prune(result)
+        self._paths_memo[key] = result
+        return result
+
+    def _envelope_from(self, name: Optional[str], stop: Optional[str], stack: set) -> Cost:
+        if name is None or name == stop or name not in self.graph.elements or name in stack:
+            return Cost()
+        key = (name, stop)
+        if key in self._env_memo:
+            return self._env_memo[key]
+
+        stack.add(name)
+        node = self.graph.elements[name]
+        if node.kind == 'loops':
+            cost = (self.element_cost(node) + self._loop_body(node, stack)
+                    + self._envelope_from(node.loop_exit, stop, stack))
+        else:
+            tails = [self._envelope_from(t, stop, stack) for _, t in node.successors] or [Cost()]
+            worst = tails[0]
+            for tail in tails[1:]:
+                worst = worst.envelope(tail)
+            cost = self.element_cost(node) + worst
+        stack.discard(name)
+
+        self._env_memo[key] = cost
+        return cost
+
+    def _count_from(self, name: Optional[str], stop: Optional[str], stack: set) -> int:
+        if name is None or name == stop or name not in self.graph.elements or name in stack:
+            return 1
+        key = (name, stop)
+        if key not in self._count_memo:
+            stack.add(name)
+            node = self.graph.elements[name]
+            if node.kind == 'loops':
+                total = self._count_from(node.loop_exit, stop, stack)
+            else:
+                total = sum(self._count_from(t, stop, stack) for _, t in node.successors) or 1
+            stack.discard(name)
+            self._count_memo[key] = total
+        return self._count_memo[key]
+
+    def paths(self, score_point: Tuple[float, float] = (1.0, 1.0)) -> List[ExecutionPath]:
+        """All (or the max_paths heaviest at score_point) start-to-end paths."""
+        self._score_point = score_point
+        return self._paths_from(self.graph.start_target, None, set())
+
+    def envelope(self) -> Cost:
+        """Coefficient-wise worst case over every path (sound even when paths are pruned)."""
+        return self._envelope_from(self.graph.start_target, None, set())
+
+    def path_count(self) -> int:
+        """Exact number of top-level paths (loop bodies folded)."""
+        return self._count_from(self.graph.start_target, None, set())
+
+    def loop_members(self) -> Dict[str, str]:
+        """Map each element inside a loop body to its innermost enclosing loop."""
+        bodies: Dict[str, set] = {}
+        for loop in self.graph.elements.values():
+            if loop.kind != 'loops':
+                continue
+            body, stack = set(), [loop.loop_body]
+            while stack:
+                name = stack.pop()
+                if name in body or name == loop.name or name not in self.graph.elements:
+                    continue
+                body.add(name)
+                node = self.graph.elements[name]
+                stack.extend([node.loop_body, node.loop_exit] if node.kind == 'loops'
+                             else [t for _, t in node.successors])
+            bodies[loop.name] = body
+
+        members: Dict[str, str] = {}
+        for loop, body in sorted(bodies.items(), key=lambda item: -len(item[1])):
+            for name in body:
+                members[name] = loop  # smaller (inner) bodies overwrite outer ones
+        return members
+
+    def dml_targets(self, trigger_object: Optional[str] = None) -> List[Dict]:
+        """
+        DML elements with the object and operation they write.
+
+        Returns:
+            List of dicts: element, object (None if unknown), operation
+            (insert/update/delete), cost (element Cost) and loop (enclosing
+            loop name or None)
+        """
+        operations = {'recordCreates': 'insert', 'recordUpdates': 'update', 'recordDeletes': 'delete'}
+        members = self.loop_members()
+        targets = []
+        for node in self.graph.elements.values():
+            if node.kind not in DML_ELEMENTS:
+                continue
+            ref = (_text(node.xml, 'inputReference') or '').split('.')[0]
+            implicit_record = self._implicit_record_update(node)
+            self_update = ref == '$Record' or (implicit_record and self.record_triggered)
+            if ref == '$Record' or implicit_record:
+                obj = trigger_object
+            else:
+                obj = _text(node.xml, 'object') or self.graph.reference_type(ref)
+            targets.append({
+                'element': node.name,
+                'object': obj,
+                'operation': operations[node.kind],
+                'cost': self.element_cost(node),
+                'loop': members.get(node.name),
+                'self_update': self_update,
+            })
+        return targets
+
+
 class FlowSimulator:
-    def __init__(self, xml_path: str, num_records: int = 200):
+    def __init__(self, xml_path: str, num_records: int = 200, loop_size: Optional[int] = None,
+                 collection_sizes: Optional[Dict[str, int]] = None, max_paths: int = 256,
+                 show_paths: int = 5, model: Optional[CostModel] = None, verbose: bool = True):
         self.xml_path = xml_path
         self.num_records = num_records
+        self.loop_size = loop_size
+        self.collection_sizes = collection_sizes or {}
+        self.max_paths = max_paths
+        self.show_paths = show_paths
+        self.model = model or CostModel()
+        self.verbose = verbose
         self.tree = None
         self.root = None
         self.namespace = {'ns': 'http://soap.sforce.com/2006/04/metadata'}
@@ -57,10 +607,19 @@ class FlowSimulator:
         self.warnings = []
         self.errors = []
         self.flow_type = "Unknown"
+        self.analyzer: Optional[FlowAnalyzer] = None
+        self.path_results: List[Dict] = []
+        self.path_count = 0
+        self.worst_cost: Optional[Cost] = None
+        self.path_costs: List[Cost] = []
+
+    def _print(self, *args):
+        if self.verbose:
+            print(*args)
 
     def simulate(self) -> Dict:
         """Main simulation entry point"""
-        print(f"\n🔬 Simulating Flow Execution with {self.num_records} records...\n")
+        self._print(f"\n🔬 Simulating Flow Execution with {self.num_records} records...\n")
 
         # Load flow
         if not self._load_xml():
@@ -68,8 +627,8 @@ class FlowSimulator:
 
         # Analyze flow structure
         self.flow_type = self._get_flow_type()
-        print(f"Flow Type: {self.flow_type}")
-        print(f"Processing {self.num_records} records in bulk...\n")
+        self._print(f"Flow Type: {self.flow_type}")
+        self._print(f"Processing {self.num_records} records in bulk...\n")
 
         # Simulate execution based on flow type
         self._simulate_flow_execution()
@@ -116,278 +675,223 @@ class FlowSimulator:
         """Check if this is a record-triggered flow"""
         return "Record-Triggered" in self.flow_type
 
-    def _simulate_flow_execution(self):
+    def evaluation_point(self, records: Optional[int] = None,
+                         loop_size: Optional[int] = None) -> Tuple[int, int]:
         """
-        Simulate flow execution and track resource usage.
+        (N, F) used to evaluate cost polynomials.
+
+        Record-triggered flows run one interview per record in the batch and
+        loops iterate related records (--loop-size, default 50). Other flows
+        run a single interview whose loops iterate --test-records items.
 
-        v2.1.0 FIX: Removed bulkSupport check - deprecated in API 60.0+
-        Record-triggered flows automatically handle bulk processing at the platform level.
-        The $Record context provides single-record access, but the platform batches
-        execution efficiently.
+        Args:
+            records: Batch size (default: num_records)
+            loop_size: Related records per loop (default: loop_size)
         """
+        records = self.num_records if records is None else records
+        loop_size = self.loop_size if loop_size is None else loop_size
         if self._is_record_triggered():
-            # v2.1.0: Record-triggered flows use $Record context
-            # Platform handles batching automatically - no bulkSupport element needed
-            self._simulate_record_triggered_flow()
-        else:
-            # Screen flows, Autolaunched flows, Scheduled flows
-            self._simulate_standard_flow()
+            return records, loop_size if loop_size is not None else 50
+        return 1, loop_size if loop_size is not None else records
 
-    def _simulate_record_triggered_flow(self):
+    def record_chunks(self, records: int) -> List[Tuple[int, int]]:
         """
-        Simulate record-triggered flow with $Record context.
-
-        v2.1.0 FIX: Record-triggered flows work with single-record context ($Record).
-        The platform batches executions automatically. Governor limits are PER TRANSACTION,
-        not per record. A batch of 200 records runs in one transaction with shared limits.
+        (chunk size, count) pairs a save of `records` runs the flow in.
 
-        Key insight: SOQL/DML counts are per-transaction, not multiplied by record count.
-        However, loops over RELATED records can still cause issues.
+        Record-triggered flows are invoked once per TRIGGER_CHUNK_SIZE records;
+        other flows run as a single interview.
         """
-        print("✓ Simulating record-triggered flow with $Record context...")
-        print("  (Platform handles bulk batching automatically in API 60.0+)\n")
-
-        # Count operations in the flow (per-transaction, NOT per-record)
-        dml_operations = self._count_dml_operations()
-        soql_queries = self._count_soql_queries()
-
-        # For record-triggered flows, these are PER TRANSACTION limits
-        self.metrics.dml_statements = dml_operations
-        self.metrics.soql_queries = soql_queries
-        self.metrics.dml_rows = self.num_records  # Each DML can affect up to batch size
-
-        # Estimate CPU time for record-triggered (much lower than individual processing)
-        self.metrics.cpu_time_ms = 50 + (self.num_records * 2)  # Base + minimal per-record
-
-        # Check for loops that might cause issues with RELATED records
-        self._analyze_loops_for_record_triggered()
-
-    def _simulate_standard_flow(self):
-        """Simulate non-record-triggered flows (Screen, Autolaunched, Scheduled)"""
-        print("✓ Simulating standard flow execution...")
-
-        # Count unique DML/SOQL operations (executed per invocation)
-        dml_operations = self._count_dml_operations()
-        soql_queries = self._count_soql_queries()
-
-        self.metrics.dml_statements = dml_operations
-        self.metrics.soql_queries = soql_queries
-        self.metrics.dml_rows = self.num_records * dml_operations
-
-        # Estimate CPU time
-        self.metrics.cpu_time_ms = 100 + (self.num_records * 5)
-
-        # Check for loops
-        self._analyze_loops()
-
-    def _count_dml_operations(self) -> int:
-        """Count DML operations in flow"""
-        dml_types = ['recordCreates', 'recordUpdates', 'recordDeletes']
-        count = 0
-        for dml_type in dml_types:
-            count += len(self.root.findall(f'ns:{dml_type}', self.namespace))
-        return count
-
-    def _count_soql_queries(self) -> int:
-        """Count SOQL queries in flow"""
-        return len(self.root.findall('ns:recordLookups', self.namespace))
-
-    def _analyze_loops_for_record_triggered(self):
+        if not self._is_record_triggered():
+            return [(records, 1)]
+        return trigger_chunks(records)
+
+    def evaluate_cost(self, cost: Cost, records: Optional[int] = None,
+                      loop_size: Optional[int] = None) -> Dict[str, int]:
+        """Cost for a save of `records`, summed over its trigger chunks."""
+        records = self.num_records if records is None else records
+        totals = dict.fromkeys(COST_METRICS, 0)
+        for size, count in self.record_chunks(records):
+            for metric, value in cost.evaluate(*self.evaluation_point(size, loop_size)).items():
+                totals[metric] += value * count
+        return totals
+
+    def _worst_batches(self, batches: List[Tuple[int, Optional[int]]]) -> List[List[float]]:
         """
-        Analyze loops in record-triggered flows.
+        Worst case at each (records, fan-out), summed over trigger chunks.
 
-        v2.1.0 FIX: In record-triggered flows, loops over RELATED records are valid.
-        We should only flag DML that is actually INSIDE the loop body (nextValueConnector path),
-        NOT DML that's on the exit path (noMoreValuesConnector).
+        All chunks of all batches are evaluated in one vectorised pass.
         """
-        loops = self.root.findall('.//ns:loops', self.namespace)
-
-        for loop in loops:
-            loop_name_elem = loop.find('ns:name', self.namespace)
-            loop_name = loop_name_elem.text if loop_name_elem is not None else 'Unknown'
-            self.metrics.loops_executed += 1
-
-            # Check if DML is INSIDE the loop (via nextValueConnector path)
-            if self._has_dml_in_loop_body(loop):
-                # Estimate iterations based on typical related record counts
-                estimated_iterations = 50  # Conservative estimate for related records
-                dml_in_loop = self._count_dml_in_loop_body(loop)
-                total_dml_from_loop = dml_in_loop * estimated_iterations
-
-                self.errors.append(
-                    f"❌ CRITICAL: Loop '{loop_name}' contains DML operations in loop body. "
-                    f"With ~{estimated_iterations} related records, this adds ~{total_dml_from_loop} DML statements "
-                    f"(limit: {self.limits.DML_STATEMENTS})"
-                )
-
-                self.metrics.dml_statements += total_dml_from_loop
-            else:
-                # Loop exists but DML is outside (correct collect-then-DML pattern)
-                print(f"  ✓ Loop '{loop_name}' follows correct collect-then-DML pattern")
-
-            # Add CPU time for loop processing
-            self.metrics.cpu_time_ms += 50 * 10  # ~10ms per iteration estimate
-
-    def _analyze_loops(self):
-        """Analyze loops for potential issues (standard flows)"""
-        loops = self.root.findall('.//ns:loops', self.namespace)
-
-        for loop in loops:
-            loop_name_elem = loop.find('ns:name', self.namespace)
-            loop_name = loop_name_elem.text if loop_name_elem is not None else 'Unknown'
-            self.metrics.loops_executed += 1
-
-            if self._has_dml_in_loop_body(loop):
-                iterations = self.num_records
-                dml_in_loop = self._count_dml_in_loop_body(loop)
-                total_dml_from_loop = dml_in_loop * iterations
-
-                self.errors.append(
-                    f"❌ CRITICAL: Loop '{loop_name}' contains DML operations. "
-                    f"With {iterations} records, this will execute {total_dml_from_loop} DML statements "
-                    f"(limit: {self.limits.DML_STATEMENTS})"
-                )
+        points, spans = [], []
+        for records, fan_out in batches:
+            chunks = self.record_chunks(records)
+            spans.append([(len(points) + i, count) for i, (_, count) in enumerate(chunks)])
+            points.extend(self.evaluation_point(size, fan_out) for size, _ in chunks)
+        values = self._worst_many(points) if points else []
+        return [[sum(values[i][k] * count for i, count in span) for k in range(len(COST_METRICS))]
+                for span in spans]
+
+    def _worst_many(self, points: List[Tuple[int, int]]) -> List[List[float]]:
+        """Worst case over the analyzed paths at each (N, F) point."""
+        worst = None
+        for cost in self.path_costs:
+            values = cost.evaluate_many(points)
+            worst = values if worst is None else [
+                [max(a, b) for a, b in zip(row_a, row_b)] for row_a, row_b in zip(worst, values)]
+        return worst or [[0.0] * len(COST_METRICS) for _ in points]
+
+    def sweep(self, batch_sizes: List[int], fan_outs: Optional[List[int]] = None,
+              max_records: int = 1000000) -> Dict:
+        """
+        Evaluate the cost model across batch sizes and loop fan-outs.
 
-                self.metrics.dml_statements += total_dml_from_loop
+        The flow is analyzed once; every grid point and breaking-point probe
+        evaluates the same path polynomials. Record-triggered flows are costed
+        per TRIGGER_CHUNK_SIZE chunk, so statement counts grow with the number
+        of chunks in the save.
 
-            self.metrics.cpu_time_ms += self.num_records * 10
+        Args:
+            batch_sizes: Record counts to tabulate
+            fan_outs: Related records per loop (ignored for flows whose loops
+                iterate the batch itself, unless --loop-size is set)
+            max_records: Upper bound for the breaking-point search
 
-    def _has_dml_in_loop_body(self, loop_elem) -> bool:
+        Returns:
+            Dict with 'grid' rows and per-fan-out 'breaking_points'
         """
-        Check if loop body (nextValueConnector path) contains DML.
-
-        v2.1.0 FIX: Properly distinguishes between:
-        - nextValueConnector: Points to loop body (INSIDE the loop)
-        - noMoreValuesConnector: Points to exit path (OUTSIDE the loop)
-
-        Only flag DML that is reachable via nextValueConnector before returning to loop.
+        if self.root is None and not self._load_xml():
+            return {'errors': self.errors}
+        if self.analyzer is None:
+            self.flow_type = self._get_flow_type()
+            self._simulate_flow_execution()
+
+        if not self._is_record_triggered() and self.loop_size is None:
+            fan_outs = [None]
+        fan_outs = fan_outs or [self.loop_size if self.loop_size is not None else 50]
+
+        grid_points = [(r, fo) for fo in fan_outs for r in batch_sizes]
+        values = self._worst_batches(grid_points)
+        grid = []
+        for (records, fan_out), row in zip(grid_points, values):
+            metrics = {m: int(round(v)) for m, v in zip(COST_METRICS, row)}
+            grid.append({
+                'records': records,
+                'fan_out': fan_out,
+                'metrics': metrics,
+                'exceeded': [m for m in COST_METRICS if metrics[m] > METRIC_LIMITS[m]],
+            })
+
+        breaking = {}
+        for fan_out in fan_outs:
+            breaking[str(fan_out) if fan_out is not None else '-'] = self._breaking_points(fan_out, max_records)
+        return {'flow_type': self.flow_type, 'chunk_size': TRIGGER_CHUNK_SIZE if self._is_record_triggered() else None,
+                'grid': grid, 'breaking_points': breaking,
+                'exceeded': any(row['exceeded'] for row in grid)}
+
+    def _breaking_points(self, fan_out: Optional[int], max_records: int) -> Dict[str, Optional[int]]:
         """
-        # Get loop name to detect loop-back
-        loop_name_elem = loop_elem.find('ns:name', self.namespace)
-        loop_name = loop_name_elem.text if loop_name_elem is not None else ''
-
-        # Get the nextValueConnector (loop body entry point)
-        next_connector = loop_elem.find('ns:nextValueConnector/ns:targetReference', self.namespace)
-        if next_connector is None:
-            return False
-
-        # Get the noMoreValuesConnector (exit path - DML here is OK)
-        exit_connector = loop_elem.find('ns:noMoreValuesConnector/ns:targetReference', self.namespace)
-        exit_target = exit_connector.text if exit_connector is not None else None
-
-        # Build element map for efficient lookup
-        element_map = self._build_element_map()
-
-        # Check the loop body path
-        visited = set()
-        return self._check_path_for_dml_in_loop(
-            next_connector.text, loop_name, exit_target, visited, element_map
-        )
-
-    def _build_element_map(self) -> Dict:
-        """Build a map of element names to (type, element) for fast lookup"""
-        element_map = {}
-        element_types = [
-            'assignments', 'decisions', 'recordCreates', 'recordUpdates',
-            'recordDeletes', 'recordLookups', 'loops', 'subflows', 'screens'
-        ]
-        for elem_type in element_types:
-            for elem in self.root.findall(f'.//ns:{elem_type}', self.namespace):
-                name_elem = elem.find('ns:name', self.namespace)
-                if name_elem is not None:
-                    element_map[name_elem.text] = (elem_type, elem)
-        return element_map
-
-    def _check_path_for_dml_in_loop(self, current: str, loop_name: str, exit_target: str,
-                                     visited: set, element_map: Dict) -> bool:
+        Smallest record count at which each limit is exceeded (None if never
+        within max_records). Costs are monotone in the record count, so all
+        metrics are bisected together, one vectorised evaluation per step.
         """
-        Recursively check if path contains DML before exiting loop.
+        def over(records_per_metric: List[int]) -> List[bool]:
+            rows = self._worst_batches([(r, fan_out) for r in records_per_metric])
+            return [rows[i][i] > METRIC_LIMITS[m] for i, m in enumerate(COST_METRICS)]
+
+        k = len(COST_METRICS)
+        hi_ok = over([max_records] * k)
+        lo, hi = [0] * k, [max_records] * k
+        while any(h - l > 1 for l, h, ok in zip(lo, hi, hi_ok) if ok):
+            mid = [(l + h) // 2 for l, h in zip(lo, hi)]
+            for i, exceeded in enumerate(over(mid)):
+                if hi_ok[i] and hi[i] - lo[i] > 1:
+                    if exceeded:
+                        hi[i] = mid[i]
+                    else:
+                        lo[i] = mid[i]
+        return {m: (hi[i] if hi_ok[i] else None) for i, m in enumerate(COST_METRICS)}
 
-        Returns True only if DML is found in the loop body (before looping back or exiting).
+    def _simulate_flow_execution(self):
         """
-        if current in visited:
-            return False
-        if current == loop_name:
-            # Looped back - this is expected, no DML found on this path segment
-            return False
-        if current == exit_target:
-            # Reached exit path - DML here is OUTSIDE the loop (correct pattern)
-            return False
-
-        visited.add(current)
-
-        if current not in element_map:
-            return False
-
-        elem_type, elem = element_map[current]
-
-        # Check if this is a DML operation
-        if elem_type in ['recordCreates', 'recordUpdates', 'recordDeletes']:
-            return True
-
-        # Follow connectors
-        connectors = []
-
-        connector = elem.find('ns:connector/ns:targetReference', self.namespace)
-        if connector is not None:
-            connectors.append(connector.text)
-
-        for rule in elem.findall('.//ns:rules', self.namespace):
-            rule_connector = rule.find('ns:connector/ns:targetReference', self.namespace)
-            if rule_connector is not None:
-                connectors.append(rule_connector.text)
-
-        default_connector = elem.find('ns:defaultConnector/ns:targetReference', self.namespace)
-        if default_connector is not None:
-            connectors.append(default_connector.text)
-
-        for next_target in connectors:
-            if self._check_path_for_dml_in_loop(next_target, loop_name, exit_target, visited.copy(), element_map):
-                return True
-
-        return False
-
-    def _count_dml_in_loop_body(self, loop_elem) -> int:
-        """Count DML operations in loop body"""
-        loop_name_elem = loop_elem.find('ns:name', self.namespace)
-        loop_name = loop_name_elem.text if loop_name_elem is not None else ''
-
-        next_connector = loop_elem.find('ns:nextValueConnector/ns:targetReference', self.namespace)
-        if next_connector is None:
-            return 0
-
-        exit_connector = loop_elem.find('ns:noMoreValuesConnector/ns:targetReference', self.namespace)
-        exit_target = exit_connector.text if exit_connector is not None else None
-
-        element_map = self._build_element_map()
-        visited = set()
-        return self._count_dml_in_path(next_connector.text, loop_name, exit_target, visited, element_map)
-
-    def _count_dml_in_path(self, current: str, loop_name: str, exit_target: str,
-                           visited: set, element_map: Dict) -> int:
-        """Count DML operations in path"""
-        if current in visited or current == loop_name or current == exit_target:
-            return 0
-        if current not in element_map:
-            return 0
-
-        visited.add(current)
-        elem_type, elem = element_map[current]
-        count = 1 if elem_type in ['recordCreates', 'recordUpdates', 'recordDeletes'] else 0
-
-        connector = elem.find('ns:connector/ns:targetReference', self.namespace)
-        if connector is not None:
-            count += self._count_dml_in_path(connector.text, loop_name, exit_target, visited.copy(), element_map)
+        Simulate flow execution and track resource usage.
 
-        return count
+        Record-triggered flows are bulkified by the platform: each element runs
+        once per chunk of up to 200 interviews, so SOQL/DML statement counts
+        scale with the number of chunks rather than with N, while rows and CPU
+        scale with N. Elements inside a loop run once per iteration.
+        """
+        if self._is_record_triggered():
+            self._print("✓ Simulating record-triggered flow with $Record context...")
+            self._print("  (Platform handles bulk batching automatically in API 60.0+)\n")
+        else:
+            self._print("✓ Simulating standard flow execution...")
+
+        self.analyzer = FlowAnalyzer(
+            self.xml_path, self.model, self.collection_sizes,
+            before_save='Before Save' in self.flow_type, max_paths=self.max_paths)
+        n, f = self.evaluation_point()
+
+        paths = self.analyzer.paths(score_point=(n, f))
+        self.path_count = self.analyzer.path_count()
+        for path in paths:
+            self.path_results.append({
+                'outcomes': list(path.outcomes),
+                'elements': path.elements,
+                'metrics': self.evaluate_cost(path.cost),
+            })
+        self.path_results.sort(key=lambda p: max(
+            p['metrics'][m] / METRIC_LIMITS[m] for m in COST_METRICS), reverse=True)
+
+        # Worst case: exact max over paths, or the envelope when paths were pruned
+        self.worst_cost = self.analyzer.envelope()
+        if self.analyzer.truncated or not self.path_results:
+            self.path_costs = [self.worst_cost]
+            worst = self.evaluate_cost(self.worst_cost)
+            self.warnings.append(
+                f"⚠️  {self.path_count} paths - analyzed the {self.max_paths} heaviest; "
+                f"worst case is an upper bound")
+        else:
+            self.path_costs = [path.cost for path in paths]
+            worst = {m: max(p['metrics'][m] for p in self.path_results) for m in COST_METRICS}
+
+        for metric, value in worst.items():
+            setattr(self.metrics, metric, value)
+        self.metrics.loops_executed = sum(
+            1 for e in self.analyzer.graph.elements.values() if e.kind == 'loops')
+        self.metrics.decisions_evaluated = sum(
+            1 for e in self.analyzer.graph.elements.values() if e.kind == 'decisions')
+
+        self._report_loops(n, f)
+        for note in self.analyzer.notes:
+            self.warnings.append(f"⚠️  {note}")
+
+    def _report_loops(self, n: int, f: int):
+        """Flag loops whose body issues SOQL or DML on every iteration."""
+        for loop in self.analyzer.graph.elements.values():
+            if loop.kind != 'loops':
+                continue
+            body = self.analyzer.loop_findings.get(loop.name)
+            if body is None:
+                self._print(f"  ✓ Loop '{loop.name}' follows correct collect-then-DML pattern")
+                continue
+
+            iterations = self.collection_sizes.get(loop.name, f)
+            per_iteration = body.evaluate(n, f)
+            parts = []
+            if per_iteration['dml_statements']:
+                parts.append(f"~{per_iteration['dml_statements'] * iterations} DML statements "
+                             f"(limit: {self.limits.DML_STATEMENTS})")
+            if per_iteration['soql_queries']:
+                parts.append(f"~{per_iteration['soql_queries'] * iterations} SOQL queries "
+                             f"(limit: {self.limits.SOQL_QUERIES})")
+            kind = "DML operations" if per_iteration['dml_statements'] else "SOQL queries"
+            self.errors.append(
+                f"❌ CRITICAL: Loop '{loop.name}' contains {kind} in loop body. "
+                f"With {iterations} iterations, this adds {' and '.join(parts)}"
+            )
 
-    def _find_element_by_name(self, name: str, elem_type: str):
-        """Find element by name and type"""
-        for elem in self.root.findall(f'ns:{elem_type}', self.namespace):
-            name_elem = elem.find('ns:name', self.namespace)
-            if name_elem is not None and name_elem.text == name:
-                return elem
-        return None
+        for name, body in self.analyzer.loop_findings.items():
+            if '.' in name:
+                self.warnings.append(f"⚠️  Subflow loop '{name}' issues SOQL/DML per iteration")
 
     def _check_governor_limits(self):
         """Check if metrics exceed governor limits"""
@@ -433,73 +937,91 @@ class FlowSimulator:
 
     def _generate_report(self) -> Dict:
         """Generate simulation report"""
-        print("\n" + "━" * 70)
-        print("Flow Simulation Report")
-        print("━" * 70)
-        print(f"\nTest Configuration:")
-        print(f"  Records Processed: {self.num_records}")
-        print(f"  Flow: {self.xml_path.split('/')[-1]}")
-        print(f"  Flow Type: {self.flow_type}")
+        self._print("\n" + "━" * 70)
+        self._print("Flow Simulation Report")
+        self._print("━" * 70)
+        self._print(f"\nTest Configuration:")
+        self._print(f"  Records Processed: {self.num_records}")
+        self._print(f"  Flow: {self.xml_path.split('/')[-1]}")
+        self._print(f"  Flow Type: {self.flow_type}")
 
         if self._is_record_triggered():
-            print(f"\n📋 Note: Record-triggered flows use $Record context.")
-            print(f"   Platform handles bulk batching automatically (API 60.0+).")
-            print(f"   Limits below are PER TRANSACTION, not per record.")
-
-        print(f"\n📊 Resource Usage (per transaction):")
-        print(f"  SOQL Queries:    {self.metrics.soql_queries:4d} / {self.limits.SOQL_QUERIES} "
-              f"({self._percentage(self.metrics.soql_queries, self.limits.SOQL_QUERIES)}%)")
-        print(f"  SOQL Records:    {self.metrics.soql_records:4d} / {self.limits.SOQL_RECORDS} "
-              f"({self._percentage(self.metrics.soql_records, self.limits.SOQL_RECORDS)}%)")
-        print(f"  DML Statements:  {self.metrics.dml_statements:4d} / {self.limits.DML_STATEMENTS} "
-              f"({self._percentage(self.metrics.dml_statements, self.limits.DML_STATEMENTS)}%)")
-        print(f"  DML Rows:        {self.metrics.dml_rows:4d} / {self.limits.DML_ROWS} "
-              f"({self._percentage(self.metrics.dml_rows, self.limits.DML_ROWS)}%)")
-        print(f"  CPU Time:        {self.metrics.cpu_time_ms:4d}ms / {self.limits.CPU_TIME_MS}ms "
-              f"({self._percentage(self.metrics.cpu_time_ms, self.limits.CPU_TIME_MS)}%)")
+            self._print(f"\n📋 Note: Record-triggered flows use $Record context.")
+            self._print(f"   Platform handles bulk batching automatically (API 60.0+).")
+            self._print(f"   Limits below are PER TRANSACTION, not per record.")
+            if self.num_records > TRIGGER_CHUNK_SIZE:
+                self._print(f"   {self.num_records} records run as {-(-self.num_records // TRIGGER_CHUNK_SIZE)} "
+                            f"chunks of up to {TRIGGER_CHUNK_SIZE} in one transaction.")
+
+        self._print(f"\n📊 Resource Usage (per transaction):")
+        self._print(f"  SOQL Queries:    {self.metrics.soql_queries:4d} / {self.limits.SOQL_QUERIES} "
+                    f"({self._percentage(self.metrics.soql_queries, self.limits.SOQL_QUERIES)}%)")
+        self._print(f"  SOQL Records:    {self.metrics.soql_records:4d} / {self.limits.SOQL_RECORDS} "
+                    f"({self._percentage(self.metrics.soql_records, self.limits.SOQL_RECORDS)}%)")
+        self._print(f"  DML Statements:  {self.metrics.dml_statements:4d} / {self.limits.DML_STATEMENTS} "
+                    f"({self._percentage(self.metrics.dml_statements, self.limits.DML_STATEMENTS)}%)")
+        self._print(f"  DML Rows:        {self.metrics.dml_rows:4d} / {self.limits.DML_ROWS} "
+                    f"({self._percentage(self.metrics.dml_rows, self.limits.DML_ROWS)}%)")
+        self._print(f"  CPU Time:        {self.metrics.cpu_time_ms:4d}ms / {self.limits.CPU_TIME_MS}ms "
+                    f"({self._percentage(self.metrics.cpu_time_ms, self.limits.CPU_TIME_MS)}%)")
+
+        # Heaviest paths
+        if self.path_results and self.show_paths:
+            n, f = self.evaluation_point()
+            self._print(f"\n🛤️  Execution Paths: {self.path_count} (N={n} interviews, F={f} loop items)")
+            for i, path in enumerate(self.path_results[:self.show_paths], 1):
+                m = path['metrics']
+                route = ' · '.join(path['outcomes']) or '(straight line)'
+                self._print(f"  {i}. SOQL {m['soql_queries']:3d} | rows {m['soql_records']:6d} | "
+                            f"DML {m['dml_statements']:3d} | rows {m['dml_rows']:6d} | "
+                            f"CPU {m['cpu_time_ms']:5d}ms  {route}")
 
         # Errors
         if self.errors:
-            print(f"\n❌ Errors ({len(self.errors)}):")
+            self._print(f"\n❌ Errors ({len(self.errors)}):")
             for error in self.errors:
-                print(f"  {error}")
+                self._print(f"  {error}")
         else:
-            print(f"\n✓ No governor limit errors detected")
+            self._print(f"\n✓ No governor limit errors detected")
 
         # Warnings
         if self.warnings:
-            print(f"\n⚠️  Warnings ({len(self.warnings)}):")
+            self._print(f"\n⚠️  Warnings ({len(self.warnings)}):")
             for warning in self.warnings:
-                print(f"  {warning}")
+                self._print(f"  {warning}")
 
         # Overall status
-        print("\n" + "━" * 70)
+        self._print("\n" + "━" * 70)
         if self.errors:
-            print("❌ SIMULATION FAILED - Flow will hit governor limits with bulk data")
-            print("\nRecommendations:")
-            print("  1. Move DML operations outside of loops (collect-then-DML pattern)")
-            print("  2. Use collection variables to batch records")
-            print("  3. Consider using Transform element for field mapping")
+            self._print("❌ SIMULATION FAILED - Flow will hit governor limits with bulk data")
+            self._print("\nRecommendations:")
+            self._print("  1. Move DML operations outside of loops (collect-then-DML pattern)")
+            self._print("  2. Use collection variables to batch records")
+            self._print("  3. Consider using Transform element for field mapping")
             if self._is_record_triggered():
-                print("  4. For record-triggered flows, loops should only iterate RELATED records")
+                self._print("  4. For record-triggered flows, loops should only iterate RELATED records")
             status = "FAILED"
         elif self.warnings:
-            print("⚠️  SIMULATION PASSED WITH WARNINGS - Monitor closely in production")
+            self._print("⚠️  SIMULATION PASSED WITH WARNINGS - Monitor closely in production")
             status = "WARNING"
         else:
-            print("✓ SIMULATION PASSED - Flow is ready for production")
+            self._print("✓ SIMULATION PASSED - Flow is ready for production")
             if self._is_record_triggered():
-                print("  (Record-triggered flow with proper $Record context usage)")
+                self._print("  (Record-triggered flow with proper $Record context usage)")
             status = "PASSED"
 
-        print("━" * 70 + "\n")
+        self._print("━" * 70 + "\n")
 
         return {
             'status': status,
             'flow_type': self.flow_type,
             'metrics': self.metrics.__dict__,
             'errors': self.errors,
-            'warnings': self.warnings
+            'warnings': self.warnings,
+            'evaluation_point': dict(zip(('N', 'F'), self.evaluation_point())) if self.root is not None else {},
+            'worst_case': self.worst_cost.to_dict() if self.worst_cost else {},
+            'path_count': self.path_count,
+            'paths': self.path_results,
         }
 
     def _percentage(self, value: int, limit: int) -> int:
@@ -508,6 +1030,39 @@ class FlowSimulator:
             return 0
         return int((value / limit) * 100)
 
+def _int_list(value: str) -> List[int]:
+    try:
+        return [int(v) for v in value.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got '{value}'")
+
+
+def print_sweep(result: Dict, flow_name: str):
+    """Print a sweep as a volume table plus breaking points per limit."""
+    labels = {'soql_queries': 'SOQL', 'soql_records': 'SOQL rows', 'dml_statements': 'DML',
+              'dml_rows': 'DML rows', 'cpu_time_ms': 'CPU ms'}
+    print("\n" + "━" * 70)
+    print(f"Flow Volume Sweep: {flow_name} ({result['flow_type']})")
+    if result.get('chunk_size'):
+        print(f"  Saves run the flow once per {result['chunk_size']} records; chunks share one transaction")
+    print("━" * 70)
+    header = f"  {'Records':>8} {'Fan-out':>8} " + " ".join(f"{labels[m]:>10}" for m in COST_METRICS)
+    print(header)
+    for row in result['grid']:
+        cells = []
+        for m in COST_METRICS:
+            mark = '!' if m in row['exceeded'] else ' '
+            cells.append(f"{row['metrics'][m]:>9}{mark}")
+        fan_out = row['fan_out'] if row['fan_out'] is not None else '-'
+        print(f"  {row['records']:>8} {fan_out:>8} " + " ".join(cells))
+
+    print("\n📉 Breaking points (first record count over the limit):")
+    for fan_out, points in result['breaking_points'].items():
+        parts = [f"{labels[m]}: {points[m] if points[m] is not None else 'never'}" for m in COST_METRICS]
+        print(f"  fan-out {fan_out:>5}  " + " | ".join(parts))
+    print("━" * 70 + "\n")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Simulate Salesforce Flow execution with bulk data'
@@ -519,11 +1074,52 @@ def main():
                        help='Generate mock data for testing')
     parser.add_argument('--analyze-only', action='store_true',
                        help='Analyze flow structure without simulation')
+    parser.add_argument('--loop-size', type=int,
+                       help='Items per loop iteration (default: 50 for record-triggered flows, '
+                            'otherwise --test-records)')
+    parser.add_argument('--collection-size', action='append', default=[], metavar='LOOP=N',
+                       help='Iteration count for a specific loop element (repeatable)')
+    parser.add_argument('--max-paths', type=int, default=256,
+                       help='Keep at most this many heaviest paths per sub-path (default: 256)')
+    parser.add_argument('--show-paths', type=int, default=5,
+                       help='Number of heaviest paths to print (default: 5, 0 to hide)')
+    parser.add_argument('--format', choices=['console', 'json'], default='console',
+                       help='Output format (default: console)')
+    parser.add_argument('--sweep', type=_int_list, metavar='N1,N2,...',
+                       help='Evaluate these batch sizes in one pass and report breaking points')
+    parser.add_argument('--fan-out', type=_int_list, metavar='F1,F2,...',
+                       help='Related records per loop to sweep (record-triggered flows; default: --loop-size or 50)')
+    parser.add_argument('--sweep-max', type=int, default=1000000,
+                       help='Largest record count searched for breaking points (default: 1000000)')
 
     args = parser.parse_args()
 
-    simulator = FlowSimulator(args.flow_xml, args.test_records)
+    collection_sizes = {}
+    for item in args.collection_size:
+        loop, _, size = item.partition('=')
+        if not size.isdigit():
+            parser.error(f"--collection-size expects LOOP=N, got '{item}'")
+        collection_sizes[loop] = int(size)
+
+    simulator = FlowSimulator(args.flow_xml, args.test_records, loop_size=args.loop_size,
+                              collection_sizes=collection_sizes, max_paths=args.max_paths,
+                              show_paths=args.show_paths,
+                              verbose=args.format == 'console' and not args.sweep)
+    if args.sweep:
+        result = simulator.sweep(args.sweep, args.fan_out, args.sweep_max)
+        if 'errors' in result:
+            print(f"❌ {result['errors'][0]}")
+            sys.exit(1)
+        if args.format == 'json':
+            print(json.dumps(result, indent=2))
+        else:
+            print_sweep(result, os.path.basename(args.flow_xml))
+        # Like a failed single run, any grid point over a limit fails the build
+        sys.exit(1 if result['exceeded'] else 0)
+
     result = simulator.simulate()
+    if args.format == 'json':
+        print(json.dumps(result, indent=2, ensure_ascii=False))
 
     # Exit with error code if simulation failed
     if result['status'] == 'FAILED':
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Salesforce Transaction Simulator - Combined Record-Triggered Automation (v1.0.0)
+
+Governor limits are shared by everything that fires in one save: before-save
+flows, Trigger Actions Framework (TAF) actions, after-save flows, and every
+save those cause in turn. This script indexes a project's record-triggered
+flows and Trigger_Action__mdt records by object and context, orders them the
+way the platform does, and simulates the combined SOQL/DML/CPU budget of a
+save, following DML into nested saves (including recursive updates of the
+same object).
+
+Order of execution modelled per save:
+    1. Before-save flows (by triggerOrder, then name)
+    2. TAF before actions (by Order__c)
+    3. TAF after actions (by Order__c)
+    4. After-save flows (by triggerOrder, then name)
+
+A save of more than 200 records runs all of them once per 200-record chunk,
+every chunk drawing on the same transaction limits.
+
+Recursion model (static heuristics):
+- After-save flows without entry conditions re-run on recursive updates
+  (the pattern validate_flow.py flags as an infinite-loop risk); flows with
+  entry conditions run once per object/operation in the transaction
+- TAF flow actions re-run only when Allow_Flow_Recursion__c is true
+- TAF Apex actions re-run on every nested save (recursion guards inside the
+  class are not visible statically)
+- Nesting stops at --max-depth (the platform's trigger depth limit is 16)
+
+Usage:
+    python3 simulate_transaction.py <project-dir> --object Account --operation update
+    python3 simulate_transaction.py <project-dir> --object Lead --records 200 --loop-size 20
+    python3 simulate_transaction.py <project-dir> --list
+"""
+
+import os
+import re
+import sys
+import argparse
+import json
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from simulate_flow import (  # noqa: E402
+    COST_METRICS, METRIC_LIMITS, NS, Cost, CostModel, FlowAnalyzer, _text, trigger_chunks,
+)
+
+MD_NS = '{http://soap.sforce.com/2006/04/metadata}'
+XSI_NIL = '{http://www.w3.org/2001/XMLSchema-instance}nil'
+
+OPERATIONS = ('insert', 'update', 'delete', 'undelete')
+
+# Flow recordTriggerType -> operations it fires on
+FLOW_TRIGGER_OPERATIONS = {
+    'Create': ('insert',),
+    'Update': ('update',),
+    'CreateAndUpdate': ('insert', 'update'),
+    'Delete': ('delete',),
+}
+
+# Trigger_Action__mdt context field -> (timing, operation)
+TAF_CONTEXT_FIELDS = {
+    'Before_Insert__c': ('before', 'insert'),
+    'After_Insert__c': ('after', 'insert'),
+    'Before_Update__c': ('before', 'update'),
+    'After_Update__c': ('after', 'update'),
+    'Before_Delete__c': ('before', 'delete'),
+    'After_Delete__c': ('after', 'delete'),
+    'After_Undelete__c': ('after', 'undelete'),
+}
+
+# Execution phases within one save, in platform order
+PHASES = ('before_flow', 'before_trigger', 'after_trigger', 'after_flow')
+PHASE_LABELS = {
+    'before_flow': 'Before-Save Flow',
+    'before_trigger': 'TAF Before',
+    'after_trigger': 'TAF After',
+    'after_flow': 'After-Save Flow',
+}
+
+TAF_FLOW_CLASS = 'TriggerActionFlow'
+APEX_SOQL_RE = re.compile(r'\[\s*SELECT\b|Database\.(?:query|countQuery|getQueryLocator)\s*\(', re.IGNORECASE)
+APEX_DML_RE = re.compile(
+    r'\b(?:insert|update|upsert|delete|undelete|merge)\s+[\w\[(]'
+    r'|Database\.(?:insert|update|upsert|delete|undelete|merge)\s*\(', re.IGNORECASE)
+
+
+@dataclass
+class AutomationStep:
+    """One piece of automation registered on an object/operation."""
+    name: str
+    kind: str                      # 'flow', 'taf_apex' or 'taf_flow'
+    object: str
+    phase: str
+    operations: Tuple[str, ...]
+    order: float = 0.0
+    path: Optional[str] = None
+    has_entry_conditions: bool = False
+    allow_recursion: bool = True
+    bypassed: bool = False
+    active: bool = True
+
+
+@dataclass
+class TimelineEntry:
+    """One execution of a step inside the simulated transaction."""
+    depth: int
+    object: str
+    operation: str
+    records: int
+    phase: str
+    step: str
+    kind: str
+    repeat: int
+    metrics: Dict[str, int]
+    cumulative: Dict[str, int] = field(default_factory=dict)
+
+
+def _md_values(path: str) -> Dict[str, Optional[str]]:
+    """Field -> value map of a CustomMetadata record file (nil values are None)."""
+    root = ET.parse(path).getroot()
+    values = {}
+    for value in root.findall(f'{MD_NS}values'):
+        name = value.find(f'{MD_NS}field')
+        val = value.find(f'{MD_NS}value')
+        if name is None:
+            continue
+        if val is None or val.get(XSI_NIL) == 'true':
+            values[name.text] = None
+        else:
+            values[name.text] = (val.text or '').strip()
+    return values
+
+
+def _is_true(value: Optional[str]) -> bool:
+    return (value or '').lower() == 'true'
+
+
+class AutomationIndex:
+    """Record-triggered flows and TAF actions in a project, indexed by object and operation."""
+
+    def __init__(self, project_dir: str):
+        self.project_dir = os.path.abspath(project_dir)
+        self.steps: List[AutomationStep] = []
+        self.flows: Dict[str, str] = {}          # flow API name -> file
+        self.apex_classes: Dict[str, str] = {}   # class name -> file
+        self.settings: Dict[str, str] = {}       # sObject_Trigger_Setting developer name -> object
+        self.errors: List[str] = []
+        self._by_key: Dict[Tuple[str, str], List[AutomationStep]] = {}
+        self._scan()
+
+    def _scan(self):
+        trigger_actions = []
+        for dirpath, dirnames, filenames in os.walk(self.project_dir):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if filename.endswith('.flow-meta.xml'):
+                    self.flows[filename[:-len('.flow-meta.xml')]] = path
+                elif filename.endswith('.cls'):
+                    self.apex_classes[filename[:-len('.cls')]] = path
+                elif filename.startswith('sObject_Trigger_Setting.') and filename.endswith('.md-meta.xml'):
+                    self._load_setting(path, filename)
+                elif filename.startswith('Trigger_Action.') and filename.endswith('.md-meta.xml'):
+                    trigger_actions.append(path)
+
+        for name, path in sorted(self.flows.items()):
+            self._load_flow(name, path)
+        # Settings must be known before actions can be mapped to objects
+        for path in sorted(trigger_actions):
+            self._load_trigger_action(path)
+
+        for step in self.steps:
+            for operation in step.operations:
+                self._by_key.setdefault((step.object.lower(), operation), []).append(step)
+
+    def _load_setting(self, path: str, filename: str):
+        developer_name = filename[len('sObject_Trigger_Setting.'):-len('.md-meta.xml')]
+        try:
+            obj = _md_values(path).get('Object_API_Name__c')
+        except ET.ParseError as e:
+            self.errors.append(f"{path}: {e}")
+            return
+        if obj:
+            self.settings[developer_name] = obj
+
+    def _load_flow(self, name: str, path: str):
+        try:
+            root = ET.parse(path).getroot()
+        except ET.ParseError as e:
+            self.errors.append(f"{path}: {e}")
+            return
+        start = root.find(f'{NS}start')
+        if start is None:
+            return
+        trigger_type = _text(start, 'triggerType') or ''
+        obj = _text(start, 'object')
+        operations = FLOW_TRIGGER_OPERATIONS.get(_text(start, 'recordTriggerType') or '')
+        if not obj or not operations or not trigger_type.startswith('Record'):
+            return
+        order = _text(root, 'triggerOrder') or _text(start, 'triggerOrder') or '0'
+        has_conditions = (start.find(f'{NS}filters') is not None
+                          or start.find(f'{NS}filterLogic') is not None
+                          or start.find(f'{NS}filterFormula') is not None)
+        self.steps.append(AutomationStep(
+            name=name,
+            kind='flow',
+            object=obj,
+            phase='after_flow' if trigger_type == 'RecordAfterSave' else 'before_flow',
+            operations=operations,
+            order=float(order) if order.replace('.', '', 1).isdigit() else 0.0,
+            path=path,
+            has_entry_conditions=has_conditions,
+            active=(_text(root, 'status') or 'Active') == 'Active',
+        ))
+
+    def _load_trigger_action(self, path: str):
+        try:
+            values = _md_values(path)
+        except ET.ParseError as e:
+            self.errors.append(f"{path}: {e}")
+            return
+        label = os.path.basename(path)[len('Trigger_Action.'):-len('.md-meta.xml')]
+        apex_class = values.get('Apex_Class_Name__c') or ''
+        flow_name = values.get('Flow_Name__c')
+        is_flow = bool(flow_name) or apex_class == TAF_FLOW_CLASS
+        order = values.get('Order__c') or '0'
+
+        contexts = [(field_name, values[field_name]) for field_name in TAF_CONTEXT_FIELDS
+                    if values.get(field_name)]
+        if not contexts and values.get('sObject__c'):
+            self.errors.append(f"{label}: uses sObject__c instead of a context field "
+                               f"(Before_Insert__c, After_Update__c, ...) - not registered")
+            return
+
+        for field_name, setting in contexts:
+            timing, operation = TAF_CONTEXT_FIELDS[field_name]
+            setting_name = setting.split('.', 1)[-1]
+            obj = self.settings.get(setting_name, setting_name)
+            self.steps.append(AutomationStep(
+                name=flow_name or apex_class or label,
+                kind='taf_flow' if is_flow else 'taf_apex',
+                object=obj,
+                phase=f'{timing}_trigger',
+                operations=(operation,),
+                order=float(order) if order.replace('.', '', 1).isdigit() else 0.0,
+                path=self.flows.get(flow_name) if is_flow else self.apex_classes.get(apex_class),
+                has_entry_conditions=bool(values.get('Entry_Criteria__c')),
+                allow_recursion=_is_true(values.get('Allow_Flow_Recursion__c')) if is_flow else True,
+                bypassed=_is_true(values.get('Bypass_Execution__c')),
+            ))
+
+    def steps_for(self, obj: str, operation: str) -> List[AutomationStep]:
+        """Active steps for a save, in execution order."""
+        steps = [s for s in self._by_key.get((obj.lower(), operation), [])
+                 if s.active and not s.bypassed]
+        return sorted(steps, key=lambda s: (PHASES.index(s.phase), s.order, s.name))
+
+    def objects(self) -> List[str]:
+        return sorted({s.object for s in self.steps}, key=str.lower)
+
+
+class TransactionSimulator:
+    """Simulates one save and every nested save it causes."""
+
+    def __init__(self, index: AutomationIndex, records: int = 200, loop_size: int = 50,
+                 max_depth: int = 16, model: Optional[CostModel] = None, max_entries: int = 2000):
+        self.index = index
+        self.records = records
+        self.loop_size = loop_size
+        self.max_depth = max_depth
+        self.model = model or CostModel()
+        self.max_entries = max_entries
+        self.timeline: List[TimelineEntry] = []
+        self.totals = {m: 0 for m in COST_METRICS}
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self._analysis: Dict[Tuple[str, str, bool], Tuple[Cost, List[Dict]]] = {}
+        self._apex_costs: Dict[str, Cost] = {}
+        self._truncated = False
+
+    # ------------------------------------------------------------------
+    # Step costs
+    # ------------------------------------------------------------------
+
+    def _flow_analysis(self, step: AutomationStep) -> Tuple[Cost, List[Dict]]:
+        key = (step.path, step.object, step.phase == 'before_flow')
+        if key not in self._analysis:
+            analyzer = FlowAnalyzer(step.path, self.model, before_save=step.phase == 'before_flow')
+            cost = analyzer.envelope()
+            self._analysis[key] = (cost, analyzer.dml_targets(step.object))
+            for note in analyzer.notes:
+                self._warn(f"{step.name}: {note}")
+        return self._analysis[key]
+
+    def _apex_cost(self, step: AutomationStep) -> Cost:
+        """Static estimate for a TAF Apex action: SOQL/DML statements counted in its source."""
+        if step.name in self._apex_costs:
+            return self._apex_costs[step.name]
+        # Apex actions run once per batch; per-record work is approximated as element CPU
+        base = (Cost.of(cpu_time_ms=self.model.cpu_per_action_ms)
+                + Cost.of((1, 0), cpu_time_ms=self.model.cpu_per_element_ms))
+        if not step.path:
+            self._warn(f"Apex class {step.name} not found in project; costed as CPU only")
+            cost = base
+        else:
+            with open(step.path, 'r', encoding='utf-8', errors='replace') as f:
+                source = re.sub(r'//.*?$|/\*.*?\*/', '', f.read(), flags=re.DOTALL | re.MULTILINE)
+            queries = len(APEX_SOQL_RE.findall(source))
+            dmls = len(APEX_DML_RE.findall(source))
+            m = self.model
+            cost = (base
+                    + Cost.of(soql_queries=queries, dml_statements=dmls,
+                              cpu_time_ms=queries * m.cpu_per_query_ms + dmls * m.cpu_per_dml_ms)
+                    + Cost.of((1, 0), soql_records=queries, dml_rows=dmls,
+                              cpu_time_ms=queries * m.cpu_per_query_row_ms + dmls * m.cpu_per_dml_row_ms))
+            if dmls:
+                self._warn(f"Apex action {step.name} issues {dmls} DML statement(s) whose target "
+                           f"objects are not followed into nested saves")
+        self._apex_costs[step.name] = cost
+        return cost
+
+    def _warn(self, message: str):
+        if message not in self.warnings:
+            self.warnings.append(message)
+
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+
+    def run(self, obj: str, operation: str) -> Dict:
+        """Simulate a save of `records` records of obj and return the report dict."""
+        if not self.index.steps_for(obj, operation):
+            self._warn(f"No record-triggered automation found for {obj} {operation}")
+        self._save(obj, operation, self.records, depth=0, repeat=1, chain=())
+        for metric, limit in METRIC_LIMITS.items():
+            if self.totals[metric] > limit:
+                self.errors.append(f"{metric} limit exceeded: {self.totals[metric]} (limit: {limit})")
+        return self.report(obj, operation)
+
+    def _should_run(self, step: AutomationStep, obj: str, operation: str, chain: Tuple) -> bool:
+        """Apply the recursion heuristics for a step re-entered by a nested save."""
+        if (obj.lower(), operation) not in {(o.lower(), op) for o, op in chain}:
+            return True
+        if step.kind == 'flow':
+            if step.has_entry_conditions:
+                return False
+            if step.phase == 'after_flow':
+                self._warn(f"Flow {step.name} has no entry conditions and re-runs on recursive "
+                           f"{obj} {operation} (infinite loop risk)")
+            return True
+        if step.kind == 'taf_flow':
+            return step.allow_recursion
+        return True
+
+    def _save(self, obj: str, operation: str, records: int, depth: int, repeat: int, chain: Tuple):
+        if depth >= self.max_depth:
+            message = (f"Maximum trigger depth ({self.max_depth}) reached: "
+                       f"{' → '.join(f'{o} {op}' for o, op in chain + ((obj, operation),))}")
+            if message not in self.errors:
+                self.errors.append(message)
+            return
+        chain = chain + ((obj, operation),)
+        f = self.loop_size
+        # Flows and trigger actions run once per 200-record chunk of the save
+        chunks = trigger_chunks(records)
+
+        for step in self.index.steps_for(obj, operation):
+            if len(self.timeline) >= self.max_entries:
+                if not self._truncated:
+                    self._truncated = True
+                    self.errors.append(f"Stopped after {self.max_entries} steps - automation cascade too large")
+                return
+            if not self._should_run(step, obj, operation, chain[:-1]):
+                continue
+
+            if step.kind in ('flow', 'taf_flow'):
+                if not step.path:
+                    self._warn(f"Flow {step.name} referenced by a trigger action was not found")
+                    continue
+                cost, targets = self._flow_analysis(step)
+            else:
+                cost, targets = self._apex_cost(step), []
+
+            metrics = dict.fromkeys(COST_METRICS, 0)
+            for size, count in chunks:
+                for m, v in cost.evaluate(size, f).items():
+                    metrics[m] += v * count * repeat
+            for m, v in metrics.items():
+                self.totals[m] += v
+            self.timeline.append(TimelineEntry(
+                depth=depth, object=obj, operation=operation, records=records,
+                phase=step.phase, step=step.name, kind=step.kind, repeat=repeat,
+                metrics=metrics, cumulative=dict(self.totals)))
+
+            for target in targets:
+                for size, count in chunks:
+                    self._follow_dml(step, target, obj, operation, size, f, depth, repeat * count, chain)
+
+    def _follow_dml(self, step: AutomationStep, target: Dict, obj: str, operation: str,
+                    n: int, f: int, depth: int, repeat: int, chain: Tuple):
+        if step.phase == 'before_flow' and target['self_update']:
+            return  # saved with the record, no nested save
+        if not target['object']:
+            self._warn(f"{step.name}.{target['element']}: target object unknown; nested save not simulated")
+            return
+        rows = target['cost'].evaluate(n, f)['dml_rows']
+        if rows <= 0:
+            return
+        iterations = f if target['loop'] else 1
+        if target['self_update'] or target['object'].lower() == obj.lower():
+            rows = min(rows, n)  # recursive update of the same records
+        self._save(target['object'], target['operation'], rows, depth + 1,
+                   repeat * iterations, chain)
+
+    def report(self, obj: str, operation: str) -> Dict:
+        status = 'FAILED' if self.errors else ('WARNING' if self.warnings else 'PASSED')
+        return {
+            'status': status,
+            'object': obj,
+            'operation': operation,
+            'records': self.records,
+            'loop_size': self.loop_size,
+            'totals': self.totals,
+            'limits': METRIC_LIMITS,
+            'timeline': [entry.__dict__ for entry in self.timeline],
+            'errors': self.errors,
+            'warnings': self.warnings,
+        }
+
+
+def print_index(index: AutomationIndex):
+    """Print automation per object and operation in execution order."""
+    print(f"\n📇 Record-triggered automation in {index.project_dir}\n")
+    for obj in index.objects():
+        print(f"  {obj}")
+        for operation in OPERATIONS:
+            steps = index.steps_for(obj, operation)
+            if not steps:
+                continue
+            print(f"    {operation}:")
+            for step in steps:
+                flags = []
+                if step.has_entry_conditions:
+                    flags.append('entry conditions')
+                if step.kind == 'taf_flow' and step.allow_recursion:
+                    flags.append('allows recursion')
+                if not step.path:
+                    flags.append('source not found')
+                suffix = f"  ({', '.join(flags)})" if flags else ''
+                print(f"      {PHASE_LABELS[step.phase]:17s} {step.order:>6g}  {step.name}{suffix}")
+    for error in index.errors:
+        print(f"  ⚠️  {error}")
+    print()
+
+
+def print_report(result: Dict):
+    """Print the transaction timeline and totals."""
+    print("\n" + "━" * 70)
+    print(f"Transaction Simulation: {result['records']} × {result['object']} {result['operation']}")
+    print("━" * 70)
+    print(f"\n{'Step':44s} {'SOQL':>5} {'DML':>5} {'DML rows':>9} {'CPU ms':>7}")
+    for entry in result['timeline']:
+        indent = '  ' * entry['depth']
+        repeat = f" ×{entry['repeat']}" if entry['repeat'] > 1 else ''
+        label = f"{indent}{entry['object']} {entry['operation']} · {PHASE_LABELS[entry['phase']]}: {entry['step']}{repeat}"
+        m = entry['metrics']
+        print(f"{label[:44]:44s} {m['soql_queries']:>5} {m['dml_statements']:>5} "
+              f"{m['dml_rows']:>9} {m['cpu_time_ms']:>7}")
+
+    print(f"\n📊 Transaction totals:")
+    for metric in COST_METRICS:
+        value, limit = result['totals'][metric], result['limits'][metric]
+        pct = int(value / limit * 100) if limit else 0
+        marker = '❌' if value > limit else ('⚠️ ' if value > limit * 0.8 else '✓ ')
+        print(f"  {marker} {metric:15s} {value:>7} / {limit} ({pct}%)")
+
+    if result['errors']:
+        print(f"\n❌ Errors ({len(result['errors'])}):")
+        for error in result['errors']:
+            print(f"  {error}")
+    if result['warnings']:
+        print(f"\n⚠️  Warnings ({len(result['warnings'])}):")
+        for warning in result['warnings']:
+            print(f"  {warning}")
+
+    print("\n" + "━" * 70)
+    if result['status'] == 'FAILED':
+        print("❌ TRANSACTION FAILED - combined automation exceeds governor limits")
+    elif result['status'] == 'WARNING':
+        print("⚠️  TRANSACTION PASSED WITH WARNINGS")
+    else:
+        print("✓ TRANSACTION PASSED")
+    print("━" * 70 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Simulate all record-triggered automation firing in one Salesforce transaction'
+    )
+    parser.add_argument('project_dir', help='SFDX project directory (searched recursively)')
+    parser.add_argument('--object', help='Object whose save starts the transaction (e.g. Account)')
+    parser.add_argument('--operation', choices=OPERATIONS, default='update',
+                        help='DML operation that starts the transaction (default: update)')
+    parser.add_argument('--records', type=int, default=200,
+                        help='Records in the triggering batch (default: 200)')
+    parser.add_argument('--loop-size', type=int, default=50,
+                        help='Related records per flow loop (default: 50)')
+    parser.add_argument('--max-depth', type=int, default=16,
+                        help='Maximum nested save depth (default: 16)')
+    parser.add_argument('--list', action='store_true',
+                        help='List indexed automation per object and operation')
+    parser.add_argument('--format', choices=['console', 'json'], default='console')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.project_dir):
+        print(f"❌ Not a directory: {args.project_dir}")
+        sys.exit(1)
+
+    index = AutomationIndex(args.project_dir)
+    if args.list or not args.object:
+        if args.format == 'json':
+            print(json.dumps([step.__dict__ for step in index.steps], indent=2))
+        else:
+            print_index(index)
+        sys.exit(0)
+
+    simulator = TransactionSimulator(index, args.records, args.loop_size, args.max_depth)
+    result = simulator.run(args.object, args.operation)
+    if args.format == 'json':
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(result)
+    sys.exit(1 if result['status'] == 'FAILED' else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -22,6 +22,10 @@ v2.2.0 New Validations (Lightning Flow Scanner Parity):
 - AutoLayout check - Canvas mode preference
 - CopyAPIName detection - "Copy_X_Of" lazy naming pattern
 
+Cross-file references:
+- Objects, fields, Apex actions and subflows missing from the SFDX project
+  (via the shared project metadata index; skipped outside a project)
+
 v2.1.0 Fixes:
 - FIXED: DML-in-loop detection now traces actual connector paths
 - FIXED: Subflow recommendation skipped for record-triggered flows (can't call subflows via XML)
@@ -50,6 +54,19 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from naming_validator import NamingValidator
 from security_validator import SecurityValidator
 
+# Project metadata index (shared/metadata_index) for cross-file reference checks
+SHARED_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), 'shared'
+)
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+
+try:
+    from metadata_index import index_for
+    INDEX_AVAILABLE = True
+except ImportError:
+    INDEX_AVAILABLE = False
+
 
 class EnhancedFlowValidator:
     """Comprehensive flow validator with 6-category scoring."""
@@ -243,6 +260,18 @@ class EnhancedFlowValidator:
                 'suggestion': 'Test with bulk data; complex formulas in loops can cause CPU timeouts'
             })
 
+        # Cross-file references (metadata index)
+        missing_refs = self._check_metadata_references()
+        if missing_refs:
+            score -= min(4, len(missing_refs))
+            shown = ', '.join(f"{ref['target']} ({ref['context']})" for ref in missing_refs[:5])
+            more = f' (+{len(missing_refs) - 5} more)' if len(missing_refs) > 5 else ''
+            warnings.append({
+                'severity': 'HIGH',
+                'message': f'⚠️ {len(missing_refs)} reference(s) not found in project: {shown}{more}',
+                'suggestion': 'Deploy or retrieve the missing metadata, or fix the API names - deployment will fail'
+            })
+
         # Decision complexity (5 points)
         decision_count = self._count_elements('decisions')
         if decision_count > 5:
@@ -1302,6 +1331,22 @@ class EnhancedFlowValidator:
 
         return False
 
+    def _check_metadata_references(self) -> List[Dict]:
+        """
+        Find objects, fields, Apex actions and subflows the flow uses that the
+        project does not define.
+
+        Returns:
+            Missing references ({'kind', 'target', 'context'}); empty outside an
+            SFDX project or when the metadata index is unavailable
+        """
+        if not INDEX_AVAILABLE:
+            return []
+        index = index_for(self.flow_path)
+        if index is None:
+            return []
+        return index.missing_refs(self.flow_path)
+
     def _check_action_calls_in_loop(self) -> bool:
         """
         Check if Apex action calls exist inside loops (callout limit risk).
@@ -22,6 +22,8 @@ Validates Salesforce metadata XML files against best practices.
    - Numeric precision/scale
    - Picklist definitions
    - Relationship constraints
+   - Cross-file references (fields, objects, record types, classes and
+     layouts that the project's metadata index shows are missing)
 
 4. Security & FLS (20 points)
    - Field-level security considerations
@@ -38,6 +40,9 @@ Validates Salesforce metadata XML files against best practices.
    - No hardcoded IDs
    - Global Value Sets for reusable picklists
 
+Profiles and Permission Sets are streamed with iterparse (see
+MetadataValidator.STREAMING_TYPES) so multi-MB files validate in constant memory.
+
 Usage:
     python validate_metadata.py /path/to/metadata-file.xml
 """
@@ -48,6 +53,19 @@ import sys
 import xml.etree.ElementTree as ET
 from typing import Dict, List, Tuple, Optional
 
+# Project metadata index (shared/metadata_index) for cross-file reference checks
+SHARED_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), 'shared'
+)
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+
+try:
+    from metadata_index import index_for
+    INDEX_AVAILABLE = True
+except ImportError:
+    INDEX_AVAILABLE = False
+
 
 class MetadataValidator:
     """Validates Salesforce metadata XML files."""
@@ -75,9 +93,23 @@ class MetadataValidator:
         'best_practices': {'name': 'Best Practices', 'max': 20, 'score': 20, 'issues': []},
     }
 
-    def __init__(self, file_path: str):
+    # Types validated by streaming top-level elements instead of building a DOM
+    STREAMING_TYPES = ('Profile', 'PermissionSet')
+
+    # System permissions that grant access to all data
+    BROAD_USER_PERMISSIONS = ('ModifyAllData', 'ViewAllData')
+
+    # Object permission flags that bypass sharing
+    BYPASS_SHARING_FLAGS = ('modifyAllRecords', 'viewAllRecords')
+
+    # Cross-file reference checks: points per missing reference, and the cap
+    MISSING_REF_DEDUCTION = 2
+    MISSING_REF_MAX_DEDUCTION = 10
+
+    def __init__(self, file_path: str, use_index: bool = True):
         """Initialize validator with file path."""
         self.file_path = file_path
+        self.use_index = use_index and INDEX_AVAILABLE
         self.file_name = os.path.basename(file_path)
         self.tree = None
         self.root = None
@@ -85,6 +117,8 @@ class MetadataValidator:
         self.categories = {k: dict(v) for k, v in self.CATEGORIES.items()}
         for cat in self.categories.values():
             cat['issues'] = []
+        # Streaming tallies: key -> [count, first few names]
+        self.tallies = {}
 
     def _detect_metadata_type(self) -> str:
         """Detect metadata type from file name."""
@@ -129,10 +163,13 @@ class MetadataValidator:
 
     def validate(self) -> Dict:
         """Run all validations and return results."""
-        # Parse XML
+        # Parse XML (permission files are checked while streaming)
         try:
-            self.tree = ET.parse(self.file_path)
-            self.root = self.tree.getroot()
+            if self.metadata_type in self.STREAMING_TYPES:
+                self._stream_permissions()
+            else:
+                self.tree = ET.parse(self.file_path)
+                self.root = self.tree.getroot()
         except ET.ParseError as e:
             self._add_issue('structure_format', 'CRITICAL', f'Invalid XML: {e}', 10)
             return self._build_results()
@@ -144,12 +181,79 @@ class MetadataValidator:
         self._validate_structure()
         self._validate_naming()
         self._validate_data_integrity()
+        self._validate_references()
         self._validate_security()
         self._validate_documentation()
         self._validate_best_practices()
 
         return self._build_results()
 
+    def _stream_permissions(self):
+        """
+        Parse a Profile/PermissionSet with iterparse, checking entries as they complete.
+
+        Each permission entry (fieldPermissions, userPermissions, ...) is
+        checked and then detached from the root, so memory stays flat no
+        matter how many entries the file has. Simple values (label,
+        description, license, ...) stay on self.root for the other checks.
+        """
+        depth = 0
+        with open(self.file_path, 'rb') as f:
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if depth == 0:
+                        self.root = elem
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth == 1 and len(elem):
+                    self._check_permission_entry(elem)
+                    self.root.remove(elem)
+
+        self._report_tally(
+            'bypass_sharing', 'security_fls', 'WARNING',
+            'object(s) grant View All/Modify All Records, bypassing sharing', 3
+        )
+        self._report_tally(
+            'editable_not_readable', 'structure_format', 'CRITICAL',
+            'field permission(s) are editable but not readable - deployment will fail', 5
+        )
+
+    def _check_permission_entry(self, elem):
+        """Security checks for one top-level permission entry."""
+        tag = elem.tag.rsplit('}', 1)[-1]
+        if tag not in ('userPermissions', 'objectPermissions', 'fieldPermissions'):
+            return
+        # One pass over the entry's children (cheaper than a find() per value)
+        values = {child.tag.rsplit('}', 1)[-1]: (child.text or '').strip() for child in elem}
+        if tag == 'userPermissions':
+            name = values.get('name', '')
+            if name in self.BROAD_USER_PERMISSIONS and values.get('enabled') == 'true':
+                self._add_issue(
+                    'security_fls', 'WARNING',
+                    f'{name} permission enabled - use with caution', 5
+                )
+        elif tag == 'objectPermissions':
+            if any(values.get(flag) == 'true' for flag in self.BYPASS_SHARING_FLAGS):
+                self._tally('bypass_sharing', values.get('object', ''))
+        elif values.get('editable') == 'true' and values.get('readable') != 'true':
+            self._tally('editable_not_readable', values.get('field', ''))
+
+    def _tally(self, key: str, name: str, sample_size: int = 5):
+        """Count a finding, remembering only the first few names."""
+        count_names = self.tallies.setdefault(key, [0, []])
+        count_names[0] += 1
+        if len(count_names[1]) < sample_size:
+            count_names[1].append(name)
+
+    def _report_tally(self, key: str, category: str, severity: str, message: str, deduction: int):
+        """Turn a tally into a single issue."""
+        if key not in self.tallies:
+            return
+        count, names = self.tallies[key]
+        more = f' (+{count - len(names)} more)' if count > len(names) else ''
+        self._add_issue(category, severity, f'{count} {message}: {", ".join(names)}{more}', deduction)
+
     def _validate_structure(self):
         """Validate XML structure and format."""
         # Check namespace
@@ -282,6 +386,28 @@ class MetadataValidator:
                     'Error messages should be descriptive', 2
                 )
 
+    def _validate_references(self):
+        """Check references to other metadata against the project index."""
+        if not self.use_index or self.metadata_type == 'Unknown':
+            return
+        index = index_for(self.file_path)
+        if index is None:
+            return
+
+        missing = {}
+        for ref in index.missing_refs(self.file_path):
+            missing.setdefault(ref['kind'], []).append(ref['target'])
+
+        deduction_left = self.MISSING_REF_MAX_DEDUCTION
+        for kind, targets in missing.items():
+            shown = ', '.join(targets[:5]) + (f' (+{len(targets) - 5} more)' if len(targets) > 5 else '')
+            deduction = min(deduction_left, self.MISSING_REF_DEDUCTION * len(targets))
+            deduction_left -= deduction
+            self._add_issue(
+                'data_integrity', 'WARNING',
+                f'{len(targets)} {kind} reference(s) not found in project: {shown}', deduction
+            )
+
     def _validate_security(self):
         """Validate security and FLS settings."""
         # Check for sensitive field patterns
@@ -308,17 +434,8 @@ class MetadataValidator:
                     'Public Read/Write sharing model - verify this is intentional', 2
                 )
 
-        # For Permission Sets/Profiles, check for ModifyAllData or ViewAllData
-        if self.metadata_type in ['Profile', 'PermissionSet']:
-            user_perms = self.root.findall('.//sf:userPermissions', self.NAMESPACE)
-            for perm in user_perms:
-                name = self._get_text(perm, 'name')
-                enabled = self._get_text(perm, 'enabled')
-                if enabled == 'true' and name in ['ModifyAllData', 'ViewAllData']:
-                    self._add_issue(
-                        'security_fls', 'WARNING',
-                        f'{name} permission enabled - use with caution', 5
-                    )
+        # Permission Sets/Profiles: userPermissions are checked while streaming
+        # (_check_permission_entry)
 
     def _validate_documentation(self):
         """Validate documentation elements."""
@@ -11,14 +11,27 @@ Environment Variables:
 
 Output:
     Formatted test results with failure analysis and fix suggestions
+
+Standalone mode (large org runs):
+    python3 parse-test-results.py test-results/test-result.json [--top 20]
+    python3 parse-test-results.py test-results/junit.xml --history .sf-test-history
+    sf apex run test ... --result-format json | python3 parse-test-results.py -
+
+Files and stdin are parsed incrementally (JSON arrays item by item, JUnit
+via iterparse), every test keeps its runtime, and each run is saved to a
+history directory so the next run is compared against it.
 """
 
+import argparse
+import heapq
 import json
 import os
 import sys
 import re
+import xml.etree.ElementTree as ET
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 # Only process sf apex run test commands
 def should_process():
@@ -58,20 +71,15 @@ def parse_json_results(data: dict) -> dict:
     coverage = []
 
     # Parse test results
-    tests = result.get('tests', [])
+    tests = [normalize_json_test(test) for test in result.get('tests', [])]
     for test in tests:
-        outcome = test.get('Outcome', test.get('outcome', '')).lower()
+        outcome = test['outcome']
+        summary['duration_ms'] += test['run_time']
         if outcome == 'pass':
             summary['passed'] += 1
         elif outcome == 'fail':
             summary['failed'] += 1
-            failures.append({
-                'class': test.get('ApexClass', {}).get('Name', test.get('className', 'Unknown')),
-                'method': test.get('MethodName', test.get('methodName', 'Unknown')),
-                'message': test.get('Message', test.get('message', '')),
-                'stack_trace': test.get('StackTrace', test.get('stackTrace', '')),
-                'run_time': test.get('RunTime', test.get('runTime', 0))
-            })
+            failures.append(test)
         elif outcome == 'skip':
             summary['skipped'] += 1
 
@@ -86,35 +94,98 @@ def parse_json_results(data: dict) -> dict:
     covered_lines = 0
 
     for cov in coverage_data:
-        class_name = cov.get('name', cov.get('apexClassOrTriggerName', 'Unknown'))
-        num_lines = cov.get('totalLines', cov.get('numLinesCovered', 0) + cov.get('numLinesUncovered', 0))
-        num_covered = cov.get('coveredLines', cov.get('numLinesCovered', 0))
-        if isinstance(num_covered, list):
-            num_covered = len(num_covered)
+        entry = normalize_coverage(cov)
+        coverage.append(entry)
+        total_lines += entry['total_lines']
+        covered_lines += entry['covered_lines']
 
-        uncovered = cov.get('uncoveredLines', [])
-        if isinstance(uncovered, int):
-            uncovered = []
+    summary['coverage_percent'] = round(covered_lines / total_lines * 100, 1) if total_lines > 0 else 0
 
-        pct = (num_covered / num_lines * 100) if num_lines > 0 else 0
+    return {
+        'summary': summary,
+        'failures': failures,
+        'coverage': coverage,
+        'tests': tests
+    }
 
-        coverage.append({
-            'class': class_name,
-            'total_lines': num_lines,
-            'covered_lines': num_covered,
-            'uncovered_lines': uncovered[:10] if uncovered else [],  # Limit to first 10
-            'percent': round(pct, 1)
-        })
+def normalize_json_test(test: dict) -> dict:
+    """Map an sf CLI / Tooling API test record to the fields this script uses."""
+    apex_class = test.get('ApexClass') or {}
+    class_name = apex_class.get('Name') or test.get('className')
+    method = test.get('MethodName', test.get('methodName'))
+    full_name = test.get('FullName', test.get('fullName', ''))
+    class_coverage, class_uncovered = per_test_coverage(test.get('perClassCoverage'))
+    if (not class_name or not method) and '.' in full_name:
+        class_name, method = full_name.rsplit('.', 1)
+    return {
+        'class': class_name or 'Unknown',
+        'method': method or 'Unknown',
+        'outcome': str(test.get('Outcome', test.get('outcome', ''))).lower(),
+        'message': test.get('Message', test.get('message', '')) or '',
+        'stack_trace': test.get('StackTrace', test.get('stackTrace', '')) or '',
+        'run_time': _to_ms(test.get('RunTime', test.get('runTime', 0))),
+        'class_coverage': class_coverage,
+        'class_uncovered': class_uncovered,
+    }
 
-        total_lines += num_lines
-        covered_lines += num_covered if isinstance(num_covered, int) else 0
+def per_test_coverage(per_class: Optional[list]) -> Tuple[Dict[str, List[int]], Dict[str, List[int]]]:
+    """
+    Map a test's perClassCoverage (sf CLI --detailed-coverage) to
+    ({class or trigger name: covered line numbers}, {name: uncovered line
+    numbers}). Classes reported as covered without line detail map to an
+    empty list; only classes the test covers appear in the first mapping.
+    """
+    covered, uncovered = {}, {}
+    for entry in per_class or []:
+        if not isinstance(entry, dict):
+            continue
+        detail = entry.get('coverage') if isinstance(entry.get('coverage'), dict) else {}
+        cov = normalize_coverage({**entry, **detail})
+        if cov['covered_lines'] or cov['covered_line_numbers']:
+            covered[cov['class']] = cov['covered_line_numbers']
+        if cov['uncovered_lines']:
+            uncovered[cov['class']] = cov['uncovered_lines']
+    return covered, uncovered
+
+def _to_ms(value, scale: float = 1.0) -> int:
+    """Coerce a runtime value (number or numeric string) to integer milliseconds."""
+    try:
+        return int(round(float(value) * scale))
+    except (TypeError, ValueError):
+        return 0
 
-    summary['coverage_percent'] = round(covered_lines / total_lines * 100, 1) if total_lines > 0 else 0
+def normalize_coverage(cov: dict) -> dict:
+    """
+    Map one coverage record to class/total/covered/uncovered lines.
 
+    Handles the sf CLI shape ('lines': {"12": 1, "13": 0}) as well as the
+    Tooling API shape (numLinesCovered/numLinesUncovered + line lists).
+    """
+    class_name = cov.get('name', cov.get('apexClassOrTriggerName', 'Unknown'))
+    covered_list, uncovered = [], cov.get('uncoveredLines', [])
+    if isinstance(cov.get('lines'), dict):
+        covered_list = sorted(int(n) for n, hit in cov['lines'].items() if hit)
+        uncovered = sorted(int(n) for n, hit in cov['lines'].items() if not hit)
+    elif isinstance(cov.get('coveredLines'), list):
+        covered_list = cov['coveredLines']
+    if not isinstance(uncovered, list):
+        uncovered = []
+
+    num_covered = cov.get('totalCovered', cov.get('numLinesCovered'))
+    if num_covered is None or isinstance(num_covered, list):
+        num_covered = len(covered_list)
+    num_lines = cov.get('totalLines')
+    if num_lines is None:
+        num_lines = num_covered + cov.get('numLinesUncovered', len(uncovered))
+
+    pct = (num_covered / num_lines * 100) if num_lines > 0 else 0
     return {
-        'summary': summary,
-        'failures': failures,
-        'coverage': coverage
+        'class': class_name,
+        'total_lines': num_lines,
+        'covered_lines': num_covered,
+        'covered_line_numbers': covered_list,
+        'uncovered_lines': uncovered,
+        'percent': round(pct, 1)
     }
 
 def parse_text_results(output: str) -> dict:
@@ -325,8 +396,10 @@ def format_output(results: dict) -> str:
 
         for cov in sorted(low_coverage, key=lambda x: x['percent']):
             lines.append(f"   {cov['class']}: {cov['percent']}%")
-            if cov.get('uncovered_lines'):
-                lines.append(f"      Uncovered lines: {cov['uncovered_lines']}")
+            uncovered = cov.get('uncovered_lines') or []
+            if uncovered:
+                more = f" (+{len(uncovered) - 10} more)" if len(uncovered) > 10 else ""
+                lines.append(f"      Uncovered lines: {uncovered[:10]}{more}")
 
         lines.append("")
 
@@ -334,8 +407,422 @@ def format_output(results: dict) -> str:
 
     return "\n".join(lines)
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Streaming ingestion
+# ═══════════════════════════════════════════════════════════════════════════
+
+# JSON paths whose array items (or value) are streamed, and the name they're yielded under
+JSON_TARGETS = {
+    ('result', 'tests'): 'test',
+    ('tests',): 'test',
+    ('result', 'coverage', 'coverage'): 'coverage',
+    ('coverage', 'coverage'): 'coverage',
+    ('result', 'codecoverage'): 'coverage',
+    ('codecoverage',): 'coverage',
+    ('result', 'summary'): 'summary',
+    ('summary',): 'summary',
+}
+
+class JsonStream:
+    """
+    Incremental reader over a JSON document.
+
+    Only the containers leading to JSON_TARGETS are walked character by
+    character; every other value (and each streamed array item) is decoded
+    with JSONDecoder.raw_decode from a growing buffer, so memory stays
+    proportional to the largest single item rather than the whole file.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = 1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def take(self, expected: str):
+        if self.peek() != expected:
+            raise ValueError(f"Expected '{expected}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number ending exactly at the buffer edge may continue in the next chunk
+                if end < len(self.buf) or self.eof or not isinstance(obj, (int, float)):
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            size *= 2  # large values: read bigger chunks so retries stay linear
+            self._fill(size)
+
+    def items(self, targets: Dict[Tuple[str, ...], str] = JSON_TARGETS) -> Iterator[Tuple[str, object]]:
+        """Yield (target name, item) for every item of a targeted array (or targeted value)."""
+        prefixes = {path[:i] for path in targets for i in range(len(path))}
+        yield from self._walk((), targets, prefixes)
+
+    def _walk(self, path, targets, prefixes):
+        ch = self.peek()
+        if ch == '{' and path in prefixes:
+            self.pos += 1
+            if self.peek() == '}':
+                self.pos += 1
+                return
+            while True:
+                key = self.value()
+                self.take(':')
+                yield from self._walk(path + (key,), targets, prefixes)
+                ch = self.peek()
+                self.pos += 1
+                if ch == '}':
+                    return
+                if ch != ',':
+                    raise ValueError(f"Malformed JSON object near offset {self.pos}")
+        elif ch == '[' and path in targets:
+            self.pos += 1
+            if self.peek() == ']':
+                self.pos += 1
+                return
+            while True:
+                yield targets[path], self.value()
+                ch = self.peek()
+                self.pos += 1
+                if ch == ']':
+                    return
+                if ch != ',':
+                    raise ValueError(f"Malformed JSON array near offset {self.pos}")
+        else:
+            value = self.value()
+            if path in targets:
+                yield targets[path], value
+
+class PrefixedReader:
+    """Read-only stream that replays already consumed text before the rest of a stream."""
+
+    def __init__(self, prefix: str, stream: TextIO):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size: int = -1) -> str:
+        if not self.prefix:
+            return self.stream.read(size)
+        if size is None or size < 0:
+            data, self.prefix = self.prefix + self.stream.read(), ''
+        else:
+            data, self.prefix = self.prefix[:size], self.prefix[size:]
+        return data
+
+def iter_junit(stream) -> Iterator[Tuple[str, object]]:
+    """Yield ('test', normalized test) for each JUnit <testcase>, clearing elements as it goes."""
+    for _, elem in ET.iterparse(stream, events=('end',)):
+        if elem.tag != 'testcase':
+            continue
+        outcome, message, stack = 'pass', '', ''
+        for child in elem:
+            if child.tag in ('failure', 'error'):
+                outcome = 'fail'
+                message = child.get('message') or (child.text or '').strip().split('\n')[0]
+                stack = (child.text or '').strip()
+            elif child.tag == 'skipped':
+                outcome = 'skip'
+        class_name = elem.get('classname') or 'Unknown'
+        yield 'test', {
+            'class': class_name.rsplit('.', 1)[-1] if '.' in class_name else class_name,
+            'method': elem.get('name') or 'Unknown',
+            'outcome': outcome,
+            'message': message,
+            'stack_trace': stack,
+            'run_time': _to_ms(elem.get('time'), 1000.0),  # JUnit time is in seconds
+            'class_coverage': {},
+            'class_uncovered': {},
+        }
+        elem.clear()
+
+def iter_result_items(path: str) -> Iterator[Tuple[str, object]]:
+    """Stream ('test' | 'coverage' | 'summary', item) from a JSON or JUnit file ('-' for stdin)."""
+    if path == '-':
+        stream = sys.stdin
+        first = stream.read(1)
+        while first and first.isspace():
+            first = stream.read(1)
+        if first == '<':
+            yield from iter_junit(PrefixedReader(first, stream))
+            return
+        reader = JsonStream(stream)
+        reader.buf = first
+        for kind, item in reader.items():
+            yield kind, normalize_json_test(item) if kind == 'test' else item
+        return
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        head = f.read(512).lstrip()
+        f.seek(0)
+        if head.startswith('<'):
+            f.close()
+            yield from iter_junit(path)
+            return
+        for kind, item in JsonStream(f).items():
+            yield kind, normalize_json_test(item) if kind == 'test' else item
+
+# Runtime histogram bucket upper bounds (ms)
+HISTOGRAM_BUCKETS = [(100, '<100ms'), (500, '100-500ms'), (1000, '0.5-1s'), (5000, '1-5s'),
+                     (10000, '5-10s'), (30000, '10-30s'), (float('inf'), '>30s')]
+
+class TestRunStats:
+    """Single-pass accumulator over streamed test results."""
+
+    def __init__(self, top: int = 20):
+        self.top = top
+        self.summary = {'passed': 0, 'failed': 0, 'skipped': 0, 'total': 0,
+                        'duration_ms': 0, 'coverage_percent': 0}
+        self.failures: List[dict] = []
+        self.coverage: List[dict] = []
+        self.classes: Dict[str, List[int]] = {}        # class -> [tests, total ms, max ms]
+        self.histogram = [0] * len(HISTOGRAM_BUCKETS)
+        self.tests: Dict[str, Tuple[str, int]] = {}     # "Class.method" -> (outcome, ms)
+        self._slowest: List[Tuple[int, str]] = []       # min-heap of (ms, name)
+        self.run_summary: dict = {}
+        self._covered = self._total_lines = 0
+
+    def add_test(self, test: dict):
+        outcome, ms = test['outcome'], test['run_time']
+        name = f"{test['class']}.{test['method']}"
+        key = {'pass': 'passed', 'fail': 'failed', 'skip': 'skipped'}.get(outcome)
+        if key:
+            self.summary[key] += 1
+        self.summary['total'] += 1
+        self.summary['duration_ms'] += ms
+        if outcome == 'fail':
+            self.failures.append(test)
+
+        entry = self.classes.setdefault(test['class'], [0, 0, 0])
+        entry[0] += 1
+        entry[1] += ms
+        entry[2] = max(entry[2], ms)
+        for i, (upper, _) in enumerate(HISTOGRAM_BUCKETS):
+            if ms < upper:
+                self.histogram[i] += 1
+                break
+        self.tests[name] = (outcome, ms)
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, (ms, name))
+        elif ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (ms, name))
+
+    def add_coverage(self, cov: dict):
+        entry = normalize_coverage(cov)
+        self.coverage.append(entry)
+        self._covered += entry['covered_lines']
+        self._total_lines += entry['total_lines']
+        self.summary['coverage_percent'] = (
+            round(self._covered / self._total_lines * 100, 1) if self._total_lines else 0)
+
+    def consume(self, items: Iterable[Tuple[str, object]]) -> 'TestRunStats':
+        for kind, item in items:
+            if kind == 'test':
+                self.add_test(item)
+            elif kind == 'coverage' and isinstance(item, dict):
+                self.add_coverage(item)
+            elif kind == 'summary' and isinstance(item, dict):
+                self.run_summary = item
+        return self
+
+    def slowest_tests(self) -> List[Tuple[str, int]]:
+        return [(name, ms) for ms, name in sorted(self._slowest, reverse=True)]
+
+    def slowest_classes(self) -> List[Tuple[str, int, int, int]]:
+        ranked = sorted(self.classes.items(), key=lambda kv: kv[1][1], reverse=True)[:self.top]
+        return [(name, tests, total, worst) for name, (tests, total, worst) in ranked]
+
+    def results(self) -> dict:
+        """Same shape as parse_test_results() so format_output() can render it."""
+        return {'summary': self.summary, 'failures': self.failures, 'coverage': self.coverage}
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Run history
+# ═══════════════════════════════════════════════════════════════════════════
+
+HISTORY_ENV_VAR = 'SF_TEST_HISTORY_DIR'
+DEFAULT_HISTORY_DIR = '.sf-test-history'
+
+def history_dir(path: Optional[str] = None) -> Path:
+    return Path(path or os.environ.get(HISTORY_ENV_VAR) or DEFAULT_HISTORY_DIR)
+
+def save_run(stats: TestRunStats, directory: Path, label: str = '', keep: int = 50) -> Path:
+    """Persist a compact run record and prune the oldest beyond `keep`."""
+    directory.mkdir(parents=True, exist_ok=True)
+    run_id = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+    record = {
+        'run_id': run_id,
+        'label': label,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'summary': stats.summary,
+        'tests': {name: [outcome, ms] for name, (outcome, ms) in stats.tests.items()},
+    }
+    path = directory / f"run-{run_id}.json"
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(record, f, separators=(',', ':'))
+    os.replace(tmp, path)
+    for old in sorted(directory.glob('run-*.json'))[:-keep]:
+        old.unlink()
+    return path
+
+def load_run(directory: Path, run_id: str = 'latest') -> Optional[dict]:
+    runs = sorted(directory.glob('run-*.json'))
+    if run_id != 'latest':
+        runs = [r for r in runs if run_id in r.stem]
+    if not runs:
+        return None
+    with open(runs[-1], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_runs(previous: dict, stats: TestRunStats, slower_ratio: float = 1.5,
+                 min_delta_ms: int = 500) -> dict:
+    """
+    Compare the current run with a saved one.
+
+    A test counts as slower/faster when its runtime changed by more than
+    slower_ratio AND by at least min_delta_ms (filters out jitter on fast tests).
+    """
+    before = previous.get('tests', {})
+    diff = {'baseline': previous.get('run_id'), 'new_failures': [], 'fixed': [],
+            'slower': [], 'faster': [], 'added': [], 'removed': []}
+    for name, (outcome, ms) in stats.tests.items():
+        if name not in before:
+            diff['added'].append(name)
+            continue
+        old_outcome, old_ms = before[name]
+        if outcome == 'fail' and old_outcome != 'fail':
+            diff['new_failures'].append(name)
+        elif outcome == 'pass' and old_outcome == 'fail':
+            diff['fixed'].append(name)
+        if ms - old_ms >= min_delta_ms and ms > old_ms * slower_ratio:
+            diff['slower'].append((name, old_ms, ms))
+        elif old_ms - ms >= min_delta_ms and old_ms > ms * slower_ratio:
+            diff['faster'].append((name, old_ms, ms))
+    diff['removed'] = sorted(set(before) - set(stats.tests))
+    diff['slower'].sort(key=lambda t: t[2] - t[1], reverse=True)
+    diff['faster'].sort(key=lambda t: t[1] - t[2], reverse=True)
+    diff['duration_delta_ms'] = stats.summary['duration_ms'] - previous.get('summary', {}).get('duration_ms', 0)
+    return diff
+
+def format_timing(stats: TestRunStats, diff: Optional[dict] = None, top: int = 10) -> str:
+    """Format slowest tests/classes, the runtime histogram and run-over-run changes."""
+    lines = []
+    lines.append("⏱️  SLOWEST TESTS")
+    lines.append("-" * 60)
+    for name, ms in stats.slowest_tests()[:top]:
+        lines.append(f"   {ms / 1000:8.2f}s  {name}")
+    lines.append("")
+
+    lines.append("🐢 SLOWEST CLASSES (total runtime)")
+    lines.append("-" * 60)
+    for name, tests, total, worst in stats.slowest_classes()[:top]:
+        lines.append(f"   {total / 1000:8.2f}s  {name} ({tests} tests, slowest {worst / 1000:.2f}s)")
+    lines.append("")
+
+    lines.append("📊 RUNTIME HISTOGRAM")
+    lines.append("-" * 60)
+    peak = max(stats.histogram) or 1
+    for (_, label), count in zip(HISTOGRAM_BUCKETS, stats.histogram):
+        bar = '█' * max(1 if count else 0, int(count / peak * 40))
+        lines.append(f"   {label:>10} {count:6d} {bar}")
+    lines.append(f"   Total runtime: {stats.summary['duration_ms'] / 1000:.1f}s across {stats.summary['total']} tests")
+    lines.append("")
+
+    if diff:
+        delta = diff['duration_delta_ms'] / 1000
+        lines.append(f"🔀 COMPARED WITH RUN {diff['baseline']} ({delta:+.1f}s total)")
+        lines.append("-" * 60)
+        for label, key in (("New failures", 'new_failures'), ("Fixed", 'fixed')):
+            if diff[key]:
+                lines.append(f"   {label} ({len(diff[key])}): {', '.join(diff[key][:10])}")
+        if diff['slower']:
+            lines.append(f"   Slower ({len(diff['slower'])}):")
+            for name, old_ms, ms in diff['slower'][:top]:
+                lines.append(f"      {old_ms / 1000:6.2f}s → {ms / 1000:6.2f}s  {name}")
+        if diff['faster']:
+            lines.append(f"   Faster ({len(diff['faster'])}):")
+            for name, old_ms, ms in diff['faster'][:5]:
+                lines.append(f"      {old_ms / 1000:6.2f}s → {ms / 1000:6.2f}s  {name}")
+        if diff['added'] or diff['removed']:
+            lines.append(f"   Tests added: {len(diff['added'])}, removed: {len(diff['removed'])}")
+        lines.append("")
+    return "\n".join(lines)
+
+def cli_main():
+    """Standalone mode: stream a results file, report timing, persist and compare runs."""
+    parser = argparse.ArgumentParser(description="Analyze Apex test results (JSON or JUnit XML)")
+    parser.add_argument("results", help="Result file from --output-dir, or '-' for stdin")
+    parser.add_argument("--top", type=int, default=10, help="Entries per timing table (default: 10)")
+    parser.add_argument("--history", help=f"Run history directory (default: ${HISTORY_ENV_VAR} or {DEFAULT_HISTORY_DIR})")
+    parser.add_argument("--compare", default="latest", metavar="RUN_ID",
+                        help="Saved run to compare against (default: latest)")
+    parser.add_argument("--no-save", action="store_true", help="Do not record this run in the history")
+    parser.add_argument("--label", default="", help="Label stored with the run (e.g. branch or commit)")
+    parser.add_argument("--keep", type=int, default=50, help="Runs kept in the history (default: 50)")
+    parser.add_argument("--format", choices=["console", "json"], default="console")
+    args = parser.parse_args()
+
+    try:
+        stats = TestRunStats(top=max(args.top, 20)).consume(iter_result_items(args.results))
+    except (OSError, ValueError, ET.ParseError) as e:
+        print(f"❌ Could not parse {args.results}: {e}")
+        sys.exit(1)
+
+    directory = history_dir(args.history)
+    previous = load_run(directory, args.compare)
+    diff = compare_runs(previous, stats) if previous else None
+    saved = None if args.no_save else save_run(stats, directory, args.label, args.keep)
+
+    if args.format == "json":
+        print(json.dumps({
+            'summary': stats.summary,
+            'failures': stats.failures,
+            'slowest_tests': stats.slowest_tests()[:args.top],
+            'slowest_classes': stats.slowest_classes()[:args.top],
+            'histogram': {label: count for (_, label), count in zip(HISTOGRAM_BUCKETS, stats.histogram)},
+            'comparison': diff,
+            'saved_run': str(saved) if saved else None,
+        }, indent=2))
+    else:
+        print(format_output(stats.results()))
+        print(format_timing(stats, diff, args.top))
+        if saved:
+            print(f"Run saved to {saved}")
+    sys.exit(1 if stats.summary['failed'] else 0)
+
 def main():
     """Main entry point."""
+    if len(sys.argv) > 1:
+        cli_main()
+
     if not should_process():
         # Not an apex test command, exit silently
         sys.exit(0)
@@ -356,6 +843,11 @@ def main():
         if results['summary']['total'] > 0 or results['failures']:
             formatted = format_output(results)
             print(formatted)
+            slowest = sorted(results.get('tests', []), key=lambda t: t['run_time'], reverse=True)[:5]
+            if slowest and slowest[0]['run_time'] > 0:
+                print("⏱️  SLOWEST TESTS")
+                for test in slowest:
+                    print(f"   {test['run_time'] / 1000:8.2f}s  {test['class']}.{test['method']}")
     except Exception as e:
         # Silently fail - don't block on parsing errors
         sys.exit(0)
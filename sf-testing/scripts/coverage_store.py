@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+coverage_store.py - Merge line-level Apex coverage across test runs and shards
+
+Stores coverage as two bitsets per class/trigger (coverable lines, covered
+lines; bit n = line n) keyed by class name + a hash of the source it was
+measured against. Merging a run is a bitwise OR, so shards and repeated runs
+union in O(lines) and re-merging the same file is harmless. Coverage
+measured against an older version of a source stays under its old hash and
+is never mixed with the current one.
+
+Usage:
+    python3 coverage_store.py merge shard-*/test-result.json --source force-app
+    python3 coverage_store.py report [--below 75]
+    python3 coverage_store.py uncovered AccountService --source force-app
+    python3 coverage_store.py uncovered --git-diff origin/main --source force-app
+    python3 coverage_store.py export --format lcov -o coverage.lcov --source force-app
+    python3 coverage_store.py prune --source force-app
+"""
+
+import os
+import sys
+import json
+import hashlib
+import sqlite3
+import argparse
+import subprocess
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from test_impact import (Colors, discover_sources, parse_git_diff, results_module,  # noqa: E402
+                         source_name)
+
+SCHEMA_VERSION = 1
+DEFAULT_DB = '.sf-coverage.db'
+UNKNOWN_HASH = ''  # coverage merged without access to the source
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS coverage (
+    name TEXT NOT NULL COLLATE NOCASE,
+    source_hash TEXT NOT NULL,
+    path TEXT,
+    coverable BLOB NOT NULL,
+    covered BLOB NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY (name, source_hash)
+);
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Bitsets
+# ═══════════════════════════════════════════════════════════════════════════
+
+def to_bits(lines: Iterable[int]) -> int:
+    bits = 0
+    for n in lines:
+        bits |= 1 << int(n)
+    return bits
+
+
+def from_bits(bits: int) -> List[int]:
+    """Set bit positions in ascending order."""
+    return [i for i, c in enumerate(bin(bits)[:1:-1]) if c == '1'] if bits > 0 else []
+
+
+def pack(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+
+def unpack(blob: bytes) -> int:
+    return int.from_bytes(blob, 'little')
+
+
+def format_ranges(lines: List[int]) -> str:
+    """[3, 4, 5, 9] -> '3-5, 9'."""
+    parts = []
+    for n in lines:
+        if parts and n == parts[-1][1] + 1:
+            parts[-1][1] = n
+        else:
+            parts.append([n, n])
+    return ', '.join(str(a) if a == b else f"{a}-{b}" for a, b in parts)
+
+
+def source_hash(path: str) -> str:
+    """Hash of a source file, insensitive to line-ending style."""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read().replace(b'\r\n', b'\n')).hexdigest()[:16]
+
+
+class SourceTree:
+    """Name -> (path, hash) for the Apex sources under a directory."""
+
+    def __init__(self, directory: Optional[str]):
+        self.paths: Dict[str, str] = {}
+        self._hashes: Dict[str, str] = {}
+        if directory:
+            for path in discover_sources(directory):
+                self.paths[source_name(path).lower()] = path
+
+    def path(self, name: str) -> Optional[str]:
+        return self.paths.get(name.lower())
+
+    def hash(self, name: str) -> str:
+        key = name.lower()
+        if key not in self._hashes:
+            path = self.paths.get(key)
+            self._hashes[key] = source_hash(path) if path else UNKNOWN_HASH
+        return self._hashes[key]
+
+
+class ClassCoverage:
+    """Coverage of one class/trigger version."""
+
+    __slots__ = ('name', 'source_hash', 'path', 'coverable', 'covered')
+
+    def __init__(self, name: str, source_hash: str, path: Optional[str], coverable: int, covered: int):
+        self.name = name
+        self.source_hash = source_hash
+        self.path = path
+        self.coverable = coverable | covered
+        self.covered = covered
+
+    @property
+    def uncovered(self) -> int:
+        return self.coverable & ~self.covered
+
+    @property
+    def total_lines(self) -> int:
+        return bin(self.coverable).count('1')
+
+    @property
+    def covered_lines(self) -> int:
+        return bin(self.covered).count('1')
+
+    @property
+    def percent(self) -> float:
+        total = self.total_lines
+        return round(self.covered_lines / total * 100, 1) if total else 0.0
+
+
+class CoverageStore:
+    """SQLite-backed store of per-class coverage bitsets."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self._migrate()
+
+    def _migrate(self):
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            version = int(row[0]) if row else None
+        except sqlite3.OperationalError:
+            pass
+        if version is not None and version != SCHEMA_VERSION:
+            for table in ('coverage', 'meta'):
+                self.conn.execute(f'DROP TABLE IF EXISTS {table}')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def _row(self, row: sqlite3.Row) -> ClassCoverage:
+        return ClassCoverage(row['name'], row['source_hash'], row['path'],
+                             unpack(row['coverable']), unpack(row['covered']))
+
+    def get(self, name: str, source_hash: str) -> Optional[ClassCoverage]:
+        row = self.conn.execute('SELECT * FROM coverage WHERE name = ? AND source_hash = ?',
+                                (name, source_hash)).fetchone()
+        return self._row(row) if row else None
+
+    def latest(self, name: str) -> Optional[ClassCoverage]:
+        row = self.conn.execute('SELECT * FROM coverage WHERE name = ? ORDER BY updated_at DESC LIMIT 1',
+                                (name,)).fetchone()
+        return self._row(row) if row else None
+
+    def all(self) -> List[ClassCoverage]:
+        """Most recently updated version of every class."""
+        rows = self.conn.execute(
+            'SELECT * FROM coverage c WHERE updated_at = '
+            '(SELECT MAX(updated_at) FROM coverage WHERE name = c.name) ORDER BY name').fetchall()
+        seen, result = set(), []
+        for row in rows:
+            if row['name'].lower() not in seen:
+                seen.add(row['name'].lower())
+                result.append(self._row(row))
+        return result
+
+    def merge(self, items: Iterable[Tuple[str, object]], sources: SourceTree) -> Dict[str, int]:
+        """
+        Union one run's coverage into the store.
+
+        Accepts aggregate coverage records and per-test coverage, each with
+        covered and uncovered lines; both are ORed into the bitsets of the
+        class version currently on disk.
+        """
+        pending: Dict[Tuple[str, str], List[int]] = {}   # (name, hash) -> [coverable, covered]
+        names: Dict[Tuple[str, str], str] = {}
+        stats = {'records': 0, 'classes': 0}
+
+        def add(name: str, covered: Iterable[int], uncovered: Iterable[int] = ()):
+            key = (name.lower(), sources.hash(name))
+            names.setdefault(key, name)
+            entry = pending.setdefault(key, [0, 0])
+            covered_bits = to_bits(covered)
+            entry[0] |= covered_bits | to_bits(uncovered)
+            entry[1] |= covered_bits
+            stats['records'] += 1
+
+        for kind, item in items:
+            if kind == 'coverage' and isinstance(item, dict):
+                cov = results_module.normalize_coverage(item)
+                add(cov['class'], cov['covered_line_numbers'], cov['uncovered_lines'])
+            elif kind == 'test':
+                covered = item.get('class_coverage') or {}
+                uncovered = item.get('class_uncovered') or {}
+                for name in set(covered) | set(uncovered):
+                    add(name, covered.get(name, ()), uncovered.get(name, ()))
+
+        now = datetime.now().isoformat(timespec='seconds')
+        for key, (coverable, covered) in pending.items():
+            name, digest = names[key], key[1]
+            existing = self.get(name, digest)
+            if existing:
+                coverable |= existing.coverable
+                covered |= existing.covered
+            self.conn.execute('INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?, ?)',
+                              (name, digest, sources.path(name) or (existing.path if existing else None),
+                               pack(coverable | covered), pack(covered), now))
+        self.conn.commit()
+        stats['classes'] = len(pending)
+        return stats
+
+    def current(self, name: str, sources: SourceTree) -> Tuple[Optional[ClassCoverage], bool]:
+        """
+        Coverage for the class version on disk.
+
+        Returns:
+            (coverage, is_current); falls back to the latest stored version
+            with is_current False when the source changed since it was measured
+        """
+        digest = sources.hash(name)
+        found = self.get(name, digest)
+        if found:
+            return found, True
+        return self.latest(name), False
+
+    def prune(self, sources: SourceTree) -> int:
+        """Drop versions that no longer match the source on disk."""
+        removed = 0
+        for row in self.conn.execute('SELECT name, source_hash FROM coverage').fetchall():
+            if sources.path(row['name']) and row['source_hash'] != sources.hash(row['name']):
+                self.conn.execute('DELETE FROM coverage WHERE name = ? AND source_hash = ?',
+                                  (row['name'], row['source_hash']))
+                removed += 1
+        self.conn.commit()
+        return removed
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Export
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _relative(path: Optional[str], name: str) -> str:
+    if not path:
+        return name
+    try:
+        return os.path.relpath(path)
+    except ValueError:
+        return path
+
+
+def export_lcov(classes: List[ClassCoverage]) -> str:
+    """LCOV tracefile (genhtml, Codecov, SonarQube generic importers)."""
+    out = []
+    for cov in classes:
+        covered = cov.covered
+        out.append("TN:")
+        out.append(f"SF:{_relative(cov.path, cov.name)}")
+        for line in from_bits(cov.coverable):
+            out.append(f"DA:{line},{1 if covered >> line & 1 else 0}")
+        out.append(f"LF:{cov.total_lines}")
+        out.append(f"LH:{cov.covered_lines}")
+        out.append("end_of_record")
+    return "\n".join(out) + "\n"
+
+
+def export_cobertura(classes: List[ClassCoverage], source_dir: Optional[str]) -> str:
+    """Cobertura XML (Jenkins, GitLab, Azure DevOps)."""
+    total = sum(c.total_lines for c in classes)
+    covered = sum(c.covered_lines for c in classes)
+    rate = f"{covered / total:.4f}" if total else "0"
+    root = ET.Element('coverage', {
+        'line-rate': rate, 'branch-rate': '0', 'lines-covered': str(covered), 'lines-valid': str(total),
+        'branches-covered': '0', 'branches-valid': '0', 'complexity': '0', 'version': '1',
+        'timestamp': str(int(datetime.now().timestamp())),
+    })
+    ET.SubElement(ET.SubElement(root, 'sources'), 'source').text = os.path.abspath(source_dir or '.')
+    package = ET.SubElement(ET.SubElement(root, 'packages'), 'package',
+                            {'name': 'apex', 'line-rate': rate, 'branch-rate': '0', 'complexity': '0'})
+    class_list = ET.SubElement(package, 'classes')
+    base = os.path.abspath(source_dir) if source_dir else None
+    for cov in classes:
+        filename = os.path.relpath(cov.path, base) if cov.path and base else _relative(cov.path, cov.name)
+        element = ET.SubElement(class_list, 'class', {
+            'name': cov.name, 'filename': filename,
+            'line-rate': f"{cov.covered_lines / cov.total_lines:.4f}" if cov.total_lines else "0",
+            'branch-rate': '0', 'complexity': '0'})
+        ET.SubElement(element, 'methods')
+        lines = ET.SubElement(element, 'lines')
+        for line in from_bits(cov.coverable):
+            ET.SubElement(lines, 'line', {'number': str(line), 'hits': str(cov.covered >> line & 1)})
+    ET.indent(root)
+    return '<?xml version="1.0" ?>\n' + ET.tostring(root, encoding='unicode') + "\n"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════════════
+
+def uncovered_report(store: CoverageStore, sources: SourceTree,
+                     targets: Dict[str, Set[int]]) -> List[dict]:
+    """
+    Uncovered lines per class; restricted to the changed lines when known.
+
+    A class whose source changed since coverage was measured has no line
+    coverage for its current version, so every changed line is reported as
+    unverified rather than mapped through stale line numbers.
+    """
+    report = []
+    for target, changed in targets.items():
+        name = source_name(target)
+        cov, is_current = store.current(name, sources)
+        entry = {'class': cov.name if cov else name, 'current': is_current,
+                 'percent': cov.percent if cov and is_current else None}
+        if not cov:
+            entry['status'] = 'no coverage recorded'
+            entry['lines'] = sorted(changed)
+        elif not is_current:
+            entry['status'] = 'source changed since last run'
+            entry['lines'] = sorted(changed)
+        elif changed:
+            # Changed lines that are coverable but not covered; non-code lines don't count
+            entry['status'] = 'ok'
+            entry['lines'] = from_bits(to_bits(changed) & cov.uncovered)
+        else:
+            entry['status'] = 'ok'
+            entry['lines'] = from_bits(cov.uncovered)
+        report.append(entry)
+    return report
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", default=DEFAULT_DB, help=f"SQLite store (default: {DEFAULT_DB})")
+    common.add_argument("--source", help="Apex source directory used to hash/locate classes (e.g. force-app)")
+    parser = argparse.ArgumentParser(description="Merge and query line-level Apex coverage")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    merge_parser = sub.add_parser("merge", parents=[common], help="Union coverage from one or more test result files")
+    merge_parser.add_argument("results", nargs="+", help="sf apex run test JSON files ('-' for stdin)")
+
+    report_parser = sub.add_parser("report", parents=[common], help="Coverage per class")
+    report_parser.add_argument("--below", type=float, help="Only classes below this percentage")
+    report_parser.add_argument("--format", choices=["console", "json"], default="console")
+
+    uncovered_parser = sub.add_parser("uncovered", parents=[common], help="Uncovered lines for classes or changed lines")
+    uncovered_parser.add_argument("classes", nargs="*", help="Class/trigger names or files")
+    uncovered_parser.add_argument("--git-diff", metavar="REF", help="Only lines changed since REF")
+    uncovered_parser.add_argument("--format", choices=["console", "json"], default="console")
+
+    export_parser = sub.add_parser("export", parents=[common], help="Export merged coverage")
+    export_parser.add_argument("--format", choices=["lcov", "cobertura"], default="lcov")
+    export_parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+
+    sub.add_parser("prune", parents=[common], help="Drop coverage measured against outdated sources (needs --source)")
+
+    args = parser.parse_args()
+    store = CoverageStore(args.db)
+    sources = SourceTree(args.source)
+    try:
+        if args.command == "merge":
+            if not args.source:
+                print(f"{Colors.YELLOW}⚠️  No --source given: coverage is stored without source hashes{Colors.NC}")
+            for path in args.results:
+                stats = store.merge(results_module.iter_result_items(path), sources)
+                print(f"{Colors.GREEN}✓{Colors.NC} {path}: {stats['records']} coverage records "
+                      f"→ {stats['classes']} classes")
+
+        elif args.command == "report":
+            classes = [c for c in store.all() if args.below is None or c.percent < args.below]
+            total = sum(c.total_lines for c in classes)
+            covered = sum(c.covered_lines for c in classes)
+            if args.format == "json":
+                print(json.dumps({'total_lines': total, 'covered_lines': covered,
+                                  'classes': [{'class': c.name, 'percent': c.percent, 'total_lines': c.total_lines,
+                                               'covered_lines': c.covered_lines} for c in classes]}, indent=2))
+            else:
+                print(f"\n{Colors.BOLD}📊 MERGED COVERAGE{Colors.NC}")
+                print("-" * 60)
+                for c in sorted(classes, key=lambda c: c.percent):
+                    color = Colors.GREEN if c.percent >= 75 else Colors.RED
+                    print(f"   {color}{c.percent:5.1f}%{Colors.NC}  {c.name} ({c.covered_lines}/{c.total_lines})")
+                pct = covered / total * 100 if total else 0
+                print(f"\n   Total: {pct:.1f}% ({covered}/{total} lines, {len(classes)} classes)\n")
+
+        elif args.command == "uncovered":
+            targets: Dict[str, Set[int]] = {name: set() for name in args.classes}
+            if args.git_diff:
+                targets.update(parse_git_diff(args.git_diff))
+            if not targets:
+                print(f"{Colors.RED}❌ Pass class names or --git-diff REF{Colors.NC}")
+                sys.exit(1)
+            report = uncovered_report(store, sources, targets)
+            if args.format == "json":
+                print(json.dumps(report, indent=2))
+            else:
+                print(f"\n{Colors.BOLD}🔍 UNCOVERED LINES{Colors.NC}")
+                print("-" * 60)
+                for entry in report:
+                    if entry['status'] != 'ok':
+                        print(f"   {Colors.YELLOW}⚠️  {entry['class']}: {entry['status']}{Colors.NC}"
+                              + (f" (changed: {format_ranges(entry['lines'])})" if entry['lines'] else ""))
+                    elif entry['lines']:
+                        print(f"   {Colors.RED}❌ {entry['class']}{Colors.NC} ({entry['percent']}%): "
+                              f"{format_ranges(entry['lines'])}")
+                    else:
+                        print(f"   {Colors.GREEN}✓{Colors.NC} {entry['class']} ({entry['percent']}%)")
+                print()
+
+        elif args.command == "export":
+            classes = store.all()
+            text = export_lcov(classes) if args.format == "lcov" else export_cobertura(classes, args.source)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                print(f"{Colors.GREEN}✓{Colors.NC} {len(classes)} classes → {args.output}")
+            else:
+                sys.stdout.write(text)
+
+        else:
+            if not args.source:
+                print(f"{Colors.RED}❌ prune needs --source{Colors.NC}")
+                sys.exit(1)
+            print(f"{Colors.GREEN}✓{Colors.NC} Removed {store.prune(sources)} outdated class versions")
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"{Colors.RED}❌ {e}{Colors.NC}")
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print(f"{Colors.RED}❌ SQLite error: {e}{Colors.NC}")
+        sys.exit(1)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+test_impact.py - Select the Apex test classes affected by a change
+
+Keeps a SQLite test-impact index with two sources of truth:
+
+  * per-test line coverage recorded from `sf apex run test --detailed-coverage`
+    results (which test method executed which lines of which class/trigger)
+  * a static reference graph of the Apex sources (which class/trigger mentions
+    which other class), used for code that has no coverage data yet
+
+Given changed .cls/.trigger files (or a git ref to diff against) it returns a
+small set of test classes that together exercise every change, so a
+validation run does not need RunLocalTests.
+
+Usage:
+    python3 test_impact.py scan force-app
+    python3 test_impact.py record test-results/test-result.json
+    python3 test_impact.py select force-app/main/default/classes/AccountService.cls
+    python3 test_impact.py select --git-diff origin/main --format list
+    python3 test_impact.py stats
+
+Both `scan` and `record` are incremental: scan only re-reads sources whose
+mtime/size changed, and record only replaces coverage for the test methods
+present in the given run.
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import argparse
+import subprocess
+import importlib.util
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+RESULTS_PARSER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   '..', 'hooks', 'scripts', 'parse-test-results.py')
+
+_spec = importlib.util.spec_from_file_location('parse_test_results', RESULTS_PARSER_PATH)
+results_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(results_module)
+
+SCHEMA_VERSION = 1
+DEFAULT_DB = '.sf-test-impact.db'
+SOURCE_EXTENSIONS = ('.cls', '.trigger')
+DEFAULT_DEPTH = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY COLLATE NOCASE,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    is_test INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    source TEXT NOT NULL COLLATE NOCASE REFERENCES sources(name) ON DELETE CASCADE,
+    target TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (source, target)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    test_class TEXT NOT NULL COLLATE NOCASE,
+    test_method TEXT NOT NULL COLLATE NOCASE,
+    covered TEXT NOT NULL COLLATE NOCASE,
+    lines TEXT NOT NULL,
+    run_id TEXT,
+    PRIMARY KEY (test_class, test_method, covered)
+);
+CREATE TABLE IF NOT EXISTS test_runtime (
+    test_class TEXT NOT NULL COLLATE NOCASE,
+    test_method TEXT NOT NULL COLLATE NOCASE,
+    run_ms INTEGER,
+    outcome TEXT,
+    run_id TEXT,
+    PRIMARY KEY (test_class, test_method)
+);
+CREATE INDEX IF NOT EXISTS idx_refs_target ON refs(target);
+CREATE INDEX IF NOT EXISTS idx_coverage_covered ON coverage(covered);
+"""
+
+# Comments and string literals are removed before collecting identifiers
+APEX_NOISE_RE = re.compile(r"/\*.*?\*/|//[^\n]*|'(?:\\.|[^'\\])*'", re.DOTALL)
+IDENTIFIER_RE = re.compile(r'\b[A-Za-z_][A-Za-z0-9_]*\b')
+IS_TEST_RE = re.compile(r'@IsTest\b[^{;]*?\bclass\b', re.IGNORECASE)
+HUNK_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+# ANSI color codes
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    CYAN = '\033[0;36m'
+    BOLD = '\033[1m'
+    NC = '\033[0m'  # No Color
+
+
+def encode_lines(lines: Iterable[int]) -> str:
+    """Compact sorted line numbers as ranges: [1, 2, 3, 7] -> '1-3,7'."""
+    parts = []
+    start = prev = None
+    for n in sorted(set(lines)):
+        if prev is not None and n == prev + 1:
+            prev = n
+            continue
+        if start is not None:
+            parts.append(str(start) if start == prev else f"{start}-{prev}")
+        start = prev = n
+    if start is not None:
+        parts.append(str(start) if start == prev else f"{start}-{prev}")
+    return ','.join(parts)
+
+
+def decode_lines(encoded: str) -> Set[int]:
+    """Inverse of encode_lines."""
+    lines = set()
+    for part in filter(None, encoded.split(',')):
+        start, _, end = part.partition('-')
+        lines.update(range(int(start), int(end or start) + 1))
+    return lines
+
+
+def source_name(path: str) -> str:
+    """AccountService.cls -> AccountService."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def discover_sources(directory: str) -> List[str]:
+    """All .cls/.trigger files under directory, sorted."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+        for filename in filenames:
+            if filename.endswith(SOURCE_EXTENSIONS):
+                found.append(os.path.abspath(os.path.join(dirpath, filename)))
+    return sorted(found)
+
+
+def scan_source(path: str) -> Tuple[bool, Set[str]]:
+    """
+    Read one Apex source file.
+
+    Returns:
+        (is test class, identifiers referenced outside comments/strings)
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        content = APEX_NOISE_RE.sub(' ', f.read())
+    is_test = path.endswith('.cls') and bool(IS_TEST_RE.search(content))
+    return is_test, {m.group(0).lower() for m in IDENTIFIER_RE.finditer(content)}
+
+
+def parse_git_diff(ref: str, cwd: Optional[str] = None) -> Dict[str, Set[int]]:
+    """
+    Changed Apex files relative to ref (plus uncommitted changes).
+
+    Returns:
+        {absolute path: changed line numbers in the new file}; deleted files
+        map to an empty set
+    """
+    top = subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=cwd,
+                         capture_output=True, text=True, check=True).stdout.strip()
+    diff = subprocess.run(['git', 'diff', '-U0', '--no-color', ref, '--', '*.cls', '*.trigger'],
+                          cwd=top, capture_output=True, text=True, check=True).stdout
+    changed: Dict[str, Set[int]] = {}
+    old_path = current = None
+    for line in diff.split('\n'):
+        if line.startswith('--- '):
+            old_path = line[6:] if line.startswith('--- a/') else None
+        elif line.startswith('+++ '):
+            if line == '+++ /dev/null':
+                # Deleted file: select its tests, no line information
+                changed[os.path.join(top, old_path)] = set()
+                current = None
+            else:
+                current = os.path.join(top, line[6:])
+                changed.setdefault(current, set())
+        elif current and line.startswith('@@'):
+            match = HUNK_RE.match(line)
+            if match:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                # Pure deletions (count 0) touch the lines around the hunk
+                changed[current].update(range(start, start + count) if count else (start, start + 1))
+    return changed
+
+
+class ImpactIndex:
+    """SQLite store for the reference graph, per-test coverage and test runtimes."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self._migrate()
+
+    def _migrate(self):
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            version = int(row[0]) if row else None
+        except sqlite3.OperationalError:
+            pass
+        if version is not None and version != SCHEMA_VERSION:
+            for table in ('refs', 'sources', 'coverage', 'test_runtime', 'meta'):
+                self.conn.execute(f'DROP TABLE IF EXISTS {table}')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ── Static reference graph ─────────────────────────────────────────────
+
+    def scan(self, directory: str, force: bool = False) -> Dict[str, int]:
+        """
+        Re-read new/changed sources under directory and rebuild their edges.
+
+        Edges are stored by name only; targets are resolved against the
+        known sources at query time, so a class added later is linked
+        without re-reading the files that mention it.
+        """
+        paths = discover_sources(directory)
+        known = {row['path']: (row['mtime_ns'], row['size'])
+                 for row in self.conn.execute('SELECT path, mtime_ns, size FROM sources')}
+        stats = {'discovered': len(paths), 'scanned': 0, 'skipped': 0, 'removed': 0}
+
+        for path in paths:
+            st = os.stat(path)
+            if not force and known.get(path) == (st.st_mtime_ns, st.st_size):
+                stats['skipped'] += 1
+                continue
+            name = source_name(path)
+            is_test, identifiers = scan_source(path)
+            identifiers.discard(name.lower())
+            self.conn.execute('DELETE FROM sources WHERE name = ?', (name,))
+            self.conn.execute('INSERT INTO sources VALUES (?, ?, ?, ?, ?, ?)',
+                              (name, path, 'trigger' if path.endswith('.trigger') else 'class',
+                               int(is_test), st.st_mtime_ns, st.st_size))
+            self.conn.executemany('INSERT INTO refs VALUES (?, ?)', [(name, ident) for ident in identifiers])
+            stats['scanned'] += 1
+
+        prefix = os.path.join(os.path.abspath(directory), '')
+        present = set(paths)
+        for row in self.conn.execute('SELECT name, path FROM sources').fetchall():
+            if row['path'].startswith(prefix) and row['path'] not in present:
+                self.conn.execute('DELETE FROM sources WHERE name = ?', (row['name'],))
+                stats['removed'] += 1
+
+        self.conn.commit()
+        return stats
+
+    def sources(self) -> Dict[str, sqlite3.Row]:
+        return {row['name'].lower(): row for row in self.conn.execute('SELECT * FROM sources')}
+
+    def dependents(self) -> Dict[str, Set[str]]:
+        """Reverse reference graph: lowercased name -> names that reference it."""
+        graph: Dict[str, Set[str]] = defaultdict(set)
+        for row in self.conn.execute('SELECT r.source, r.target FROM refs r JOIN sources s ON s.name = r.target'):
+            graph[row['target'].lower()].add(row['source'].lower())
+        return graph
+
+    # ── Coverage from test runs ────────────────────────────────────────────
+
+    def record(self, tests: Iterable[dict], run_id: str) -> Dict[str, int]:
+        """
+        Replace coverage/runtime for each test method in a run.
+
+        Methods without per-test coverage (no --detailed-coverage, or JUnit
+        input) only update runtimes, so their previous coverage is kept.
+        """
+        stats = {'tests': 0, 'with_coverage': 0, 'rows': 0}
+        for test in tests:
+            stats['tests'] += 1
+            key = (test['class'], test['method'])
+            self.conn.execute('INSERT OR REPLACE INTO test_runtime VALUES (?, ?, ?, ?, ?)',
+                              key + (test['run_time'], test['outcome'], run_id))
+            class_coverage = test.get('class_coverage') or {}
+            if not class_coverage:
+                continue
+            stats['with_coverage'] += 1
+            self.conn.execute('DELETE FROM coverage WHERE test_class = ? AND test_method = ?', key)
+            rows = [key + (covered, encode_lines(lines), run_id)
+                    for covered, lines in class_coverage.items()
+                    if covered.lower() != test['class'].lower()]
+            self.conn.executemany('INSERT INTO coverage VALUES (?, ?, ?, ?, ?)', rows)
+            stats['rows'] += len(rows)
+        self.conn.commit()
+        return stats
+
+    def covering_tests(self, name: str) -> Dict[str, Set[int]]:
+        """Test class -> union of lines of `name` its methods covered."""
+        covering: Dict[str, Set[int]] = defaultdict(set)
+        for row in self.conn.execute('SELECT test_class, lines FROM coverage WHERE covered = ?', (name,)):
+            covering[row['test_class']] |= decode_lines(row['lines'])
+        return covering
+
+    def test_class_runtimes(self) -> Dict[str, int]:
+        return {row['test_class'].lower(): row['total'] for row in self.conn.execute(
+            'SELECT test_class, SUM(run_ms) AS total FROM test_runtime GROUP BY test_class')}
+
+    def stats(self) -> Dict[str, int]:
+        one = lambda sql: self.conn.execute(sql).fetchone()[0]
+        return {
+            'sources': one('SELECT COUNT(*) FROM sources'),
+            'test_classes': one('SELECT COUNT(*) FROM sources WHERE is_test = 1'),
+            'references': one('SELECT COUNT(*) FROM refs'),
+            'covered_classes': one('SELECT COUNT(DISTINCT covered) FROM coverage'),
+            'test_methods_with_coverage': one(
+                'SELECT COUNT(*) FROM (SELECT DISTINCT test_class, test_method FROM coverage)'),
+            'test_methods_timed': one('SELECT COUNT(*) FROM test_runtime'),
+        }
+
+
+class TestSelector:
+    """Greedy minimum set cover of changed code by test classes."""
+
+    def __init__(self, index: ImpactIndex, depth: int = DEFAULT_DEPTH):
+        self.index = index
+        self.depth = depth
+        self.sources = index.sources()
+        self.runtimes = index.test_class_runtimes()
+        self._dependents: Optional[Dict[str, Set[str]]] = None
+
+    def _display(self, name: str) -> str:
+        row = self.sources.get(name.lower())
+        return row['name'] if row else name
+
+    def is_test(self, name: str) -> bool:
+        row = self.sources.get(name.lower())
+        return bool(row and row['is_test'])
+
+    def static_tests(self, name: str) -> Dict[str, int]:
+        """Test classes that reach `name` through the reference graph, with hop count."""
+        if self._dependents is None:
+            self._dependents = self.index.dependents()
+        found, seen = {}, {name.lower()}
+        queue = deque([(name.lower(), 0)])
+        while queue:
+            current, hops = queue.popleft()
+            if hops >= self.depth:
+                continue
+            for dependent in self._dependents.get(current, ()):
+                if dependent in seen:
+                    continue
+                seen.add(dependent)
+                if self.is_test(dependent):
+                    found[self._display(dependent)] = hops + 1
+                else:
+                    queue.append((dependent, hops + 1))
+        return found
+
+    def select(self, changes: Dict[str, Set[int]]) -> dict:
+        """
+        Pick test classes for changed files.
+
+        Args:
+            changes: {path or class/trigger name: changed line numbers (empty = whole file)}
+
+        Returns:
+            dict with 'tests' (selected, in pick order), 'reasons', 'direct'
+            (changed test classes), 'untested' and 'static_only' class names
+        """
+        # Each element of the universe is (class, line) or (class, None) for "any test of class"
+        universe: Set[Tuple[str, Optional[int]]] = set()
+        candidates: Dict[str, Set[Tuple[str, Optional[int]]]] = defaultdict(set)
+        direct, untested, static_only = [], [], []
+
+        for changed, lines in changes.items():
+            name = self._display(source_name(changed))
+            if self.is_test(name):
+                direct.append(name)
+                continue
+
+            covering = self.index.covering_tests(name)
+            covering = {test: hit for test, hit in covering.items()
+                        if test.lower() in self.sources or not self.sources}  # drop deleted tests
+            if covering:
+                hit_lines = set()
+                for test, covered in covering.items():
+                    hits = covered & lines if lines else set()
+                    hit_lines |= hits
+                    candidates[test].update((name, line) for line in hits)
+                    candidates[test].add((name, None))
+                universe.update((name, line) for line in hit_lines)
+                universe.add((name, None))
+                continue
+
+            static = self.static_tests(name)
+            if static:
+                static_only.append(name)
+                universe.add((name, None))
+                for test in static:
+                    candidates[test].add((name, None))
+            else:
+                untested.append(name)
+
+        selected, reasons = [], {}
+        remaining = set(universe)
+        while remaining:
+            best = max(candidates, key=lambda t: (len(candidates[t] & remaining),
+                                                  -self.runtimes.get(t.lower(), 0), t))
+            gained = candidates[best] & remaining
+            if not gained:
+                break
+            selected.append(best)
+            remaining -= gained
+        # A later pick can make an earlier one redundant
+        for test in list(reversed(selected)):
+            others = set().union(*(candidates[t] for t in selected if t != test)) if len(selected) > 1 else set()
+            if universe <= others:
+                selected.remove(test)
+        for test in selected:
+            reasons[test] = sorted({cls for cls, _ in candidates[test] & universe})
+
+        tests = sorted(set(selected) | set(direct), key=str.lower)
+        return {
+            'tests': tests,
+            'reasons': reasons,
+            'direct': sorted(direct),
+            'static_only': sorted(static_only),
+            'untested': sorted(untested),
+            'estimated_ms': sum(self.runtimes.get(t.lower(), 0) for t in tests),
+        }
+
+
+def print_selection(selection: dict, changes: Dict[str, Set[int]]):
+    """Console report for `select`."""
+    print(f"\n{Colors.BOLD}🎯 TEST IMPACT{Colors.NC} ({len(changes)} changed file(s))")
+    print("-" * 60)
+    if not selection['tests']:
+        print("   No test classes found for these changes.")
+    for test in selection['tests']:
+        if test in selection['reasons']:
+            print(f"   {Colors.GREEN}✓{Colors.NC} {test}  ← {', '.join(selection['reasons'][test])}")
+        else:
+            print(f"   {Colors.GREEN}✓{Colors.NC} {test}  (changed test class)")
+    if selection['static_only']:
+        print(f"\n   {Colors.YELLOW}⚠️  No coverage recorded, selected by references:{Colors.NC} "
+              f"{', '.join(selection['static_only'])}")
+    if selection['untested']:
+        print(f"   {Colors.RED}❌ No tests reference:{Colors.NC} {', '.join(selection['untested'])}")
+    if selection['estimated_ms']:
+        print(f"\n   Estimated runtime: {selection['estimated_ms'] / 1000:.1f}s (from recorded runs)")
+    if selection['tests']:
+        print(f"\n   sf apex run test --class-names {','.join(selection['tests'])} "
+              f"--code-coverage --detailed-coverage --result-format json")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Select Apex test classes affected by a change")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite index file (default: {DEFAULT_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = sub.add_parser("scan", help="Index Apex sources and their references (incremental)")
+    scan_parser.add_argument("directory", help="Source directory, e.g. force-app")
+    scan_parser.add_argument("--force", action="store_true", help="Re-read every file")
+
+    record_parser = sub.add_parser("record", help="Record per-test coverage and runtimes from a test run")
+    record_parser.add_argument("results", help="sf apex run test JSON (--detailed-coverage) or JUnit XML, '-' for stdin")
+
+    select_parser = sub.add_parser("select", help="Choose test classes for changed files")
+    select_parser.add_argument("files", nargs="*", help="Changed .cls/.trigger files or class names")
+    select_parser.add_argument("--git-diff", metavar="REF", help="Use files/lines changed since REF")
+    select_parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH,
+                               help=f"Reference hops searched for uncovered classes (default: {DEFAULT_DEPTH})")
+    select_parser.add_argument("--format", choices=["console", "json", "list"], default="console",
+                               help="list prints comma-separated names for --class-names")
+
+    sub.add_parser("stats", help="Show index size")
+
+    args = parser.parse_args()
+    index = ImpactIndex(args.db)
+    try:
+        if args.command == "scan":
+            if not os.path.isdir(args.directory):
+                print(f"{Colors.RED}❌ Not a directory: {args.directory}{Colors.NC}")
+                sys.exit(1)
+            stats = index.scan(args.directory, args.force)
+            print(f"{Colors.GREEN}✓{Colors.NC} {stats['discovered']} sources: {stats['scanned']} scanned, "
+                  f"{stats['skipped']} unchanged, {stats['removed']} removed → {args.db}")
+
+        elif args.command == "record":
+            run_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+            tests = (item for kind, item in results_module.iter_result_items(args.results) if kind == 'test')
+            stats = index.record(tests, run_id)
+            print(f"{Colors.GREEN}✓{Colors.NC} {stats['tests']} tests recorded, {stats['with_coverage']} with "
+                  f"per-test coverage ({stats['rows']} class mappings) → {args.db}")
+            if stats['tests'] and not stats['with_coverage']:
+                print(f"{Colors.YELLOW}⚠️  No per-test coverage found; run tests with "
+                      f"--code-coverage --detailed-coverage to map tests to classes{Colors.NC}")
+
+        elif args.command == "select":
+            changes: Dict[str, Set[int]] = {path: set() for path in args.files}
+            if args.git_diff:
+                changes.update(parse_git_diff(args.git_diff))
+            if not changes:
+                print(f"{Colors.RED}❌ Pass changed files or --git-diff REF{Colors.NC}")
+                sys.exit(1)
+            selection = TestSelector(index, args.depth).select(changes)
+            if args.format == "json":
+                print(json.dumps(selection, indent=2))
+            elif args.format == "list":
+                print(','.join(selection['tests']))
+            else:
+                print_selection(selection, changes)
+
+        else:
+            print(json.dumps(index.stats(), indent=2))
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"{Colors.RED}❌ {e}{Colors.NC}")
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print(f"{Colors.RED}❌ SQLite error: {e}{Colors.NC}")
+        sys.exit(1)
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Project-wide metadata index shared by sf-skills validators.
+
+Indexes the objects, fields, record types, validation rules, layouts,
+permission sets/profiles, flows and Apex classes of an SFDX project, plus
+what they reference (field grants, layout items, flow record elements...),
+in a SQLite database per project (default: ~/.cache/sf-skills/metadata-index/,
+override with $SF_METADATA_INDEX_DB). Files are streamed with iterparse and
+re-parsed only when their mtime or size changes.
+
+Components:
+    - extract: per-type iterparse extractors
+    - index: MetadataIndex (SQLite, incremental refresh, reference checks)
+    - cli: build / status / refs / uses / dangling
+
+Usage:
+    from metadata_index import index_for
+
+    index = index_for("force-app/main/default/flows/My_Flow.flow-meta.xml")
+    if index and index.check_field("Invoice__c", "Amount__c") == "missing":
+        ...
+"""
+
+from .extract import iter_top_level, local_name, child_text
+from .index import MetadataIndex, index_for, find_project_root, default_db_path, is_custom, is_namespaced
+
+__all__ = [
+    "MetadataIndex",
+    "index_for",
+    "find_project_root",
+    "default_db_path",
+    "is_custom",
+    "is_namespaced",
+    "iter_top_level",
+    "local_name",
+    "child_text",
+]
+
+__version__ = "1.0.0"
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Build and query the project metadata index.
+
+Usage:
+    python3 shared/metadata_index/cli.py build [--project .] [--force]
+    python3 shared/metadata_index/cli.py status
+    python3 shared/metadata_index/cli.py uses CustomField Invoice__c.Amount__c
+    python3 shared/metadata_index/cli.py refs force-app/main/default/permissionsets/Sales.permissionset-meta.xml
+    python3 shared/metadata_index/cli.py dangling
+
+Validators refresh the index themselves; `build` is only needed to warm it
+up front (e.g. in CI) or after switching branches.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metadata_index import MetadataIndex, find_project_root  # noqa: E402
+
+
+def _when(timestamp) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M") if timestamp else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the SFDX project metadata index")
+    parser.add_argument("--project", default=".", help="Any path inside the SFDX project (default: .)")
+    parser.add_argument("--db", help="Index database (default: $SF_METADATA_INDEX_DB or ~/.cache/sf-skills)")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = sub.add_parser("build", help="Index new and changed files")
+    build_parser.add_argument("--force", action="store_true", help="Re-parse every file")
+
+    sub.add_parser("status", help="Components per type")
+
+    uses_parser = sub.add_parser("uses", help="Where a component is referenced")
+    uses_parser.add_argument("kind", help="CustomField, CustomObject, RecordType, ApexClass, Layout, Flow")
+    uses_parser.add_argument("name", help="API name, e.g. Invoice__c.Amount__c")
+
+    refs_parser = sub.add_parser("refs", help="What a file references")
+    refs_parser.add_argument("file")
+
+    sub.add_parser("dangling", help="References to custom components missing from the project")
+
+    args = parser.parse_args()
+    root = find_project_root(args.project)
+    if root is None:
+        print(f"❌ No sfdx-project.json at or above {os.path.abspath(args.project)}")
+        sys.exit(1)
+
+    index = MetadataIndex(str(root), args.db)
+    try:
+        stats = index.refresh(force=getattr(args, "force", False))
+        if args.command == "build":
+            if args.json:
+                print(json.dumps(stats, indent=2))
+            else:
+                print(f"✓ Indexed {root}: {stats['added']} added, {stats['updated']} updated, "
+                      f"{stats['removed']} removed, {stats['unchanged']} unchanged in {stats['seconds']:.2f}s")
+                if stats["failed"]:
+                    print(f"⚠️ {stats['failed']} file(s) could not be parsed")
+
+        elif args.command == "status":
+            status = index.status()
+            if args.json:
+                print(json.dumps(status, indent=2))
+                return
+            print(f"Project: {status['project']}")
+            print(f"Index:   {status['db']} (refreshed {_when(status['refreshed_at'])})")
+            print(f"Files:   {status['files']} ({status['failed']} unparseable), {status['references']} references")
+            for kind, count in status["components"].items():
+                print(f"  {kind:<16} {count:>7}")
+
+        elif args.command == "uses":
+            rows = index.references_to(args.kind, args.name)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+                return
+            defined = index.exists(args.kind, args.name)
+            print(f"{args.kind} {args.name}: {'defined' if defined else 'not defined'} in project, "
+                  f"{len(rows)} reference(s)")
+            for row in rows:
+                detail = ", ".join(key for key, value in (row["detail"] or {}).items() if value)
+                print(f"  {row['path']}  [{row['context']}]" + (f"  {detail}" if detail else ""))
+
+        elif args.command == "refs":
+            rows = index.references_from(args.file)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+                return
+            for row in rows:
+                print(f"  {row['kind']:<14} {row['target']}  [{row['context']}]")
+            print(f"{len(rows)} reference(s)")
+
+        else:
+            rows = index.dangling_refs()
+            if args.json:
+                print(json.dumps(rows, indent=2))
+                return
+            for row in rows:
+                print(f"  {row['path']}: {row['kind']} {row['target']} [{row['context']}]")
+            print(f"{'⚠️' if rows else '✓'} {len(rows)} dangling reference(s)")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
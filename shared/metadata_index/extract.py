@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Extract components and references from SFDX source files.
+
+Every XML file is streamed with iterparse: each top-level element is handed
+to the extractor and then removed from the tree, so memory stays flat even
+for 30 MB profiles. An extractor returns
+
+    components: [(kind, name, object, detail)]     what the file defines
+    refs:       [(kind, target, context, detail)]  what it points at
+
+where `kind` is a metadata type (CustomField, CustomObject, ...) and names
+are API names ("Invoice__c.Amount__c" for fields, record types and rules).
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional, Tuple
+
+Component = Tuple[str, str, Optional[str], dict]
+Ref = Tuple[str, str, str, dict]
+
+# File suffix -> metadata type (checked in order; longest suffixes first)
+SUFFIX_KINDS = [
+    ('.object-meta.xml', 'CustomObject'),
+    ('.field-meta.xml', 'CustomField'),
+    ('.recordType-meta.xml', 'RecordType'),
+    ('.validationRule-meta.xml', 'ValidationRule'),
+    ('.layout-meta.xml', 'Layout'),
+    ('.permissionset-meta.xml', 'PermissionSet'),
+    ('.profile-meta.xml', 'Profile'),
+    ('.flow-meta.xml', 'Flow'),
+    ('.cls', 'ApexClass'),
+    ('.trigger', 'ApexTrigger'),
+]
+
+# Kinds whose files live in objects/<Object>/<folder>/ and are named Object.Member
+OBJECT_MEMBER_KINDS = {'CustomField', 'RecordType', 'ValidationRule'}
+
+# Flow elements that name an sObject and the children that name its fields
+FLOW_RECORD_ELEMENTS = ('recordLookups', 'recordCreates', 'recordUpdates', 'recordDeletes', 'start')
+FLOW_FIELD_CHILDREN = ('filters', 'inputAssignments', 'outputAssignments')
+
+# Custom field tokens in a formula that belong to the rule's own object
+FORMULA_FIELD_RE = re.compile(r'(?<![.$\w])([A-Za-z][A-Za-z0-9_]*__c)\b')
+
+OBJECT_PERMISSION_FLAGS = ('allowCreate', 'allowDelete', 'allowEdit', 'allowRead',
+                           'modifyAllRecords', 'viewAllRecords')
+
+
+def local_name(tag: str) -> str:
+    """Tag without namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def child_text(elem: ET.Element, name: str, default: str = '') -> str:
+    """Stripped text of the first direct child with this local name."""
+    for child in elem:
+        if local_name(child.tag) == name:
+            return (child.text or '').strip()
+    return default
+
+
+def iter_top_level(path: str) -> Iterator[Tuple[str, ET.Element]]:
+    """
+    Yield (local name, element) for each child of the document root.
+
+    The element is complete when yielded and is detached from the root
+    afterwards, so only one top-level element is held in memory at a time.
+    """
+    depth = 0
+    root = None
+    with open(path, 'rb') as f:
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if depth == 0:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                yield local_name(elem.tag), elem
+                root.remove(elem)
+
+
+def kind_for(path: str) -> Optional[str]:
+    """Metadata type of a source file, or None if it is not indexed."""
+    for suffix, kind in SUFFIX_KINDS:
+        if path.endswith(suffix):
+            return kind
+    return None
+
+
+def component_name(path: str, kind: str) -> Tuple[str, Optional[str]]:
+    """(API name, owning object) derived from the file path."""
+    base = os.path.basename(path)
+    for suffix, suffix_kind in SUFFIX_KINDS:
+        if suffix_kind == kind:
+            base = base[:-len(suffix)]
+            break
+    if kind in OBJECT_MEMBER_KINDS:
+        obj = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        return f'{obj}.{base}', obj
+    if kind == 'CustomObject':
+        return base, base
+    if kind == 'Layout':
+        return base, base.split('-', 1)[0]
+    return base, None
+
+
+def _flags(elem: ET.Element, names) -> Dict[str, bool]:
+    return {name: child_text(elem, name) == 'true' for name in names}
+
+
+def _extract_object(path, name, obj) -> Tuple[List[Component], List[Ref]]:
+    detail, components = {}, []
+    for tag, elem in iter_top_level(path):
+        if tag in ('label', 'sharingModel'):
+            detail[tag] = (elem.text or '').strip()
+        elif tag == 'fields':
+            # Metadata API format keeps fields inline in the object file
+            field = child_text(elem, 'fullName')
+            if field:
+                components.append(('CustomField', f'{obj}.{field}', obj, {'type': child_text(elem, 'type')}))
+    return [('CustomObject', name, obj, detail)] + components, []
+
+
+def _extract_field(path, name, obj) -> Tuple[List[Component], List[Ref]]:
+    detail, refs = {}, []
+    for tag, elem in iter_top_level(path):
+        if tag in ('type', 'required', 'referenceTo', 'relationshipName'):
+            detail[tag] = (elem.text or '').strip()
+        elif tag == 'formula':
+            detail['formula'] = True
+    if detail.get('referenceTo'):
+        refs.append(('CustomObject', detail['referenceTo'], 'referenceTo', {}))
+    return [('CustomField', name, obj, detail)], refs
+
+
+def _extract_record_type(path, name, obj) -> Tuple[List[Component], List[Ref]]:
+    detail, refs = {}, []
+    for tag, elem in iter_top_level(path):
+        if tag == 'active':
+            detail['active'] = (elem.text or '').strip() == 'true'
+        elif tag == 'picklistValues':
+            picklist = child_text(elem, 'picklist')
+            if picklist:
+                refs.append(('CustomField', f'{obj}.{picklist}', 'picklistValues', {}))
+    return [('RecordType', name, obj, detail)], refs
+
+
+def _extract_validation_rule(path, name, obj) -> Tuple[List[Component], List[Ref]]:
+    detail, refs = {}, []
+    for tag, elem in iter_top_level(path):
+        text = (elem.text or '').strip()
+        if tag == 'active':
+            detail['active'] = text == 'true'
+        elif tag == 'errorDisplayField' and text:
+            refs.append(('CustomField', f'{obj}.{text}', 'errorDisplayField', {}))
+        elif tag == 'errorConditionFormula':
+            for field in sorted(set(FORMULA_FIELD_RE.findall(text))):
+                refs.append(('CustomField', f'{obj}.{field}', 'errorConditionFormula', {}))
+    return [('ValidationRule', name, obj, detail)], refs
+
+
+def _extract_layout(path, name, obj) -> Tuple[List[Component], List[Ref]]:
+    refs = []
+    for tag, elem in iter_top_level(path):
+        if tag != 'layoutSections':
+            continue
+        for item in elem.iter():
+            if local_name(item.tag) == 'layoutItems':
+                field = child_text(item, 'field')
+                if field:
+                    refs.append(('CustomField', f'{obj}.{field}', 'layoutItems', {}))
+    return [('Layout', name, obj, {})], refs
+
+
+def _extract_permissions(path, name, kind) -> Tuple[List[Component], List[Ref]]:
+    detail, refs = {}, []
+    for tag, elem in iter_top_level(path):
+        if tag == 'fieldPermissions':
+            refs.append(('CustomField', child_text(elem, 'field'), tag, _flags(elem, ('readable', 'editable'))))
+        elif tag == 'objectPermissions':
+            refs.append(('CustomObject', child_text(elem, 'object'), tag, _flags(elem, OBJECT_PERMISSION_FLAGS)))
+        elif tag == 'recordTypeVisibilities':
+            refs.append(('RecordType', child_text(elem, 'recordType'), tag, _flags(elem, ('visible',))))
+        elif tag == 'classAccesses':
+            refs.append(('ApexClass', child_text(elem, 'apexClass'), tag, _flags(elem, ('enabled',))))
+        elif tag == 'layoutAssignments':
+            refs.append(('Layout', child_text(elem, 'layout'), tag, {}))
+        elif tag in ('label', 'license', 'userLicense'):
+            detail[tag] = (elem.text or '').strip()
+    return [(kind, name, None, detail)], [ref for ref in refs if ref[1]]
+
+
+def _extract_flow(path, name, obj) -> Tuple[List[Component], List[Ref]]:
+    detail, refs = {}, []
+    for tag, elem in iter_top_level(path):
+        if tag in ('processType', 'status'):
+            detail[tag] = (elem.text or '').strip()
+        elif tag in FLOW_RECORD_ELEMENTS:
+            sobject = child_text(elem, 'object')
+            if not sobject:
+                continue
+            refs.append(('CustomObject', sobject, tag, {}))
+            for child in elem:
+                child_tag = local_name(child.tag)
+                if child_tag in FLOW_FIELD_CHILDREN:
+                    field = child_text(child, 'field')
+                elif child_tag == 'queriedFields':
+                    field = (child.text or '').strip()
+                else:
+                    continue
+                if field:
+                    refs.append(('CustomField', f'{sobject}.{field}', tag, {}))
+        elif tag == 'actionCalls' and child_text(elem, 'actionType') == 'apex':
+            refs.append(('ApexClass', child_text(elem, 'actionName'), tag, {}))
+        elif tag == 'subflows':
+            refs.append(('Flow', child_text(elem, 'flowName'), tag, {}))
+    return [('Flow', name, None, detail)], [ref for ref in refs if ref[1]]
+
+
+def extract(path: str, kind: str) -> Tuple[List[Component], List[Ref]]:
+    """
+    Components and references of one source file.
+
+    Raises:
+        ET.ParseError: for malformed XML
+    """
+    name, obj = component_name(path, kind)
+    if kind == 'CustomObject':
+        return _extract_object(path, name, obj)
+    if kind == 'CustomField':
+        return _extract_field(path, name, obj)
+    if kind == 'RecordType':
+        return _extract_record_type(path, name, obj)
+    if kind == 'ValidationRule':
+        return _extract_validation_rule(path, name, obj)
+    if kind == 'Layout':
+        return _extract_layout(path, name, obj)
+    if kind in ('PermissionSet', 'Profile'):
+        return _extract_permissions(path, name, kind)
+    if kind == 'Flow':
+        return _extract_flow(path, name, obj)
+    # Apex: the file name is all the index needs
+    return [(kind, name, None, {})], []
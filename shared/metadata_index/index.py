@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Persistent index of an SFDX project's metadata.
+
+Records which objects, fields, record types, layouts, validation rules,
+permission sets, profiles, flows and Apex classes exist in the project's
+package directories, and what they reference (permission set grants, layout
+items, flow record elements, ...). The index lives in SQLite and is
+refreshed incrementally: only files whose mtime or size changed are parsed
+again, so validators can afford a refresh on every save and answer
+reference checks from in-memory name sets.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .extract import extract, kind_for
+
+SCHEMA_VERSION = 1
+DB_ENV_VAR = "SF_METADATA_INDEX_DB"
+CACHE_ENV_VAR = "SF_SKILLS_CACHE_DIR"
+PROJECT_FILE = "sfdx-project.json"
+
+# Directories never descended into when walking package directories
+SKIP_DIRS = {".git", ".sf", ".sfdx", "node_modules", "__pycache__"}
+
+# "<ns>__" at the start of a name part, unless what follows is only a type suffix
+# (Invoice__c is custom; ns__Helper and ns__Invoice__c come from a managed package)
+NAMESPACE_RE = re.compile(r"^[A-Za-z][A-Za-z0-9]*__(?!(?:c|r|mdt|e|x|b|xo|s|kav|ka|share|history|feed|"
+                          r"hd|hqr|chn|pc|pr|del)$)", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS components (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE,
+    object TEXT COLLATE NOCASE,
+    path TEXT NOT NULL,
+    detail TEXT
+);
+CREATE TABLE IF NOT EXISTS refs (
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL COLLATE NOCASE,
+    context TEXT,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_components_name ON components(kind, name);
+CREATE INDEX IF NOT EXISTS idx_components_object ON components(object);
+CREATE INDEX IF NOT EXISTS idx_components_path ON components(path);
+CREATE INDEX IF NOT EXISTS idx_refs_target ON refs(kind, target);
+CREATE INDEX IF NOT EXISTS idx_refs_path ON refs(path);
+"""
+
+
+def find_project_root(path: str) -> Optional[Path]:
+    """Nearest directory at or above path containing sfdx-project.json."""
+    current = Path(path).resolve()
+    if current.is_file() or not current.exists():
+        current = current.parent
+    for directory in [current] + list(current.parents):
+        if (directory / PROJECT_FILE).is_file():
+            return directory
+    return None
+
+
+def default_db_path(project_root: Path) -> Path:
+    """$SF_METADATA_INDEX_DB, else one database per project in the sf-skills cache directory."""
+    if os.environ.get(DB_ENV_VAR):
+        return Path(os.environ[DB_ENV_VAR]).expanduser()
+    if os.environ.get(CACHE_ENV_VAR):
+        base = Path(os.environ[CACHE_ENV_VAR]).expanduser()
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = (Path(xdg).expanduser() if xdg else Path.home() / ".cache") / "sf-skills"
+    digest = hashlib.sha1(str(project_root.resolve()).encode("utf-8")).hexdigest()[:12]
+    return base / "metadata-index" / f"{project_root.name}-{digest}.db"
+
+
+def is_custom(name: str) -> bool:
+    """Custom, non-namespaced API name (Invoice__c, not Account or ns__Invoice__c)."""
+    return name.endswith("__c") and "__" not in name[:-3]
+
+
+def is_namespaced(name: str) -> bool:
+    """
+    True if any part of a name carries a managed-package prefix.
+
+    Parts are split on "." (Object.Field) and "-" (Object-Layout Name), so
+    Account.ns__Score__c, ns__Helper and ns__Invoice__c-ns__Main count.
+    """
+    return any(NAMESPACE_RE.match(part.strip()) for part in re.split(r"[.-]", name))
+
+
+class MetadataIndex:
+    """
+    Component and reference index for one SFDX project.
+
+    Usage:
+        index = MetadataIndex.for_path("force-app/main/default/layouts/Invoice__c-Invoice Layout.layout-meta.xml")
+        if index and index.check_field("Invoice__c", "Amount__c") == "missing":
+            ...
+    """
+
+    def __init__(self, project_root: str, db_path: Optional[str] = None):
+        self.project_root = Path(project_root).resolve()
+        self.db_path = Path(db_path) if db_path else default_db_path(self.project_root)
+        if str(self.db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self._migrate()
+        self._names: Dict[str, Set[str]] = {}
+        self._objects: Optional[Set[str]] = None
+
+    @classmethod
+    def for_path(cls, path: str, refresh: bool = True) -> Optional["MetadataIndex"]:
+        """Index of the project containing path (refreshed), or None outside an SFDX project."""
+        root = find_project_root(path)
+        if root is None:
+            return None
+        index = cls(str(root))
+        if refresh:
+            index.refresh()
+        return index
+
+    def _migrate(self):
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            version = int(row[0]) if row else None
+        except sqlite3.OperationalError:
+            pass
+        if version is not None and version != SCHEMA_VERSION:
+            # Derived data only: rebuild rather than migrate
+            for table in ("refs", "components", "files", "meta"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def package_dirs(self) -> List[Path]:
+        """packageDirectories from sfdx-project.json (default: force-app)."""
+        try:
+            with open(self.project_root / PROJECT_FILE, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            paths = [entry["path"] for entry in config.get("packageDirectories", []) if entry.get("path")]
+        except (OSError, ValueError, KeyError, TypeError):
+            paths = []
+        dirs = [self.project_root / path for path in (paths or ["force-app"])]
+        return [directory for directory in dirs if directory.is_dir()]
+
+    def scan_files(self) -> Dict[str, Tuple[str, int, int]]:
+        """{relative path: (kind, mtime_ns, size)} for every indexable file."""
+        found = {}
+        for package_dir in self.package_dirs():
+            for dirpath, dirnames, filenames in os.walk(package_dir):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                for filename in filenames:
+                    kind = kind_for(filename)
+                    if kind is None:
+                        continue
+                    full = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(full)
+                    except OSError:
+                        continue
+                    found[os.path.relpath(full, self.project_root)] = (kind, stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def refresh(self, force: bool = False) -> Dict[str, float]:
+        """
+        Bring the index up to date with the files on disk.
+
+        Args:
+            force: Re-parse every file, not just changed ones
+
+        Returns:
+            Counts of added/updated/removed/unchanged/failed files and seconds taken
+        """
+        start = time.monotonic()
+        current = self.scan_files()
+        known = {row["path"]: (row["kind"], row["mtime_ns"], row["size"])
+                 for row in self.conn.execute("SELECT path, kind, mtime_ns, size FROM files")}
+        changed = [path for path, state in current.items() if force or known.get(path) != state]
+        removed = [path for path in known if path not in current]
+        stats = {"added": 0, "updated": 0, "removed": len(removed), "failed": 0,
+                 "unchanged": len(current) - len(changed)}
+
+        for path in removed + changed:
+            self._forget(path)
+        for path in changed:
+            kind, mtime_ns, size = current[path]
+            stats["updated" if path in known else "added"] += 1
+            error = None
+            try:
+                components, refs = extract(str(self.project_root / path), kind)
+            except (ET.ParseError, OSError, UnicodeDecodeError) as e:
+                components, refs, error = [], [], str(e)
+                stats["failed"] += 1
+            self.conn.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?)", (path, kind, mtime_ns, size, error))
+            self.conn.executemany(
+                "INSERT INTO components VALUES (?, ?, ?, ?, ?)",
+                [(c_kind, name, obj, path, json.dumps(detail)) for c_kind, name, obj, detail in components])
+            self.conn.executemany(
+                "INSERT INTO refs VALUES (?, ?, ?, ?, ?)",
+                [(path, r_kind, target, context, json.dumps(detail) if detail else None)
+                 for r_kind, target, context, detail in refs])
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (str(time.time()),))
+        self.conn.commit()
+        if changed or removed:
+            self._names.clear()
+            self._objects = None
+        stats["seconds"] = time.monotonic() - start
+        return stats
+
+    def _forget(self, path: str):
+        for table in ("files", "components", "refs"):
+            self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def names(self, kind: str) -> Set[str]:
+        """Lower-cased API names of one kind, loaded once per refresh."""
+        if kind not in self._names:
+            self._names[kind] = {row[0].lower() for row in
+                                 self.conn.execute("SELECT name FROM components WHERE kind = ?", (kind,))}
+        return self._names[kind]
+
+    def exists(self, kind: str, name: str) -> bool:
+        return name.lower() in self.names(kind)
+
+    def objects(self) -> Set[str]:
+        """Objects the project has any source for (object file, fields, record types, ...)."""
+        if self._objects is None:
+            self._objects = {row[0].lower() for row in self.conn.execute(
+                "SELECT DISTINCT object FROM components WHERE object IS NOT NULL AND kind != 'Layout'")}
+        return self._objects
+
+    def check_object(self, name: str) -> str:
+        """
+        'found', 'missing' or 'unknown'.
+
+        Standard and managed-package objects are 'unknown': they exist in the
+        org without being in source. Custom objects are 'missing' only when
+        the project keeps any objects in source at all.
+        """
+        if not is_custom(name):
+            return "unknown"
+        if name.lower() in self.objects():
+            return "found"
+        return "missing" if self.names("CustomObject") else "unknown"
+
+    def check_field(self, sobject: str, field: str) -> str:
+        """
+        'found', 'missing' or 'unknown' for sobject.field.
+
+        Standard and managed-package fields are 'unknown'. A custom field is
+        'missing' when its object has source in the project but the field does not.
+        """
+        if self.exists("CustomField", f"{sobject}.{field}"):
+            return "found"
+        if not is_custom(field):
+            return "unknown"
+        return "missing" if sobject.lower() in self.objects() else "unknown"
+
+    def is_indexed(self, path: str) -> bool:
+        row = self.conn.execute("SELECT error FROM files WHERE path = ?", (self._relative(path),)).fetchone()
+        return row is not None and row[0] is None
+
+    def components(self, kind: Optional[str] = None, sobject: Optional[str] = None) -> List[dict]:
+        sql, params = "SELECT kind, name, object, path, detail FROM components WHERE 1 = 1", []
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if sobject:
+            sql += " AND object = ?"
+            params.append(sobject)
+        return [self._row(row) for row in self.conn.execute(sql + " ORDER BY kind, name", params)]
+
+    def references_to(self, kind: str, target: str) -> List[dict]:
+        """Where a component is used: [{'path', 'context', 'detail'}]."""
+        rows = self.conn.execute("SELECT path, context, detail FROM refs WHERE kind = ? AND target = ? "
+                                 "ORDER BY path", (kind, target))
+        return [self._row(row) for row in rows]
+
+    def references_from(self, path: str) -> List[dict]:
+        """What an indexed file references: [{'kind', 'target', 'context', 'detail'}]."""
+        rel = self._relative(path)
+        rows = self.conn.execute("SELECT kind, target, context, detail FROM refs WHERE path = ? "
+                                 "ORDER BY kind, target", (rel,))
+        return [self._row(row) for row in rows]
+
+    def dangling_refs(self, kinds=("CustomObject", "CustomField", "RecordType", "ApexClass", "Layout",
+                                   "Flow")) -> List[dict]:
+        """References to components the project does not define and that are knowably missing."""
+        dangling = []
+        for kind in kinds:
+            for row in self.conn.execute("SELECT DISTINCT path, target, context FROM refs WHERE kind = ? "
+                                         "ORDER BY path, target", (kind,)):
+                if self.is_missing(kind, row["target"]):
+                    dangling.append({"kind": kind, **dict(row)})
+        return dangling
+
+    def is_missing(self, kind: str, target: str) -> bool:
+        """
+        True when a reference points at a custom component the project should, but does not, define.
+
+        Managed-package components (namespaced names) are external and never missing.
+        """
+        if is_namespaced(target):
+            return False
+        if kind == "CustomObject":
+            return self.check_object(target) == "missing"
+        if kind == "CustomField" and "." in target:
+            return self.check_field(*target.split(".", 1)) == "missing"
+        if kind == "RecordType" and "." in target:
+            sobject = target.split(".", 1)[0]
+            return not self.exists(kind, target) and is_custom(sobject) and sobject.lower() in self.objects()
+        if kind in ("ApexClass", "Layout", "Flow"):
+            return bool(self.names(kind)) and not self.exists(kind, target)
+        return False
+
+    def missing_refs(self, path: str) -> List[dict]:
+        """
+        References made by one file to components missing from the project.
+
+        Indexed files are answered from the database; files outside the
+        package directories are parsed on the spot.
+        """
+        if self.is_indexed(path):
+            refs = [(row["kind"], row["target"], row["context"]) for row in self.references_from(path)]
+        else:
+            kind = kind_for(path)
+            if kind is None:
+                return []
+            try:
+                refs = [(r_kind, target, context) for r_kind, target, context, _ in extract(path, kind)[1]]
+            except (ET.ParseError, OSError, UnicodeDecodeError):
+                return []
+        missing, seen = [], set()
+        for kind, target, context in refs:
+            if (kind, target.lower()) not in seen and self.is_missing(kind, target):
+                seen.add((kind, target.lower()))
+                missing.append({"kind": kind, "target": target, "context": context})
+        return missing
+
+    def status(self) -> dict:
+        counts = {row[0]: row[1] for row in
+                  self.conn.execute("SELECT kind, COUNT(*) FROM components GROUP BY kind ORDER BY kind")}
+        files = self.conn.execute("SELECT COUNT(*), SUM(error IS NOT NULL) FROM files").fetchone()
+        refs = self.conn.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
+        refreshed = self.conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        return {"project": str(self.project_root), "db": str(self.db_path), "files": files[0],
+                "failed": files[1] or 0, "references": refs, "components": counts,
+                "refreshed_at": float(refreshed[0]) if refreshed else None}
+
+    def _relative(self, path: str) -> str:
+        full = Path(path)
+        if full.is_absolute() or full.exists():
+            try:
+                return os.path.relpath(full.resolve(), self.project_root)
+            except ValueError:
+                pass
+        return str(path)
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> dict:
+        data = dict(row)
+        if data.get("detail"):
+            data["detail"] = json.loads(data["detail"])
+        return data
+
+
+_OPEN: Dict[str, Optional[MetadataIndex]] = {}
+
+
+def index_for(path: str) -> Optional[MetadataIndex]:
+    """
+    Shared, refreshed index for the project containing path (None outside a project).
+
+    Validators call this per file; the index is opened and refreshed once per
+    process and project.
+    """
+    root = find_project_root(path)
+    if root is None:
+        return None
+    key = str(root)
+    if key not in _OPEN:
+        try:
+            _OPEN[key] = MetadataIndex.for_path(str(root))
+        except sqlite3.Error:
+            _OPEN[key] = None
+    return _OPEN[key]
@@ -0,0 +1,34 @@
+"""
+Local org metadata snapshot cache shared by sf-skills.
+
+Stores describes, record counts, OWDs and field metadata per org alias in a
+SQLite database (default: ~/.cache/sf-skills/org-snapshots.db, override with
+$SF_ORG_SNAPSHOT_DB) with per-entry TTLs, so diagram generation and SOQL/flow
+analysis can reuse what an earlier run fetched, or work fully offline.
+
+Components:
+    - store: OrgSnapshotStore (SQLite, TTLs, numbered snapshots, fixtures)
+    - snapshot: OrgSnapshot read-through cache, FixtureSource for recorded data
+    - cli: status / show / invalidate / export / import / clear
+
+Usage:
+    from org_snapshot import OrgSnapshot, FixtureSource
+
+    snapshot = OrgSnapshot("myorg", source=fetcher)        # fetcher.fetch_entries(kind, keys)
+    counts = snapshot.record_counts(["Account", "Contact"])
+
+    offline = OrgSnapshot("myorg", source=FixtureSource("tests/fixtures/myorg.json"))
+"""
+
+from .store import OrgSnapshotStore, DEFAULT_TTLS, default_db_path
+from .snapshot import OrgSnapshot, FixtureSource
+
+__all__ = [
+    "OrgSnapshotStore",
+    "OrgSnapshot",
+    "FixtureSource",
+    "DEFAULT_TTLS",
+    "default_db_path",
+]
+
+__version__ = "1.0.0"
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Inspect and manage the org snapshot cache.
+
+Usage:
+    python3 shared/org_snapshot/cli.py status [--org myorg]
+    python3 shared/org_snapshot/cli.py show --org myorg --kind record_count [Account Contact]
+    python3 shared/org_snapshot/cli.py invalidate --org myorg [--kind record_count]
+    python3 shared/org_snapshot/cli.py export --org myorg -o tests/fixtures/myorg.json
+    python3 shared/org_snapshot/cli.py import tests/fixtures/myorg.json [--org fixture-org]
+    python3 shared/org_snapshot/cli.py clear --org myorg
+
+Entries are fetched (and refreshed) by the skills that use them, e.g.
+    python3 sf-diagram/scripts/query-org-metadata.py --objects Account --target-org myorg --refresh
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from org_snapshot import OrgSnapshotStore  # noqa: E402
+
+
+def _when(timestamp) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M") if timestamp else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local org metadata snapshot cache")
+    parser.add_argument("--db", help="Snapshot database (default: $SF_ORG_SNAPSHOT_DB or ~/.cache/sf-skills)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    status_parser = sub.add_parser("status", help="Entries per org and kind")
+    status_parser.add_argument("--org")
+
+    show_parser = sub.add_parser("show", help="Print cached values")
+    show_parser.add_argument("--org", required=True)
+    show_parser.add_argument("--kind", required=True, help="entity, record_count, fields, ...")
+    show_parser.add_argument("keys", nargs="*", help="Keys to show (default: all)")
+
+    invalidate_parser = sub.add_parser("invalidate", help="Expire entries so the next run re-fetches them")
+    invalidate_parser.add_argument("--org", required=True)
+    invalidate_parser.add_argument("--kind")
+
+    export_parser = sub.add_parser("export", help="Write an org's entries as a JSON fixture")
+    export_parser.add_argument("--org", required=True)
+    export_parser.add_argument("-o", "--output", required=True)
+
+    import_parser = sub.add_parser("import", help="Load a JSON fixture as a new snapshot")
+    import_parser.add_argument("fixture")
+    import_parser.add_argument("--org", help="Store under this alias (default: the fixture's org)")
+
+    clear_parser = sub.add_parser("clear", help="Delete everything cached for an org")
+    clear_parser.add_argument("--org", required=True)
+
+    args = parser.parse_args()
+    store = OrgSnapshotStore(args.db)
+    try:
+        if args.command == "status":
+            rows = store.status(args.org)
+            print(f"Snapshot DB: {store.db_path}")
+            if not rows:
+                print("  (empty)")
+            for row in rows:
+                print(f"  {row['org']:<25} {row['kind']:<14} {row['entries']:>6} entries "
+                      f"({row['expired']} expired)  last fetched {_when(row['last_fetched'])}  "
+                      f"snapshot #{row['snapshot']}")
+
+        elif args.command == "show":
+            if args.keys:
+                fresh, stale = store.get_many(args.org, args.kind, args.keys)
+                values = {**stale, **fresh}
+            else:
+                values = store.export_fixture(args.org)["entries"].get(args.kind, {})
+            print(json.dumps(values, indent=2))
+
+        elif args.command == "invalidate":
+            print(f"✓ Expired {store.invalidate(args.org, args.kind)} entries")
+
+        elif args.command == "export":
+            fixture = store.export_fixture(args.org)
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(fixture, f, indent=2, sort_keys=True)
+            count = sum(len(v) for v in fixture["entries"].values())
+            print(f"✓ Exported {count} entries for {args.org} → {args.output}")
+
+        elif args.command == "import":
+            with open(args.fixture, "r", encoding="utf-8") as f:
+                fixture = json.load(f)
+            written = store.import_fixture(fixture, args.org, source=f"fixture:{args.fixture}")
+            print(f"✓ Imported {written} entries for {args.org or fixture.get('org')}")
+
+        else:
+            print(f"✓ Deleted {store.delete_org(args.org)} entries for {args.org}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Read-through access to cached org metadata.
+
+OrgSnapshot answers lookups from the store and asks its source only for keys
+that are missing or expired. A source is any object with
+
+    fetch_entries(kind: str, keys: list[str]) -> dict[str, value]
+
+e.g. the sf CLI fetcher in sf-diagram/scripts/query-org-metadata.py, or
+FixtureSource for a recorded JSON fixture (tests, offline demos).
+"""
+
+import json
+from typing import Dict, List, Optional
+
+from .store import OrgSnapshotStore
+
+
+class FixtureSource:
+    """Serves entries from a fixture file written by `OrgSnapshotStore.export_fixture`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "r", encoding="utf-8") as f:
+            self.fixture = json.load(f)
+        self.entries = {kind: {key.lower(): value for key, value in values.items()}
+                        for kind, values in self.fixture.get("entries", {}).items()}
+        self.requests: List[tuple] = []  # (kind, keys) per call, for assertions in tests
+
+    @property
+    def name(self) -> str:
+        return f"fixture:{self.path}"
+
+    def fetch_entries(self, kind: str, keys: List[str]) -> Dict[str, object]:
+        self.requests.append((kind, list(keys)))
+        values = self.entries.get(kind, {})
+        return {key: values[key.lower()] for key in keys if key.lower() in values}
+
+
+class OrgSnapshot:
+    """
+    Cached view of one org.
+
+    Args:
+        org: Org alias or username the entries are stored under
+        source: Object with fetch_entries(kind, keys); None means cache only
+        store: OrgSnapshotStore (default: the shared store)
+        offline: Never call the source; expired entries are returned as-is
+        refresh: Ignore cached values and re-fetch everything requested
+    """
+
+    def __init__(self, org: str, source=None, store: Optional[OrgSnapshotStore] = None,
+                 offline: bool = False, refresh: bool = False):
+        self.org = org
+        self.source = source
+        self.store = store or OrgSnapshotStore()
+        self.offline = offline or source is None
+        self.refresh = refresh
+        self.hits = 0
+        self.fetched = 0
+        self._snapshot_id: Optional[int] = None
+
+    def get(self, kind: str, keys: List[str]) -> Dict[str, object]:
+        """
+        Values for keys; keys the org (or fixture) does not have are omitted.
+
+        When the source fails (raises, or leaves a key out) for a key that has
+        an expired cached value, the expired value is returned instead.
+        """
+        keys = list(dict.fromkeys(keys))
+        fresh, stale = self.store.get_many(self.org, kind, keys)
+        if self.refresh:
+            stale.update(fresh)
+            fresh = {}
+        self.hits += len(fresh)
+        missing = [key for key in keys if key not in fresh]
+        if not missing:
+            return fresh
+        if self.offline:
+            # Better an old count than none when working offline
+            self.hits += sum(1 for key in missing if key in stale)
+            return {**fresh, **{key: stale[key] for key in missing if key in stale}}
+
+        if self._snapshot_id is None:
+            self._snapshot_id = self.store.begin_snapshot(self.org, getattr(self.source, "name", "sf"))
+        try:
+            fetched = self.source.fetch_entries(kind, missing)
+        except Exception:
+            if not any(key in stale for key in missing):
+                raise
+            fetched = {}
+        self.store.put_many(self.org, kind, fetched, snapshot_id=self._snapshot_id)
+        self.fetched += len(fetched)
+        fallback = {key: stale[key] for key in missing if key not in fetched and key in stale}
+        self.hits += len(fallback)
+        return {**fresh, **fallback, **fetched}
+
+    def record_counts(self, objects: List[str]) -> Dict[str, int]:
+        return self.get("record_count", objects)
+
+    def entities(self, objects: List[str]) -> Dict[str, dict]:
+        """Label, key prefix, custom flag and OWD per object."""
+        return self.get("entity", objects)
+
+    def fields(self, sobject: str) -> List[dict]:
+        """Field metadata (name, label, type, referenceTo, ...) for one object."""
+        return self.get("fields", [sobject]).get(sobject, [])
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+SQLite store for cached org metadata.
+
+Entries are keyed by (org alias, kind, key) and hold a JSON value, the time
+it was fetched and a TTL. Every refresh that writes entries is recorded as a
+numbered snapshot so it is visible which run (and which source: live org or
+recorded fixture) produced a value.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA_VERSION = 1
+DB_ENV_VAR = "SF_ORG_SNAPSHOT_DB"
+CACHE_ENV_VAR = "SF_SKILLS_CACHE_DIR"
+
+DAY = 24 * 60 * 60
+
+# Default time-to-live per entry kind (seconds)
+DEFAULT_TTLS = {
+    "entity": 7 * DAY,        # label, key prefix, OWD
+    "fields": 7 * DAY,        # field metadata from describe
+    "record_count": 1 * DAY,  # COUNT() results
+}
+FALLBACK_TTL = 1 * DAY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    org TEXT NOT NULL COLLATE NOCASE,
+    source TEXT,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    org TEXT NOT NULL COLLATE NOCASE,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL COLLATE NOCASE,
+    value TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    ttl REAL NOT NULL,
+    snapshot_id INTEGER REFERENCES snapshots(id),
+    PRIMARY KEY (org, kind, key)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_snapshot ON entries(snapshot_id);
+"""
+
+
+def default_db_path() -> Path:
+    """$SF_ORG_SNAPSHOT_DB, else org-snapshots.db in the sf-skills cache directory."""
+    if os.environ.get(DB_ENV_VAR):
+        return Path(os.environ[DB_ENV_VAR]).expanduser()
+    if os.environ.get(CACHE_ENV_VAR):
+        base = Path(os.environ[CACHE_ENV_VAR]).expanduser()
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = (Path(xdg).expanduser() if xdg else Path.home() / ".cache") / "sf-skills"
+    return base / "org-snapshots.db"
+
+
+class OrgSnapshotStore:
+    """
+    Versioned key/value store of org metadata with per-entry TTLs.
+
+    Usage:
+        store = OrgSnapshotStore()
+        snapshot_id = store.begin_snapshot("myorg", source="sf")
+        store.put_many("myorg", "record_count", {"Account": 120000}, snapshot_id=snapshot_id)
+        fresh, stale = store.get_many("myorg", "record_count", ["Account", "Contact"])
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self._migrate()
+
+    def _migrate(self):
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            version = int(row[0]) if row else None
+        except sqlite3.OperationalError:
+            pass
+        if version is not None and version != SCHEMA_VERSION:
+            # Cached data only: rebuild rather than migrate
+            for table in ("entries", "snapshots", "meta"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def begin_snapshot(self, org: str, source: str) -> int:
+        """Record a refresh run; entries written by it reference the returned id."""
+        cursor = self.conn.execute("INSERT INTO snapshots (org, source, started_at) VALUES (?, ?, ?)",
+                                   (org, source, time.time()))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def put_many(self, org: str, kind: str, values: Dict[str, object], ttl: Optional[float] = None,
+                 snapshot_id: Optional[int] = None, fetched_at: Optional[float] = None):
+        ttl = DEFAULT_TTLS.get(kind, FALLBACK_TTL) if ttl is None else ttl
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(org, kind, key, json.dumps(value), fetched_at, ttl, snapshot_id) for key, value in values.items()])
+        self.conn.commit()
+
+    def get_many(self, org: str, kind: str, keys: Iterable[str],
+                 now: Optional[float] = None) -> Tuple[Dict[str, object], Dict[str, object]]:
+        """
+        Look up keys.
+
+        Returns:
+            (fresh values, expired values), both keyed by the requested spelling;
+            keys never stored appear in neither
+        """
+        now = time.time() if now is None else now
+        wanted = {key.lower(): key for key in keys}
+        fresh, stale = {}, {}
+        items = list(wanted.items())
+        for i in range(0, len(items), 500):  # stay under SQLite's host parameter limit
+            chunk = [original for _, original in items[i:i + 500]]
+            rows = self.conn.execute(
+                f"SELECT key, value, fetched_at, ttl FROM entries WHERE org = ? AND kind = ? "
+                f"AND key IN ({', '.join('?' * len(chunk))})", [org, kind] + chunk)
+            for row in rows:
+                key = wanted.get(row["key"].lower(), row["key"])
+                target = fresh if row["fetched_at"] + row["ttl"] > now else stale
+                target[key] = json.loads(row["value"])
+        return fresh, stale
+
+    def invalidate(self, org: str, kind: Optional[str] = None, keys: Optional[List[str]] = None) -> int:
+        """Expire entries (they stay available to offline readers)."""
+        sql, params = "UPDATE entries SET ttl = 0 WHERE org = ?", [org]
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if keys:
+            sql += f" AND key IN ({', '.join('?' * len(keys))})"
+            params.extend(keys)
+        cursor = self.conn.execute(sql, params)
+        self.conn.commit()
+        return cursor.rowcount
+
+    def delete_org(self, org: str) -> int:
+        cursor = self.conn.execute("DELETE FROM entries WHERE org = ?", (org,))
+        self.conn.execute("DELETE FROM snapshots WHERE org = ?", (org,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def status(self, org: Optional[str] = None, now: Optional[float] = None) -> List[dict]:
+        """Entry counts per org and kind, with how many are expired."""
+        now = time.time() if now is None else now
+        sql = ("SELECT org, kind, COUNT(*) AS entries, SUM(fetched_at + ttl <= ?) AS expired, "
+               "MAX(fetched_at) AS last_fetched, MAX(snapshot_id) AS snapshot FROM entries")
+        params: list = [now]
+        if org:
+            sql += " WHERE org = ?"
+            params.append(org)
+        sql += " GROUP BY org, kind ORDER BY org, kind"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def export_fixture(self, org: str) -> dict:
+        """All entries of an org in the fixture format FixtureSource and import_fixture read."""
+        entries: Dict[str, Dict[str, object]] = {}
+        for row in self.conn.execute("SELECT kind, key, value FROM entries WHERE org = ? ORDER BY kind, key", (org,)):
+            entries.setdefault(row["kind"], {})[row["key"]] = json.loads(row["value"])
+        return {"version": SCHEMA_VERSION, "org": org, "exported_at": time.time(), "entries": entries}
+
+    def import_fixture(self, fixture: dict, org: Optional[str] = None, source: str = "fixture") -> int:
+        """Load a fixture as a new snapshot. Returns the number of entries written."""
+        org = org or fixture.get("org") or "fixture"
+        snapshot_id = self.begin_snapshot(org, source)
+        written = 0
+        for kind, values in fixture.get("entries", {}).items():
+            self.put_many(org, kind, values, snapshot_id=snapshot_id)
+            written += len(values)
+        return written
@@ -12,26 +12,17 @@ Features:
 - Actionable recommendations
 """
 
+import os
 import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
-try:
-    import yaml
-except ImportError:
-    print("\n" + "=" * 70)
-    print("ERROR: PyYAML is required but not installed")
-    print("=" * 70)
-    print("\nTo install PyYAML, run ONE of these commands:\n")
-    print("  pip3 install --break-system-packages pyyaml")
-    print("  brew install pyyaml")
-    print("=" * 70)
-    sys.exit(1)
+from skill_index import SkillIndex, default_cache_dir
 
 # ANSI color codes
 class Colors:
@@ -53,6 +44,13 @@ VALID_TOOLS = [
     "ExitPlanMode"
 ]
 
+# Bump when validation rules change so cached results are discarded
+RESULTS_CACHE_VERSION = 1
+RESULTS_CACHE_FILENAME = "bulk-validate-results.json"
+
+# Below this many skills to validate, process start-up costs more than it saves
+PROCESS_POOL_THRESHOLD = 16
+
 
 @dataclass
 class ValidationIssue:
@@ -127,34 +125,16 @@ def discover_skills() -> List[Tuple[Path, str]]:
     return skills
 
 
-def extract_frontmatter(file_path: Path) -> Tuple[str, str]:
-    """Extract YAML frontmatter from SKILL.md file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    delimiter_indices = []
-    for i, line in enumerate(lines):
-        if line.strip() == '---':
-            delimiter_indices.append(i)
-            if len(delimiter_indices) == 2:
-                break
-
-    if len(delimiter_indices) < 2:
-        return "", "".join(lines)
-
-    yaml_lines = lines[delimiter_indices[0] + 1:delimiter_indices[1]]
-    yaml_content = "".join(yaml_lines)
-
-    content_lines = lines[delimiter_indices[1] + 1:]
-    content = "".join(content_lines)
-
-    return yaml_content, content
-
-
-def validate_single_skill(skill_path: Path, location_type: str) -> SkillValidationResult:
+def validate_single_skill(skill_path: Path, location_type: str,
+                          index: Optional[SkillIndex] = None) -> SkillValidationResult:
     """
     Validate a single skill file.
 
+    Args:
+        skill_path: Path to SKILL.md
+        location_type: 'global' or 'project'
+        index: Shared SkillIndex; frontmatter is read from it instead of re-parsing
+
     Returns:
         SkillValidationResult with all findings
     """
@@ -165,18 +145,20 @@ def validate_single_skill(skill_path: Path, location_type: str) -> SkillValidati
         location_type=location_type
     )
 
-    # Extract frontmatter
-    try:
-        yaml_content, content = extract_frontmatter(skill_path)
-    except Exception as e:
+    # Look up parsed frontmatter
+    if index is None:
+        index = SkillIndex(persist=False)
+    record = index.get(skill_path)
+    if record is None or record.read_error:
+        reason = record.read_error if record else "file not found"
         result.errors.append(ValidationIssue(
             severity='error',
-            message=f"Failed to read skill file: {e}",
+            message=f"Failed to read skill file: {reason}",
             location=str(skill_path)
         ))
         return result
 
-    if not yaml_content:
+    if not record.has_frontmatter:
         result.errors.append(ValidationIssue(
             severity='error',
             message="No YAML frontmatter found",
@@ -185,18 +167,25 @@ def validate_single_skill(skill_path: Path, location_type: str) -> SkillValidati
         ))
         return result
 
-    # Parse YAML
-    try:
-        data = yaml.safe_load(yaml_content)
-    except yaml.YAMLError as e:
+    if record.yaml_error:
         result.errors.append(ValidationIssue(
             severity='error',
-            message=f"Invalid YAML syntax: {e}",
+            message=f"Invalid YAML syntax: {record.yaml_error}",
             location=str(skill_path),
             fix="Fix YAML syntax errors"
         ))
         return result
 
+    data = record.frontmatter
+    if not isinstance(data, dict):
+        result.errors.append(ValidationIssue(
+            severity='error',
+            message="Frontmatter must be a YAML mapping",
+            location=str(skill_path),
+            fix="Use key: value pairs between the --- delimiters"
+        ))
+        return result
+
     # Check required fields
     required_fields = {'name': 'Skill name', 'description': 'Description', 'version': 'Version'}
 
@@ -275,7 +264,7 @@ def validate_single_skill(skill_path: Path, location_type: str) -> SkillValidati
         ))
 
     # Check for content
-    if not content.strip():
+    if not record.has_content:
         result.errors.append(ValidationIssue(
             severity='error',
             message="No content found after YAML frontmatter",
@@ -311,38 +300,181 @@ def validate_single_skill(skill_path: Path, location_type: str) -> SkillValidati
     return result
 
 
-def validate_all_skills(parallel: bool = True) -> ValidationReport:
+def result_to_dict(result: SkillValidationResult) -> Dict:
+    """Serialize a result for JSON output and the results cache."""
+    return {
+        'skill_name': result.skill_name,
+        'skill_path': str(result.skill_path),
+        'location_type': result.location_type,
+        'version': result.version,
+        'is_valid': result.is_valid,
+        'errors': [{'message': e.message, 'location': e.location, 'fix': e.fix} for e in result.errors],
+        'warnings': [{'message': w.message, 'location': w.location} for w in result.warnings],
+        'infos': [{'message': i.message, 'location': i.location} for i in result.infos]
+    }
+
+
+def result_from_dict(data: Dict) -> SkillValidationResult:
+    """Rebuild a result from result_to_dict() output."""
+    def issues(items, severity):
+        return [ValidationIssue(severity=severity, message=i['message'],
+                                location=i.get('location', ''), fix=i.get('fix'))
+                for i in items]
+
+    return SkillValidationResult(
+        skill_name=data['skill_name'],
+        skill_path=Path(data['skill_path']),
+        location_type=data['location_type'],
+        version=data['version'],
+        is_valid=data['is_valid'],
+        errors=issues(data['errors'], 'error'),
+        warnings=issues(data['warnings'], 'warning'),
+        infos=issues(data['infos'], 'info'),
+    )
+
+
+class ResultCache:
+    """Validation results keyed by SKILL.md path and content hash."""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.path = (Path(cache_dir) if cache_dir else default_cache_dir()) / RESULTS_CACHE_FILENAME
+        self.entries: Dict[str, Dict] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == RESULTS_CACHE_VERSION:
+                self.entries = data.get('results', {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, skill_path: Path, sha256: str) -> Optional[Dict]:
+        entry = self.entries.get(str(Path(skill_path).absolute()))
+        if entry and entry.get('sha256') == sha256:
+            return entry['result']
+        return None
+
+    def put(self, skill_path: Path, sha256: str, result: SkillValidationResult):
+        self.entries[str(Path(skill_path).absolute())] = {
+            'sha256': sha256,
+            'result': result_to_dict(result),
+        }
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': RESULTS_CACHE_VERSION, 'results': self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+def _validate_in_process(skill_path: Path, location_type: str):
+    """
+    Process-pool entry point.
+
+    Workers cannot share the parent's index, so each one parses with a private
+    in-memory index and hands the fresh record back to be merged.
+    """
+    index = SkillIndex(persist=False)
+    result = validate_single_skill(skill_path, location_type, index)
+    return result, index.records.get(str(Path(skill_path).absolute()))
+
+
+def validate_all_skills(parallel: bool = True, index: Optional[SkillIndex] = None,
+                        executor: str = 'auto', workers: Optional[int] = None,
+                        changed_only: bool = False, cache_dir: Optional[Path] = None,
+                        on_result: Optional[Callable[[SkillValidationResult, bool], None]] = None
+                        ) -> ValidationReport:
     """
     Validate all discovered skills.
 
+    Args:
+        parallel: Validate skills concurrently
+        index: SkillIndex to read frontmatter from (saved after the run)
+        executor: 'thread', 'process', or 'auto' (processes for large runs)
+        workers: Pool size (default: os.cpu_count())
+        changed_only: Reuse cached results for skills whose SKILL.md hash is unchanged
+        cache_dir: Location of the results cache (default: the skill index cache dir)
+        on_result: Called with (result, from_cache) as each skill completes
+
     Returns:
         ValidationReport with all results
     """
     start_time = datetime.now()
 
+    if index is None:
+        index = SkillIndex()
     skills = discover_skills()
     results = []
+    result_cache = ResultCache(cache_dir or index.cache_dir)
+    workers = workers or os.cpu_count() or 4
+
+    def emit(result, from_cache=False):
+        results.append(result)
+        if on_result:
+            on_result(result, from_cache)
+
+    # Reuse results for unchanged skills (stat-only lookup when mtime is unchanged)
+    pending = []
+    for skill_path, loc_type in skills:
+        record = index.get(skill_path) if changed_only else None
+        cached = result_cache.get(skill_path, record.sha256) if record else None
+        if cached:
+            result = result_from_dict(cached)
+            result.location_type = loc_type
+            emit(result, from_cache=True)
+        else:
+            pending.append((skill_path, loc_type))
+
+    if executor == 'auto':
+        executor = 'process' if len(pending) >= PROCESS_POOL_THRESHOLD else 'thread'
+
+    if parallel and len(pending) > 1 and executor == 'process':
+        # CPU-bound YAML parsing and regex checks scale past the GIL
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_validate_in_process, path, loc_type): (path, loc_type)
+                for path, loc_type in pending
+            }
 
-    if parallel and len(skills) > 1:
+            for future in as_completed(futures):
+                try:
+                    result, record = future.result()
+                    if record is not None:
+                        index.put(record)
+                    emit(result)
+                except Exception as e:
+                    path, loc_type = futures[future]
+                    print(f"Error validating {path}: {e}", file=sys.stderr)
+    elif parallel and len(pending) > 1:
         # Parallel validation
-        with ThreadPoolExecutor(max_workers=4) as executor:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
             futures = {
-                executor.submit(validate_single_skill, path, loc_type): (path, loc_type)
-                for path, loc_type in skills
+                pool.submit(validate_single_skill, path, loc_type, index): (path, loc_type)
+                for path, loc_type in pending
             }
 
             for future in as_completed(futures):
                 try:
-                    result = future.result()
-                    results.append(result)
+                    emit(future.result())
                 except Exception as e:
                     path, loc_type = futures[future]
-                    print(f"Error validating {path}: {e}")
+                    print(f"Error validating {path}: {e}", file=sys.stderr)
     else:
         # Sequential validation
-        for skill_path, loc_type in skills:
-            result = validate_single_skill(skill_path, loc_type)
-            results.append(result)
+        for skill_path, loc_type in pending:
+            emit(validate_single_skill(skill_path, loc_type, index))
+
+    for result in results:
+        record = index.get(result.skill_path)
+        if record:
+            result_cache.put(result.skill_path, record.sha256, result)
+
+    index.save()
+    if index.persist:
+        result_cache.save()
 
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -363,6 +495,25 @@ def validate_all_skills(parallel: bool = True) -> ValidationReport:
     )
 
 
+def print_progress(result: SkillValidationResult, from_cache: bool):
+    """Console line printed as each skill finishes."""
+    if result.has_errors:
+        status = f"{Colors.RED}✗{Colors.NC}"
+    elif result.warnings:
+        status = f"{Colors.YELLOW}⚠{Colors.NC}"
+    else:
+        status = f"{Colors.GREEN}✓{Colors.NC}"
+    cached = f" {Colors.CYAN}(cached){Colors.NC}" if from_cache else ""
+    print(f"   {status} {result.skill_name} (v{result.version}){cached}", flush=True)
+
+
+def print_jsonl(result: SkillValidationResult, from_cache: bool):
+    """JSON Lines record printed as each skill finishes."""
+    record = result_to_dict(result)
+    record['cached'] = from_cache
+    print(json.dumps(record), flush=True)
+
+
 def generate_console_report(report: ValidationReport, errors_only: bool = False):
     """Generate and print console report."""
     print(f"{Colors.MAGENTA}{Colors.BOLD}╔══════════════════════════════════════════════════════════╗{Colors.NC}")
@@ -437,17 +588,7 @@ def generate_json_report(report: ValidationReport) -> str:
     }
 
     for result in report.results:
-        result_dict = {
-            'skill_name': result.skill_name,
-            'skill_path': str(result.skill_path),
-            'location_type': result.location_type,
-            'version': result.version,
-            'is_valid': result.is_valid,
-            'errors': [{'message': e.message, 'location': e.location, 'fix': e.fix} for e in result.errors],
-            'warnings': [{'message': w.message, 'location': w.location} for w in result.warnings],
-            'infos': [{'message': i.message, 'location': i.location} for i in result.infos]
-        }
-        report_dict['results'].append(result_dict)
+        report_dict['results'].append(result_to_dict(result))
 
     return json.dumps(report_dict, indent=2)
 
@@ -470,14 +611,20 @@ Examples:
 
   # Sequential validation (no parallel)
   %(prog)s --no-parallel
+
+  # Only revalidate skills whose SKILL.md changed since the last run
+  %(prog)s --changed-only
+
+  # Stream one JSON object per skill as results complete
+  %(prog)s --format jsonl --executor process
         '''
     )
 
     parser.add_argument(
         '--format',
-        choices=['console', 'json'],
+        choices=['console', 'json', 'jsonl'],
         default='console',
-        help='Output format (default: console)'
+        help='Output format (default: console; jsonl streams one result per line)'
     )
 
     parser.add_argument(
@@ -492,6 +639,38 @@ Examples:
         help='Disable parallel validation'
     )
 
+    parser.add_argument(
+        '--executor',
+        choices=['auto', 'thread', 'process'],
+        default='auto',
+        help=f'Worker pool type (default: auto - processes for {PROCESS_POOL_THRESHOLD}+ skills)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Pool size (default: CPU count)'
+    )
+
+    parser.add_argument(
+        '--changed-only',
+        action='store_true',
+        help='Reuse cached results for skills whose SKILL.md is unchanged'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        help='Skill index cache directory (default: ~/.cache/sf-skills)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the persistent skill index'
+    )
+
     parser.add_argument(
         '--auto-fix',
         action='store_true',
@@ -504,12 +683,32 @@ Examples:
         print(f"{Colors.YELLOW}⚠️  Auto-fix feature coming soon!{Colors.NC}\n")
 
     # Run validation
-    report = validate_all_skills(parallel=not args.no_parallel)
+    index = SkillIndex(cache_dir=args.cache_dir, persist=not args.no_cache)
+    if args.format == 'jsonl':
+        on_result = print_jsonl
+    elif args.format == 'console':
+        print(f"{Colors.BOLD}Validating...{Colors.NC}")
+        on_result = print_progress
+    else:
+        on_result = None
+
+    report = validate_all_skills(
+        parallel=not args.no_parallel,
+        index=index,
+        executor=args.executor,
+        workers=args.workers,
+        changed_only=args.changed_only and not args.no_cache,
+        on_result=on_result,
+    )
 
     # Generate report
     if args.format == 'json':
         print(generate_json_report(report))
+    elif args.format == 'jsonl':
+        summary = json.loads(generate_json_report(report))['summary']
+        print(json.dumps({'summary': summary}))
     else:
+        print()
         generate_console_report(report, errors_only=args.errors_only)
 
     # Exit with appropriate code
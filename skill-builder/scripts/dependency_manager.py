@@ -7,6 +7,8 @@ Commands:
   tree <skill>      - Show dependency tree
   validate --all    - Validate dependencies for all skills
   circular <skill>  - Detect circular dependencies
+  order [skill]     - Show install order (dependencies first)
+  resolve <spec>... - Compute a compatible version plan for a set of skills
 """
 
 import sys
@@ -15,7 +17,8 @@ from pathlib import Path
 from typing import List
 
 from dependency_validator import DependencyValidator, DependencyCheckResult
-from version_resolver import VersionResolver
+from version_resolver import VersionResolver, DependencySolver, ResolutionError
+from skill_index import SkillIndex
 
 
 # ANSI color codes
@@ -31,14 +34,15 @@ class Colors:
 class DependencyManager:
     """CLI tool for managing skill dependencies."""
 
-    def __init__(self, skills_dir: Path = None):
+    def __init__(self, skills_dir: Path = None, index: SkillIndex = None):
         """
         Initialize dependency manager.
 
         Args:
             skills_dir: Path to skills directory
+            index: SkillIndex shared with the validator
         """
-        self.validator = DependencyValidator(skills_dir)
+        self.validator = DependencyValidator(skills_dir, index=index)
 
     def cmd_check(self, skill_name: str) -> int:
         """
@@ -53,7 +57,7 @@ class DependencyManager:
         print(f"{Colors.BOLD}Checking dependencies for: {skill_name}{Colors.NC}\n")
 
         # Load skill metadata
-        metadata, error = self.validator.load_skill_metadata(skill_name)
+        metadata, error = self.validator.graph.metadata(skill_name)
         if error or metadata is None:
             print(f"{Colors.RED}✗ {error}{Colors.NC}")
             return 1
@@ -91,6 +95,12 @@ class DependencyManager:
                 print(f"  {status} {result.dependency.name} ({result.dependency.version_constraint})")
                 print(f"     → {Colors.RED}NOT INSTALLED{Colors.NC}{optional_str}")
 
+        # Transitive view (shared graph, no extra file reads for already-loaded skills)
+        transitive = self.validator.graph.transitive_dependencies(skill_name) - {skill_name}
+        indirect = sorted(transitive - {r.dependency.name for r in results})
+        if indirect:
+            print(f"\n{Colors.BOLD}Indirect dependencies ({len(indirect)}):{Colors.NC} {', '.join(indirect)}")
+
         # Summary
         print()
         if all_satisfied:
@@ -126,6 +136,10 @@ class DependencyManager:
             line = line.replace('[optional]', f'{Colors.YELLOW}[optional]{Colors.NC}')
             print(line)
 
+        order = self.validator.graph.install_order([skill_name])
+        if len(order) > 1:
+            print(f"\n{Colors.BOLD}Install order:{Colors.NC} {' → '.join(order)}")
+
         return 0
 
     def cmd_circular(self, skill_name: str) -> int:
@@ -140,16 +154,78 @@ class DependencyManager:
         """
         print(f"{Colors.BOLD}Checking for circular dependencies: {skill_name}{Colors.NC}\n")
 
-        circular_error = self.validator.detect_circular_dependencies(skill_name)
+        cycles = self.validator.find_all_cycles([skill_name])
 
-        if circular_error:
-            print(f"{Colors.RED}✗ Circular dependency detected!{Colors.NC}\n")
-            print(f"Cycle: {Colors.YELLOW}{' → '.join(circular_error.cycle_path)}{Colors.NC}")
+        if cycles:
+            label = "Circular dependency" if len(cycles) == 1 else f"{len(cycles)} circular dependencies"
+            print(f"{Colors.RED}✗ {label} detected!{Colors.NC}\n")
+            for cycle in cycles:
+                path = cycle.cycle_path + [cycle.cycle_path[0]]
+                print(f"Cycle: {Colors.YELLOW}{' → '.join(path)}{Colors.NC}")
             return 1
         else:
             print(f"{Colors.GREEN}✓ No circular dependencies found{Colors.NC}")
             return 0
 
+    def cmd_order(self, skill_name: str = None) -> int:
+        """
+        Print install order (dependencies first).
+
+        Args:
+            skill_name: Root skill, or None for every installed skill
+
+        Returns:
+            Exit code (1 if the graph contains cycles)
+        """
+        graph = self.validator.graph
+        roots = [skill_name] if skill_name else None
+        print(f"{Colors.BOLD}Install order{f' for {skill_name}' if skill_name else ''}:{Colors.NC}\n")
+
+        for position, component in enumerate(graph.components(roots), 1):
+            names = ', '.join(component)
+            if graph.is_cyclic(component):
+                print(f"  {position:3}. {Colors.YELLOW}{names} [cycle]{Colors.NC}")
+            else:
+                _, error = graph.metadata(component[0])
+                missing = f" {Colors.RED}[not installed]{Colors.NC}" if error else ""
+                print(f"  {position:3}. {names}{missing}")
+
+        return 1 if graph.cycles(roots) else 0
+
+    def cmd_resolve(self, specs: List[str], source_dirs: List[Path] = None,
+                    include_optional: bool = False) -> int:
+        """
+        Compute one compatible version plan for a set of skills.
+
+        Args:
+            specs: Skill specs ("name" or "name@constraint")
+            source_dirs: Extra directories providing candidate versions
+            include_optional: Resolve optional dependencies too
+
+        Returns:
+            Exit code (0 if a plan exists, 1 otherwise)
+        """
+        print(f"{Colors.BOLD}Resolving: {', '.join(specs)}{Colors.NC}\n")
+
+        catalog = self.validator.build_catalog(source_dirs)
+        solver = DependencySolver(catalog, include_optional=include_optional)
+
+        try:
+            plan = solver.solve(specs)
+        except ResolutionError as e:
+            print(f"{Colors.RED}✗ No compatible version plan{Colors.NC}\n")
+            if e.conflict:
+                print(f"  Conflict: {Colors.YELLOW}{e.conflict}{Colors.NC}")
+            return 1
+
+        print(f"{Colors.BOLD}Install plan ({len(plan)} skills, {solver.steps} search steps):{Colors.NC}\n")
+        for position, candidate in enumerate(solver.install_order(plan), 1):
+            print(f"  {position:3}. {Colors.CYAN}{candidate.name}{Colors.NC} {candidate.version}"
+                  f"  ← {candidate.source}")
+
+        print(f"\n{Colors.GREEN}✓ All constraints satisfied{Colors.NC}")
+        return 0
+
     def cmd_validate_all(self) -> int:
         """
         Validate dependencies for all installed skills.
@@ -165,7 +241,7 @@ class DependencyManager:
             print(f"{Colors.RED}Skills directory not found: {skills_dir}{Colors.NC}")
             return 1
 
-        skill_dirs = [d for d in skills_dir.iterdir() if d.is_dir() and (d / "SKILL.md").exists()]
+        skill_dirs = [r.skill_dir for r in self.validator.index.scan([skills_dir], recursive=False)]
 
         if not skill_dirs:
             print(f"{Colors.YELLOW}No skills found in {skills_dir}{Colors.NC}")
@@ -173,7 +249,7 @@ class DependencyManager:
 
         print(f"Found {len(skill_dirs)} skills\n")
 
-        # Check each skill
+        # Check each skill (metadata is loaded once via the shared graph)
         total_skills = 0
         skills_with_deps = 0
         total_deps = 0
@@ -206,6 +282,9 @@ class DependencyManager:
                     if result.dependency.required:
                         issues.append(f"{skill_name}: {result.dependency.name} - {result.message}")
 
+        for cycle in self.validator.find_all_cycles([d.name for d in skill_dirs]):
+            issues.append(str(cycle))
+
         # Print summary
         print(f"{Colors.CYAN}{'═' * 60}{Colors.NC}")
         print(f"{Colors.BOLD}Summary:{Colors.NC}\n")
@@ -236,6 +315,8 @@ Commands:
   check <skill>     Check dependencies for a specific skill
   tree <skill>      Show dependency tree with status
   circular <skill>  Detect circular dependencies
+  order [skill]     Show install order (all skills if omitted)
+  resolve <spec>... Compatible version plan for skills (name or name@constraint)
   validate --all    Validate dependencies for all skills
 
 Examples:
@@ -251,6 +332,9 @@ Examples:
   # Validate all skills
   python3 dependency_manager.py validate --all
 
+  # Plan versions for several skills, also drawing candidates from a checkout
+  python3 dependency_manager.py resolve sf-apex sf-flow@^2.0.0 --source ./sf-skills
+
 Dependency Format in SKILL.md:
   dependencies:
     - name: skill-builder
@@ -271,14 +355,28 @@ Version Constraints:
 
     parser.add_argument(
         'command',
-        choices=['check', 'tree', 'circular', 'validate'],
+        choices=['check', 'tree', 'circular', 'order', 'resolve', 'validate'],
         help='Command to execute'
     )
 
     parser.add_argument(
         'skill',
-        nargs='?',
-        help='Skill name (required for check, tree, circular)'
+        nargs='*',
+        help='Skill name (required for check, tree, circular; one or more specs for resolve)'
+    )
+
+    parser.add_argument(
+        '--source',
+        type=Path,
+        action='append',
+        default=[],
+        help='Extra directory of skills offering candidate versions (resolve; repeatable)'
+    )
+
+    parser.add_argument(
+        '--include-optional',
+        action='store_true',
+        help='Resolve optional dependencies as well (resolve)'
     )
 
     parser.add_argument(
@@ -293,17 +391,30 @@ Version Constraints:
         help='Path to skills directory (default: ~/.claude/skills/)'
     )
 
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        help='Skill index cache directory (default: ~/.cache/sf-skills)'
+    )
+
     args = parser.parse_args()
 
     # Validate arguments
-    if args.command in ['check', 'tree', 'circular'] and not args.skill:
+    if args.command in ['check', 'tree', 'circular', 'resolve'] and not args.skill:
         parser.error(f"'{args.command}' command requires a skill name")
 
+    if args.command != 'resolve' and len(args.skill) > 1:
+        parser.error(f"'{args.command}' command takes a single skill name")
+
+    specs = args.skill
+    args.skill = specs[0] if specs else None
+
     if args.command == 'validate' and not args.all:
         parser.error("'validate' command requires --all flag")
 
     # Initialize manager
-    manager = DependencyManager(skills_dir=args.skills_dir)
+    index = SkillIndex(cache_dir=args.cache_dir)
+    manager = DependencyManager(skills_dir=args.skills_dir, index=index)
 
     # Execute command
     try:
@@ -316,6 +427,12 @@ Version Constraints:
         elif args.command == 'circular':
             return manager.cmd_circular(args.skill)
 
+        elif args.command == 'order':
+            return manager.cmd_order(args.skill)
+
+        elif args.command == 'resolve':
+            return manager.cmd_resolve(specs, args.source, args.include_optional)
+
         elif args.command == 'validate':
             return manager.cmd_validate_all()
 
@@ -329,6 +446,9 @@ Version Constraints:
         traceback.print_exc()
         return 1
 
+    finally:
+        index.save()
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -14,14 +14,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 
-try:
-    import yaml
-except ImportError:
-    print("ERROR: PyYAML required. Run: pip install pyyaml")
-    import sys
-    sys.exit(1)
-
-from version_resolver import VersionResolver
+from version_resolver import VersionResolver, Candidate
+from skill_index import SkillIndex
 
 
 @dataclass
@@ -62,20 +56,182 @@ class CircularDependencyError:
         return f"Circular dependency: {' → '.join(self.cycle_path)} → {self.cycle_path[0]}"
 
 
+class SkillGraph:
+    """
+    Memoized skill dependency graph.
+
+    Each skill's metadata is loaded at most once. Cycles are found with an
+    iterative Tarjan SCC pass, which also yields a dependencies-first install
+    order; transitive closures are computed once per component and cached.
+    """
+
+    def __init__(self, validator: 'DependencyValidator'):
+        self.validator = validator
+        self._metadata: Dict[str, Tuple[Optional[Dict], Optional[str]]] = {}
+        self._dependencies: Dict[str, List[Dependency]] = {}
+        self._closure: Dict[str, frozenset] = {}
+        self._component: Dict[str, int] = {}
+        self._components: List[List[str]] = []
+
+    def metadata(self, skill_name: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """Cached load_skill_metadata()."""
+        if skill_name not in self._metadata:
+            self._metadata[skill_name] = self.validator.load_skill_metadata(skill_name)
+        return self._metadata[skill_name]
+
+    def dependencies(self, skill_name: str) -> List[Dependency]:
+        """Parsed dependencies of a skill (empty if it is missing or unreadable)."""
+        if skill_name not in self._dependencies:
+            data, error = self.metadata(skill_name)
+            self._dependencies[skill_name] = (
+                self.validator.parse_dependencies(data) if isinstance(data, dict) and not error else []
+            )
+        return self._dependencies[skill_name]
+
+    def edges(self, skill_name: str) -> List[str]:
+        return [dep.name for dep in self.dependencies(skill_name)]
+
+    def all_skills(self) -> List[str]:
+        """Names of every skill directory in the validator's skills_dir."""
+        skills_dir = self.validator.skills_dir
+        if not skills_dir.exists():
+            return []
+        return sorted(d.name for d in skills_dir.iterdir() if d.is_dir() and (d / "SKILL.md").exists())
+
+    def _tarjan(self, roots: List[str]):
+        """Assign every node reachable from roots to a strongly connected component."""
+        index_of: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+
+        def visit(node):
+            index_of[node] = low[node] = len(index_of)
+            stack.append(node)
+            on_stack.add(node)
+            return node, iter(self.edges(node))
+
+        for root in roots:
+            if root in index_of or root in self._component:
+                continue
+            work = [visit(root)]
+            while work:
+                node, children = work[-1]
+                descended = False
+                for child in children:
+                    if child in self._component:
+                        continue  # Finished in an earlier pass
+                    if child not in index_of:
+                        work.append(visit(child))
+                        descended = True
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index_of[child])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    self._add_component(sorted(component))
+
+    def _add_component(self, component: List[str]):
+        """Record a finished SCC; all of its dependencies are already closed."""
+        comp_id = len(self._components)
+        self._components.append(component)
+        members = set(component)
+        for member in component:
+            self._component[member] = comp_id
+
+        closure: Set[str] = set()
+        for member in component:
+            for child in self.edges(member):
+                closure.add(child)
+                if child not in members:
+                    closure |= self._closure[child]
+        frozen = frozenset(closure)
+        for member in component:
+            self._closure[member] = frozen
+
+    def _ensure(self, roots: Optional[List[str]]) -> List[str]:
+        roots = self.all_skills() if roots is None else list(roots)
+        self._tarjan(roots)
+        return roots
+
+    def components(self, roots: Optional[List[str]] = None) -> List[List[str]]:
+        """SCCs reachable from roots (default: all skills), dependencies first."""
+        roots = self._ensure(roots)
+        wanted = {self._component[r] for r in roots}
+        for r in roots:
+            wanted |= {self._component[d] for d in self._closure[r]}
+        return [c for i, c in enumerate(self._components) if i in wanted]
+
+    def is_cyclic(self, component: List[str]) -> bool:
+        return len(component) > 1 or component[0] in self.edges(component[0])
+
+    def _cycle_path(self, component: List[str]) -> List[str]:
+        """A concrete cycle through the component's first member (BFS within the SCC)."""
+        start = component[0]
+        members = set(component)
+        parent = {start: None}
+        queue = [start]
+        for node in queue:
+            for child in self.edges(node):
+                if child == start:
+                    path = [node]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    return list(reversed(path))
+                if child in members and child not in parent:
+                    parent[child] = node
+                    queue.append(child)
+        return component
+
+    def cycles(self, roots: Optional[List[str]] = None) -> List[CircularDependencyError]:
+        """Every dependency cycle reachable from roots, one per SCC."""
+        return [
+            CircularDependencyError(cycle_path=self._cycle_path(component))
+            for component in self.components(roots)
+            if self.is_cyclic(component)
+        ]
+
+    def install_order(self, roots: Optional[List[str]] = None) -> List[str]:
+        """Skills reachable from roots in install order (dependencies before dependents)."""
+        return [name for component in self.components(roots) for name in component]
+
+    def transitive_dependencies(self, skill_name: str) -> frozenset:
+        """All skills skill_name depends on, directly or indirectly."""
+        self._ensure([skill_name])
+        return self._closure[skill_name]
+
+
 class DependencyValidator:
     """Validates and checks skill dependencies."""
 
-    def __init__(self, skills_dir: Optional[Path] = None):
+    def __init__(self, skills_dir: Optional[Path] = None, index: Optional[SkillIndex] = None):
         """
         Initialize validator.
 
         Args:
             skills_dir: Path to skills directory (default: ~/.claude/skills/)
+            index: SkillIndex used to look up frontmatter (default: persistent index in the cache dir)
         """
         if skills_dir is None:
             self.skills_dir = Path.home() / ".claude/skills"
         else:
             self.skills_dir = skills_dir
+        self.index = index if index is not None else SkillIndex()
+        self.graph = SkillGraph(self)
 
     def load_skill_metadata(self, skill_name: str) -> Tuple[Optional[Dict], Optional[str]]:
         """
@@ -89,33 +245,20 @@ class DependencyValidator:
         """
         skill_path = self.skills_dir / skill_name / "SKILL.md"
 
-        if not skill_path.exists():
+        record = self.index.get(skill_path)
+        if record is None:
             return None, f"Skill not found: {skill_name}"
 
-        try:
-            with open(skill_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+        if record.read_error:
+            return None, f"Error loading {skill_name}: {record.read_error}"
 
-            # Find frontmatter delimiters
-            delimiter_indices = []
-            for i, line in enumerate(lines):
-                if line.strip() == '---':
-                    delimiter_indices.append(i)
-                    if len(delimiter_indices) == 2:
-                        break
-
-            if len(delimiter_indices) < 2:
-                return None, f"No frontmatter found in {skill_name}/SKILL.md"
-
-            # Extract and parse YAML
-            yaml_lines = lines[delimiter_indices[0] + 1:delimiter_indices[1]]
-            yaml_content = "".join(yaml_lines)
-            data = yaml.safe_load(yaml_content)
+        if not record.has_frontmatter:
+            return None, f"No frontmatter found in {skill_name}/SKILL.md"
 
-            return data, None
+        if record.yaml_error:
+            return None, f"Error loading {skill_name}: {record.yaml_error}"
 
-        except Exception as e:
-            return None, f"Error loading {skill_name}: {str(e)}"
+        return record.frontmatter, None
 
     def parse_dependencies(self, data: Dict) -> List[Dependency]:
         """
@@ -173,7 +316,7 @@ class DependencyValidator:
             DependencyCheckResult with outcome
         """
         # Load dependency skill metadata
-        dep_metadata, error = self.load_skill_metadata(dependency.name)
+        dep_metadata, error = self.graph.metadata(dependency.name)
 
         if error or dep_metadata is None:
             return DependencyCheckResult(
@@ -219,12 +362,12 @@ class DependencyValidator:
             Tuple of (list of results, error_message)
         """
         # Load skill metadata
-        metadata, error = self.load_skill_metadata(skill_name)
+        metadata, error = self.graph.metadata(skill_name)
         if error or metadata is None:
             return [], error
 
         # Parse dependencies
-        dependencies = self.parse_dependencies(metadata)
+        dependencies = self.graph.dependencies(skill_name)
 
         if not dependencies:
             return [], None
@@ -239,51 +382,59 @@ class DependencyValidator:
 
     def detect_circular_dependencies(self, skill_name: str, visited: Optional[Set[str]] = None, path: Optional[List[str]] = None) -> Optional[CircularDependencyError]:
         """
-        Detect circular dependencies recursively.
+        Detect a circular dependency reachable from a skill.
 
         Args:
             skill_name: Name of skill to check
-            visited: Set of visited skills
-            path: Current dependency path
+            visited: Unused; kept for backwards compatibility
+            path: Unused; kept for backwards compatibility
 
         Returns:
             CircularDependencyError if found, None otherwise
         """
-        if visited is None:
-            visited = set()
-        if path is None:
-            path = []
-
-        # Check if we've seen this skill in current path
-        if skill_name in path:
-            # Found a cycle
-            cycle_start = path.index(skill_name)
-            cycle_path = path[cycle_start:] + [skill_name]
-            return CircularDependencyError(cycle_path=cycle_path)
-
-        # Skip if already fully explored
-        if skill_name in visited:
-            return None
+        cycles = self.graph.cycles([skill_name])
+        return cycles[0] if cycles else None
 
-        # Load skill metadata
-        metadata, error = self.load_skill_metadata(skill_name)
-        if error or metadata is None:
-            # Can't load, skip
-            return None
+    def find_all_cycles(self, skill_names: Optional[List[str]] = None) -> List[CircularDependencyError]:
+        """
+        Report every dependency cycle at once.
 
-        # Parse dependencies
-        dependencies = self.parse_dependencies(metadata)
+        Args:
+            skill_names: Roots to search from (default: all installed skills)
 
-        # Explore each dependency
-        path.append(skill_name)
+        Returns:
+            List of CircularDependencyError, one per strongly connected component
+        """
+        return self.graph.cycles(skill_names)
 
-        for dep in dependencies:
-            circular_error = self.detect_circular_dependencies(dep.name, visited, path[:])
-            if circular_error:
-                return circular_error
+    def build_catalog(self, source_dirs: Optional[List[Path]] = None) -> Dict[str, List[Candidate]]:
+        """
+        Collect every available skill version for the dependency solver.
+
+        Args:
+            source_dirs: Extra directories (e.g. repo checkouts) searched after skills_dir
 
-        visited.add(skill_name)
-        return None
+        Returns:
+            Skill name -> list of Candidate (installed versions first)
+        """
+        catalog: Dict[str, List[Candidate]] = {}
+        seen: Set[Tuple[str, str]] = set()
+
+        for root in [self.skills_dir] + list(source_dirs or []):
+            for record in self.index.scan([root]):
+                if not record.ok:
+                    continue
+                name = record.name or record.skill_dir.name
+                skill_version = record.version or '0.0.0'
+                if (name, skill_version) in seen:
+                    continue
+                seen.add((name, skill_version))
+                deps = [(d.name, d.version_constraint, d.required)
+                        for d in self.parse_dependencies(record.frontmatter)]
+                catalog.setdefault(name, []).append(Candidate(
+                    name=name, version=skill_version, dependencies=deps, source=str(record.skill_dir)))
+
+        return catalog
 
     def build_dependency_tree(self, skill_name: str, depth: int = 0, max_depth: int = 10, seen: Optional[Set[str]] = None) -> List[str]:
         """
@@ -312,7 +463,7 @@ class DependencyValidator:
         lines = []
 
         # Load skill metadata
-        metadata, error = self.load_skill_metadata(skill_name)
+        metadata, error = self.graph.metadata(skill_name)
 
         if error or metadata is None:
             if depth == 0:
@@ -326,7 +477,7 @@ class DependencyValidator:
             lines.append(f"{skill_name} ({version})")
 
         # Parse dependencies
-        dependencies = self.parse_dependencies(metadata)
+        dependencies = self.graph.dependencies(skill_name)
 
         if not dependencies:
             return lines
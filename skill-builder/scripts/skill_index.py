@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+skill_index.py - Persistent, incrementally refreshed index of SKILL.md metadata
+
+Bulk validation, dependency checks and skill listings all need the same
+frontmatter fields. Instead of re-opening and re-parsing every SKILL.md, they
+query this index, which stores the parsed frontmatter together with the
+file's mtime, size and content hash in a JSON file under a cache directory:
+
+- Unchanged files (same mtime and size) are served straight from the index
+- Touched files with identical content (same hash) only update their stat info
+- Changed files are re-read and re-parsed
+
+Usage:
+    python3 skill_index.py [root ...] [--cache-dir DIR] [--format json]
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from dataclasses import dataclass, field, asdict
+
+try:
+    import yaml
+except ImportError:
+    print("ERROR: PyYAML required. Run: pip install pyyaml")
+    sys.exit(1)
+
+
+INDEX_VERSION = 2
+INDEX_FILENAME = "skill-index.json"
+CACHE_ENV_VAR = "SF_SKILLS_CACHE_DIR"
+
+# Frontmatter block as matched by skill-forge's validate_skill
+STRICT_FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---', re.DOTALL)
+
+
+def default_cache_dir() -> Path:
+    """Resolve the cache directory ($SF_SKILLS_CACHE_DIR, $XDG_CACHE_HOME/sf-skills, ~/.cache/sf-skills)."""
+    if os.environ.get(CACHE_ENV_VAR):
+        return Path(os.environ[CACHE_ENV_VAR]).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "sf-skills"
+
+
+def split_frontmatter(text: str):
+    """
+    Split SKILL.md text into (yaml_content, body) on the first two '---' lines.
+
+    Returns:
+        Tuple of (yaml_content or None if no frontmatter, body)
+    """
+    lines = text.splitlines(keepends=True)
+    delimiter_indices = []
+    for i, line in enumerate(lines):
+        if line.strip() == '---':
+            delimiter_indices.append(i)
+            if len(delimiter_indices) == 2:
+                break
+
+    if len(delimiter_indices) < 2:
+        return None, text
+
+    yaml_content = "".join(lines[delimiter_indices[0] + 1:delimiter_indices[1]])
+    body = "".join(lines[delimiter_indices[1] + 1:])
+    return yaml_content, body
+
+
+def _json_safe(value: Any) -> Any:
+    """Round-trip YAML values (dates, sets) through JSON-compatible types."""
+    return json.loads(json.dumps(value, default=str))
+
+
+@dataclass
+class SkillRecord:
+    """Indexed metadata for one SKILL.md file."""
+    path: str
+    name: str = ""
+    version: str = ""
+    description: str = ""
+    dependencies: List[Any] = field(default_factory=list)
+    tools: List[str] = field(default_factory=list)
+    frontmatter: Any = None
+    has_frontmatter: bool = False
+    has_content: bool = False
+    yaml_error: Optional[str] = None
+    read_error: Optional[str] = None
+    exact: bool = False  # frontmatter is what a direct yaml.safe_load of the strict block returns
+    mtime_ns: int = 0
+    size: int = 0
+    sha256: str = ""
+
+    @property
+    def skill_dir(self) -> Path:
+        return Path(self.path).parent
+
+    @property
+    def ok(self) -> bool:
+        """True if the frontmatter was read and parsed into a mapping."""
+        return (self.read_error is None and self.has_frontmatter
+                and self.yaml_error is None and isinstance(self.frontmatter, dict))
+
+
+def parse_skill_file(skill_md: Path, data: bytes, stat_result) -> SkillRecord:
+    """Build a SkillRecord from the raw bytes of a SKILL.md file."""
+    record = SkillRecord(
+        path=str(skill_md),
+        mtime_ns=stat_result.st_mtime_ns,
+        size=stat_result.st_size,
+        sha256=hashlib.sha256(data).hexdigest(),
+    )
+
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        record.read_error = str(e)
+        return record
+
+    yaml_content, body = split_frontmatter(text)
+    record.has_content = bool(body.strip())
+    if yaml_content is None:
+        return record
+    record.has_frontmatter = True
+
+    try:
+        frontmatter = yaml.safe_load(yaml_content)
+    except yaml.YAMLError as e:
+        record.yaml_error = str(e)
+        return record
+
+    record.frontmatter = _json_safe(frontmatter)
+    strict = STRICT_FRONTMATTER_RE.match(text)
+    record.exact = (strict is not None and strict.group(1) + "\n" == yaml_content
+                    and record.frontmatter == frontmatter)
+    if isinstance(frontmatter, dict):
+        metadata = frontmatter.get('metadata') if isinstance(frontmatter.get('metadata'), dict) else {}
+        record.name = str(frontmatter.get('name') or "")
+        record.version = str(frontmatter.get('version') or metadata.get('version') or "")
+        record.description = str(frontmatter.get('description') or "").strip()
+        record.dependencies = record.frontmatter.get('dependencies') or []
+        tools = frontmatter.get('allowed-tools') or []
+        if isinstance(tools, str):
+            tools = [t.strip() for t in tools.replace(',', ' ').split()]
+        record.tools = [str(t) for t in tools] if isinstance(tools, list) else []
+    return record
+
+
+class SkillIndex:
+    """Thread-safe SKILL.md metadata index persisted as JSON."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, persist: bool = True):
+        """
+        Initialize the index.
+
+        Args:
+            cache_dir: Directory holding skill-index.json (default: default_cache_dir())
+            persist: Load from and save to disk; False keeps the index in memory only
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.index_path = self.cache_dir / INDEX_FILENAME
+        self.persist = persist
+        self.records: Dict[str, SkillRecord] = {}
+        self.stats = {'hits': 0, 'touched': 0, 'parsed': 0}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if persist:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION:
+            return
+        for path, raw in data.get('skills', {}).items():
+            try:
+                self.records[path] = SkillRecord(**raw)
+            except TypeError:
+                continue
+
+    def save(self):
+        """Write the index atomically if anything changed."""
+        if not self.persist or not self._dirty:
+            return
+        with self._lock:
+            payload = {
+                'version': INDEX_VERSION,
+                'skills': {path: asdict(rec) for path, rec in sorted(self.records.items())},
+            }
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.index_path.with_name(f"{INDEX_FILENAME}.{os.getpid()}.tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f)
+                os.replace(tmp_path, self.index_path)
+                self._dirty = False
+            except OSError:
+                pass
+
+    def get(self, skill_md: Path) -> Optional[SkillRecord]:
+        """
+        Return the record for a SKILL.md file, refreshing it if the file changed.
+
+        Returns:
+            SkillRecord, or None if the file does not exist
+        """
+        skill_md = Path(skill_md).absolute()
+        key = str(skill_md)
+        try:
+            st = skill_md.stat()
+        except OSError:
+            with self._lock:
+                if self.records.pop(key, None) is not None:
+                    self._dirty = True
+            return None
+
+        with self._lock:
+            cached = self.records.get(key)
+        if cached and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+            self.stats['hits'] += 1
+            return cached
+
+        try:
+            data = skill_md.read_bytes()
+        except OSError as e:
+            return SkillRecord(path=key, read_error=str(e))
+
+        if cached and cached.sha256 == hashlib.sha256(data).hexdigest():
+            cached.mtime_ns = st.st_mtime_ns
+            self.stats['touched'] += 1
+            record = cached
+        else:
+            record = parse_skill_file(skill_md, data, st)
+            self.stats['parsed'] += 1
+
+        with self._lock:
+            self.records[key] = record
+            self._dirty = True
+        return record
+
+    def put(self, record: SkillRecord):
+        """Merge a record parsed elsewhere (e.g. in a worker process)."""
+        with self._lock:
+            self.records[record.path] = record
+            self._dirty = True
+
+    def scan(self, roots: Iterable[Path], recursive: bool = True) -> List[SkillRecord]:
+        """
+        Discover and refresh every SKILL.md under the given roots.
+
+        Entries under a scanned root whose file no longer exists are dropped.
+
+        Args:
+            roots: Directories to search
+            recursive: Search nested layouts (sf-skills/<skill>/SKILL.md) or only <root>/<skill>/SKILL.md
+
+        Returns:
+            List of SkillRecord sorted by path
+        """
+        found = []
+        for root in roots:
+            root = Path(root).absolute()
+            if not root.is_dir():
+                continue
+            pattern = root.rglob("SKILL.md") if recursive else root.glob("*/SKILL.md")
+            seen = set()
+            for skill_md in pattern:
+                if ".git" in skill_md.parts:
+                    continue
+                record = self.get(skill_md)
+                if record:
+                    seen.add(record.path)
+                    found.append(record)
+            prefix = str(root) + os.sep
+            with self._lock:
+                stale = [p for p in self.records
+                         if p.startswith(prefix) and p not in seen
+                         and (recursive or p[len(prefix):].count(os.sep) == 1)]
+                for path in stale:
+                    del self.records[path]
+                    self._dirty = True
+        return sorted(found, key=lambda r: r.path)
+
+    def find(self, name: str) -> Optional[SkillRecord]:
+        """Look up an already indexed skill by frontmatter name or directory name."""
+        with self._lock:
+            records = list(self.records.values())
+        for record in records:
+            if record.name == name or record.skill_dir.name == name:
+                return record
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the SKILL.md metadata index")
+    parser.add_argument("roots", nargs="*", type=Path,
+                        help="Directories to scan (default: ~/.claude/skills and ./.claude/skills)")
+    parser.add_argument("--cache-dir", type=Path, help="Index cache directory")
+    parser.add_argument("--format", choices=["console", "json"], default="console")
+    args = parser.parse_args()
+
+    roots = args.roots or [Path.home() / ".claude" / "skills", Path.cwd() / ".claude" / "skills"]
+    index = SkillIndex(cache_dir=args.cache_dir)
+    records = index.scan(roots)
+    index.save()
+
+    if args.format == "json":
+        print(json.dumps([asdict(r) for r in records], indent=2))
+    else:
+        for r in records:
+            status = "✓" if r.ok else "✗"
+            deps = len(r.dependencies) if isinstance(r.dependencies, list) else 0
+            print(f"  {status} {r.name or r.skill_dir.name:30s} {r.version or '-':10s} deps={deps} tools={len(r.tools)}")
+        print(f"\n{len(records)} skills ({index.stats['parsed']} parsed, "
+              f"{index.stats['touched']} touched, {index.stats['hits']} cached) → {index.index_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,28 @@ Supports common version constraint syntaxes:
 - >=1.2.0 : Greater than or equal
 - 1.2.0 : Exact version
 - * : Any version
+
+Version strings and constraints are parsed once and cached, and
+DependencySolver resolves a consistent version plan for a whole set of
+skills with backtracking search.
 """
 
 import re
-from typing import Optional, Tuple
-from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
 from packaging import version
 
 
+@lru_cache(maxsize=4096)
+def _parse_version(version_str: str) -> Optional[version.Version]:
+    """Parse a version string once; None if invalid."""
+    try:
+        return version.parse(str(version_str).strip())
+    except version.InvalidVersion:
+        return None
+
+
 @dataclass
 class VersionConstraint:
     """Represents a version constraint."""
@@ -41,7 +55,7 @@ class VersionResolver:
     @staticmethod
     def parse_constraint(constraint_str: str) -> Optional[VersionConstraint]:
         """
-        Parse a version constraint string.
+        Parse a version constraint string (cached per distinct string).
 
         Args:
             constraint_str: Version constraint (e.g., "^1.2.0", ">=1.0.0")
@@ -49,6 +63,11 @@ class VersionResolver:
         Returns:
             VersionConstraint object or None if invalid
         """
+        return VersionResolver._parse_constraint_cached(str(constraint_str))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_constraint_cached(constraint_str: str) -> Optional[VersionConstraint]:
         constraint_str = constraint_str.strip()
 
         # Handle wildcard
@@ -99,9 +118,8 @@ class VersionResolver:
         Returns:
             Tuple of (satisfies, reason)
         """
-        try:
-            check_ver = version.parse(check_version)
-        except version.InvalidVersion:
+        check_ver = _parse_version(check_version)
+        if check_ver is None:
             return False, f"Invalid version: {check_version}"
 
         # Wildcard matches anything
@@ -185,6 +203,25 @@ class VersionResolver:
         return False, "Unknown constraint operator"
 
     @staticmethod
+    @lru_cache(maxsize=8192)
+    def matches(constraint_str: str, check_version: str) -> bool:
+        """
+        Cached boolean form of satisfies() for hot loops such as the solver.
+
+        Args:
+            constraint_str: Version constraint string
+            check_version: Version string to check
+
+        Returns:
+            True if check_version satisfies the constraint
+        """
+        constraint = VersionResolver.parse_constraint(constraint_str)
+        if constraint is None:
+            return False
+        return VersionResolver.satisfies(constraint, check_version)[0]
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
     def _parse_version_parts(version_str: str) -> Tuple[int, int, int]:
         """
         Parse version string into (major, minor, patch) tuple.
@@ -213,17 +250,16 @@ class VersionResolver:
         Returns:
             -1 if v1 < v2, 0 if v1 == v2, 1 if v1 > v2
         """
-        try:
-            ver1 = version.parse(v1)
-            ver2 = version.parse(v2)
-
-            if ver1 < ver2:
-                return -1
-            elif ver1 > ver2:
-                return 1
-            else:
-                return 0
-        except version.InvalidVersion:
+        ver1 = _parse_version(v1)
+        ver2 = _parse_version(v2)
+        if ver1 is None or ver2 is None:
+            return 0
+
+        if ver1 < ver2:
+            return -1
+        elif ver1 > ver2:
+            return 1
+        else:
             return 0
 
     @staticmethod
@@ -237,11 +273,7 @@ class VersionResolver:
         Returns:
             True if valid semver
         """
-        try:
-            version.parse(version_str)
-            return True
-        except version.InvalidVersion:
-            return False
+        return _parse_version(version_str) is not None
 
     @staticmethod
     def get_constraint_range(constraint_str: str) -> str:
@@ -282,6 +314,171 @@ class VersionResolver:
             return f"{constraint.operator} {constraint.version_str}"
 
 
+@dataclass
+class Candidate:
+    """One installable version of a skill and what it requires."""
+    name: str
+    version: str
+    dependencies: List[Tuple[str, str, bool]] = field(default_factory=list)  # (name, constraint, required)
+    source: str = ""
+
+    def __str__(self) -> str:
+        return f"{self.name}@{self.version}"
+
+
+@dataclass
+class ResolutionConflict:
+    """A skill for which no candidate satisfies every constraint placed on it."""
+    name: str
+    constraints: List[Tuple[str, str]]  # (constraint, required_by)
+    available: List[str]
+
+    def __str__(self) -> str:
+        wanted = ", ".join(f"{c} (from {who})" for c, who in self.constraints)
+        have = ", ".join(self.available) if self.available else "none"
+        return f"{self.name}: needs {wanted}; available: {have}"
+
+
+class ResolutionError(Exception):
+    """Raised when no compatible version plan exists."""
+
+    def __init__(self, conflict: Optional[ResolutionConflict]):
+        self.conflict = conflict
+        super().__init__(str(conflict) if conflict else "No compatible version plan")
+
+
+class DependencySolver:
+    """
+    Backtracking resolver over a catalog of skill versions.
+
+    Picks the most constrained unresolved skill first, tries its newest
+    compatible version, adds that version's dependency constraints and
+    backtracks on conflict. Candidate filtering is cached per (skill, constraint
+    set), so revisiting the same state during backtracking is a dict lookup.
+    """
+
+    def __init__(self, catalog: Dict[str, List[Candidate]], include_optional: bool = False):
+        """
+        Initialize solver.
+
+        Args:
+            catalog: Skill name -> available candidates
+            include_optional: Treat optional dependencies as required
+        """
+        self.include_optional = include_optional
+        self.catalog = {
+            name: sorted(cands, key=lambda c: (_parse_version(c.version) is not None,
+                                               _parse_version(c.version) or version.Version("0")),
+                         reverse=True)
+            for name, cands in catalog.items()
+        }
+        self._viable_cache: Dict[Tuple[str, frozenset], Tuple[Candidate, ...]] = {}
+        self._last_conflict: Optional[ResolutionConflict] = None
+        self.steps = 0
+
+    def _viable(self, name: str, constraints: frozenset) -> Tuple[Candidate, ...]:
+        key = (name, constraints)
+        if key not in self._viable_cache:
+            self._viable_cache[key] = tuple(
+                c for c in self.catalog.get(name, [])
+                if all(VersionResolver.matches(con, c.version) for con in constraints)
+            )
+        return self._viable_cache[key]
+
+    def _edges(self, candidate: Candidate):
+        for dep_name, constraint, required in candidate.dependencies:
+            if required or self.include_optional:
+                yield dep_name, constraint or '*'
+
+    def _search(self, assigned: Dict[str, Candidate],
+                constraints: Dict[str, Tuple[Tuple[str, str], ...]]) -> Optional[Dict[str, Candidate]]:
+        self.steps += 1
+        open_names = [n for n in constraints if n not in assigned]
+        if not open_names:
+            return assigned
+
+        # Most constrained variable first
+        options = {n: self._viable(n, frozenset(c for c, _ in constraints[n])) for n in open_names}
+        name = min(open_names, key=lambda n: (len(options[n]), n))
+
+        if not options[name]:
+            self._last_conflict = ResolutionConflict(
+                name=name,
+                constraints=list(constraints[name]),
+                available=[c.version for c in self.catalog.get(name, [])],
+            )
+            return None
+
+        for candidate in options[name]:
+            next_constraints = dict(constraints)
+            consistent = True
+            for dep_name, constraint in self._edges(candidate):
+                if dep_name in assigned and not VersionResolver.matches(constraint, assigned[dep_name].version):
+                    consistent = False
+                    self._last_conflict = ResolutionConflict(
+                        name=dep_name,
+                        constraints=list(constraints.get(dep_name, ())) + [(constraint, str(candidate))],
+                        available=[c.version for c in self.catalog.get(dep_name, [])],
+                    )
+                    break
+                next_constraints[dep_name] = next_constraints.get(dep_name, ()) + ((constraint, str(candidate)),)
+            if not consistent:
+                continue
+
+            result = self._search({**assigned, name: candidate}, next_constraints)
+            if result is not None:
+                return result
+
+        return None
+
+    def solve(self, requirements: Iterable[str]) -> Dict[str, Candidate]:
+        """
+        Resolve a compatible version for every skill reachable from requirements.
+
+        Args:
+            requirements: Skill specs like "sf-apex", "sf-apex@^2.0.0"
+
+        Returns:
+            Skill name -> chosen Candidate
+
+        Raises:
+            ResolutionError: If no consistent plan exists
+        """
+        constraints: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        for spec in requirements:
+            name, _, constraint = spec.partition('@')
+            name = name.strip()
+            constraints[name] = constraints.get(name, ()) + (((constraint.strip() or '*'), 'request'),)
+
+        self._last_conflict = None
+        plan = self._search({}, constraints)
+        if plan is None:
+            raise ResolutionError(self._last_conflict)
+        return plan
+
+    def install_order(self, plan: Dict[str, Candidate]) -> List[Candidate]:
+        """Order a plan so every skill comes after its dependencies (cycles keep name order)."""
+        order: List[Candidate] = []
+        state: Dict[str, int] = {}
+
+        for root in sorted(plan):
+            stack = [(root, iter(sorted(d for d, _ in self._edges(plan[root]) if d in plan)))]
+            if state.get(root):
+                continue
+            state[root] = 1
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    state[node] = 2
+                    order.append(plan[node])
+                elif not state.get(child):
+                    state[child] = 1
+                    stack.append((child, iter(sorted(d for d, _ in self._edges(plan[child]) if d in plan))))
+        return order
+
+
 if __name__ == "__main__":
     # Test version resolution
     print("Testing Version Resolver...\n")
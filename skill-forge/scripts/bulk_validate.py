@@ -20,7 +20,14 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 # Import the canonical validator
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
-from validate_skill import validate_skill
+from validate_skill import validate_skill, validate_frontmatter
+
+# Shared frontmatter index from skill-builder (optional: falls back to direct parsing)
+sys.path.insert(0, str(script_dir.parent.parent / "skill-builder" / "scripts"))
+try:
+    from skill_index import SkillIndex
+except ImportError:
+    SkillIndex = None
 
 
 class Colors:
@@ -64,10 +71,31 @@ def discover_skills():
     return skills
 
 
-def validate_one(skill_path, location_type):
+def validate_indexed(skill_path, index):
+    """
+    Validate using frontmatter from the skill index instead of re-parsing.
+
+    The index is only trusted when its record matches what validate_skill
+    would parse (same delimiters, no YAML types lost to the JSON cache);
+    anything else goes through validate_skill so both paths agree.
+    """
+    record = index.get(skill_path / "SKILL.md")
+    if record is None:
+        return False, "SKILL.md not found"
+    if record.read_error:
+        return False, f"Could not read SKILL.md: {record.read_error}"
+    if not record.exact:
+        return validate_skill(skill_path)
+    return validate_frontmatter(record.frontmatter)
+
+
+def validate_one(skill_path, location_type, index=None):
     """Validate a single skill, returning structured result."""
     name = skill_path.name
-    valid, message = validate_skill(skill_path)
+    if index is not None:
+        valid, message = validate_indexed(skill_path, index)
+    else:
+        valid, message = validate_skill(skill_path)
     return {
         "name": name,
         "path": str(skill_path),
@@ -77,7 +105,7 @@ def validate_one(skill_path, location_type):
     }
 
 
-def run_bulk(parallel=True):
+def run_bulk(parallel=True, index=None):
     """Discover and validate all skills."""
     start = datetime.now()
     skills = discover_skills()
@@ -86,7 +114,7 @@ def run_bulk(parallel=True):
     if parallel and len(skills) > 1:
         with ThreadPoolExecutor(max_workers=4) as pool:
             futures = {
-                pool.submit(validate_one, path, loc): (path, loc)
+                pool.submit(validate_one, path, loc, index): (path, loc)
                 for path, loc in skills
             }
             for future in as_completed(futures):
@@ -103,7 +131,10 @@ def run_bulk(parallel=True):
                     })
     else:
         for path, loc in skills:
-            results.append(validate_one(path, loc))
+            results.append(validate_one(path, loc, index))
+
+    if index is not None:
+        index.save()
 
     duration = (datetime.now() - start).total_seconds()
     results.sort(key=lambda r: (r["valid"], r["name"]))
@@ -158,9 +189,11 @@ def main():
     parser.add_argument("--errors-only", action="store_true", help="Show only failures")
     parser.add_argument("--format", choices=["console", "json"], default="console")
     parser.add_argument("--no-parallel", action="store_true", help="Sequential validation")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every SKILL.md (skip the skill index)")
     args = parser.parse_args()
 
-    report = run_bulk(parallel=not args.no_parallel)
+    index = SkillIndex() if SkillIndex and not args.no_cache else None
+    report = run_bulk(parallel=not args.no_parallel, index=index)
 
     if args.format == "json":
         print(json.dumps(report, indent=2))
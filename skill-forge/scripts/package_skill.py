@@ -2,27 +2,328 @@
 """
 Skill Packager - Creates a distributable .skill file of a skill folder
 
+Archives are reproducible: entries are written in sorted order with normalized
+timestamps and permissions, so packaging the same tree twice yields
+byte-identical files. Caches and dotfiles are skipped (see DEFAULT_IGNORE and
+an optional .skillignore in the skill root), entries are compressed in
+parallel, and files whose content is unchanged since the previous package
+reuse its compressed bytes instead of being deflated again. Each archive
+records its format version, deflate level and zlib version in the ZIP comment;
+bytes are only reused from a package whose record matches, so the output does
+not depend on which package already exists.
+
 Usage:
     python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py --all <skills-root> [output-directory]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py --all skills/public ./dist --workers 8
 """
 
+import os
 import sys
+import time
+import stat
+import zlib
+import struct
+import fnmatch
 import zipfile
+import argparse
+import threading
 from pathlib import Path
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from validate_skill import validate_skill
 
 
-def package_skill(skill_path, output_dir=None):
+# Patterns matched against every path component (and against the relative
+# path for patterns containing '/'). Dotfiles are excluded, matching the
+# documented "packaging ignores hidden files" behaviour.
+DEFAULT_IGNORE = [
+    '.*',
+    '__pycache__',
+    '*.pyc',
+    '*.pyo',
+    'node_modules',
+    '*.skill',
+    '*.swp',
+    '*~',
+    'Thumbs.db',
+]
+
+IGNORE_FILE = '.skillignore'
+
+# Fixed DOS timestamp (1980-01-01 00:00:00) unless SOURCE_DATE_EPOCH is set
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+DEFAULT_LEVEL = 9
+
+# Bump when the entry layout or compression settings change, so packages
+# written by older versions are never used as a source of compressed bytes
+PACKAGE_FORMAT = 1
+
+# Compressed entries are buffered at most this many times the worker count
+WINDOW_FACTOR = 4
+
+_ZIP_VERSION = 20
+_FLAG_UTF8 = 0x800
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+_MAX_32 = 0xFFFFFFFF
+
+
+# ============================================================================
+# File selection
+# ============================================================================
+
+def load_ignore_patterns(skill_path):
+    """Return DEFAULT_IGNORE plus any patterns from the skill's .skillignore."""
+    patterns = list(DEFAULT_IGNORE)
+    ignore_file = Path(skill_path) / IGNORE_FILE
+    if ignore_file.is_file():
+        for line in ignore_file.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                patterns.append(line.rstrip('/'))
+    return patterns
+
+
+def is_ignored(rel_path, patterns):
+    """Check a POSIX relative path against ignore patterns."""
+    name = rel_path.rsplit('/', 1)[-1]
+    for pattern in patterns:
+        if '/' in pattern:
+            if fnmatch.fnmatch(rel_path, pattern.lstrip('/')):
+                return True
+        elif fnmatch.fnmatch(name, pattern):
+            return True
+    return False
+
+
+def collect_files(skill_path, patterns):
+    """
+    Walk the skill folder in sorted order, pruning ignored directories.
+
+    Returns:
+        List of (absolute Path, relative POSIX path) tuples
+    """
+    skill_path = Path(skill_path)
+    files = []
+    for root, dirs, filenames in os.walk(skill_path):
+        rel_root = Path(root).relative_to(skill_path).as_posix()
+        prefix = '' if rel_root == '.' else rel_root + '/'
+        dirs[:] = sorted(d for d in dirs if not is_ignored(prefix + d, patterns))
+        for filename in sorted(filenames):
+            rel = prefix + filename
+            if not is_ignored(rel, patterns):
+                files.append((Path(root) / filename, rel))
+    return files
+
+
+# ============================================================================
+# Reproducible ZIP writing
+# ============================================================================
+
+def package_comment(level):
+    """ZIP comment identifying what produced an archive's compressed bytes."""
+    return (f"skill-package/{PACKAGE_FORMAT} level={level} "
+            f"zlib={zlib.ZLIB_RUNTIME_VERSION}").encode('ascii')
+
+
+def _dos_date_time():
+    """Normalized (time, date) DOS fields for every entry."""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        date_time = time.gmtime(max(int(epoch), 315532800))[:6]
+    else:
+        date_time = DEFAULT_DATE_TIME
+    year, month, day, hour, minute, second = date_time
+    dos_date = (year - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_time, dos_date
+
+
+class PreviousPackage:
+    """
+    Read access to the raw compressed entries of an earlier .skill file.
+
+    Entries are only offered when the archive's comment matches `comment`
+    (same format and deflate level); otherwise every lookup misses.
+    """
+
+    def __init__(self, path, comment):
+        self.path = Path(path)
+        self.entries = {}
+        self._fh = None
+        self._lock = threading.Lock()
+        try:
+            with zipfile.ZipFile(self.path) as zf:
+                if zf.comment != comment:
+                    return
+                for info in zf.infolist():
+                    if info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                        self.entries[info.filename] = info
+            self._fh = open(self.path, 'rb')
+        except (OSError, zipfile.BadZipFile):
+            self.entries = {}
+
+    def lookup(self, arcname, crc, size):
+        """Return (compress_type, raw bytes) if the entry content is unchanged."""
+        info = self.entries.get(arcname)
+        if info is None or info.CRC != crc or info.file_size != size:
+            return None
+        with self._lock:
+            self._fh.seek(info.header_offset)
+            header = self._fh.read(_LOCAL_HEADER.size)
+            name_len, extra_len = struct.unpack('<HH', header[26:30])
+            self._fh.seek(name_len + extra_len, os.SEEK_CUR)
+            return info.compress_type, self._fh.read(info.compress_size)
+
+    def close(self):
+        if self._fh:
+            self._fh.close()
+
+
+def _compress_entry(file_path, arcname, level, previous):
+    """Read and compress one file. Runs in a worker thread (zlib drops the GIL)."""
+    data = file_path.read_bytes()
+    crc = zlib.crc32(data)
+    mode = 0o755 if file_path.stat().st_mode & stat.S_IXUSR else 0o644
+
+    reused = previous.lookup(arcname, crc, len(data)) if previous else None
+    if reused:
+        method, payload = reused
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        payload = compressor.compress(data) + compressor.flush()
+        method = zipfile.ZIP_DEFLATED
+        if len(payload) >= len(data):
+            method, payload = zipfile.ZIP_STORED, data
+
+    return {
+        'arcname': arcname,
+        'crc': crc,
+        'size': len(data),
+        'method': method,
+        'payload': payload,
+        'mode': mode,
+        'reused': reused is not None,
+    }
+
+
+def _write_archive(out, entries, comment=b''):
+    """Write compressed entries (an iterable) as a ZIP stream; returns stats."""
+    dos_time, dos_date = _dos_date_time()
+    central = []
+    written = []
+    offset = 0
+
+    for entry in entries:
+        name = entry['arcname'].encode('utf-8')
+        flags = _FLAG_UTF8 if not entry['arcname'].isascii() else 0
+        csize = len(entry['payload'])
+        if offset > _MAX_32 or entry['size'] > _MAX_32 or csize > _MAX_32:
+            raise ValueError("Skill too large for a .skill archive (ZIP64 not supported)")
+
+        out.write(_LOCAL_HEADER.pack(
+            0x04034b50, _ZIP_VERSION, flags, entry['method'], dos_time, dos_date,
+            entry['crc'], csize, entry['size'], len(name), 0))
+        out.write(name)
+        out.write(entry['payload'])
+
+        central.append(_CENTRAL_HEADER.pack(
+            0x02014b50, 3 << 8 | _ZIP_VERSION, _ZIP_VERSION, flags, entry['method'],
+            dos_time, dos_date, entry['crc'], csize, entry['size'], len(name),
+            0, 0, 0, 0, (stat.S_IFREG | entry['mode']) << 16, offset) + name)
+        offset += _LOCAL_HEADER.size + len(name) + csize
+
+        entry['compressed'] = csize
+        del entry['payload']
+        written.append(entry)
+
+    central_size = sum(len(record) for record in central)
+    for record in central:
+        out.write(record)
+    out.write(_END_RECORD.pack(
+        0x06054b50, 0, 0, len(central), len(central), central_size, offset, len(comment)))
+    out.write(comment)
+    return written
+
+
+def _compress_stream(files, skill_name, level, previous, workers):
+    """Yield compressed entries in sorted order with a bounded lookahead window."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for file_path, rel in files:
+            arcname = f"{skill_name}/{rel}"
+            pending.append(pool.submit(_compress_entry, file_path, arcname, level, previous))
+            if len(pending) >= workers * WINDOW_FACTOR:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def build_report(entries, skill_name):
+    """Aggregate size/compression per directory within the skill."""
+    dirs = OrderedDict()
+    prefix_len = len(skill_name) + 1
+    for entry in entries:
+        rel = entry['arcname'][prefix_len:]
+        directory = rel.rsplit('/', 1)[0] if '/' in rel else '.'
+        stats = dirs.setdefault(directory, {'files': 0, 'size': 0, 'compressed': 0, 'reused': 0})
+        stats['files'] += 1
+        stats['size'] += entry['size']
+        stats['compressed'] += entry['compressed']
+        stats['reused'] += entry['reused']
+    return dirs
+
+
+def _human(num_bytes):
+    for unit in ('B', 'KB', 'MB'):
+        if num_bytes < 1024 or unit == 'MB':
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def print_report(report):
+    """Print the per-directory size/compression table."""
+    print(f"  {'Directory':<32} {'Files':>5} {'Size':>10} {'Packed':>10} {'Ratio':>6} {'Reused':>6}")
+    print(f"  {'-' * 32} {'-' * 5} {'-' * 10} {'-' * 10} {'-' * 6} {'-' * 6}")
+    totals = {'files': 0, 'size': 0, 'compressed': 0, 'reused': 0}
+    for directory, stats in sorted(report.items()):
+        for key in totals:
+            totals[key] += stats[key]
+        ratio = stats['compressed'] / stats['size'] if stats['size'] else 1.0
+        print(f"  {directory:<32} {stats['files']:>5} {_human(stats['size']):>10} "
+              f"{_human(stats['compressed']):>10} {ratio:>6.0%} {stats['reused']:>6}")
+    ratio = totals['compressed'] / totals['size'] if totals['size'] else 1.0
+    print(f"  {'TOTAL':<32} {totals['files']:>5} {_human(totals['size']):>10} "
+          f"{_human(totals['compressed']):>10} {ratio:>6.0%} {totals['reused']:>6}")
+
+
+# ============================================================================
+# Packaging
+# ============================================================================
+
+def package_skill(skill_path, output_dir=None, workers=None, level=DEFAULT_LEVEL,
+                  reuse=True, verbose=False):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        workers: Compression threads (defaults to os.cpu_count())
+        level: zlib compression level (0-9)
+        reuse: Reuse compressed bytes of unchanged files from an existing package
+        verbose: Print one line per archived file
 
     Returns:
         Path to the created .skill file, or None if error
@@ -62,48 +363,90 @@ def package_skill(skill_path, output_dir=None):
         output_path = Path.cwd()
 
     skill_filename = output_path / f"{skill_name}.skill"
+    tmp_filename = skill_filename.with_name(skill_filename.name + '.tmp')
 
-    # Create the .skill file (zip format)
-    try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
-
-        print(f"\n✅ Successfully packaged skill to: {skill_filename}")
-        return skill_filename
+    files = collect_files(skill_path, load_ignore_patterns(skill_path))
+    workers = max(1, workers or os.cpu_count() or 1)
+    comment = package_comment(level)
+    previous = PreviousPackage(skill_filename, comment) if reuse and skill_filename.exists() else None
 
+    # Create the .skill file (zip format) next to the target, then swap it in
+    start = time.perf_counter()
+    try:
+        with open(tmp_filename, 'wb') as out:
+            entries = _write_archive(
+                out, _compress_stream(files, skill_name, level, previous, workers), comment)
+        if previous:
+            previous.close()
+        os.replace(tmp_filename, skill_filename)
     except Exception as e:
+        if previous:
+            previous.close()
+        tmp_filename.unlink(missing_ok=True)
         print(f"❌ Error creating .skill file: {e}")
         return None
+    duration = time.perf_counter() - start
+
+    if verbose:
+        for entry in entries:
+            marker = " (reused)" if entry['reused'] else ""
+            print(f"  Added: {entry['arcname']}{marker}")
+        print()
+
+    print_report(build_report(entries, skill_name))
+    print(f"\n✅ Successfully packaged skill to: {skill_filename} ({duration:.2f}s)")
+    return skill_filename
+
+
+def discover_skill_dirs(root):
+    """Find every folder under root that contains a SKILL.md."""
+    patterns = list(DEFAULT_IGNORE)
+    return sorted(
+        skill_md.parent for skill_md in Path(root).rglob('SKILL.md')
+        if not any(is_ignored(part, patterns) for part in skill_md.relative_to(root).parts[:-1])
+    )
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
+    parser = argparse.ArgumentParser(
+        description="Package a skill folder into a reproducible .skill file")
+    parser.add_argument("skill_path", help="Skill folder (or skills root with --all)")
+    parser.add_argument("output_dir", nargs="?", help="Output directory (default: cwd)")
+    parser.add_argument("--all", action="store_true",
+                        help="Package every skill found under skill_path")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Compression threads (default: CPU count)")
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL, choices=range(0, 10),
+                        metavar="0-9", help=f"Deflate level (default: {DEFAULT_LEVEL})")
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="Recompress every file even if a previous package exists")
+    parser.add_argument("--verbose", "-v", action="store_true", help="List every archived file")
+    args = parser.parse_args()
+
+    targets = discover_skill_dirs(args.skill_path) if args.all else [args.skill_path]
+    if not targets:
+        print(f"❌ Error: No skills found under {args.skill_path}")
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    failed = 0
+    for target in targets:
+        print(f"📦 Packaging skill: {target}")
+        if args.output_dir:
+            print(f"   Output directory: {args.output_dir}")
+        print()
 
-    print(f"📦 Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
-    print()
+        result = package_skill(target, args.output_dir, workers=args.workers,
+                               level=args.level, reuse=not args.no_reuse,
+                               verbose=args.verbose)
+        if not result:
+            failed += 1
+        if len(targets) > 1:
+            print()
 
-    result = package_skill(skill_path, output_dir)
+    if len(targets) > 1:
+        print(f"📦 Packaged {len(targets) - failed}/{len(targets)} skills")
 
-    if result:
-        sys.exit(0)
-    else:
-        sys.exit(1)
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == "__main__":
@@ -33,11 +33,16 @@ def validate_skill(skill_path):
     # Parse YAML frontmatter
     try:
         frontmatter = yaml.safe_load(frontmatter_text)
-        if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
     except yaml.YAMLError as e:
         return False, f"Invalid YAML in frontmatter: {e}"
 
+    return validate_frontmatter(frontmatter)
+
+def validate_frontmatter(frontmatter):
+    """Validate already-parsed frontmatter (e.g. from the skill index)"""
+    if not isinstance(frontmatter, dict):
+        return False, "Frontmatter must be a YAML dictionary"
+
     # Define allowed properties
     ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata', 'compatibility'}
 
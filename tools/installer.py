@@ -41,6 +41,13 @@ sys.path.insert(0, str(SCRIPT_DIR))
 
 from cli_adapters import ADAPTERS, CLIAdapter
 
+# Shared SKILL.md frontmatter index (optional: needs PyYAML)
+sys.path.insert(0, str(REPO_ROOT / "skill-builder" / "scripts"))
+try:
+    from skill_index import SkillIndex
+except (ImportError, SystemExit):
+    SkillIndex = None
+
 
 # ANSI colors for terminal output
 class Colors:
@@ -234,9 +241,18 @@ def list_skills() -> None:
         print_warning("No skills found in repository")
         return
 
+    index = SkillIndex() if SkillIndex else None
+
     for skill in skills:
         skill_md = REPO_ROOT / skill / "SKILL.md"
-        if skill_md.exists():
+        record = index.get(skill_md) if index else None
+        if record is not None:
+            desc = " ".join(record.description.split())[:60]
+            if desc:
+                print(f"  {Colors.CYAN}{skill:20}{Colors.ENDC} {desc}...")
+            else:
+                print(f"  {Colors.CYAN}{skill:20}{Colors.ENDC}")
+        elif skill_md.exists():
             content = skill_md.read_text(encoding='utf-8')
             # Extract description from YAML frontmatter
             import re
@@ -249,6 +265,9 @@ def list_skills() -> None:
         else:
             print(f"  {Colors.CYAN}{skill:20}{Colors.ENDC} (no description)")
 
+    if index:
+        index.save()
+
 
 def list_clis() -> None:
     """List supported CLIs and their install paths."""